@@ -0,0 +1,566 @@
+"""
+バイナリ形式のアクセスログと集計ツール
+
+リクエストごとに固定長（32バイト）のレコードをバッファに追記し、まとめてファイルに書き出す。
+ルート・カテゴリ・単位はCRC32のIDで記録し、名前は同じ名前のファイルに .names を付けた
+サイドカーファイルに1回だけ書き出す（IDはプロセス・ファイルをまたいで同じ値になる）。
+ファイルは一定のサイズでローテーションし、ワーカープロセスごとに別のファイルに書き出す。
+
+集計ツールはブロック単位で読み込んだレコードから集計のキーになる列を struct.iter_unpack で
+まとめて取り出して Counter で数えるため、レコードごとのPythonの処理がない。
+
+使い方:
+    python access_log.py /var/log/metrix [--since 2026-10-01] [--until 2026-10-08] [--top 10] [--jobs 4] [--json]
+"""
+
+import contextvars
+import logging
+import math
+import os
+import struct
+import sys
+import time
+import zlib
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+from itertools import repeat
+
+logger = logging.getLogger(__name__)
+
+# ファイルの先頭: マジック, 形式のバージョン, レコードのバイト数（レコードと同じ32バイト）
+HEADER = struct.Struct("<4sHH24x")
+MAGIC = b"MXAL"
+FORMAT_VERSION = 1
+# レコード: 時刻（UNIX時刻のマイクロ秒）, 処理時間（マイクロ秒）, ルートID, ステータスコード, 予約,
+#           カテゴリID, 変換元の単位ID, 変換先の単位ID
+# （集計で1つのキーとして読み出す列を隣り合わせに並べる）
+RECORD = struct.Struct("<QIIHHIII")
+
+# 集計用にレコードから読み出すキー（レコードごとのPythonの処理なしで Counter に渡せる）
+_LATENCY_KEY = struct.Struct("<8xQ16x")     # 処理時間 | ルートID << 32
+_STATUS_KEY = struct.Struct("<12xIH14x")    # (ルートID, ステータスコード)
+_PAIR_KEY = struct.Struct("<20xIII")        # (カテゴリID, 変換元の単位ID, 変換先の単位ID)
+_TIMESTAMP = struct.Struct("<Q24x")
+
+LOG_SUFFIX = ".mxlog"
+NAMES_SUFFIX = ".names"
+
+# ルートに一致しなかったリクエスト（404など）のルート名
+UNMATCHED_ROUTE = "(unmatched)"
+
+# 処理時間の上限（32ビットのマイクロ秒、約71分）
+_MAX_DURATION_US = 0xFFFFFFFF
+
+# 集計時に1回に読み込むレコード数
+_READ_RECORDS = 32768
+
+# リクエストの処理中にハンドラーが記録するカテゴリ・単位（ミドルウェアが用意した辞書）
+_annotations: contextvars.ContextVar[dict | None] = contextvars.ContextVar("access_log_annotations", default=None)
+
+
+def name_id(name: str | None) -> int:
+    """名前のID（CRC32、名前がない場合は0）を返す"""
+    if not name:
+        return 0
+    return zlib.crc32(name.encode("utf-8")) or 1
+
+
+def begin_request() -> dict:
+    """
+    リクエストの処理を始める（ハンドラーが annotate で記録する辞書を用意する）
+
+    ハンドラーが別のタスクで実行されても同じ辞書に記録されるよう、処理の前に呼び出す
+
+    Returns:
+        dict: ハンドラーが記録したカテゴリ・単位（category, from_unit, to_unit）
+    """
+    annotations = {}
+    _annotations.set(annotations)
+    return annotations
+
+
+def annotate(category: str, from_unit: str | None = None, to_unit: str | None = None) -> None:
+    """
+    処理中のリクエストのカテゴリ・単位をアクセスログに記録する（アクセスログが無効な場合は何もしない）
+
+    Args:
+        category: カテゴリ
+        from_unit: 変換元の単位コード
+        to_unit: 変換先の単位コード
+    """
+    annotations = _annotations.get()
+    if annotations is not None:
+        annotations["category"] = category
+        annotations["from_unit"] = from_unit
+        annotations["to_unit"] = to_unit
+
+
+class AccessLogWriter:
+    """
+    バイナリ形式のアクセスログをバッファ付きで書き出すライター
+
+    レコードはバッファに追記し、buffer_size バイトに達した時点または前回の書き出しから
+    flush_interval 秒経過した後の最初の書き込みでファイルに書き出す。ファイルが max_bytes を
+    超えると次のファイルに切り替える（ファイル名は access-<開始時刻>-<PID>-<連番>.mxlog）。
+    書き出しに失敗した場合はバッファのレコードを破棄して件数を dropped_total に数え、
+    次の書き出しで新しいファイルを開き直す（リクエストの処理には例外を伝えない）。
+
+    Args:
+        directory: ログファイルを書き出すディレクトリ
+        max_bytes: 1ファイルの最大バイト数
+        buffer_size: バッファのバイト数
+        flush_interval: バッファを書き出す間隔（秒）
+    """
+
+    def __init__(
+        self, directory: str, max_bytes: int = 64 * 1024 * 1024, buffer_size: int = 64 * 1024,
+        flush_interval: float = 1.0
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.records_total = 0
+        self.dropped_total = 0
+        self._failing = False
+        self._buffer = bytearray()
+        # プロセスで出現した名前 (種類, ID) -> 名前 と、現在のファイルのサイドカーに未書き出しの名前
+        self._known: dict[tuple[str, int], str] = {}
+        self._pending_names: list[tuple[str, int]] = []
+        self._file = None
+        self._names_file = None
+        self._file_size = 0
+        self._sequence = 0
+        self._last_flush = time.monotonic()
+        self.path: str | None = None
+
+    def prepare(self) -> None:
+        """
+        ログのディレクトリを作成し、書き込めることを確認する（起動時に呼び出す）
+
+        Raises:
+            OSError: ディレクトリを作成できない、または書き込めない場合
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        if not os.access(self.directory, os.W_OK | os.X_OK):
+            raise PermissionError(f"Access log directory is not writable: {self.directory}")
+
+    def write(
+        self, route: str, status: int, duration: float, timestamp: float | None = None,
+        category: str | None = None, from_unit: str | None = None, to_unit: str | None = None
+    ) -> None:
+        """
+        リクエスト1件を記録する
+
+        Args:
+            route: ルート（"POST /api/convert" など、パスはパラメーターを含まないテンプレート）
+            status: ステータスコード
+            duration: 処理時間（秒）
+            timestamp: リクエストの受付時刻（UNIX時刻、省略時は現在時刻）
+            category: カテゴリ
+            from_unit: 変換元の単位コード
+            to_unit: 変換先の単位コード
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        self._buffer += RECORD.pack(
+            int(timestamp * 1_000_000),
+            min(max(int(duration * 1_000_000), 0), _MAX_DURATION_US),
+            self._intern("route", route),
+            status,
+            0,
+            self._intern("category", category),
+            self._intern("unit", from_unit),
+            self._intern("unit", to_unit),
+        )
+        self.records_total += 1
+        if len(self._buffer) >= self.buffer_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def _intern(self, kind: str, name: str | None) -> int:
+        """名前のIDを返す（初めて出てきた名前はサイドカーファイルに書き出す）"""
+        id_ = name_id(name)
+        if id_ and (kind, id_) not in self._known:
+            self._known[(kind, id_)] = name
+            self._pending_names.append((kind, id_))
+        return id_
+
+    def flush(self) -> None:
+        """バッファのレコードをファイルに書き出す（必要に応じて次のファイルに切り替える）"""
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        try:
+            if self._file is None or self._file_size + len(self._buffer) > self.max_bytes:
+                self._rotate()
+            # 名前はレコードより先に書き出す（集計時に名前のないIDが出ないようにする）
+            if self._pending_names:
+                self._names_file.write("".join(
+                    f"{kind}\t{id_}\t{self._known[(kind, id_)]}\n" for kind, id_ in self._pending_names
+                ))
+                self._names_file.flush()
+                self._pending_names.clear()
+            self._file.write(self._buffer)
+            self._file.flush()
+        except OSError as e:
+            # バッファを破棄して、次の書き出しで新しいファイル（名前を含む）から書き直す
+            self.dropped_total += len(self._buffer) // RECORD.size
+            self._buffer.clear()
+            self._close_files()
+            if not self._failing:
+                logger.error(f"Failed to write access log, dropping records: {e}")
+                self._failing = True
+            return
+        if self._failing:
+            logger.info("Access log writes recovered")
+            self._failing = False
+        self._file_size += len(self._buffer)
+        self._buffer.clear()
+
+    def _rotate(self) -> None:
+        """次のファイルに切り替える（サイドカーファイルにはこれまでに出現した名前をすべて書き出す）"""
+        self._close_files()
+        os.makedirs(self.directory, exist_ok=True)
+        self._sequence += 1
+        started = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        self.path = os.path.join(self.directory, f"access-{started}-{os.getpid()}-{self._sequence}{LOG_SUFFIX}")
+        self._file = open(self.path, "wb")
+        self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size))
+        self._file_size = HEADER.size
+        self._names_file = open(self.path + NAMES_SUFFIX, "w", encoding="utf-8")
+        self._pending_names = list(self._known)
+
+    def close(self) -> None:
+        """バッファを書き出してファイルを閉じる"""
+        self.flush()
+        self._close_files()
+
+    def _close_files(self) -> None:
+        for f in (self._file, self._names_file):
+            if f is not None:
+                try:
+                    f.close()
+                except OSError:
+                    # 書き出しに失敗したファイルは閉じる際にも失敗することがある
+                    pass
+        self._file = None
+        self._names_file = None
+
+
+def log_files(paths: Iterable[str]) -> list[str]:
+    """
+    集計対象のログファイルの一覧を返す（ディレクトリは直下の .mxlog ファイルを名前順に展開する）
+
+    Args:
+        paths: ファイルまたはディレクトリのパス
+
+    Returns:
+        list[str]: ログファイルのパス
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(LOG_SUFFIX)
+            )
+        else:
+            files.append(path)
+    return files
+
+
+def read_names(path: str) -> dict[tuple[str, int], str]:
+    """
+    ログファイルのサイドカーファイルから名前を読み込む
+
+    Args:
+        path: ログファイルのパス
+
+    Returns:
+        dict[tuple[str, int], str]: (種類, ID) -> 名前（サイドカーファイルがない場合は空）
+    """
+    names = {}
+    try:
+        with open(path + NAMES_SUFFIX, encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t", 2)
+                if len(parts) == 3 and parts[1].isdigit():
+                    names[(parts[0], int(parts[1]))] = parts[2]
+    except FileNotFoundError:
+        pass
+    return names
+
+
+def read_blocks(path: str, since: float | None = None, until: float | None = None) -> Iterator[bytes]:
+    """
+    ログファイルのレコードをまとめて読み込む
+
+    Args:
+        path: ログファイルのパス
+        since: この時刻（UNIX時刻）以降のレコードのみ
+        until: この時刻（UNIX時刻）より前のレコードのみ
+
+    Yields:
+        bytes: レコード（RECORD）を連結したブロック
+
+    Raises:
+        ValueError: ログファイルの形式が不正な場合
+    """
+    since_us = None if since is None else int(since * 1_000_000)
+    until_us = None if until is None else int(until * 1_000_000)
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return
+        magic, version, record_size = HEADER.unpack(header)
+        if magic != MAGIC or version != FORMAT_VERSION or record_size != RECORD.size:
+            raise ValueError(f"{path}: not a metrix access log")
+        while True:
+            data = f.read(_READ_RECORDS * RECORD.size)
+            # 書き込み途中で終了した場合の末尾の不完全なレコードは無視する
+            usable = len(data) - len(data) % RECORD.size
+            if usable == 0:
+                return
+            block = data[:usable] if usable < len(data) else data
+            if since_us is not None or until_us is not None:
+                # レコードはほぼ時刻順のため、範囲に完全に含まれる・含まれないブロックは個別に判定しない
+                low, high = min(_TIMESTAMP.iter_unpack(block))[0], max(_TIMESTAMP.iter_unpack(block))[0]
+                if (since_us is not None and high < since_us) or (until_us is not None and low >= until_us):
+                    continue
+                if (since_us is not None and low < since_us) or (until_us is not None and high >= until_us):
+                    block = b"".join(
+                        block[offset:offset + RECORD.size]
+                        for offset, (timestamp,) in zip(range(0, usable, RECORD.size), _TIMESTAMP.iter_unpack(block))
+                        if (since_us is None or timestamp >= since_us) and (until_us is None or timestamp < until_us)
+                    )
+                    if not block:
+                        continue
+            yield block
+
+
+def _percentile(durations: list[tuple[int, int]], total: int, fraction: float) -> int:
+    """(処理時間, 件数) の昇順のリストから最近接順位法でパーセンタイルを求める"""
+    rank = max(1, math.ceil(total * fraction))
+    seen = 0
+    for duration, count in durations:
+        seen += count
+        if seen >= rank:
+            return duration
+    return durations[-1][0]
+
+
+def _latency_summary(counts: Counter, total: int) -> dict:
+    """処理時間（マイクロ秒）ごとの件数からパーセンタイル（ミリ秒）を求める"""
+    durations = sorted(counts.items())
+    return {
+        "p50_ms": _percentile(durations, total, 0.50) / 1000,
+        "p90_ms": _percentile(durations, total, 0.90) / 1000,
+        "p99_ms": _percentile(durations, total, 0.99) / 1000,
+        "max_ms": durations[-1][0] / 1000,
+    }
+
+
+def _error_rates(status_counts: Counter, total: int) -> dict:
+    """ステータスコードごとの件数から4xx・5xxの割合を求める"""
+    client_errors = sum(count for status, count in status_counts.items() if 400 <= status < 500)
+    server_errors = sum(count for status, count in status_counts.items() if status >= 500)
+    return {"client_error_rate": client_errors / total, "server_error_rate": server_errors / total}
+
+
+def _count_file(path: str, since: float | None, until: float | None) -> tuple:
+    """
+    1つのログファイルのレコードを数える（プロセスプールのワーカーでも実行される）
+
+    Returns:
+        tuple: (名前, 処理時間の件数, ステータスコードの件数, 単位ペアの件数, 最初の時刻, 最後の時刻)
+    """
+    latency: Counter = Counter()        # (処理時間 | ルートID << 32,) -> 件数
+    statuses: Counter = Counter()       # (ルートID, ステータスコード) -> 件数
+    pairs: Counter = Counter()          # (カテゴリID, 変換元の単位ID, 変換先の単位ID) -> 件数
+    first = last = None
+    for block in read_blocks(path, since, until):
+        latency.update(_LATENCY_KEY.iter_unpack(block))
+        statuses.update(_STATUS_KEY.iter_unpack(block))
+        pairs.update(_PAIR_KEY.iter_unpack(block))
+        low, high = min(_TIMESTAMP.iter_unpack(block))[0], max(_TIMESTAMP.iter_unpack(block))[0]
+        first = low if first is None else min(first, low)
+        last = high if last is None else max(last, high)
+    return read_names(path), latency, statuses, pairs, first, last
+
+
+def analyze(
+    paths: Iterable[str], since: float | None = None, until: float | None = None, top: int = 10, jobs: int = 1
+) -> dict:
+    """
+    アクセスログを集計する
+
+    Args:
+        paths: ログファイルまたはディレクトリのパス
+        since: この時刻（UNIX時刻）以降のレコードのみ
+        until: この時刻（UNIX時刻）より前のレコードのみ
+        top: ルート・単位ペアの上位件数
+        jobs: 並列にファイルを集計するプロセス数
+
+    Returns:
+        dict: 件数・期間・全体とルートごとのパーセンタイルとエラー率・単位ペアの上位
+
+    Raises:
+        OSError: ログファイルを読み込めない場合
+        ValueError: ログファイルの形式が不正な場合
+    """
+    files = log_files(paths)
+    if jobs > 1 and len(files) > 1:
+        # サーバーからは使わないため、並列に集計する場合のみ読み込む
+        from concurrent.futures import ProcessPoolExecutor
+    names: dict[tuple[str, int], str] = {}
+    latency: Counter = Counter()
+    statuses: Counter = Counter()
+    pairs: Counter = Counter()
+    first = last = None
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 and len(files) > 1 else None
+    try:
+        counted = (
+            executor.map(_count_file, files, repeat(since), repeat(until)) if executor is not None
+            else (_count_file(path, since, until) for path in files)
+        )
+        for file_names, file_latency, file_statuses, file_pairs, file_first, file_last in counted:
+            names.update(file_names)
+            latency.update(file_latency)
+            statuses.update(file_statuses)
+            pairs.update(file_pairs)
+            if file_first is not None:
+                first = file_first if first is None else min(first, file_first)
+                last = file_last if last is None else max(last, file_last)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    def name(kind: str, id_: int) -> str:
+        return names.get((kind, id_), f"#{id_:08x}")
+
+    total = sum(statuses.values())
+    report = {"records": total, "start": None, "end": None, "overall": None, "routes": [], "unit_pairs": []}
+    if total == 0:
+        return report
+
+    # ルートごと・全体の処理時間とステータスコードの件数
+    route_latency: defaultdict[int, Counter] = defaultdict(Counter)
+    route_statuses: defaultdict[int, Counter] = defaultdict(Counter)
+    overall_latency: Counter = Counter()
+    overall_statuses: Counter = Counter()
+    for (key,), count in latency.items():
+        duration = key & _MAX_DURATION_US
+        route_latency[key >> 32][duration] += count
+        overall_latency[duration] += count
+    for (route, status), count in statuses.items():
+        route_statuses[route][status] += count
+        overall_statuses[status] += count
+
+    route_totals = sorted(
+        ((sum(counts.values()), route) for route, counts in route_statuses.items()), reverse=True
+    )
+    report.update(
+        start=datetime.fromtimestamp(first / 1_000_000, tz=timezone.utc).isoformat(),
+        end=datetime.fromtimestamp(last / 1_000_000, tz=timezone.utc).isoformat(),
+        overall={**_latency_summary(overall_latency, total), **_error_rates(overall_statuses, total)},
+        routes=[
+            {
+                "route": name("route", route),
+                "count": count,
+                **_latency_summary(route_latency[route], count),
+                **_error_rates(route_statuses[route], count),
+            }
+            for count, route in route_totals[:top]
+        ],
+        unit_pairs=[
+            {
+                "category": name("category", category),
+                "from_unit": name("unit", from_unit) if from_unit else None,
+                "to_unit": name("unit", to_unit) if to_unit else None,
+                "count": count,
+            }
+            for (category, from_unit, to_unit), count in pairs.most_common()
+            if category
+        ][:top],
+    )
+    return report
+
+
+def format_report(report: dict) -> str:
+    """集計結果を表形式のテキストにする"""
+    if report["records"] == 0:
+        return "no records\n"
+    overall = report["overall"]
+    lines = [
+        f"records: {report['records']}  ({report['start']} - {report['end']})",
+        f"overall: p50 {overall['p50_ms']:.3f}ms  p90 {overall['p90_ms']:.3f}ms  "
+        f"p99 {overall['p99_ms']:.3f}ms  max {overall['max_ms']:.3f}ms  "
+        f"4xx {overall['client_error_rate']:.2%}  5xx {overall['server_error_rate']:.2%}",
+        "",
+        f"{'route':<36} {'count':>10} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9} {'4xx':>7} {'5xx':>7}",
+    ]
+    for route in report["routes"]:
+        lines.append(
+            f"{route['route']:<36} {route['count']:>10} {route['p50_ms']:>9.3f} {route['p90_ms']:>9.3f} "
+            f"{route['p99_ms']:>9.3f} {route['max_ms']:>9.3f} "
+            f"{route['client_error_rate']:>7.2%} {route['server_error_rate']:>7.2%}"
+        )
+    if report["unit_pairs"]:
+        lines += ["", f"{'category':<16} {'from':<12} {'to':<12} {'count':>10}"]
+        for pair in report["unit_pairs"]:
+            lines.append(
+                f"{pair['category']:<16} {pair['from_unit'] or '-':<12} {pair['to_unit'] or '-':<12} {pair['count']:>10}"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def _parse_time(text: str) -> float:
+    """ISO 8601の日付・日時をUNIX時刻にする（タイムゾーンの指定がない場合はUTC）"""
+    moment = datetime.fromisoformat(text)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    集計ツールのエントリーポイント
+
+    Args:
+        argv: コマンドライン引数（省略時は sys.argv）
+
+    Returns:
+        int: 終了コード（0: 成功, 1: ログファイルを読み込めない場合）
+    """
+    # サーバーからは使わないため、コマンドラインの実行時に読み込む
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(
+        prog="metrix-access-log",
+        description="バイナリ形式のアクセスログのレイテンシ・エラー率を集計する",
+    )
+    parser.add_argument("paths", nargs="+", help="ログファイルまたはディレクトリ（直下の .mxlog ファイル）")
+    parser.add_argument("--since", type=_parse_time, help="この日時以降のレコードのみ（ISO 8601、省略時はUTC）")
+    parser.add_argument("--until", type=_parse_time, help="この日時より前のレコードのみ（ISO 8601、省略時はUTC）")
+    parser.add_argument("--top", type=int, default=10, help="ルート・単位ペアの上位件数")
+    parser.add_argument("--json", action="store_true", help="JSONで出力する")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="並列にファイルを集計するプロセス数")
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    try:
+        report = analyze(args.paths, since=args.since, until=args.until, top=args.top, jobs=args.jobs)
+    except (OSError, ValueError) as e:
+        print(f"metrix-access-log: {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        sys.stdout.write(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
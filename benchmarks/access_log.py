@@ -0,0 +1,72 @@
+"""
+アクセスログのベンチマーク
+
+AccessLogWriter でランダムなレコードを一時ディレクトリに書き出し、書き込み（1秒あたりのレコード数）と
+集計ツールの analyze（jobs ごとの所要時間）を計測する。
+
+使い方:
+    python benchmarks/access_log.py [--records 3000000] [--files 4] [--jobs 1 4]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from access_log import AccessLogWriter, analyze  # noqa: E402
+
+ROUTES = [
+    ("POST /api/convert", 0.6),
+    ("GET /api/units/{category}", 0.2),
+    ("POST /api/convert/batch", 0.1),
+    ("POST /api/convert/bulk", 0.05),
+    ("GET /api/categories", 0.05),
+]
+PAIRS = [("length", "m", "km"), ("length", "in", "cm"), ("weight", "kg", "lb"), ("temperature", "C", "F")]
+
+
+def _write(directory: str, records: int, files: int) -> float:
+    """records 件のレコードを files 個のライター（ワーカープロセスに相当）に分けて書き出し、所要時間を返す"""
+    rng = random.Random(0)
+    routes, weights = zip(*ROUTES)
+    start_time = time.time() - 86400
+    elapsed = 0.0
+    per_file = records // files
+    for index in range(files):
+        writer = AccessLogWriter(f"{directory}/worker{index}")
+        chosen = rng.choices(routes, weights, k=per_file)
+        started = time.perf_counter()
+        for i, route in enumerate(chosen):
+            status = 200 if rng.random() > 0.02 else rng.choice((400, 404, 500))
+            writer.write(route, status, rng.lognormvariate(-7, 1), start_time + i * 0.01, *rng.choice(PAIRS))
+        writer.close()
+        elapsed += time.perf_counter() - started
+    return elapsed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="アクセスログの書き込みと集計の速度を計測する")
+    parser.add_argument("--records", type=int, default=3_000_000, help="書き出すレコード数")
+    parser.add_argument("--files", type=int, default=4, help="ログファイル（ライター）の数")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 4], help="集計のプロセス数（複数指定可）")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [f"{directory}/worker{index}" for index in range(args.files)]
+        elapsed = _write(directory, args.records, args.files)
+        written = args.records // args.files * args.files
+        print(f"write:   {written:,} records in {elapsed:.2f}s ({written / elapsed:,.0f} records/s)")
+        for jobs in args.jobs:
+            started = time.perf_counter()
+            report = analyze(paths, jobs=jobs)
+            elapsed = time.perf_counter() - started
+            print(f"analyze: {report['records']:,} records in {elapsed:.2f}s (jobs={jobs})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+高速レーンのベンチマーク
+
+METRIX_FAST_LANE を無効・有効にした別々のプロセスで main.app をASGIとして直接呼び出し、
+ワーカー1つあたりのスループット（1秒あたりのリクエスト数）を比較する。
+ネットワークとHTTPサーバーの処理を含まないため、アプリケーション内の処理コストの差を表す。
+
+使い方:
+    python benchmarks/fast_lane.py [--requests 20000] [--log]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    "convert": (
+        "POST", "/api/convert",
+        json.dumps({"value": 1.5, "from_unit": "km", "to_unit": "mi", "category": "length"}).encode(),
+    ),
+    "convert_invalid_unit": (
+        "POST", "/api/convert",
+        json.dumps({"value": 1.5, "from_unit": "kmm", "to_unit": "mi", "category": "length"}).encode(),
+    ),
+    "units": ("GET", "/api/units/length", b""),
+}
+
+
+async def _request(app, method: str, path: str, body: bytes) -> int:
+    """ASGIアプリを1回呼び出し、ステータスコードを返す"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"localhost"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8080),
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def _run_worker(requests: int) -> dict[str, float]:
+    """このプロセスの設定でシナリオごとのスループットを計測する"""
+    sys.path.insert(0, str(ROOT))
+    os.chdir(ROOT)
+    from main import app
+
+    results = {}
+    for name, (method, path, body) in SCENARIOS.items():
+        for _ in range(min(1000, requests)):
+            await _request(app, method, path, body)
+        start = time.perf_counter()
+        for _ in range(requests):
+            await _request(app, method, path, body)
+        results[name] = requests / (time.perf_counter() - start)
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="高速レーンの有無によるスループットを比較する")
+    parser.add_argument("--requests", type=int, default=20000, help="シナリオごとのリクエスト数")
+    parser.add_argument("--log", action="store_true", help="リクエストログを出力する（既定は無効）")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        import logging
+
+        if not args.log:
+            logging.disable(logging.INFO)
+        print(json.dumps(asyncio.run(_run_worker(args.requests))))
+        return 0
+
+    measured = {}
+    for mode, flag in (("full", "0"), ("fast_lane", "1")):
+        env = {**os.environ, "METRIX_FAST_LANE": flag, "METRIX_CATALOG_RELOAD": "0"}
+        command = [sys.executable, __file__, "--worker", "--requests", str(args.requests)]
+        if args.log:
+            command.append("--log")
+        output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+        measured[mode] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"{'scenario':<22}{'full req/s':>14}{'fast lane req/s':>18}{'speedup':>10}")
+    for name in SCENARIOS:
+        full = measured["full"][name]
+        fast = measured["fast_lane"][name]
+        print(f"{name:<22}{full:>14,.0f}{fast:>18,.0f}{fast / full:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""
+metrix コマンドラインツール
+
+標準入力またはファイルから値を読み込み、変換結果を標準出力にストリーミングする。
+FastAPIを経由せず、converters の一括変換関数を直接使用する。
+
+使い方:
+    metrix --from m --to ft < values.txt
+    metrix --category temperature --from celsius --to kelvin --format csv --column temp data.csv
+    metrix --category weight --from kg --to lb --format ndjson --field value --jobs 4 events.ndjson
+"""
+
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+from converters import CATEGORY_CONFIG, find_category, resolve_unit
+
+FORMATS = ('plain', 'csv', 'ndjson')
+
+# 1チャンクに含める行数のデフォルト
+DEFAULT_CHUNK_SIZE = 10000
+
+
+class ConversionError(ValueError):
+    """入力の変換に失敗した場合のエラー（行番号付き）"""
+
+
+def _parse_value(text: str, line_number: int) -> float:
+    """入力の値を数値として解析する"""
+    try:
+        value = float(text)
+    except (TypeError, ValueError):
+        raise ConversionError(f"line {line_number}: invalid number: {str(text)[:50]}")
+    if not math.isfinite(value):
+        raise ConversionError(f"line {line_number}: value must be a finite number")
+    return value
+
+
+def convert_chunk(task: tuple) -> str:
+    """
+    1チャンク分の行を変換し、出力する文字列を返す（プロセスプールのワーカーでも実行される）
+
+    Args:
+        task: (形式, カテゴリ, 変換元の単位, 変換先の単位, 列・フィールドの指定, 先頭の行番号, 行のリスト)
+
+    Returns:
+        str: 変換結果（改行区切り）
+
+    Raises:
+        ConversionError: 値の解析または変換に失敗した場合
+    """
+    fmt, category, from_unit, to_unit, selector, first_line, lines = task
+    convert_many = CATEGORY_CONFIG[category]["convert_many_func"]
+    line_numbers = range(first_line, first_line + len(lines))
+
+    if fmt == 'plain':
+        values = []
+        for line_number, line in zip(line_numbers, lines):
+            line = line.strip()
+            if line:
+                values.append(_parse_value(line, line_number))
+        return "".join(f"{result!r}\n" for result in convert_many(values, from_unit, to_unit))
+
+    if fmt == 'csv':
+        reader = csv.reader(lines)
+        rows = []
+        values = []
+        for row in reader:
+            if not row:
+                continue
+            line_number = first_line - 1 + reader.line_num
+            rows.append(row)
+            if selector >= len(row):
+                raise ConversionError(f"line {line_number}: column {selector} not found")
+            values.append(_parse_value(row[selector], line_number))
+        for row, result in zip(rows, convert_many(values, from_unit, to_unit)):
+            row[selector] = repr(result)
+        out = io.StringIO()
+        csv.writer(out, lineterminator="\n").writerows(rows)
+        return out.getvalue()
+
+    # ndjson
+    records = []
+    values = []
+    for line_number, line in zip(line_numbers, lines):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            raise ConversionError(f"line {line_number}: invalid JSON")
+        if not isinstance(record, dict) or selector not in record:
+            raise ConversionError(f"line {line_number}: field '{selector}' not found")
+        records.append(record)
+        values.append(_parse_value(record[selector], line_number))
+    for record, result in zip(records, convert_many(values, from_unit, to_unit)):
+        record[selector] = result
+    return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+
+def _chunks(lines: Iterable[str], chunk_size: int, first_line: int = 1) -> Iterator[tuple[int, list[str]]]:
+    """行を (先頭の行番号, 行のリスト) のチャンクに分割する"""
+    chunk = []
+    start = first_line
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield start, chunk
+            start += len(chunk)
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+
+def _run_ordered(executor: ProcessPoolExecutor, tasks: Iterable[tuple], max_pending: int) -> Iterator[str]:
+    """
+    タスクをプロセスプールで実行し、投入順に結果を返す
+
+    Executor.map と異なり入力を先読みしすぎないよう、実行中のタスク数を max_pending に制限する
+    """
+    pending = deque()
+    for task in tasks:
+        pending.append(executor.submit(convert_chunk, task))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _resolve_csv_column(column: str, lines: Iterator[str], out) -> tuple[int, int]:
+    """
+    CSVの変換対象の列番号を決定する
+
+    列が名前で指定された場合はヘッダー行を読み込み、そのまま出力に書き出す
+
+    Returns:
+        tuple[int, int]: (列番号, データの先頭の行番号)
+    """
+    if column.isdigit():
+        return int(column), 1
+    header_line = next(lines, None)
+    if header_line is None:
+        return 0, 2
+    header = next(csv.reader([header_line]), [])
+    if column not in header:
+        raise ConversionError(f"line 1: column '{column}' not found in header")
+    if out is not None:
+        out.write(header_line if header_line.endswith("\n") else header_line + "\n")
+    return header.index(column), 2
+
+
+def convert_stream(
+    source: Iterable[str],
+    out,
+    category: str | None,
+    from_unit: str,
+    to_unit: str,
+    fmt: str = 'plain',
+    column: str = '0',
+    field: str = 'value',
+    jobs: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    write_header: bool = True,
+    executor: ProcessPoolExecutor | None = None,
+) -> None:
+    """
+    入力ストリームの値を変換して出力ストリームに書き出す
+
+    Args:
+        source: 入力の行のイテラブル
+        out: 出力先（write メソッドを持つテキストストリーム）
+        category: 変換カテゴリ（Noneの場合は単位から判定）
+        from_unit: 変換元の単位
+        to_unit: 変換先の単位
+        fmt: 入力の形式 (plain, csv, ndjson)
+        column: CSVの変換対象の列（0始まりの番号またはヘッダーの列名）
+        field: NDJSONの変換対象のフィールド名
+        jobs: 並列数（2以上の場合はプロセスプールを使用）
+        chunk_size: 1チャンクの行数
+        write_header: CSVのヘッダー行を出力するかどうか
+        executor: jobs が2以上の場合に使用するプロセスプール（省略時は都度作成）
+
+    Raises:
+        ConversionError: 値の解析または変換に失敗した場合
+        ValueError: 無効なカテゴリ・単位が指定された場合
+    """
+    if category is None:
+        category = find_category(from_unit, to_unit)
+    config = CATEGORY_CONFIG.get(category)
+    if config is None:
+        raise ValueError(f"Invalid category: {category}")
+    # 単位の検証と別名の解決（入力を読み込む前に失敗させる）
+    from_unit = resolve_unit(category, from_unit)
+    to_unit = resolve_unit(category, to_unit)
+
+    lines = iter(source)
+    first_line = 1
+    selector: str | int = field
+    if fmt == 'csv':
+        selector, first_line = _resolve_csv_column(column, lines, out if write_header else None)
+
+    tasks = (
+        (fmt, category, from_unit, to_unit, selector, start, chunk)
+        for start, chunk in _chunks(lines, chunk_size, first_line)
+    )
+
+    if jobs <= 1:
+        for task in tasks:
+            out.write(convert_chunk(task))
+        return
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        for result in _run_ordered(executor, tasks, max_pending=jobs * 2):
+            out.write(result)
+    finally:
+        if own_executor:
+            executor.shutdown(cancel_futures=True)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    コマンドライン引数を解析する
+
+    Args:
+        argv: コマンドライン引数（省略時は sys.argv）
+
+    Returns:
+        argparse.Namespace: 解析結果
+    """
+    parser = argparse.ArgumentParser(
+        prog="metrix",
+        description="標準入力またはファイルの値を単位変換して標準出力に書き出す",
+    )
+    parser.add_argument("files", nargs="*", help="入力ファイル（省略時または - は標準入力）")
+    parser.add_argument("--category", choices=sorted(CATEGORY_CONFIG), help="変換カテゴリ（省略時は単位から判定）")
+    parser.add_argument("--from", dest="from_unit", required=True, help="変換元の単位")
+    parser.add_argument("--to", dest="to_unit", required=True, help="変換先の単位")
+    parser.add_argument("--format", dest="fmt", default="plain", choices=FORMATS, help="入力の形式")
+    parser.add_argument("--column", default="0", help="CSVの変換対象の列（0始まりの番号またはヘッダーの列名）")
+    parser.add_argument("--field", default="value", help="NDJSONの変換対象のフィールド名")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="並列に変換するプロセス数")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="1チャンクの行数")
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    コマンドラインのエントリーポイント
+
+    Args:
+        argv: コマンドライン引数（省略時は sys.argv）
+
+    Returns:
+        int: 終了コード（0: 成功, 1: 変換エラー）
+    """
+    args = parse_args(argv)
+    files = args.files or ["-"]
+    executor = ProcessPoolExecutor(max_workers=args.jobs) if args.jobs > 1 else None
+    try:
+        for index, name in enumerate(files):
+            source = sys.stdin if name == "-" else open(name, newline="" if args.fmt == "csv" else None)
+            try:
+                convert_stream(
+                    source, sys.stdout, args.category, args.from_unit, args.to_unit,
+                    fmt=args.fmt, column=args.column, field=args.field, jobs=args.jobs,
+                    chunk_size=args.chunk_size, write_header=index == 0, executor=executor,
+                )
+            except ValueError as e:
+                print(f"metrix: {name}: {e}" if name != "-" else f"metrix: {e}", file=sys.stderr)
+                return 1
+            finally:
+                if source is not sys.stdin:
+                    source.close()
+        sys.stdout.flush()
+    except OSError as e:
+        if isinstance(e, BrokenPipeError):
+            # パイプの読み手が先に終了した場合（head など）は正常終了とする
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+            return 0
+        print(f"metrix: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
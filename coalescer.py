@@ -0,0 +1,108 @@
+"""
+単一変換リクエストのマイクロバッチ処理
+
+同時に届いた単一変換を短い時間窓（または最大バッチサイズ）の間だけ集め、
+(カテゴリ, 変換元, 変換先) ごとに1回の一括変換で処理する。
+一括変換関数（為替レートのスナップショット）は実行時にカテゴリごとに1回だけ取得し、
+変換結果と一緒に実際に使ったレートのスナップショットを返す。
+"""
+
+import asyncio
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from converters.currency import RateSnapshot
+
+# 一括変換関数の型: (values, from_unit, to_unit) -> results
+ConvertManyFunc = Callable[[list[float], str, str], list[float]]
+# 一括変換関数を取得する関数の型: () -> (一括変換関数, レートのスナップショット（為替レート以外はNone）)
+ResolveFunc = Callable[[], "tuple[ConvertManyFunc, RateSnapshot | None]"]
+
+
+class ConversionCoalescer:
+    """
+    同時に届いた単一変換をまとめて一括変換するコアレッサー
+
+    submit() で受け付けた変換は、最初の受付から window 秒後、または受付数が
+    max_batch に達した時点でまとめて実行され、それぞれのFutureに (結果, レートのスナップショット) が設定される。
+    """
+
+    def __init__(self, window: float, max_batch: int = 256):
+        self.window = window
+        self.max_batch = max_batch
+        self.batches_total = 0
+        self.requests_total = 0
+        # (category, from_unit, to_unit) -> (一括変換関数を取得する関数, 値のリスト, Futureのリスト)
+        self._pending: dict[tuple[str, str, str], tuple[ResolveFunc, list[float], list[asyncio.Future]]] = {}
+        self._pending_count = 0
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    def submit(
+        self,
+        resolve: ResolveFunc,
+        category: str,
+        value: float,
+        from_unit: str,
+        to_unit: str,
+    ) -> asyncio.Future:
+        """
+        変換を受け付ける
+
+        Args:
+            resolve: カテゴリの一括変換関数とレートのスナップショットを返す関数（実行時に呼び出す）
+            category: カテゴリ
+            value: 変換する値
+            from_unit: 変換元の単位
+            to_unit: 変換先の単位
+
+        Returns:
+            asyncio.Future: (変換結果, レートのスナップショット) が設定されるFuture
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        key = (category, from_unit, to_unit)
+        group = self._pending.get(key)
+        if group is None:
+            group = self._pending[key] = (resolve, [], [])
+        group[1].append(value)
+        group[2].append(future)
+        self._pending_count += 1
+        self.requests_total += 1
+
+        if self._pending_count >= self.max_batch:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self.flush)
+        return future
+
+    def flush(self) -> None:
+        """受付済みの変換をグループごとに一括実行する"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending = self._pending
+        self._pending = {}
+        self._pending_count = 0
+
+        # カテゴリごとに一括変換関数を1回だけ取得する（実行中にレートが更新されても、
+        # 同じ実行の結果はすべて同じスナップショットで換算し、そのスナップショットを返す）
+        resolved: dict[str, "tuple[ConvertManyFunc, RateSnapshot | None]"] = {}
+        for (category, from_unit, to_unit), (resolve, values, futures) in pending.items():
+            self.batches_total += 1
+            try:
+                if category not in resolved:
+                    resolved[category] = resolve()
+                convert_many, rates = resolved[category]
+                results = convert_many(values, from_unit, to_unit)
+            except Exception as exc:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for future, result in zip(futures, results):
+                # クライアント切断などでキャンセル済みのFutureはスキップ
+                if not future.done():
+                    future.set_result((result, rates))
@@ -0,0 +1,126 @@
+"""
+アプリケーション設定
+
+環境変数 (METRIX_*) から実行時の設定値を読み込む
+"""
+
+import os
+import tempfile
+
+
+def _env_int(name: str, default: int) -> int:
+    """整数の環境変数を読み込む（未設定・不正値の場合はデフォルト値）"""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """浮動小数点数の環境変数を読み込む（未設定・不正値の場合はデフォルト値）"""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """真偽値の環境変数を読み込む（1/true/yes/on を真とみなす）"""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+# API専用モード（UI・テンプレート・静的ファイルを読み込まない）
+API_ONLY = _env_bool("METRIX_API_ONLY", False)
+# Service Workerのキャッシュのバージョン（空の場合は静的ファイルの内容のハッシュ）
+ASSET_VERSION = os.getenv("METRIX_ASSET_VERSION", "").strip() or None
+
+# レスポンス圧縮
+COMPRESSION_ENABLED = _env_bool("METRIX_COMPRESSION", True)
+# このバイト数未満のレスポンスは圧縮しない
+COMPRESSION_MIN_SIZE = _env_int("METRIX_COMPRESSION_MIN_SIZE", 1024)
+COMPRESSION_GZIP_LEVEL = _env_int("METRIX_COMPRESSION_GZIP_LEVEL", 6)
+COMPRESSION_ZSTD_LEVEL = _env_int("METRIX_COMPRESSION_ZSTD_LEVEL", 3)
+
+# クライアントごとのレート制限（1秒あたりのリクエスト数、0で無効）
+RATE_LIMIT_RATE = _env_float("METRIX_RATE_LIMIT", 0.0)
+RATE_LIMIT_BURST = _env_int("METRIX_RATE_LIMIT_BURST", 20)
+RATE_LIMIT_MAX_CLIENTS = _env_int("METRIX_RATE_LIMIT_MAX_CLIENTS", 10000)
+RATE_LIMIT_IDLE_TTL = _env_float("METRIX_RATE_LIMIT_IDLE_TTL", 300.0)
+# クライアントIPとは別に制限する登録済みのAPIキー（カンマ区切り、X-API-Key ヘッダーで指定）
+RATE_LIMIT_API_KEYS = [key.strip() for key in os.getenv("METRIX_RATE_LIMIT_API_KEYS", "").split(",") if key.strip()]
+
+# イベントループのラグに基づく適応的な同時処理数制限
+LOAD_SHED_ENABLED = _env_bool("METRIX_LOAD_SHED", True)
+LOAD_SHED_INITIAL_LIMIT = _env_int("METRIX_LOAD_SHED_INITIAL_LIMIT", 256)
+LOAD_SHED_MIN_LIMIT = _env_int("METRIX_LOAD_SHED_MIN_LIMIT", 8)
+LOAD_SHED_MAX_LIMIT = _env_int("METRIX_LOAD_SHED_MAX_LIMIT", 1024)
+# 許容するイベントループのラグ（秒）
+LOAD_SHED_TARGET_LAG = _env_float("METRIX_LOAD_SHED_TARGET_LAG", 0.05)
+LOAD_SHED_SAMPLE_INTERVAL = _env_float("METRIX_LOAD_SHED_SAMPLE_INTERVAL", 0.1)
+
+# 単一変換のマイクロバッチ処理（時間窓のミリ秒、0で無効）
+COALESCE_WINDOW_MS = _env_float("METRIX_COALESCE_WINDOW_MS", 0.0)
+COALESCE_MAX_BATCH = _env_int("METRIX_COALESCE_MAX_BATCH", 256)
+
+# 変換・単位一覧を通常のルーティングを通さずに処理する高速レーン
+FAST_LANE = _env_bool("METRIX_FAST_LANE", False)
+
+# 大きな変換処理のスレッドプールへのオフロード（要素数の閾値）
+OFFLOAD_THRESHOLD = _env_int("METRIX_OFFLOAD_THRESHOLD", 1000)
+OFFLOAD_WORKERS = _env_int("METRIX_OFFLOAD_WORKERS", min(4, os.cpu_count() or 1))
+# スレッドプールでの実行待ちとして受け付ける処理数の上限
+OFFLOAD_MAX_PENDING = _env_int("METRIX_OFFLOAD_MAX_PENDING", 64)
+# 上限に達している間に空きを待てる処理数と最大の待ち秒数（超えた場合は503）
+OFFLOAD_MAX_QUEUED = _env_int("METRIX_OFFLOAD_MAX_QUEUED", 64)
+OFFLOAD_QUEUE_TIMEOUT = _env_float("METRIX_OFFLOAD_QUEUE_TIMEOUT", 1.0)
+
+# 換算表（1つの表の最大行数、JSONの1ページの行数とその上限）
+TABLE_MAX_ROWS = _env_int("METRIX_TABLE_MAX_ROWS", 1000000)
+TABLE_PAGE_SIZE = _env_int("METRIX_TABLE_PAGE_SIZE", 1000)
+TABLE_MAX_PAGE_SIZE = _env_int("METRIX_TABLE_MAX_PAGE_SIZE", 10000)
+# よく要求される換算表をキャッシュする件数と、キャッシュする表の最大行数
+TABLE_CACHE_SIZE = _env_int("METRIX_TABLE_CACHE_SIZE", 128)
+TABLE_CACHE_MAX_ROWS = _env_int("METRIX_TABLE_CACHE_MAX_ROWS", 10000)
+
+# 変換リクエストのボディの上限（バイト数と配列の要素数、超えた場合は413）
+MAX_BODY_SIZE = _env_int("METRIX_MAX_BODY_SIZE", 16 * 1024 * 1024)
+MAX_ARRAY_LENGTH = _env_int("METRIX_MAX_ARRAY_LENGTH", 1000000)
+
+# バイナリ形式のアクセスログ（空の場合は無効、ワーカーごとに別のファイルに書き出す）
+ACCESS_LOG_DIR = os.getenv("METRIX_ACCESS_LOG_DIR", "").strip() or None
+# 1ファイルの最大バイト数（超えると次のファイルに切り替える）
+ACCESS_LOG_MAX_BYTES = _env_int("METRIX_ACCESS_LOG_MAX_BYTES", 64 * 1024 * 1024)
+# バッファのバイト数と、バッファを書き出す間隔（秒）
+ACCESS_LOG_BUFFER_SIZE = _env_int("METRIX_ACCESS_LOG_BUFFER_SIZE", 64 * 1024)
+ACCESS_LOG_FLUSH_INTERVAL = _env_float("METRIX_ACCESS_LOG_FLUSH_INTERVAL", 1.0)
+
+# 非同期変換ジョブ（無効な場合はジョブ関連のモジュールを読み込まず、/api/jobs も提供しない）
+JOBS_ENABLED = _env_bool("METRIX_JOBS", True)
+JOBS_SPOOL_DIR = os.getenv("METRIX_JOBS_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "metrix-jobs"))
+JOBS_WORKERS = _env_int("METRIX_JOBS_WORKERS", 2)
+# 1回の一括変換で処理する値の数
+JOBS_CHUNK_SIZE = _env_int("METRIX_JOBS_CHUNK_SIZE", 10000)
+# 完了したジョブの結果を保持する秒数
+JOBS_RETENTION_SECONDS = _env_float("METRIX_JOBS_RETENTION_SECONDS", 3600.0)
+JOBS_CLEANUP_INTERVAL = _env_float("METRIX_JOBS_CLEANUP_INTERVAL", 60.0)
+
+# 単位カタログ（空の場合は同梱の converters/catalog.yaml）
+CATALOG_PATH = os.getenv("METRIX_CATALOG_PATH", "").strip() or None
+# カタログファイルの変更を監視して自動で再読み込みする
+CATALOG_RELOAD = _env_bool("METRIX_CATALOG_RELOAD", True)
+
+# 為替レートのJSONファイル（空の場合はオフライン用の固定レート）
+CURRENCY_RATES_PATH = os.getenv("METRIX_CURRENCY_RATES_PATH", "").strip() or None
+# 為替レートを読み込み直す間隔（秒、0で無効）
+CURRENCY_REFRESH_INTERVAL = _env_float("METRIX_CURRENCY_REFRESH_INTERVAL", 3600.0)
+# 為替レートの履歴ストアのディレクトリ（空の場合は日付指定の換算を無効化）
+RATE_HISTORY_PATH = os.getenv("METRIX_RATE_HISTORY_PATH", "").strip() or None
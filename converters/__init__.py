@@ -1 +1,311 @@
-# Converters module for unit conversion logic
+"""
+単位変換のコアライブラリ
+
+Webフレームワーク（FastAPI・Starlette・Pydantic）に依存せず、プロセス内から
+直接単位変換を呼び出すための公開APIを提供する。
+
+使用例:
+    from converters import convert
+
+    convert(1.0, "km", "m")                  # 1000.0
+    convert([0, 100], "celsius", "kelvin")   # [273.15, 373.15]
+    convert(1, "meters", "Feet")             # 別名・表記ゆれも解決される
+    best_unit(0.000342, "km")                # ("cm", 34.2)
+"""
+
+from collections.abc import Iterable
+from numbers import Real
+
+from converters.catalog import DEFAULT_CATALOG_PATH, CatalogError
+from converters.currency import (
+    UNIT_ALIASES as CURRENCY_ALIASES,
+    convert_currency,
+    convert_currency_many,
+    get_currency_rates,
+    get_currency_unit_size,
+    get_currency_units_info,
+    get_currency_units,
+    is_valid_currency_unit
+)
+from converters.length import (
+    UNIT_ALIASES as LENGTH_ALIASES,
+    best_length_unit,
+    best_length_units_many,
+    convert_length,
+    convert_length_many,
+    get_length_unit_size,
+    get_length_units_info,
+    get_length_units,
+    is_valid_length_unit,
+    parse_length_unit
+)
+from converters.registry import CategoryRegistry
+from converters.weight import (
+    UNIT_ALIASES as WEIGHT_ALIASES,
+    best_weight_unit,
+    best_weight_units_many,
+    convert_weight,
+    convert_weight_many,
+    get_weight_unit_size,
+    get_weight_units_info,
+    get_weight_units,
+    is_valid_weight_unit,
+    parse_weight_unit
+)
+from converters.temperature import (
+    UNIT_ALIASES as TEMPERATURE_ALIASES,
+    convert_temperature,
+    convert_temperature_many,
+    get_temperature_unit_size,
+    get_temperature_units_info,
+    get_temperature_units,
+    is_valid_temperature_unit
+)
+
+__all__ = [
+    "CATEGORY_CONFIG",
+    "CatalogError",
+    "best_unit",
+    "categories",
+    "convert",
+    "find_category",
+    "get_units",
+    "reload_catalog",
+    "resolve_unit",
+]
+
+# Pythonモジュールで定義している組み込みカテゴリ
+BUILTIN_CATEGORIES = {
+    "length": {
+        "name": "Length",
+        "convert_func": convert_length,
+        "convert_many_func": convert_length_many,
+        "get_units_func": get_length_units,
+        "get_units_info_func": get_length_units_info,
+        "is_valid_unit_func": is_valid_length_unit,
+        "unit_size_func": get_length_unit_size,
+        "aliases": LENGTH_ALIASES,
+        "prefixed_unit_func": parse_length_unit,
+        # 変換先 auto で読みやすい単位を選んで変換する関数（値の大きさで選べないカテゴリはNone）
+        "best_unit_func": best_length_unit,
+        "best_units_many_func": best_length_units_many
+    },
+    "weight": {
+        "name": "Weight",
+        "convert_func": convert_weight,
+        "convert_many_func": convert_weight_many,
+        "get_units_func": get_weight_units,
+        "get_units_info_func": get_weight_units_info,
+        "is_valid_unit_func": is_valid_weight_unit,
+        "unit_size_func": get_weight_unit_size,
+        "aliases": WEIGHT_ALIASES,
+        "prefixed_unit_func": parse_weight_unit,
+        # 変換先 auto で読みやすい単位を選んで変換する関数（値の大きさで選べないカテゴリはNone）
+        "best_unit_func": best_weight_unit,
+        "best_units_many_func": best_weight_units_many
+    },
+    "temperature": {
+        "name": "Temperature",
+        "convert_func": convert_temperature,
+        "convert_many_func": convert_temperature_many,
+        "get_units_func": get_temperature_units,
+        "get_units_info_func": get_temperature_units_info,
+        "is_valid_unit_func": is_valid_temperature_unit,
+        "unit_size_func": get_temperature_unit_size,
+        "aliases": TEMPERATURE_ALIASES,
+        "prefixed_unit_func": None,
+        "best_unit_func": None,
+        "best_units_many_func": None
+    },
+    "currency": {
+        "name": "Currency",
+        "convert_func": convert_currency,
+        "convert_many_func": convert_currency_many,
+        "get_units_func": get_currency_units,
+        "get_units_info_func": get_currency_units_info,
+        "is_valid_unit_func": is_valid_currency_unit,
+        "unit_size_func": get_currency_unit_size,
+        "aliases": CURRENCY_ALIASES,
+        "prefixed_unit_func": None,
+        "best_unit_func": None,
+        "best_units_many_func": None,
+        # 為替レートのスナップショットを返す関数（変換結果とレートの時刻を揃えるため）
+        "rates_func": get_currency_rates
+    }
+}
+
+# カテゴリ別の設定マッピング（組み込みカテゴリ + 単位カタログ）
+CATEGORY_CONFIG = CategoryRegistry(BUILTIN_CATEGORIES, DEFAULT_CATALOG_PATH)
+
+
+def reload_catalog(path: str | None = None) -> None:
+    """
+    単位カタログを読み込み直す
+
+    Args:
+        path: カタログファイルのパス（省略時は現在のパス）
+
+    Raises:
+        OSError: ファイルを読み込めない場合
+        CatalogError: 定義が不正な場合（現在のカタログはそのまま使われる）
+    """
+    CATEGORY_CONFIG.reload(path)
+
+
+def categories() -> list[str]:
+    """
+    利用可能なカテゴリの一覧を返す
+
+    Returns:
+        list[str]: カテゴリ名のリスト
+    """
+    return list(CATEGORY_CONFIG.keys())
+
+
+def get_units(category: str) -> list[str]:
+    """
+    カテゴリの単位一覧を返す
+
+    Args:
+        category: カテゴリ名
+
+    Returns:
+        list[str]: 単位のリスト
+
+    Raises:
+        ValueError: 無効なカテゴリが指定された場合
+    """
+    config = CATEGORY_CONFIG.get(category)
+    if config is None:
+        raise ValueError(f"Invalid category: {category}")
+    return config["get_units_func"]()
+
+
+def _invalid_unit(unit: str, category: str | None = None) -> ValueError:
+    """候補（did you mean）付きの無効な単位のエラーを生成する"""
+    suggestions = CATEGORY_CONFIG.suggest_units(unit, category)
+    if suggestions:
+        return ValueError(f"Invalid unit: {unit} (did you mean: {', '.join(suggestions)}?)")
+    return ValueError(f"Invalid unit: {unit}")
+
+
+def resolve_unit(category: str, unit: str) -> str:
+    """
+    単位の表記（コードまたは別名）をカテゴリ内の単位コードに解決する
+
+    Args:
+        category: カテゴリ名
+        unit: 単位の表記（例: "meters", "°C", "lbs"）
+
+    Returns:
+        str: 単位コード
+
+    Raises:
+        ValueError: 無効なカテゴリ・単位が指定された場合（単位の場合は候補をメッセージに含む）
+    """
+    if category not in CATEGORY_CONFIG:
+        raise ValueError(f"Invalid category: {category}")
+    code = CATEGORY_CONFIG.resolve_unit(category, unit)
+    if code is None:
+        raise _invalid_unit(unit, category)
+    return code
+
+
+def find_category(from_unit: str, to_unit: str) -> str:
+    """
+    2つの単位の両方を含むカテゴリを探す（別名も照合する）
+
+    Args:
+        from_unit: 変換元の単位
+        to_unit: 変換先の単位
+
+    Returns:
+        str: カテゴリ名
+
+    Raises:
+        ValueError: 該当するカテゴリがない、または複数ある場合
+    """
+    from_categories = [category for category, _ in CATEGORY_CONFIG.resolve_any(from_unit)]
+    to_categories = [category for category, _ in CATEGORY_CONFIG.resolve_any(to_unit)]
+    matches = [category for category in from_categories if category in to_categories]
+    if not matches:
+        for unit, found in ((from_unit, from_categories), (to_unit, to_categories)):
+            if not found:
+                raise _invalid_unit(unit)
+        raise ValueError(f"Incompatible units: {from_unit} and {to_unit}")
+    if len(matches) > 1:
+        raise ValueError(f"Ambiguous units: {from_unit} and {to_unit} (specify category: {', '.join(matches)})")
+    return matches[0]
+
+
+def convert(
+    value: float | Iterable[float],
+    from_unit: str,
+    to_unit: str,
+    category: str | None = None,
+) -> float | list[float]:
+    """
+    値または値の並びを単位変換する
+
+    Args:
+        value: 変換する値、または値のイテラブル（list, tuple, array.array など）
+        from_unit: 変換元の単位（コードまたは別名）
+        to_unit: 変換先の単位（コードまたは別名）
+        category: カテゴリ名（省略時は単位から判定）
+
+    Returns:
+        float | list[float]: 変換後の値（イテラブルを渡した場合は入力と同じ順序のリスト）
+
+    Raises:
+        ValueError: 無効なカテゴリ・単位が指定された場合
+    """
+    if category is None:
+        category = find_category(from_unit, to_unit)
+    config = CATEGORY_CONFIG.get(category)
+    if config is None:
+        raise ValueError(f"Invalid category: {category}")
+    from_unit = resolve_unit(category, from_unit)
+    to_unit = resolve_unit(category, to_unit)
+
+    if isinstance(value, Real):
+        return config["convert_func"](value, from_unit, to_unit)
+    return config["convert_many_func"](list(value), from_unit, to_unit)
+
+
+def best_unit(
+    value: float | Iterable[float],
+    from_unit: str,
+    category: str | None = None,
+    system: str | None = None,
+) -> tuple[str, float] | tuple[list[str], list[float]]:
+    """
+    値または値の並びを読みやすい単位に変換する（例: 0.000342 km → 34.2 cm）
+
+    Args:
+        value: 変換する値、または値のイテラブル
+        from_unit: 変換元の単位（コードまたは別名）
+        category: カテゴリ名（省略時は単位から判定）
+        system: 単位系（metric / imperial、省略時は変換元の単位と同じ単位系）
+
+    Returns:
+        tuple[str, float] | tuple[list[str], list[float]]: (単位, 変換後の値)
+        （イテラブルを渡した場合は値ごとの単位と変換後の値のリスト）
+
+    Raises:
+        ValueError: 無効なカテゴリ・単位・単位系が指定された場合、カテゴリが値の大きさで単位を選べない場合
+    """
+    if category is None:
+        found = list(dict.fromkeys(category for category, _ in CATEGORY_CONFIG.resolve_any(from_unit)))
+        if not found:
+            raise _invalid_unit(from_unit)
+        if len(found) > 1:
+            raise ValueError(f"Ambiguous unit: {from_unit} (specify category: {', '.join(found)})")
+        category = found[0]
+    from_unit = resolve_unit(category, from_unit)
+    config = CATEGORY_CONFIG[category]
+    if config.get("best_unit_func") is None:
+        raise ValueError(f"Auto unit selection is not supported for category: {category}")
+
+    if isinstance(value, Real):
+        return config["best_unit_func"](value, from_unit, system)
+    return config["best_units_many_func"](list(value), from_unit, system)
@@ -0,0 +1,196 @@
+"""
+単位の別名（エイリアス）の索引
+
+別名・名称を Unicode正規化（NFKC）と大文字小文字の同一視（casefold）で正規化した索引を
+事前に構築し、`meters` や `°C`、`lbs` のような表記を単位コードに解決する。
+見つからない場合は、BK木で編集距離の近い候補（did you mean）を返す。
+"""
+
+import unicodedata
+from collections.abc import Iterable
+
+# 候補を探す入力の最大長（これより長い入力は候補を探さない）
+MAX_SUGGEST_LENGTH = 64
+
+
+def normalize_unit(text: str) -> str:
+    """
+    単位の表記を正規化する
+
+    NFKC正規化（`℃` → `°C`、`m²` → `m2`、`µ` → `μ` など）の後に casefold し、
+    前後の空白を除いて連続する空白を1つにまとめる
+
+    Args:
+        text: 単位の表記
+
+    Returns:
+        str: 正規化した表記
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def edit_distance(a: str, b: str) -> int:
+    """
+    2つの文字列の編集距離（レーベンシュタイン距離）を返す
+
+    Args:
+        a: 文字列
+        b: 文字列
+
+    Returns:
+        int: 挿入・削除・置換の最小回数
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """
+    編集距離で近い文字列を探すBK木
+
+    各ノードの子を親との距離ごとに保持し、三角不等式で探索範囲を絞り込む
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        # ノードは (単語, {距離: 子ノード})
+        self._root: tuple[str, dict] | None = None
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str) -> None:
+        """単語を追加する"""
+        if self._root is None:
+            self._root = (word, {})
+            return
+        node = self._root
+        while True:
+            distance = edit_distance(word, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                return
+            node = child
+
+    def search(self, word: str, max_distance: int) -> list[tuple[int, str]]:
+        """
+        編集距離が max_distance 以下の単語を探す
+
+        Args:
+            word: 探す単語
+            max_distance: 許容する編集距離
+
+        Returns:
+            list[tuple[int, str]]: (距離, 単語) のリスト（距離・単語の昇順）
+        """
+        if self._root is None:
+            return []
+        found = []
+        stack = [self._root]
+        while stack:
+            candidate, children = stack.pop()
+            distance = edit_distance(word, candidate)
+            if distance <= max_distance:
+                found.append((distance, candidate))
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for d, child in children.items() if low <= d <= high)
+        found.sort()
+        return found
+
+
+def suggestion_distance(key: str) -> int:
+    """入力の長さに応じた候補の最大編集距離（短い表記ほど厳しくする）"""
+    return 1 if len(key) <= 3 else 2
+
+
+class AliasIndex:
+    """
+    単位コードへの解決と候補の提示を行う索引
+
+    完全一致の単位コードと正規化した別名は辞書で O(1) に解決する。正規化すると
+    複数の単位に一致する表記（例: `Mm` と `mm`）は曖昧なため別名としては扱わない。
+
+    接頭辞を付けられるカテゴリでは、接頭辞付きの単位の表記（索引の外で大文字小文字を区別して
+    照合する記号）も symbols で受け取る。正規化した単位コードが別の単位を表す記号と一致する場合
+    （例: `MM` は `mm` と `Mm`、`Mb` は `MB` と `mB`）は曖昧なため解決せず、候補として提示する。
+    一致しない場合（例: `KG`、`KM`、`hpa`）は単位コードに解決する。
+    """
+
+    def __init__(self, units: dict[str, Iterable[str]], symbols: Iterable[tuple[str, str]] = ()):
+        """
+        Args:
+            units: 単位コードから別名（名称を含む）へのマッピング
+            symbols: 索引の外で大文字小文字を区別して照合する (表記, 単位コード) の組（接頭辞付きの単位など）
+        """
+        self.codes = frozenset(units)
+        targets: dict[str, set[str]] = {}
+        # 別名・名称として明示された表記（記号との衝突では曖昧にしない）
+        declared: set[str] = set()
+        for code, aliases in units.items():
+            for alias in (code, *aliases):
+                key = normalize_unit(alias)
+                if key:
+                    targets.setdefault(key, set()).add(code)
+                    if alias != code:
+                        declared.add(key)
+
+        # 正規化すると別の単位を表す記号と一致する単位コードの表記
+        ambiguous: set[str] = set()
+        for symbol, code in symbols:
+            key = normalize_unit(symbol)
+            if key in targets and key not in declared and code not in targets[key]:
+                ambiguous.add(key)
+
+        # 候補の提示には曖昧な表記も含め、解決には一意な別名だけを使う
+        self._candidates = {key: tuple(sorted(codes)) for key, codes in targets.items()}
+        self.aliases = {
+            key: codes[0] for key, codes in self._candidates.items() if len(codes) == 1 and key not in ambiguous
+        }
+        self._tree = BKTree(self._candidates)
+
+    def resolve(self, unit: str) -> str | None:
+        """
+        表記を単位コードに解決する
+
+        Args:
+            unit: 単位の表記
+
+        Returns:
+            str | None: 単位コード（解決できない場合はNone）
+        """
+        if unit in self.codes:
+            return unit
+        return self.aliases.get(normalize_unit(unit))
+
+    def suggest(self, unit: str, limit: int = 3) -> list[str]:
+        """
+        表記に近い単位コードの候補を返す
+
+        Args:
+            unit: 単位の表記
+            limit: 候補の最大数
+
+        Returns:
+            list[str]: 単位コードの候補（近い順）
+        """
+        key = normalize_unit(unit)
+        if not key or len(key) > MAX_SUGGEST_LENGTH:
+            return []
+        suggestions: list[str] = []
+        for _, candidate in self._tree.search(key, suggestion_distance(key)):
+            for code in self._candidates[candidate]:
+                if code not in suggestions:
+                    suggestions.append(code)
+        return suggestions[:limit]
@@ -0,0 +1,114 @@
+"""
+読みやすい単位（auto）の選択
+
+カテゴリの単位を基準単位に対する係数の昇順に並べた表（MagnitudeIndex）を事前に構築し、
+変換後の値の絶対値が1以上になる最大の単位を二分探索で選ぶ（例: 0.000342 km → 34.2 cm）。
+単位系（metric / imperial）を指定した場合は、その単位系の単位だけから選ぶ。
+係数の丸め誤差で境界のすぐ下になった値（12 in → 0.9999999999999998 ft など）は相対誤差 BOUNDARY_TOLERANCE
+以内なら境界の単位を選び、変換後の値も整数に戻す（12 in → 1 ft、3 ft → 1 yd）。
+"""
+
+from bisect import bisect_right
+
+# 変換先の単位として auto を指定すると読みやすい単位を選ぶ
+AUTO_UNIT = "auto"
+
+# 指定できる単位系
+UNIT_SYSTEMS = ("metric", "imperial")
+
+# 境界の比較・変換後の値の丸めに使う相対誤差
+BOUNDARY_TOLERANCE = 1e-9
+
+
+def scale_value(base_value: float, factor: float) -> float:
+    """
+    基準単位での値を選んだ単位での値に変換する
+
+    Args:
+        base_value: 基準単位での値
+        factor: 選んだ単位の基準単位に対する係数
+
+    Returns:
+        float: 変換後の値（整数との差が相対誤差 BOUNDARY_TOLERANCE 以内の場合はその整数）
+    """
+    value = base_value / factor
+    nearest = round(value)
+    if nearest and abs(value - nearest) <= abs(value) * BOUNDARY_TOLERANCE:
+        return float(nearest)
+    return value
+
+
+def is_auto_unit(unit: str) -> bool:
+    """変換先の単位が auto（大文字小文字は区別しない）かどうかを返す"""
+    return unit.strip().lower() == AUTO_UNIT
+
+
+class MagnitudeIndex:
+    """
+    単位の係数の昇順の表（単位系ごとに構築する）
+
+    Args:
+        factors: 単位コードから基準単位に対する係数へのマッピング
+        systems: 単位コードから単位系へのマッピング（単位系を持たない単位は省略する）
+    """
+
+    def __init__(self, factors: dict[str, float], systems: dict[str, str] | None = None):
+        systems = systems or {}
+        self._tables: dict[str | None, tuple[list[float], list[str]]] = {}
+        for system in (None, *UNIT_SYSTEMS):
+            units = sorted(
+                (factor, code) for code, factor in factors.items()
+                if system is None or systems.get(code) == system
+            )
+            if units:
+                self._tables[system] = ([factor for factor, _ in units], [code for _, code in units])
+
+    def _table(self, system: str | None) -> tuple[list[float], list[str]]:
+        if system is not None and system not in UNIT_SYSTEMS:
+            raise ValueError(f"Unit system must be one of: {', '.join(UNIT_SYSTEMS)}")
+        # 指定した単位系の単位がないカテゴリでは全単位から選ぶ
+        return self._tables.get(system) or self._tables[None]
+
+    def best(self, base_value: float, system: str | None = None, zero_factor: float = 1.0) -> str:
+        """
+        基準単位での値に対して読みやすい単位を選ぶ
+
+        Args:
+            base_value: 基準単位での値
+            system: 単位系（metric / imperial、Noneの場合は全単位）
+            zero_factor: 値が0の場合に大きさとして使う係数（通常は変換元の単位の係数）
+
+        Returns:
+            str: 変換後の値の絶対値が1以上（相対誤差 BOUNDARY_TOLERANCE 以内を含む）になる最大の単位
+                （該当しない場合は最小の単位）
+
+        Raises:
+            ValueError: 無効な単位系が指定された場合
+        """
+        factors, codes = self._table(system)
+        index = bisect_right(factors, (abs(base_value) or zero_factor) * (1 + BOUNDARY_TOLERANCE)) - 1
+        return codes[index if index >= 0 else 0]
+
+    def best_many(self, base_values: list[float], system: str | None = None, zero_factor: float = 1.0) -> list[str]:
+        """
+        基準単位での値のリストに対してそれぞれ読みやすい単位を選ぶ
+
+        Args:
+            base_values: 基準単位での値のリスト
+            system: 単位系（metric / imperial、Noneの場合は全単位）
+            zero_factor: 値が0の場合に大きさとして使う係数（通常は変換元の単位の係数）
+
+        Returns:
+            list[str]: 単位のリスト（入力と同じ順序）
+
+        Raises:
+            ValueError: 無効な単位系が指定された場合
+        """
+        factors, codes = self._table(system)
+        smallest = codes[0]
+        scale = 1 + BOUNDARY_TOLERANCE
+        result = []
+        for base_value in base_values:
+            index = bisect_right(factors, (abs(base_value) or zero_factor) * scale) - 1
+            result.append(codes[index] if index >= 0 else smallest)
+        return result
@@ -0,0 +1,173 @@
+"""
+バイナリファイルの単位変換モジュール
+
+float64 / float32 の値が並んだ生のバイナリファイル（ネイティブのバイトオーダー）を
+メモリマップで読み込み、チャンク単位で変換して出力ファイルにメモリマップで書き出す。
+
+入力全体をPythonのヒープに読み込むことはなく、処理済みの範囲はページキャッシュから
+解放するよう OS に通知するため、数億件のファイルでもメモリ使用量は一定に保たれる。
+
+コマンドラインからは次のように実行できる:
+
+    python -m converters.binary input.f64 output.f64 --category length --from m --to ft
+"""
+
+import argparse
+import math
+import mmap
+import os
+import sys
+from array import array
+
+from converters import CATEGORY_CONFIG, resolve_unit
+
+# dtype名とarrayの型コードの対応
+DTYPES = {
+    'float64': 'd',
+    'float32': 'f',
+}
+
+# 1回にマップする値の数のデフォルト（float64で8MiB）
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def _window_values(chunk_size: int, *itemsizes: int) -> int:
+    """
+    1回にマップする値の数を、mmapのオフセット境界に揃えて返す
+
+    Args:
+        chunk_size: 希望するチャンクの値の数
+        *itemsizes: 入出力の1値のバイト数
+
+    Returns:
+        int: 値の数×各バイト数がすべてオフセット境界の倍数になる値の数
+    """
+    granularity = mmap.ALLOCATIONGRANULARITY
+    # 各バイト数で境界に揃う最小の値の数の最小公倍数を単位にする
+    unit = math.lcm(*(granularity // math.gcd(granularity, itemsize) for itemsize in itemsizes))
+    return max(chunk_size - chunk_size % unit, unit)
+
+
+def _drop_cache(fd: int, offset: int, length: int) -> None:
+    """処理済みの範囲をページキャッシュから解放するようOSに通知する（非対応のOSでは何もしない）"""
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, offset, length, os.POSIX_FADV_DONTNEED)
+
+
+def convert_binary_file(
+    input_path: str,
+    output_path: str,
+    category: str,
+    from_unit: str,
+    to_unit: str,
+    dtype: str = 'float64',
+    out_dtype: str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    バイナリファイルの値をまとめて単位変換し、出力ファイルに書き出す
+
+    Args:
+        input_path: 入力ファイルのパス
+        output_path: 出力ファイルのパス（既存の場合は上書き）
+        category: 変換カテゴリ (length, weight, temperature)
+        from_unit: 変換元の単位
+        to_unit: 変換先の単位
+        dtype: 入力の値の型 (float64, float32)
+        out_dtype: 出力の値の型（省略時は入力と同じ）
+        chunk_size: 1回にマップして変換する値の数の目安
+
+    Returns:
+        int: 変換した値の数
+
+    Raises:
+        ValueError: カテゴリ・単位・型が無効な場合、またはファイルサイズが値の大きさの倍数でない場合
+    """
+    config = CATEGORY_CONFIG.get(category)
+    if config is None:
+        raise ValueError(f"Invalid category: {category}")
+    convert_many = config["convert_many_func"]
+
+    out_dtype = out_dtype or dtype
+    for name in (dtype, out_dtype):
+        if name not in DTYPES:
+            raise ValueError(f"Invalid dtype: {name}")
+    in_code, out_code = DTYPES[dtype], DTYPES[out_dtype]
+    in_size, out_size = array(in_code).itemsize, array(out_code).itemsize
+
+    # 単位の検証と別名の解決（ファイルを開く前に失敗させる）
+    from_unit = resolve_unit(category, from_unit)
+    to_unit = resolve_unit(category, to_unit)
+
+    input_bytes = os.path.getsize(input_path)
+    if input_bytes % in_size:
+        raise ValueError(f"File size {input_bytes} is not a multiple of {dtype} size ({in_size} bytes)")
+    total = input_bytes // in_size
+
+    if os.path.exists(output_path) and os.path.samefile(input_path, output_path):
+        raise ValueError("Input and output must be different files")
+
+    # 入出力のどちらのオフセットも境界に揃うよう、両方の値のサイズで窓を決める
+    window = _window_values(chunk_size, in_size, out_size)
+
+    with open(input_path, "rb") as src, open(output_path, "w+b") as dst:
+        dst.truncate(total * out_size)
+        for start in range(0, total, window):
+            count = min(window, total - start)
+            in_offset, out_offset = start * in_size, start * out_size
+            in_length, out_length = count * in_size, count * out_size
+
+            with mmap.mmap(src.fileno(), in_length, offset=in_offset, access=mmap.ACCESS_READ) as in_map, \
+                    mmap.mmap(dst.fileno(), out_length, offset=out_offset, access=mmap.ACCESS_WRITE) as out_map:
+                if hasattr(in_map, "madvise"):
+                    in_map.madvise(mmap.MADV_SEQUENTIAL)
+                with memoryview(in_map) as raw_in, raw_in.cast(in_code) as values, \
+                        memoryview(out_map) as raw_out, raw_out.cast(out_code) as results:
+                    results[:] = array(out_code, convert_many(values.tolist(), from_unit, to_unit))
+                out_map.flush()
+
+            _drop_cache(src.fileno(), in_offset, in_length)
+            _drop_cache(dst.fileno(), out_offset, out_length)
+
+    return total
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    コマンドラインのエントリーポイント
+
+    Args:
+        argv: コマンドライン引数（省略時は sys.argv）
+
+    Returns:
+        int: 終了コード
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m converters.binary",
+        description="float64/float32 のバイナリファイルを単位変換する",
+    )
+    parser.add_argument("input", help="入力ファイル")
+    parser.add_argument("output", help="出力ファイル")
+    parser.add_argument("--category", required=True, choices=sorted(CATEGORY_CONFIG), help="変換カテゴリ")
+    parser.add_argument("--from", dest="from_unit", required=True, help="変換元の単位")
+    parser.add_argument("--to", dest="to_unit", required=True, help="変換先の単位")
+    parser.add_argument("--dtype", default="float64", choices=sorted(DTYPES), help="入力の値の型")
+    parser.add_argument("--out-dtype", choices=sorted(DTYPES), help="出力の値の型（省略時は入力と同じ）")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="1回に変換する値の数の目安")
+    args = parser.parse_args(argv)
+
+    try:
+        count = convert_binary_file(
+            args.input, args.output, args.category, args.from_unit, args.to_unit,
+            dtype=args.dtype, out_dtype=args.out_dtype, chunk_size=args.chunk_size,
+        )
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Converted {count} values", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
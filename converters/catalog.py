@@ -0,0 +1,248 @@
+"""
+単位カタログ（YAML）の読み込みとコンパイル
+
+catalog.yaml のカテゴリ定義を、CATEGORY_CONFIG と同じ形式の変換関数と
+ルックアップテーブルにコンパイルする。リクエストごとにYAMLを参照することはない。
+"""
+
+import logging
+import math
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from converters.best_unit import UNIT_SYSTEMS, MagnitudeIndex, scale_value
+from converters.prefixes import PREFIX_SYSTEMS, PrefixedUnits
+
+if TYPE_CHECKING:
+    import asyncio
+
+logger = logging.getLogger(__name__)
+
+# 同梱の単位カタログ
+DEFAULT_CATALOG_PATH = Path(__file__).resolve().parent / "catalog.yaml"
+
+
+class CatalogError(ValueError):
+    """単位カタログの定義が不正な場合のエラー"""
+
+
+def _require_number(value, where: str, positive: bool = False) -> float:
+    """カタログの数値項目を検証する"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise CatalogError(f"{where} must be a finite number")
+    if positive and value <= 0:
+        raise CatalogError(f"{where} must be positive")
+    return float(value)
+
+
+def _require_prefixes(value, where: str) -> tuple[str, ...]:
+    """カタログの接頭辞の種類（si / binary またはそのリスト）を検証する"""
+    systems = [value] if isinstance(value, str) else value
+    if not isinstance(systems, list) or not all(system in PREFIX_SYSTEMS for system in systems):
+        raise CatalogError(f"{where} must be one of {sorted(PREFIX_SYSTEMS)} or a list of them")
+    return tuple(systems)
+
+
+def compile_category(category: str, spec: dict) -> dict:
+    """
+    1カテゴリ分の定義を変換関数とルックアップテーブルにコンパイルする
+
+    Args:
+        category: カテゴリ名
+        spec: カテゴリの定義（name, units。各単位は name, factor, offset, aliases, prefixes, system）
+
+    Returns:
+        dict: CATEGORY_CONFIG の1エントリと同じ形式のカテゴリ設定
+
+    Raises:
+        CatalogError: 定義が不正な場合
+    """
+    if not isinstance(spec, dict) or not isinstance(spec.get("units"), dict) or not spec["units"]:
+        raise CatalogError(f"{category}: 'units' must be a non-empty mapping")
+
+    factors: dict[str, float] = {}
+    offsets: dict[str, float] = {}
+    names: dict[str, str] = {}
+    aliases: dict[str, list[str]] = {}
+    prefixable: dict[str, tuple[float, tuple[str, ...]]] = {}
+    systems: dict[str, str] = {}
+    for code, unit in spec["units"].items():
+        where = f"{category}.{code}"
+        if not isinstance(code, str) or not code.strip():
+            raise CatalogError(f"{category}: unit codes must be non-empty strings")
+        if not isinstance(unit, dict):
+            raise CatalogError(f"{where} must be a mapping")
+        factors[code] = _require_number(unit.get("factor"), f"{where}.factor", positive=True)
+        offsets[code] = _require_number(unit.get("offset", 0), f"{where}.offset")
+        names[code] = str(unit.get("name", code))
+        unit_aliases = unit.get("aliases", [])
+        if not isinstance(unit_aliases, list) or not all(isinstance(alias, str) for alias in unit_aliases):
+            raise CatalogError(f"{where}.aliases must be a list of strings")
+        aliases[code] = unit_aliases
+        if "prefixes" in unit:
+            if offsets[code]:
+                raise CatalogError(f"{where}: prefixes cannot be used with an offset")
+            prefixable[code] = (factors[code], _require_prefixes(unit["prefixes"], f"{where}.prefixes"))
+        if "system" in unit:
+            if unit["system"] not in UNIT_SYSTEMS:
+                raise CatalogError(f"{where}.system must be one of {list(UNIT_SYSTEMS)}")
+            systems[code] = unit["system"]
+
+    units = list(factors)
+    units_info = [{"code": code, "name": names[code]} for code in units]
+    affine = any(offsets.values())
+    prefixed = PrefixedUnits(prefixable, listed=units) if prefixable else None
+    # offset を持つカテゴリでは値の大きさで単位を選べないため、変換先 auto は使えない
+    magnitude_index = MagnitudeIndex(factors, systems) if not affine else None
+
+    def _factor(unit: str) -> float | None:
+        factor = factors.get(unit)
+        if factor is None and prefixed is not None:
+            factor = prefixed.factor(unit)
+        return factor
+
+    def is_valid_unit(unit: str) -> bool:
+        return _factor(unit) is not None
+
+    def get_units() -> list[str]:
+        return units.copy()
+
+    def get_units_info() -> list[dict[str, str]]:
+        return [info.copy() for info in units_info]
+
+    def get_unit_size(unit: str) -> float:
+        return _factor(unit) or 0
+
+    def _coefficients(from_unit: str, to_unit: str) -> tuple[float, float, float, float]:
+        from_factor = _factor(from_unit)
+        if from_factor is None:
+            raise ValueError(f"Invalid unit: {from_unit}")
+        to_factor = _factor(to_unit)
+        if to_factor is None:
+            raise ValueError(f"Invalid unit: {to_unit}")
+        # 接頭辞付きの単位は offset を持たない
+        return from_factor, offsets.get(from_unit, 0.0), to_factor, offsets.get(to_unit, 0.0)
+
+    def convert(value: float, from_unit: str, to_unit: str) -> float:
+        from_factor, from_offset, to_factor, to_offset = _coefficients(from_unit, to_unit)
+        if not affine:
+            return value * from_factor / to_factor
+        return (value * from_factor + from_offset - to_offset) / to_factor
+
+    def convert_many(values: list[float], from_unit: str, to_unit: str) -> list[float]:
+        from_factor, from_offset, to_factor, to_offset = _coefficients(from_unit, to_unit)
+        if not affine:
+            return [value * from_factor / to_factor for value in values]
+        return [(value * from_factor + from_offset - to_offset) / to_factor for value in values]
+
+    def best_unit(value: float, from_unit: str, system: str | None = None) -> tuple[str, float]:
+        from_factor = _factor(from_unit)
+        if from_factor is None:
+            raise ValueError(f"Invalid unit: {from_unit}")
+        # 単位系を省略した場合は変換元の単位と同じ単位系（単位系のない単位は全単位）から選ぶ
+        system = system or systems.get(from_unit)
+        base = value * from_factor
+        to_unit = magnitude_index.best(base, system, zero_factor=from_factor)
+        return to_unit, scale_value(base, factors[to_unit])
+
+    def best_units_many(
+        values: list[float], from_unit: str, system: str | None = None
+    ) -> tuple[list[str], list[float]]:
+        from_factor = _factor(from_unit)
+        if from_factor is None:
+            raise ValueError(f"Invalid unit: {from_unit}")
+        system = system or systems.get(from_unit)
+        bases = [value * from_factor for value in values]
+        units = magnitude_index.best_many(bases, system, zero_factor=from_factor)
+        return units, [scale_value(base, factors[unit]) for base, unit in zip(bases, units)]
+
+    return {
+        "name": str(spec.get("name", category)),
+        "convert_func": convert,
+        "convert_many_func": convert_many,
+        "get_units_func": get_units,
+        "get_units_info_func": get_units_info,
+        "is_valid_unit_func": is_valid_unit,
+        "unit_size_func": get_unit_size,
+        "aliases": aliases,
+        "prefixed_unit_func": prefixed.canonical if prefixed is not None else None,
+        "best_unit_func": best_unit if magnitude_index is not None else None,
+        "best_units_many_func": best_units_many if magnitude_index is not None else None,
+    }
+
+
+def load_catalog(path: str | Path = DEFAULT_CATALOG_PATH) -> dict[str, dict]:
+    """
+    単位カタログを読み込んでコンパイルする
+
+    Args:
+        path: カタログファイルのパス
+
+    Returns:
+        dict[str, dict]: カテゴリ名からカテゴリ設定へのマッピング（定義順）
+
+    Raises:
+        OSError: ファイルを読み込めない場合
+        CatalogError: 定義が不正な場合
+    """
+    # PyYAMLはインポートに時間がかかるため、カタログを読み込むときに初めてインポートする
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path, encoding="utf-8") as f:
+        try:
+            document = yaml.load(f, Loader=loader)
+        except yaml.YAMLError as e:
+            raise CatalogError(f"Invalid YAML: {e}")
+
+    if not isinstance(document, dict) or not isinstance(document.get("categories"), dict):
+        raise CatalogError("Catalog must have a 'categories' mapping")
+    return {
+        str(category): compile_category(str(category), spec)
+        for category, spec in document["categories"].items()
+    }
+
+
+async def watch_catalog(
+    path: str | Path,
+    on_change: Callable[[], None],
+    stop_event: "asyncio.Event | None" = None,
+    debounce_ms: int = 1600,
+) -> None:
+    """
+    カタログファイルの変更を監視し、変更のたびに on_change を呼び出す
+
+    エディタによる置き換え（rename）にも追従できるよう、親ディレクトリを監視して
+    対象のファイル名だけを絞り込む。
+
+    Args:
+        path: カタログファイルのパス
+        on_change: 変更時にスレッドで呼び出す関数（例外は記録して監視を続ける）
+        stop_event: 監視を終了するためのイベント
+        debounce_ms: 連続した変更をまとめる時間（ミリ秒）
+    """
+    import asyncio
+
+    from watchfiles import awatch
+
+    target = os.path.realpath(path)
+
+    def only_catalog(change, changed_path: str) -> bool:
+        return os.path.realpath(changed_path) == target
+
+    changes = awatch(
+        os.path.dirname(target),
+        watch_filter=only_catalog,
+        stop_event=stop_event,
+        debounce=debounce_ms,
+        recursive=False,
+    )
+    async for _ in changes:
+        try:
+            # カタログの読み込みとコンパイルはイベントループを止めないようにスレッドで行う
+            await asyncio.to_thread(on_change)
+        except (OSError, CatalogError) as e:
+            # 編集途中の不正なカタログでは現在のカタログを使い続ける
+            logger.error(f"Failed to reload unit catalog: {e}")
@@ -0,0 +1,346 @@
+"""
+通貨の単位変換モジュール
+
+対応単位: USD, EUR, JPY, GBP, CNY, KRW, AUD, CAD, CHF, HKD, SGD, INR
+
+為替レートはメモリ上のスナップショット（RateSnapshot）として保持する。レートの更新は
+新しいスナップショットを完成させてから参照を1回で差し替えるため、変換処理は
+I/Oやロックを待たずに、長さの変換と同じ辞書の参照だけで完了する。
+レートの取得元はプロバイダー（RateProvider）として差し替えられる。
+"""
+
+import logging
+import math
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    import asyncio
+
+logger = logging.getLogger(__name__)
+
+# 単位の日本語名称（対応する通貨）
+UNIT_NAMES = {
+    'USD': '米ドル',
+    'EUR': 'ユーロ',
+    'JPY': '日本円',
+    'GBP': '英ポンド',
+    'CNY': '人民元',
+    'KRW': '韓国ウォン',
+    'AUD': '豪ドル',
+    'CAD': 'カナダドル',
+    'CHF': 'スイスフラン',
+    'HKD': '香港ドル',
+    'SGD': 'シンガポールドル',
+    'INR': 'インドルピー'
+}
+
+# 単位コード以外の表記（大文字小文字・Unicodeの表記ゆれは正規化して照合する）
+UNIT_ALIASES = {
+    'USD': ['$', 'US$', 'dollar', 'dollars', 'us dollar', 'us dollars', 'ドル'],
+    'EUR': ['€', 'euro', 'euros'],
+    'JPY': ['¥', '円', 'yen'],
+    'GBP': ['£', 'sterling', 'pound sterling'],
+    'CNY': ['RMB', 'yuan', '元'],
+    'KRW': ['₩', 'won', 'ウォン'],
+    'AUD': ['A$'],
+    'CAD': ['C$'],
+    'CHF': ['franc', 'swiss franc'],
+    'HKD': ['HK$'],
+    'SGD': ['S$'],
+    'INR': ['₹', 'rupee', 'rupees']
+}
+
+# オフライン用の固定レート（1 USD あたりの各通貨の額）
+FIXTURE_RATES = {
+    'USD': 1.0,
+    'EUR': 0.92,
+    'JPY': 150.0,
+    'GBP': 0.79,
+    'CNY': 7.25,
+    'KRW': 1380.0,
+    'AUD': 1.52,
+    'CAD': 1.37,
+    'CHF': 0.88,
+    'HKD': 7.8,
+    'SGD': 1.34,
+    'INR': 83.5
+}
+FIXTURE_TIMESTAMP = '2026-01-01T00:00:00Z'
+
+
+class RateError(ValueError):
+    """為替レートのデータが不正な場合のエラー"""
+
+
+class RateSnapshot:
+    """
+    ある時点の為替レート一式（構築後は変更しない）
+
+    rates は基準通貨1単位あたりの各通貨の額（例: base=USD で JPY=150.0）
+    """
+
+    __slots__ = ("base", "rates", "timestamp", "source")
+
+    def __init__(self, base: str, rates: dict[str, float], timestamp: str, source: str = "fixture"):
+        """
+        Args:
+            base: 基準通貨
+            rates: 基準通貨1単位あたりの各通貨の額
+            timestamp: レートの時刻（ISO 8601）
+            source: レートの取得元（fixture: オフライン用の固定レート、file: レートファイル）
+
+        Raises:
+            RateError: 対応する通貨のレートが不足している、または正の有限数でない場合
+        """
+        rates = {str(code): rate for code, rate in rates.items()}
+        rates.setdefault(base, 1.0)
+        for code in UNIT_NAMES:
+            rate = rates.get(code)
+            if isinstance(rate, bool) or not isinstance(rate, (int, float)) or not math.isfinite(rate) or rate <= 0:
+                raise RateError(f"Rate for {code} must be a positive finite number")
+        self.base = base
+        self.rates = {code: float(rates[code]) for code in UNIT_NAMES}
+        self.timestamp = timestamp
+        self.source = source
+
+    def convert(self, value: float, from_unit: str, to_unit: str) -> float:
+        """
+        このスナップショットのレートで通貨を換算する
+
+        Raises:
+            ValueError: 無効な単位が指定された場合
+        """
+        from_rate = self.rates.get(from_unit)
+        if from_rate is None:
+            raise ValueError(f"Invalid unit: {from_unit}")
+        to_rate = self.rates.get(to_unit)
+        if to_rate is None:
+            raise ValueError(f"Invalid unit: {to_unit}")
+        return value * to_rate / from_rate
+
+    def convert_many(self, values: list[float], from_unit: str, to_unit: str) -> list[float]:
+        """
+        このスナップショットのレートで複数の値をまとめて換算する
+
+        Raises:
+            ValueError: 無効な単位が指定された場合
+        """
+        from_rate = self.rates.get(from_unit)
+        if from_rate is None:
+            raise ValueError(f"Invalid unit: {from_unit}")
+        to_rate = self.rates.get(to_unit)
+        if to_rate is None:
+            raise ValueError(f"Invalid unit: {to_unit}")
+        return [value * to_rate / from_rate for value in values]
+
+
+class RateProvider(Protocol):
+    """為替レートの取得元"""
+
+    def fetch(self) -> RateSnapshot:
+        """
+        最新の為替レートを取得する
+
+        Raises:
+            OSError: 取得できない場合
+            RateError: データが不正な場合
+        """
+        ...
+
+
+class FixtureRateProvider:
+    """固定のレートを返すプロバイダー（オフライン・テスト用）"""
+
+    def __init__(self, rates: dict[str, float] = FIXTURE_RATES, timestamp: str = FIXTURE_TIMESTAMP, base: str = 'USD'):
+        self._snapshot = RateSnapshot(base, rates, timestamp, source="fixture")
+
+    def fetch(self) -> RateSnapshot:
+        return self._snapshot
+
+
+class FileRateProvider:
+    """
+    JSONファイルからレートを読み込むプロバイダー
+
+    ファイルの形式: {"base": "USD", "timestamp": "2026-01-01T00:00:00Z", "rates": {"JPY": 150.0, ...}}
+    （timestamp を省略した場合はファイルの更新時刻を使う）
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def fetch(self) -> RateSnapshot:
+        import json
+
+        with open(self.path, encoding="utf-8") as f:
+            try:
+                document = json.load(f)
+            except json.JSONDecodeError as e:
+                raise RateError(f"Invalid rate file: {e}")
+        if not isinstance(document, dict) or not isinstance(document.get("rates"), dict):
+            raise RateError("Rate file must have a 'rates' mapping")
+        timestamp = document.get("timestamp") or time.strftime(
+            "%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.path.stat().st_mtime)
+        )
+        return RateSnapshot(
+            str(document.get("base", "USD")), document["rates"], str(timestamp), source="file"
+        )
+
+
+# 現在のスナップショット（更新時は参照ごと差し替える）
+_snapshot = FixtureRateProvider().fetch()
+
+
+def get_currency_rates() -> RateSnapshot:
+    """
+    現在の為替レートのスナップショットを返す
+
+    Returns:
+        RateSnapshot: スナップショット（返した後に更新されても内容は変わらない）
+    """
+    return _snapshot
+
+
+def set_currency_rates(snapshot: RateSnapshot) -> None:
+    """
+    為替レートのスナップショットを差し替える
+
+    Args:
+        snapshot: 新しいスナップショット
+    """
+    global _snapshot
+    _snapshot = snapshot
+
+
+def refresh_currency_rates(provider: RateProvider) -> RateSnapshot:
+    """
+    プロバイダーから為替レートを取得して差し替える
+
+    Args:
+        provider: レートの取得元
+
+    Returns:
+        RateSnapshot: 新しいスナップショット
+
+    Raises:
+        OSError: 取得できない場合（現在のレートはそのまま使われる）
+        RateError: データが不正な場合（現在のレートはそのまま使われる）
+    """
+    snapshot = provider.fetch()
+    set_currency_rates(snapshot)
+    return snapshot
+
+
+async def refresh_loop(provider: RateProvider, interval: float, stop_event: "asyncio.Event | None" = None) -> None:
+    """
+    一定間隔で為替レートを更新する
+
+    取得はスレッドで行い、失敗した場合は記録して現在のレートを使い続ける
+
+    Args:
+        provider: レートの取得元
+        interval: 更新間隔（秒）
+        stop_event: 更新を終了するためのイベント
+    """
+    import asyncio
+
+    stop_event = stop_event or asyncio.Event()
+    while not stop_event.is_set():
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval)
+            return
+        except asyncio.TimeoutError:
+            pass
+        try:
+            snapshot = await asyncio.to_thread(refresh_currency_rates, provider)
+            logger.info(f"Currency rates refreshed ({snapshot.source}, {snapshot.timestamp})")
+        except (OSError, RateError) as e:
+            logger.error(f"Failed to refresh currency rates: {e}")
+
+
+def get_currency_units() -> list[str]:
+    """
+    利用可能な通貨の単位一覧を返す
+
+    Returns:
+        list[str]: 利用可能な単位のリスト
+    """
+    return list(UNIT_NAMES.keys())
+
+
+def get_currency_units_info() -> list[dict[str, str]]:
+    """
+    利用可能な通貨の単位情報（コードと名称）を返す
+
+    Returns:
+        list[dict[str, str]]: 単位情報のリスト [{"code": "USD", "name": "米ドル"}, ...]
+    """
+    return [
+        {"code": code, "name": name}
+        for code, name in UNIT_NAMES.items()
+    ]
+
+
+def is_valid_currency_unit(unit: str) -> bool:
+    """
+    通貨の単位として有効かどうかを返す（例外を送出しない検証用）
+
+    Args:
+        unit: 単位コード
+
+    Returns:
+        bool: 有効な単位の場合True
+    """
+    return unit in UNIT_NAMES
+
+
+def get_currency_unit_size(unit: str) -> float:
+    """
+    単位の大きさ（基準通貨に対する価値）を返す（単位の並べ替え用）
+
+    Args:
+        unit: 単位コード
+
+    Returns:
+        float: 単位の大きさ（無効な単位の場合は0）
+    """
+    rate = _snapshot.rates.get(unit)
+    return 1 / rate if rate else 0
+
+
+def convert_currency(value: float, from_unit: str, to_unit: str) -> float:
+    """
+    現在のレートで通貨を換算する
+
+    Args:
+        value: 変換する値
+        from_unit: 変換元の通貨
+        to_unit: 変換先の通貨
+
+    Returns:
+        float: 変換後の値
+
+    Raises:
+        ValueError: 無効な単位が指定された場合
+    """
+    return _snapshot.convert(value, from_unit, to_unit)
+
+
+def convert_currency_many(values: list[float], from_unit: str, to_unit: str) -> list[float]:
+    """
+    現在のレートで複数の値をまとめて通貨を換算する
+
+    Args:
+        values: 変換する値のリスト
+        from_unit: 変換元の通貨
+        to_unit: 変換先の通貨
+
+    Returns:
+        list[float]: 変換後の値のリスト（入力と同じ順序）
+
+    Raises:
+        ValueError: 無効な単位が指定された場合
+    """
+    return _snapshot.convert_many(values, from_unit, to_unit)
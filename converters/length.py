@@ -2,8 +2,12 @@
 長さの単位変換モジュール
 
 対応単位: m, km, cm, mm, in, ft, yd, mi
+SI接頭辞付きの単位（例: μm, nm, Mm）も利用できる
 """
 
+from converters.best_unit import MagnitudeIndex, scale_value
+from converters.prefixes import PrefixedUnits
+
 # 各単位からメートルへの変換係数
 UNITS_TO_METERS = {
     'm': 1.0,
@@ -28,6 +32,49 @@ UNIT_NAMES = {
     'mi': 'マイル'
 }
 
+# 単位コード以外の表記（大文字小文字・Unicodeの表記ゆれは正規化して照合する）
+UNIT_ALIASES = {
+    'm': ['meter', 'meters', 'metre', 'metres'],
+    'km': ['kilometer', 'kilometers', 'kilometre', 'kilometres'],
+    'cm': ['centimeter', 'centimeters', 'centimetre', 'centimetres'],
+    'mm': ['millimeter', 'millimeters', 'millimetre', 'millimetres'],
+    'in': ['inch', 'inches', '"', '″'],
+    'ft': ['foot', 'feet', "'", '′'],
+    'yd': ['yard', 'yards', 'yds'],
+    'mi': ['mile', 'miles']
+}
+
+# 単位系（変換先 auto で読みやすい単位を選ぶ際の絞り込みに使う）
+UNIT_SYSTEMS = {
+    'm': 'metric',
+    'km': 'metric',
+    'cm': 'metric',
+    'mm': 'metric',
+    'in': 'imperial',
+    'ft': 'imperial',
+    'yd': 'imperial',
+    'mi': 'imperial'
+}
+
+# SI接頭辞を付けられる単位（μm, nm, Mm などは係数の表に列挙せず接頭辞から解決する）
+PREFIXABLE_UNITS = {'m': ('si',)}
+
+_PREFIXED_UNITS = PrefixedUnits(
+    {unit: (UNITS_TO_METERS[unit], systems) for unit, systems in PREFIXABLE_UNITS.items()},
+    listed=UNITS_TO_METERS,
+)
+
+# 係数の昇順の表（変換先 auto の単位選択用、接頭辞付きの単位は含めない）
+_MAGNITUDE_INDEX = MagnitudeIndex(UNITS_TO_METERS, UNIT_SYSTEMS)
+
+
+def _unit_factor(unit: str) -> float | None:
+    """単位のメートルに対する係数を返す（接頭辞付きの単位を含む。無効な単位の場合はNone）"""
+    factor = UNITS_TO_METERS.get(unit)
+    if factor is None:
+        factor = _PREFIXED_UNITS.factor(unit)
+    return factor
+
 
 def get_length_units() -> list[str]:
     """
@@ -52,6 +99,45 @@ def get_length_units_info() -> list[dict[str, str]]:
     ]
 
 
+def is_valid_length_unit(unit: str) -> bool:
+    """
+    長さの単位として有効かどうかを返す（例外を送出しない検証用）
+
+    Args:
+        unit: 単位コード
+
+    Returns:
+        bool: 有効な単位の場合True
+    """
+    return _unit_factor(unit) is not None
+
+
+def parse_length_unit(unit: str) -> str | None:
+    """
+    接頭辞付きの単位を単位コードに解決する（例: `um` → `μm`）
+
+    Args:
+        unit: 単位の表記
+
+    Returns:
+        str | None: 単位コード（接頭辞付きの単位でない場合はNone）
+    """
+    return _PREFIXED_UNITS.canonical(unit)
+
+
+def get_length_unit_size(unit: str) -> float:
+    """
+    単位の大きさ（メートルに対する比率）を返す（単位の並べ替え用）
+
+    Args:
+        unit: 単位コード
+
+    Returns:
+        float: 単位の大きさ（無効な単位の場合は0）
+    """
+    return _unit_factor(unit) or 0
+
+
 def convert_length(value: float, from_unit: str, to_unit: str) -> float:
     """
     長さの単位変換を行う
@@ -67,16 +153,100 @@ def convert_length(value: float, from_unit: str, to_unit: str) -> float:
     Raises:
         ValueError: 無効な単位が指定された場合
     """
-    if from_unit not in UNITS_TO_METERS:
+    from_factor = _unit_factor(from_unit)
+    if from_factor is None:
         raise ValueError(f"Invalid unit: {from_unit}")
 
-    if to_unit not in UNITS_TO_METERS:
+    to_factor = _unit_factor(to_unit)
+    if to_factor is None:
         raise ValueError(f"Invalid unit: {to_unit}")
 
     # from_unitからメートルに変換
-    meters = value * UNITS_TO_METERS[from_unit]
+    meters = value * from_factor
 
     # メートルからto_unitに変換
-    result = meters / UNITS_TO_METERS[to_unit]
+    result = meters / to_factor
 
     return result
+
+
+def convert_length_many(values: list[float], from_unit: str, to_unit: str) -> list[float]:
+    """
+    複数の値をまとめて長さの単位変換を行う
+
+    変換係数の取得は1回だけ行い、各値には convert_length と同じ計算式を適用する
+
+    Args:
+        values: 変換する値のリスト
+        from_unit: 変換元の単位
+        to_unit: 変換先の単位
+
+    Returns:
+        list[float]: 変換後の値のリスト（入力と同じ順序）
+
+    Raises:
+        ValueError: 無効な単位が指定された場合
+    """
+    from_factor = _unit_factor(from_unit)
+    if from_factor is None:
+        raise ValueError(f"Invalid unit: {from_unit}")
+
+    to_factor = _unit_factor(to_unit)
+    if to_factor is None:
+        raise ValueError(f"Invalid unit: {to_unit}")
+
+    return [value * from_factor / to_factor for value in values]
+
+
+def best_length_unit(value: float, from_unit: str, system: str | None = None) -> tuple[str, float]:
+    """
+    読みやすい単位を選んで長さの単位変換を行う（例: 0.000342 km → 34.2 cm）
+
+    Args:
+        value: 変換する値
+        from_unit: 変換元の単位
+        system: 単位系（metric / imperial、Noneの場合は変換元の単位と同じ単位系）
+
+    Returns:
+        tuple[str, float]: (選んだ単位, 変換後の値)（変換後の値は convert_length と同じ。境界付近の丸め誤差は整数に戻す）
+
+    Raises:
+        ValueError: 無効な単位・単位系が指定された場合
+    """
+    from_factor = _unit_factor(from_unit)
+    if from_factor is None:
+        raise ValueError(f"Invalid unit: {from_unit}")
+
+    # 接頭辞付きの単位（SI接頭辞）はメートル法として扱う
+    system = system or UNIT_SYSTEMS.get(from_unit, 'metric')
+    meters = value * from_factor
+    to_unit = _MAGNITUDE_INDEX.best(meters, system, zero_factor=from_factor)
+    return to_unit, scale_value(meters, UNITS_TO_METERS[to_unit])
+
+
+def best_length_units_many(
+    values: list[float], from_unit: str, system: str | None = None
+) -> tuple[list[str], list[float]]:
+    """
+    複数の値をそれぞれ読みやすい単位を選んでまとめて長さの単位変換を行う
+
+    Args:
+        values: 変換する値のリスト
+        from_unit: 変換元の単位
+        system: 単位系（metric / imperial、Noneの場合は変換元の単位と同じ単位系）
+
+    Returns:
+        tuple[list[str], list[float]]: (選んだ単位のリスト, 変換後の値のリスト)（入力と同じ順序）
+
+    Raises:
+        ValueError: 無効な単位・単位系が指定された場合
+    """
+    from_factor = _unit_factor(from_unit)
+    if from_factor is None:
+        raise ValueError(f"Invalid unit: {from_unit}")
+
+    # 接頭辞付きの単位（SI接頭辞）はメートル法として扱う
+    system = system or UNIT_SYSTEMS.get(from_unit, 'metric')
+    meters = [value * from_factor for value in values]
+    units = _MAGNITUDE_INDEX.best_many(meters, system, zero_factor=from_factor)
+    return units, [scale_value(base, UNITS_TO_METERS[unit]) for base, unit in zip(meters, units)]
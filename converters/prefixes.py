@@ -0,0 +1,131 @@
+"""
+SI接頭辞・2進接頭辞の解析
+
+接頭辞を付けられる単位（基準となる単位）だけを登録しておき、`μm`、`nm`、`Mg`、`GiB` のような
+接頭辞付きの単位を係数の表に列挙せずに解決する。解析結果は上限付きのキャッシュに保持するため、
+よく使われる単位を毎回解析し直すことはない。
+"""
+
+import unicodedata
+from collections.abc import Iterable
+from functools import lru_cache
+
+# SI接頭辞（マイクロは NFKC正規化後の `μ`（U+03BC）を正規の表記とする）
+SI_PREFIXES = {
+    'Q': 1e30, 'R': 1e27, 'Y': 1e24, 'Z': 1e21, 'E': 1e18, 'P': 1e15,
+    'T': 1e12, 'G': 1e9, 'M': 1e6, 'k': 1e3, 'h': 1e2, 'da': 1e1,
+    'd': 1e-1, 'c': 1e-2, 'm': 1e-3, 'μ': 1e-6, 'n': 1e-9, 'p': 1e-12,
+    'f': 1e-15, 'a': 1e-18, 'z': 1e-21, 'y': 1e-24, 'r': 1e-27, 'q': 1e-30,
+}
+
+# 2進接頭辞（IEC 80000-13）
+BINARY_PREFIXES = {
+    'Ki': 2 ** 10, 'Mi': 2 ** 20, 'Gi': 2 ** 30, 'Ti': 2 ** 40,
+    'Pi': 2 ** 50, 'Ei': 2 ** 60, 'Zi': 2 ** 70, 'Yi': 2 ** 80,
+}
+
+# 接頭辞の種類
+PREFIX_SYSTEMS = {
+    'si': SI_PREFIXES,
+    'binary': BINARY_PREFIXES,
+}
+
+# 接頭辞の別表記（`u` はマイクロの代用表記）
+PREFIX_SPELLINGS = {'u': 'μ'}
+
+# 解析結果のキャッシュの上限（任意の入力でメモリが増え続けないようにする）
+PARSE_CACHE_SIZE = 4096
+
+
+class PrefixedUnits:
+    """
+    接頭辞付きの単位の解析器
+
+    接頭辞は大文字小文字を区別して照合する（`Mm` はメガメートル、`mm` はミリメートル）。
+    係数の表に列挙した単位と同じ単位は、表記によらず列挙した単位コードに解決する（`μs` → `us`）。
+    """
+
+    def __init__(
+        self,
+        bases: dict[str, tuple[float, Iterable[str]]],
+        cache_size: int = PARSE_CACHE_SIZE,
+        listed: Iterable[str] = (),
+    ):
+        """
+        Args:
+            bases: 基準となる単位コードから (基準単位に対する係数, 接頭辞の種類) へのマッピング
+            cache_size: 解析結果のキャッシュの上限
+            listed: 係数の表に列挙した単位コード（接頭辞付きの単位として解析できるものは、正規の表記の代わりに返す）
+
+        Raises:
+            ValueError: 接頭辞の種類が無効な場合
+        """
+        # 基準となる単位コード -> (係数, 接頭辞 -> 接頭辞の係数)
+        self._bases: dict[str, tuple[float, dict[str, float]]] = {}
+        for base, (factor, systems) in bases.items():
+            prefixes: dict[str, float] = {}
+            for system in systems:
+                if system not in PREFIX_SYSTEMS:
+                    raise ValueError(f"Invalid prefix system: {system}")
+                prefixes.update(PREFIX_SYSTEMS[system])
+            self._bases[base] = (factor, prefixes)
+        # 正規の表記 -> 列挙した単位コード（`μs` -> `us` など、表記が異なるものだけ）
+        self._listed: dict[str, str] = {}
+        for code in listed:
+            parsed = self._parse(code)
+            if parsed is not None and parsed[0] != code:
+                self._listed[parsed[0]] = code
+        self.parse = lru_cache(maxsize=cache_size)(self._parse)
+
+    def _parse(self, unit: str) -> tuple[str, float] | None:
+        """
+        接頭辞付きの単位を解析する（キャッシュなし）
+
+        Args:
+            unit: 単位の表記
+
+        Returns:
+            tuple[str, float] | None: (単位コード, 係数)（解析できない場合はNone）
+        """
+        text = unicodedata.normalize("NFKC", unit.strip())
+        # 2文字の接頭辞（da, Ki など）を優先する
+        for length in (2, 1):
+            if len(text) <= length:
+                continue
+            prefix, base = text[:length], text[length:]
+            entry = self._bases.get(base)
+            if entry is None:
+                continue
+            prefix = PREFIX_SPELLINGS.get(prefix, prefix)
+            factor, prefixes = entry
+            prefix_factor = prefixes.get(prefix)
+            if prefix_factor is not None:
+                code = prefix + base
+                return self._listed.get(code, code), prefix_factor * factor
+        return None
+
+    def canonical(self, unit: str) -> str | None:
+        """
+        接頭辞付きの単位を正規の単位コードに解決する（例: `um` → `μm`）
+
+        Args:
+            unit: 単位の表記
+
+        Returns:
+            str | None: 単位コード（接頭辞付きの単位でない場合はNone）
+        """
+        parsed = self.parse(unit)
+        return parsed[0] if parsed is not None else None
+
+    def factor(self, unit: str) -> float | None:
+        """
+        接頭辞付きの単位の係数を返す
+
+        Args:
+            unit: 単位の表記
+
+        Returns:
+            float | None: 基準単位に対する係数（接頭辞付きの単位でない場合はNone）
+        """
+        parsed = self.parse(unit)
+        return parsed[1] if parsed is not None else None
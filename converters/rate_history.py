@@ -0,0 +1,354 @@
+"""
+為替レートの履歴ストア
+
+日ごとの為替レートを追記専用のバイナリファイルに保存し、メモリマップで参照する。
+ディレクトリの構成（数値はネイティブのバイトオーダー）:
+
+    meta.json       {"base": "USD", "currencies": ["EUR", "JPY", ...]}
+    dates.i32       日付（date.toordinal()）の int32 列（昇順）
+    <通貨>.f64      基準通貨1単位あたりの額の float64 列（dates.i32 と同じ行数）
+
+日付の列を二分探索して「指定日以前で最新のレート」を求める。ファイルは読み取り専用で
+メモリマップするため、複数の uvicorn ワーカーが同じページキャッシュを共有し、
+プロセスごとにレートの履歴を読み込むことはない。
+
+コマンドラインからは次のように実行できる:
+
+    python -m converters.rate_history init rates/ --base USD --currencies EUR JPY GBP
+    python -m converters.rate_history append rates/ 2026-10-19 '{"EUR": 0.92, "JPY": 150.0, "GBP": 0.79}'
+"""
+
+import json
+import math
+import mmap
+import os
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+from datetime import date
+from pathlib import Path
+
+META_FILE = "meta.json"
+DATES_FILE = "dates.i32"
+# 日付列・レート列のarrayの型コード
+DATE_TYPECODE = "i"
+RATE_TYPECODE = "d"
+
+
+class RateHistoryError(ValueError):
+    """レートの履歴が不正、または指定日のレートがない場合のエラー"""
+
+
+def _column_path(path: Path, currency: str) -> Path:
+    """通貨のレート列のファイルパスを返す"""
+    return path / f"{currency}.f64"
+
+
+def _read_meta(path: Path) -> tuple[str, list[str]]:
+    """メタデータを読み込む"""
+    try:
+        with open(path / META_FILE, encoding="utf-8") as f:
+            meta = json.load(f)
+    except json.JSONDecodeError as e:
+        raise RateHistoryError(f"Invalid rate history metadata: {e}")
+    if not isinstance(meta, dict) or not isinstance(meta.get("base"), str) or not isinstance(meta.get("currencies"), list):
+        raise RateHistoryError("Rate history metadata must have 'base' and 'currencies'")
+    return meta["base"], [str(code) for code in meta["currencies"]]
+
+
+def create_rate_history(path: str | Path, base: str, currencies: Iterable[str]) -> None:
+    """
+    空のレートの履歴を作成する
+
+    Args:
+        path: 履歴のディレクトリ
+        base: 基準通貨
+        currencies: 記録する通貨（基準通貨を除く）
+
+    Raises:
+        OSError: 作成できない場合
+        RateHistoryError: 履歴がすでに存在する場合
+    """
+    path = Path(path)
+    currencies = [code for code in dict.fromkeys(currencies) if code != base]
+    path.mkdir(parents=True, exist_ok=True)
+    if (path / META_FILE).exists():
+        raise RateHistoryError(f"Rate history already exists: {path}")
+    for name in [DATES_FILE, *(_column_path(path, code).name for code in currencies)]:
+        (path / name).touch()
+    with open(path / META_FILE, "w", encoding="utf-8") as f:
+        json.dump({"base": base, "currencies": currencies}, f)
+
+
+def append_rates(path: str | Path, day: date, rates: dict[str, float]) -> None:
+    """
+    1日分のレートを追記する（書き込むプロセスは1つだけにすること）
+
+    レート列を先に書き、最後に日付列を書く。読み込み側は日付列の行数だけを参照するため、
+    書き込み途中の行が読まれることはない。
+
+    Args:
+        path: 履歴のディレクトリ
+        day: 日付（記録済みの最後の日付より後）
+        rates: 基準通貨1単位あたりの各通貨の額（記録するすべての通貨を含む）
+
+    Raises:
+        OSError: 書き込めない場合
+        RateHistoryError: 日付またはレートが不正な場合
+    """
+    path = Path(path)
+    _, currencies = _read_meta(path)
+    if not isinstance(rates, dict):
+        raise RateHistoryError("Rates must be a mapping of currency to rate")
+    for code in currencies:
+        rate = rates.get(code)
+        if isinstance(rate, bool) or not isinstance(rate, (int, float)) or not math.isfinite(rate) or rate <= 0:
+            raise RateHistoryError(f"Rate for {code} must be a positive finite number")
+
+    ordinal = day.toordinal()
+    itemsize = array(DATE_TYPECODE).itemsize
+    with open(path / DATES_FILE, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        rows = size // itemsize
+        if rows:
+            f.seek((rows - 1) * itemsize)
+            last = array(DATE_TYPECODE, f.read(itemsize))[0]
+            if ordinal <= last:
+                raise RateHistoryError(f"Date must be after {date.fromordinal(last).isoformat()}")
+
+    rate_size = array(RATE_TYPECODE).itemsize
+    for code in currencies:
+        with open(_column_path(path, code), "r+b") as f:
+            # 前回の追記が途中で失敗した場合の余分な値は上書きする
+            f.seek(rows * rate_size)
+            f.write(array(RATE_TYPECODE, [rates[code]]).tobytes())
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+    with open(path / DATES_FILE, "r+b") as f:
+        f.seek(rows * itemsize)
+        f.write(array(DATE_TYPECODE, [ordinal]).tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _map_column(file_path: Path, typecode: str) -> memoryview:
+    """列のファイルを読み取り専用でメモリマップし、数値のビューを返す"""
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return memoryview(array(typecode))
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    itemsize = array(typecode).itemsize
+    return memoryview(mapped)[:size - size % itemsize].cast(typecode)
+
+
+class RateHistory:
+    """
+    メモリマップしたレートの履歴
+
+    追記された行は refresh() で参照できるようになる（指定日が記録済みの最後の日付より
+    後の場合は自動で確認する）。列のビューは参照ごと差し替えるため、参照中のビューが
+    無効になることはない。
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        Args:
+            path: 履歴のディレクトリ
+
+        Raises:
+            OSError: 読み込めない場合
+            RateHistoryError: 履歴が不正な場合
+        """
+        self.path = Path(path)
+        self.base, self.currencies = _read_meta(self.path)
+        self._size = -1
+        self._view: tuple[memoryview, dict[str, memoryview]] = (memoryview(array(DATE_TYPECODE)), {})
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """
+        追記された行を読み込む
+
+        Returns:
+            bool: 行数が変わった場合True
+        """
+        size = os.stat(self.path / DATES_FILE).st_size
+        if size == self._size:
+            return False
+        dates = _map_column(self.path / DATES_FILE, DATE_TYPECODE)
+        columns = {
+            code: _map_column(_column_path(self.path, code), RATE_TYPECODE)[:len(dates)]
+            for code in self.currencies
+        }
+        for code, column in columns.items():
+            if len(column) < len(dates):
+                raise RateHistoryError(f"Rate column for {code} is shorter than the date column")
+        self._view = (dates, columns)
+        self._size = size
+        return True
+
+    def __len__(self) -> int:
+        return len(self._view[0])
+
+    @property
+    def first_date(self) -> date | None:
+        """記録済みの最初の日付"""
+        dates = self._view[0]
+        return date.fromordinal(dates[0]) if len(dates) else None
+
+    @property
+    def last_date(self) -> date | None:
+        """記録済みの最後の日付"""
+        dates = self._view[0]
+        return date.fromordinal(dates[-1]) if len(dates) else None
+
+    def _current(self, max_ordinal: int) -> tuple[memoryview, dict[str, memoryview]]:
+        """指定日までを参照できるビューを返す（記録済みの範囲より後の場合は追記を確認する）"""
+        dates, columns = self._view
+        if not len(dates) or max_ordinal > dates[-1]:
+            self.refresh()
+            dates, columns = self._view
+        return dates, columns
+
+    def _column(self, columns: dict[str, memoryview], currency: str) -> memoryview | None:
+        """通貨のレート列を返す（基準通貨の場合はNone）"""
+        if currency == self.base:
+            return None
+        column = columns.get(currency)
+        if column is None:
+            raise RateHistoryError(f"No rate history for currency: {currency}")
+        return column
+
+    def lookup(self, days: Sequence[date]) -> list[int]:
+        """
+        各日付について、その日以前で最新のレートの行番号を求める
+
+        昇順に並んだ日付は前回の位置より後ろだけを探索するため、期間をまとめて検索する場合は
+        探索範囲が次第に狭くなる。
+
+        Args:
+            days: 日付のシーケンス
+
+        Returns:
+            list[int]: 行番号のリスト（入力と同じ順序）
+
+        Raises:
+            RateHistoryError: 記録済みの最初の日付より前の日付がある場合
+        """
+        ordinals = [day.toordinal() for day in days]
+        if not ordinals:
+            return []
+        dates, _ = self._current(max(ordinals))
+        rows = []
+        lo = 0
+        previous = ordinals[0]
+        for ordinal in ordinals:
+            if ordinal < previous:
+                lo = 0
+            previous = ordinal
+            index = bisect_right(dates, ordinal, lo)
+            if index == 0:
+                raise RateHistoryError(f"No rate on or before {date.fromordinal(ordinal).isoformat()}")
+            lo = index
+            rows.append(index - 1)
+        return rows
+
+    def rates_at(self, currency: str, days: Sequence[date]) -> tuple[array, list[date]]:
+        """
+        各日付時点の基準通貨1単位あたりの額を返す
+
+        Args:
+            currency: 通貨
+            days: 日付のシーケンス
+
+        Returns:
+            tuple[array, list[date]]: (float64のレート, 実際に使ったレートの日付)
+
+        Raises:
+            RateHistoryError: 通貨の履歴がない、または指定日以前のレートがない場合
+        """
+        rows = self.lookup(days)
+        dates, columns = self._view
+        column = self._column(columns, currency)
+        if column is None:
+            rates = array(RATE_TYPECODE, [1.0]) * len(rows)
+        else:
+            rates = array(RATE_TYPECODE, [column[row] for row in rows])
+        return rates, [date.fromordinal(dates[row]) for row in rows]
+
+    def convert_at(
+        self, values: Sequence[float], from_unit: str, to_unit: str, days: Sequence[date]
+    ) -> tuple[list[float], list[date]]:
+        """
+        各値をそれぞれの日付時点のレートで換算する
+
+        Args:
+            values: 変換する値のシーケンス
+            from_unit: 変換元の通貨
+            to_unit: 変換先の通貨
+            days: 値ごとの日付（values と同じ長さ）
+
+        Returns:
+            tuple[list[float], list[date]]: (変換後の値, 実際に使ったレートの日付)
+
+        Raises:
+            RateHistoryError: 通貨の履歴がない、指定日以前のレートがない、または長さが異なる場合
+        """
+        if len(values) != len(days):
+            raise RateHistoryError("values and dates must have the same length")
+        rows = self.lookup(days)
+        dates, columns = self._view
+        from_column = self._column(columns, from_unit)
+        to_column = self._column(columns, to_unit)
+        results = []
+        for value, row in zip(values, rows):
+            from_rate = from_column[row] if from_column is not None else 1.0
+            to_rate = to_column[row] if to_column is not None else 1.0
+            results.append(value * to_rate / from_rate)
+        return results, [date.fromordinal(dates[row]) for row in rows]
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    コマンドラインのエントリーポイント
+
+    Args:
+        argv: コマンドライン引数（省略時は sys.argv）
+
+    Returns:
+        int: 終了コード
+    """
+    # サーバーからは使わないため、コマンドラインの実行時に読み込む
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m converters.rate_history",
+        description="為替レートの履歴ストアを作成・追記する",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    init = commands.add_parser("init", help="空の履歴を作成する")
+    init.add_argument("path", help="履歴のディレクトリ")
+    init.add_argument("--base", required=True, help="基準通貨")
+    init.add_argument("--currencies", required=True, nargs="+", help="記録する通貨")
+    append = commands.add_parser("append", help="1日分のレートを追記する")
+    append.add_argument("path", help="履歴のディレクトリ")
+    append.add_argument("date", type=date.fromisoformat, help="日付 (YYYY-MM-DD)")
+    append.add_argument("rates", help='基準通貨1単位あたりの額のJSON (例: {"JPY": 150.0})')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "init":
+            create_rate_history(args.path, args.base, args.currencies)
+        else:
+            append_rates(args.path, args.date, json.loads(args.rates))
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
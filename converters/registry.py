@@ -0,0 +1,242 @@
+"""
+カテゴリレジストリ
+
+組み込みカテゴリ（converters/ のモジュール）と単位カタログのカテゴリをまとめて保持する。
+カタログの再読み込み時は新しいテーブルを完成させてから参照を1回で差し替えるため、
+処理中のリクエストが読み込み途中のカタログを参照することはない。
+"""
+
+import threading
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from pathlib import Path
+
+from converters.aliases import AliasIndex, normalize_unit
+from converters.catalog import CatalogError, load_catalog
+from converters.prefixes import BINARY_PREFIXES, PREFIX_SPELLINGS, SI_PREFIXES
+
+
+def _make_resolver(
+    index: AliasIndex, prefixed: Callable[[str], str | None] | None
+) -> Callable[[str], str | None]:
+    """
+    単位の表記を単位コードに解決する関数を生成する
+
+    単位コードの完全一致、接頭辞付きの単位、正規化した別名の順に照合する。接頭辞は
+    大文字小文字を区別するため、正規化した別名より先に照合する（`Mm` を `mm` にしない）。
+    正規化した単位コードが接頭辞付きの別の単位の表記とも一致する場合（`MM`、`Mb`）は索引が解決しない。
+    """
+    if prefixed is None:
+        return index.resolve
+
+    def resolve(unit: str) -> str | None:
+        if unit in index.codes:
+            return unit
+        code = prefixed(unit)
+        if code is None:
+            code = index.aliases.get(normalize_unit(unit))
+        return code
+
+    return resolve
+
+
+def _prefixed_symbols(
+    units: Iterable[str], prefixed: Callable[[str], str | None]
+) -> list[tuple[str, str]]:
+    """
+    単位コードに接頭辞を付けた表記のうち、接頭辞付きの単位として解決できるものを列挙する
+
+    Returns:
+        list[tuple[str, str]]: (表記, 単位コード) のリスト（`Mm` → `Mm`、`uL` → `μL` など）
+    """
+    prefixes = (*SI_PREFIXES, *BINARY_PREFIXES, *PREFIX_SPELLINGS)
+    return [
+        (spelling, code)
+        for spelling in (prefix + unit for unit in units for prefix in prefixes)
+        if (code := prefixed(spelling)) is not None
+    ]
+
+
+class _Tables:
+    """レジストリが参照するテーブル一式（構築後は変更しない）"""
+
+    __slots__ = ("categories", "units", "aliases", "global_aliases", "resolvers", "prefixed")
+
+    def __init__(self, categories: dict[str, dict]):
+        self.categories = categories
+        # 単位コード -> カテゴリ名のタプル
+        self.units: dict[str, tuple[str, ...]] = {}
+        # カテゴリ名 -> 別名の索引
+        self.aliases: dict[str, AliasIndex] = {}
+        # 正規化した別名 -> (カテゴリ名, 単位コード) のタプル
+        self.global_aliases: dict[str, tuple[tuple[str, str], ...]] = {}
+        # カテゴリ名 -> 単位の表記を単位コードに解決する関数
+        self.resolvers: dict[str, Callable[[str], str | None]] = {}
+        # (カテゴリ名, 接頭辞付きの単位を解決する関数) のタプル
+        self.prefixed: tuple[tuple[str, Callable[[str], str | None]], ...] = ()
+
+        for category, config in list(categories.items()):
+            units = config["get_units_func"]()
+            names = {info["code"]: info["name"] for info in config["get_units_info_func"]()}
+            declared = config.get("aliases", {})
+            prefixed = config.get("prefixed_unit_func")
+            # 接頭辞を付けられるカテゴリでは、正規化すると接頭辞付きの別の単位と一致する単位コードは解決しない
+            # （MM は mm と Mm、Mb は MB と mB のどちらにも読める）
+            index = AliasIndex(
+                {code: (*declared.get(code, ()), names.get(code, code)) for code in units},
+                symbols=_prefixed_symbols(units, prefixed) if prefixed is not None else (),
+            )
+            self.aliases[category] = index
+            resolve = _make_resolver(index, prefixed)
+            self.resolvers[category] = resolve
+            if prefixed is not None:
+                self.prefixed += ((category, prefixed),)
+            # 設定からも同じ索引を参照できるようにする（1つの設定だけで処理を完結させるため）
+            categories[category] = {
+                **config,
+                "resolve_unit_func": resolve,
+                "suggest_units_func": index.suggest,
+            }
+            for unit in units:
+                self.units[unit] = self.units.get(unit, ()) + (category,)
+            for key, code in index.aliases.items():
+                self.global_aliases[key] = self.global_aliases.get(key, ()) + ((category, code),)
+
+
+class CategoryRegistry(Mapping):
+    """
+    カテゴリ名からカテゴリ設定へのマッピング
+
+    単位カタログは最初に参照されたときに読み込む（インポート時間を抑えるため）。
+    """
+
+    def __init__(self, builtins: dict[str, dict], catalog_path: str | Path | None):
+        self._builtins = builtins
+        self.catalog_path = catalog_path
+        self._tables: _Tables | None = None
+        self._lock = threading.Lock()
+
+    def _current(self) -> _Tables:
+        """現在のテーブルを返す（未読み込みの場合は読み込む）"""
+        tables = self._tables
+        if tables is None:
+            with self._lock:
+                if self._tables is None:
+                    self._tables = self._build(self.catalog_path)
+                tables = self._tables
+        return tables
+
+    def _build(self, catalog_path: str | Path | None) -> _Tables:
+        """組み込みカテゴリとカタログから新しいテーブルを構築する"""
+        categories = dict(self._builtins)
+        if catalog_path is not None:
+            for category, config in load_catalog(catalog_path).items():
+                if category in categories:
+                    raise CatalogError(f"Category '{category}' is already defined")
+                categories[category] = config
+        return _Tables(categories)
+
+    def reload(self, catalog_path: str | Path | None = None) -> None:
+        """
+        単位カタログを読み込み直してアトミックに差し替える
+
+        Args:
+            catalog_path: カタログファイルのパス（省略時は現在のパス）
+
+        Raises:
+            OSError: ファイルを読み込めない場合
+            CatalogError: 定義が不正な場合（現在のカタログはそのまま使われる）
+        """
+        path = catalog_path if catalog_path is not None else self.catalog_path
+        tables = self._build(path)
+        with self._lock:
+            self.catalog_path = path
+            self._tables = tables
+
+    def categories_for(self, unit: str) -> tuple[str, ...]:
+        """
+        単位コードを含むカテゴリを返す
+
+        Args:
+            unit: 単位コード（接頭辞付きの単位は含まない）
+
+        Returns:
+            tuple[str, ...]: カテゴリ名のタプル（該当なしの場合は空）
+        """
+        return self._current().units.get(unit, ())
+
+    def resolve_unit(self, category: str, unit: str) -> str | None:
+        """
+        カテゴリ内で単位の表記（コードまたは別名）を単位コードに解決する
+
+        Args:
+            category: カテゴリ名
+            unit: 単位の表記
+
+        Returns:
+            str | None: 単位コード（カテゴリまたは単位が無効な場合はNone）
+        """
+        resolve = self._current().resolvers.get(category)
+        return resolve(unit) if resolve is not None else None
+
+    def resolve_any(self, unit: str) -> tuple[tuple[str, str], ...]:
+        """
+        全カテゴリから単位の表記に一致する (カテゴリ名, 単位コード) を探す
+
+        単位コードの完全一致、接頭辞付きの単位、正規化した別名の順に探す
+
+        Args:
+            unit: 単位の表記
+
+        Returns:
+            tuple[tuple[str, str], ...]: (カテゴリ名, 単位コード) のタプル（該当なしの場合は空）
+        """
+        tables = self._current()
+        categories = tables.units.get(unit)
+        if categories:
+            return tuple((category, unit) for category in categories)
+        matches = tuple(
+            (category, code)
+            for category, prefixed in tables.prefixed
+            if (code := prefixed(unit)) is not None
+        )
+        if matches:
+            return matches
+        return tables.global_aliases.get(normalize_unit(unit), ())
+
+    def suggest_units(self, unit: str, category: str | None = None, limit: int = 3) -> list[str]:
+        """
+        単位の表記に近い単位コードの候補を返す
+
+        Args:
+            unit: 単位の表記
+            category: カテゴリ名（省略時は全カテゴリから探す）
+            limit: 候補の最大数
+
+        Returns:
+            list[str]: 単位コードの候補
+        """
+        aliases = self._current().aliases
+        if category is not None:
+            index = aliases.get(category)
+            return index.suggest(unit, limit) if index is not None else []
+        suggestions: list[str] = []
+        for index in aliases.values():
+            for code in index.suggest(unit, limit):
+                if code not in suggestions:
+                    suggestions.append(code)
+        return suggestions[:limit]
+
+    def get(self, category, default=None):
+        return self._current().categories.get(category, default)
+
+    def __getitem__(self, category: str) -> dict:
+        return self._current().categories[category]
+
+    def __contains__(self, category) -> bool:
+        return category in self._current().categories
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._current().categories)
+
+    def __len__(self) -> int:
+        return len(self._current().categories)
@@ -7,6 +7,9 @@
 # 対応する温度単位
 TEMPERATURE_UNITS = ['celsius', 'fahrenheit', 'kelvin']
 
+# 並べ替え用の単位の順序（大きいほど先）
+UNIT_SIZE_ORDER = {'kelvin': 3, 'celsius': 2, 'fahrenheit': 1}
+
 # 単位の日本語名称
 UNIT_NAMES = {
     'celsius': '摂氏（℃）',
@@ -14,6 +17,13 @@ UNIT_NAMES = {
     'kelvin': 'ケルビン（K）'
 }
 
+# 単位コード以外の表記（大文字小文字・Unicodeの表記ゆれは正規化して照合する）
+UNIT_ALIASES = {
+    'celsius': ['c', '°C', '℃', 'degC', 'centigrade', 'degree celsius', 'degrees celsius'],
+    'fahrenheit': ['f', '°F', '℉', 'degF', 'degree fahrenheit', 'degrees fahrenheit'],
+    'kelvin': ['k', '°K', 'kelvins']
+}
+
 
 def get_temperature_units() -> list[str]:
     """
@@ -38,6 +48,34 @@ def get_temperature_units_info() -> list[dict[str, str]]:
     ]
 
 
+def is_valid_temperature_unit(unit: str) -> bool:
+    """
+    温度の単位として有効かどうかを返す（例外を送出しない検証用）
+
+    Args:
+        unit: 単位コード
+
+    Returns:
+        bool: 有効な単位の場合True
+    """
+    return unit in TEMPERATURE_UNITS
+
+
+def get_temperature_unit_size(unit: str) -> float:
+    """
+    単位の並び順を返す（単位の並べ替え用）
+
+    温度は変換係数がないため、定義した並び順を大きさとして扱う
+
+    Args:
+        unit: 単位コード
+
+    Returns:
+        float: 並び順（無効な単位の場合は0）
+    """
+    return UNIT_SIZE_ORDER.get(unit, 0)
+
+
 def convert_temperature(value: float, from_unit: str, to_unit: str) -> float:
     """
     温度の単位変換を行う
@@ -72,6 +110,34 @@ def convert_temperature(value: float, from_unit: str, to_unit: str) -> float:
     return result
 
 
+def convert_temperature_many(values: list[float], from_unit: str, to_unit: str) -> list[float]:
+    """
+    複数の値をまとめて温度の単位変換を行う
+
+    Args:
+        values: 変換する値のリスト
+        from_unit: 変換元の単位 (celsius, fahrenheit, kelvin)
+        to_unit: 変換先の単位 (celsius, fahrenheit, kelvin)
+
+    Returns:
+        list[float]: 変換後の値のリスト（入力と同じ順序）
+
+    Raises:
+        ValueError: 無効な単位が指定された場合
+    """
+    if from_unit not in TEMPERATURE_UNITS:
+        raise ValueError(f"Invalid unit: {from_unit}")
+
+    if to_unit not in TEMPERATURE_UNITS:
+        raise ValueError(f"Invalid unit: {to_unit}")
+
+    # 同じ単位の場合はそのまま返す
+    if from_unit == to_unit:
+        return list(values)
+
+    return [_from_celsius(_to_celsius(value, from_unit), to_unit) for value in values]
+
+
 def _to_celsius(value: float, from_unit: str) -> float:
     """
     任意の単位からセルシウスに変換
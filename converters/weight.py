@@ -2,8 +2,12 @@
 重さの単位変換モジュール
 
 対応単位: g, kg, mg, lb, oz
+SI接頭辞付きの単位（例: μg, ng, Mg）も利用できる
 """
 
+from converters.best_unit import MagnitudeIndex, scale_value
+from converters.prefixes import PrefixedUnits
+
 # 各単位からグラムへの変換係数
 UNITS_TO_GRAMS = {
     'g': 1.0,
@@ -22,6 +26,43 @@ UNIT_NAMES = {
     'oz': 'オンス'
 }
 
+# 単位コード以外の表記（大文字小文字・Unicodeの表記ゆれは正規化して照合する）
+UNIT_ALIASES = {
+    'g': ['gram', 'grams', 'gramme', 'grammes'],
+    'kg': ['kilogram', 'kilograms', 'kilogramme', 'kilo', 'kilos', 'kgs'],
+    'mg': ['milligram', 'milligrams'],
+    'lb': ['pound', 'pounds', 'lbs'],
+    'oz': ['ounce', 'ounces']
+}
+
+# 単位系（変換先 auto で読みやすい単位を選ぶ際の絞り込みに使う）
+UNIT_SYSTEMS = {
+    'g': 'metric',
+    'kg': 'metric',
+    'mg': 'metric',
+    'lb': 'imperial',
+    'oz': 'imperial'
+}
+
+# SI接頭辞を付けられる単位（μg, ng, Mg などは係数の表に列挙せず接頭辞から解決する）
+PREFIXABLE_UNITS = {'g': ('si',)}
+
+_PREFIXED_UNITS = PrefixedUnits(
+    {unit: (UNITS_TO_GRAMS[unit], systems) for unit, systems in PREFIXABLE_UNITS.items()},
+    listed=UNITS_TO_GRAMS,
+)
+
+# 係数の昇順の表（変換先 auto の単位選択用、接頭辞付きの単位は含めない）
+_MAGNITUDE_INDEX = MagnitudeIndex(UNITS_TO_GRAMS, UNIT_SYSTEMS)
+
+
+def _unit_factor(unit: str) -> float | None:
+    """単位のグラムに対する係数を返す（接頭辞付きの単位を含む。無効な単位の場合はNone）"""
+    factor = UNITS_TO_GRAMS.get(unit)
+    if factor is None:
+        factor = _PREFIXED_UNITS.factor(unit)
+    return factor
+
 
 def get_weight_units() -> list[str]:
     """
@@ -46,6 +87,45 @@ def get_weight_units_info() -> list[dict[str, str]]:
     ]
 
 
+def is_valid_weight_unit(unit: str) -> bool:
+    """
+    重さの単位として有効かどうかを返す（例外を送出しない検証用）
+
+    Args:
+        unit: 単位コード
+
+    Returns:
+        bool: 有効な単位の場合True
+    """
+    return _unit_factor(unit) is not None
+
+
+def parse_weight_unit(unit: str) -> str | None:
+    """
+    接頭辞付きの単位を単位コードに解決する（例: `ug` → `μg`）
+
+    Args:
+        unit: 単位の表記
+
+    Returns:
+        str | None: 単位コード（接頭辞付きの単位でない場合はNone）
+    """
+    return _PREFIXED_UNITS.canonical(unit)
+
+
+def get_weight_unit_size(unit: str) -> float:
+    """
+    単位の大きさ（グラムに対する比率）を返す（単位の並べ替え用）
+
+    Args:
+        unit: 単位コード
+
+    Returns:
+        float: 単位の大きさ（無効な単位の場合は0）
+    """
+    return _unit_factor(unit) or 0
+
+
 def convert_weight(value: float, from_unit: str, to_unit: str) -> float:
     """
     重さの単位変換を行う
@@ -61,16 +141,100 @@ def convert_weight(value: float, from_unit: str, to_unit: str) -> float:
     Raises:
         ValueError: 無効な単位が指定された場合
     """
-    if from_unit not in UNITS_TO_GRAMS:
+    from_factor = _unit_factor(from_unit)
+    if from_factor is None:
         raise ValueError(f"Invalid unit: {from_unit}")
 
-    if to_unit not in UNITS_TO_GRAMS:
+    to_factor = _unit_factor(to_unit)
+    if to_factor is None:
         raise ValueError(f"Invalid unit: {to_unit}")
 
     # from_unitからグラムに変換
-    grams = value * UNITS_TO_GRAMS[from_unit]
+    grams = value * from_factor
 
     # グラムからto_unitに変換
-    result = grams / UNITS_TO_GRAMS[to_unit]
+    result = grams / to_factor
 
     return result
+
+
+def convert_weight_many(values: list[float], from_unit: str, to_unit: str) -> list[float]:
+    """
+    複数の値をまとめて重さの単位変換を行う
+
+    変換係数の取得は1回だけ行い、各値には convert_weight と同じ計算式を適用する
+
+    Args:
+        values: 変換する値のリスト
+        from_unit: 変換元の単位
+        to_unit: 変換先の単位
+
+    Returns:
+        list[float]: 変換後の値のリスト（入力と同じ順序）
+
+    Raises:
+        ValueError: 無効な単位が指定された場合
+    """
+    from_factor = _unit_factor(from_unit)
+    if from_factor is None:
+        raise ValueError(f"Invalid unit: {from_unit}")
+
+    to_factor = _unit_factor(to_unit)
+    if to_factor is None:
+        raise ValueError(f"Invalid unit: {to_unit}")
+
+    return [value * from_factor / to_factor for value in values]
+
+
+def best_weight_unit(value: float, from_unit: str, system: str | None = None) -> tuple[str, float]:
+    """
+    読みやすい単位を選んで重さの単位変換を行う（例: 1500 g → 1.5 kg）
+
+    Args:
+        value: 変換する値
+        from_unit: 変換元の単位
+        system: 単位系（metric / imperial、Noneの場合は変換元の単位と同じ単位系）
+
+    Returns:
+        tuple[str, float]: (選んだ単位, 変換後の値)（変換後の値は convert_weight と同じ。境界付近の丸め誤差は整数に戻す）
+
+    Raises:
+        ValueError: 無効な単位・単位系が指定された場合
+    """
+    from_factor = _unit_factor(from_unit)
+    if from_factor is None:
+        raise ValueError(f"Invalid unit: {from_unit}")
+
+    # 接頭辞付きの単位（SI接頭辞）はメートル法として扱う
+    system = system or UNIT_SYSTEMS.get(from_unit, 'metric')
+    grams = value * from_factor
+    to_unit = _MAGNITUDE_INDEX.best(grams, system, zero_factor=from_factor)
+    return to_unit, scale_value(grams, UNITS_TO_GRAMS[to_unit])
+
+
+def best_weight_units_many(
+    values: list[float], from_unit: str, system: str | None = None
+) -> tuple[list[str], list[float]]:
+    """
+    複数の値をそれぞれ読みやすい単位を選んでまとめて重さの単位変換を行う
+
+    Args:
+        values: 変換する値のリスト
+        from_unit: 変換元の単位
+        system: 単位系（metric / imperial、Noneの場合は変換元の単位と同じ単位系）
+
+    Returns:
+        tuple[list[str], list[float]]: (選んだ単位のリスト, 変換後の値のリスト)（入力と同じ順序）
+
+    Raises:
+        ValueError: 無効な単位・単位系が指定された場合
+    """
+    from_factor = _unit_factor(from_unit)
+    if from_factor is None:
+        raise ValueError(f"Invalid unit: {from_unit}")
+
+    # 接頭辞付きの単位（SI接頭辞）はメートル法として扱う
+    system = system or UNIT_SYSTEMS.get(from_unit, 'metric')
+    grams = [value * from_factor for value in values]
+    units = _MAGNITUDE_INDEX.best_many(grams, system, zero_factor=from_factor)
+    return units, [scale_value(base, UNITS_TO_GRAMS[unit]) for base, unit in zip(grams, units)]
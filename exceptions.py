@@ -7,31 +7,114 @@ API全体で使用するカスタム例外を定義
 
 class MetrixException(Exception):
     """metrixアプリケーションの基底例外クラス"""
-    def __init__(self, message: str, status_code: int = 500):
+    # エラーレスポンスに付けるヘッダー（Retry-After など）
+    headers: dict[str, str] | None = None
+
+    def __init__(self, message: str, status_code: int = 500, code: str = "INTERNAL_ERROR"):
         self.message = message
         self.status_code = status_code
+        self.code = code
         super().__init__(self.message)
 
+    def to_dict(self) -> dict:
+        """エラーレスポンスのボディを返す"""
+        return {"success": False, "error": self.message, "code": self.code}
+
 
 class ValidationError(MetrixException):
     """バリデーションエラー (400)"""
     def __init__(self, message: str):
-        super().__init__(message, status_code=400)
+        super().__init__(message, status_code=400, code="VALIDATION_ERROR")
 
 
 class InvalidCategoryError(MetrixException):
     """無効なカテゴリエラー (400)"""
     def __init__(self, category: str):
-        super().__init__(f"Invalid category: {category}", status_code=400)
+        super().__init__(f"Invalid category: {category}", status_code=400, code="INVALID_CATEGORY")
 
 
 class InvalidUnitError(MetrixException):
     """無効な単位エラー (400)"""
-    def __init__(self, unit: str):
-        super().__init__(f"Invalid unit: {unit}", status_code=400)
+    def __init__(self, unit: str, suggestions: list[str] | None = None):
+        message = f"Invalid unit: {unit}"
+        if suggestions:
+            message += f" (did you mean: {', '.join(suggestions)}?)"
+        super().__init__(message, status_code=400, code="INVALID_UNIT")
+        self.suggestions = suggestions or []
+
+    def to_dict(self) -> dict:
+        """エラーレスポンスのボディを返す（候補がある場合は suggestions を含む）"""
+        body = super().to_dict()
+        if self.suggestions:
+            body["suggestions"] = self.suggestions
+        return body
+
+
+class AutoUnitNotSupportedError(MetrixException):
+    """変換先 auto に対応していないカテゴリのエラー (400)"""
+    def __init__(self, category: str):
+        super().__init__(
+            f"Auto unit selection is not supported for category: {category}",
+            status_code=400,
+            code="AUTO_UNIT_NOT_SUPPORTED"
+        )
+
+
+class TableTooLargeError(MetrixException):
+    """換算表の行数が上限を超えるエラー (400)"""
+    def __init__(self, rows: int, max_rows: int):
+        super().__init__(
+            f"Table has {rows} rows (maximum: {max_rows})",
+            status_code=400,
+            code="TABLE_TOO_LARGE"
+        )
+
+
+class PayloadTooLargeError(MetrixException):
+    """リクエストボディが上限を超えるエラー (413)"""
+    def __init__(self, message: str):
+        super().__init__(message, status_code=413, code="PAYLOAD_TOO_LARGE")
 
 
 class CategoryNotFoundError(MetrixException):
     """カテゴリが見つからないエラー (404)"""
     def __init__(self, category: str):
-        super().__init__(f"Category not found: {category}", status_code=404)
+        super().__init__(f"Category not found: {category}", status_code=404, code="CATEGORY_NOT_FOUND")
+
+
+class RateLimitExceededError(MetrixException):
+    """レート制限超過エラー (429)"""
+    def __init__(self):
+        super().__init__("Rate limit exceeded", status_code=429, code="RATE_LIMITED")
+
+
+class ServiceOverloadedError(MetrixException):
+    """過負荷による受付拒否エラー (503)"""
+    headers = {"Retry-After": "1"}
+
+    def __init__(self):
+        super().__init__("Service overloaded", status_code=503, code="OVERLOADED")
+
+
+class JobNotFoundError(MetrixException):
+    """ジョブが見つからないエラー (404)"""
+    def __init__(self, job_id: str):
+        super().__init__(f"Job not found: {job_id}", status_code=404, code="JOB_NOT_FOUND")
+
+
+class JobNotReadyError(MetrixException):
+    """ジョブの結果がまだ取得できないエラー (409)"""
+    def __init__(self, job_id: str, status: str):
+        super().__init__(f"Job is not completed: {job_id} (status: {status})", status_code=409, code="JOB_NOT_READY")
+
+
+class RateNotAvailableError(MetrixException):
+    """指定日の為替レートがないエラー (400)"""
+    def __init__(self, message: str):
+        super().__init__(message, status_code=400, code="RATE_NOT_AVAILABLE")
+
+
+class RateHistoryUnavailableError(MetrixException):
+    """為替レートの履歴が設定されていない・読み込めないエラー (503)"""
+    def __init__(self, message: str = "Rate history is not configured"):
+        super().__init__(message, status_code=503, code="RATE_HISTORY_UNAVAILABLE")
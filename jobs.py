@@ -0,0 +1,376 @@
+"""
+非同期変換ジョブの管理
+
+大きな変換ジョブの入力・出力をローカルディスクにスプールし、上限付きの
+ワーカープールで既存の一括変換関数をチャンク単位で実行する。
+
+ジョブの状態はスプールディレクトリ内のJSONファイルに保存するため、
+同じディスクを共有する複数のuvicornワーカーから参照できる。
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import shutil
+import socket
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# ジョブの状態
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+INPUT_FILE = "input.txt"
+OUTPUT_FILE = "output.txt"
+META_FILE = "meta.json"
+
+
+def is_valid_job_id(job_id: str) -> bool:
+    """ジョブIDの形式（32桁の16進数）を検証する"""
+    return len(job_id) == 32 and all(c in "0123456789abcdef" for c in job_id)
+
+
+class JobInterruptedError(Exception):
+    """サーバーの停止により実行中のジョブを中断したことを表す例外"""
+
+
+class TextSpool:
+    """
+    アップロードされた1行1値のテキストを入力ファイルに追記する
+
+    チャンクの境界をまたぐ行を追跡し、空行を除いた行数（ジョブが変換する値の数）を数える。
+    ファイルへの書き込みを伴うため、イベントループ上ではなくスレッドで呼び出す。
+
+    Args:
+        path: 入力のスプールファイルのパス
+    """
+
+    def __init__(self, path: Path):
+        self._file = open(path, "ab")
+        self.size = 0
+        self.count = 0
+        # 改行がまだ来ていない行に空白以外の文字があるか
+        self._pending = False
+
+    def write(self, chunk: bytes) -> None:
+        """チャンクを書き出し、改行で終わった行を数える"""
+        self._file.write(chunk)
+        self.size += len(chunk)
+        *lines, tail = chunk.split(b"\n")
+        for line in lines:
+            if self._pending or line.strip():
+                self.count += 1
+            self._pending = False
+        self._pending = self._pending or bool(tail.strip())
+
+    def close(self) -> None:
+        """ファイルを閉じる（末尾に改行がない場合も最後の行を数える）"""
+        if self._file.closed:
+            return
+        if self._pending:
+            self._file.write(b"\n")
+            self.count += 1
+            self._pending = False
+        self._file.close()
+
+
+class JobManager:
+    """
+    変換ジョブのスプールと実行を管理する
+
+    入力は1行1値のテキストとしてスプールし、出力も同じ形式で書き出す。
+    """
+
+    def __init__(
+        self,
+        spool_dir: Path,
+        max_workers: int = 2,
+        chunk_size: int = 10000,
+        retention_seconds: float = 3600.0,
+    ):
+        self.spool_dir = Path(spool_dir)
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.retention_seconds = retention_seconds
+        self._executor: ThreadPoolExecutor | None = None
+        self._futures: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        # 実行中のプロセスの識別子（PIDが再利用された場合に前回のプロセスと区別する）
+        self._process_token = uuid.uuid4().hex
+
+    def create_job(self, category: str, from_unit: str, to_unit: str) -> str:
+        """
+        ジョブを作成し、スプールディレクトリを用意する
+
+        Returns:
+            str: ジョブID
+        """
+        job_id = uuid.uuid4().hex
+        job_dir = self.spool_dir / job_id
+        job_dir.mkdir(parents=True)
+        (job_dir / INPUT_FILE).touch()
+        self._write_meta(job_id, {
+            "job_id": job_id,
+            "status": STATUS_QUEUED,
+            "category": category,
+            "from_unit": from_unit,
+            "to_unit": to_unit,
+            "total": 0,
+            "processed": 0,
+            "created_at": time.time(),
+            "finished_at": None,
+            "error": None,
+            "owner": self._owner(),
+        })
+        return job_id
+
+    def delete_job(self, job_id: str) -> None:
+        """ジョブのファイルを削除する（受付を取りやめた場合）"""
+        shutil.rmtree(self.spool_dir / job_id, ignore_errors=True)
+
+    def _owner(self) -> dict:
+        """ジョブを実行するプロセスの情報"""
+        return {"host": socket.gethostname(), "pid": os.getpid(), "token": self._process_token}
+
+    def _is_orphaned(self, owner: dict | None) -> bool:
+        """
+        ジョブを実行していたプロセスが既に存在しないかどうか
+
+        別のホストのジョブは判定できないため対象外とする。
+        """
+        if not owner:
+            return True
+        if owner.get("host") != socket.gethostname():
+            return False
+        pid = owner.get("pid")
+        if pid == os.getpid():
+            return owner.get("token") != self._process_token
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except (PermissionError, TypeError, ValueError):
+            return False
+        return False
+
+    def input_path(self, job_id: str) -> Path:
+        """入力のスプールファイルのパス"""
+        return self.spool_dir / job_id / INPUT_FILE
+
+    def output_path(self, job_id: str) -> Path:
+        """出力ファイルのパス"""
+        return self.spool_dir / job_id / OUTPUT_FILE
+
+    def write_values(self, job_id: str, values: Iterable[float]) -> int:
+        """
+        値のリストを入力ファイルに書き出す
+
+        Returns:
+            int: 書き出した値の数
+        """
+        count = 0
+        with open(self.input_path(job_id), "a") as f:
+            for value in values:
+                f.write(f"{value!r}\n")
+                count += 1
+        return count
+
+    def get_job(self, job_id: str) -> dict | None:
+        """
+        ジョブの状態を取得する
+
+        Returns:
+            dict | None: ジョブのメタデータ（存在しない・期限切れの場合はNone）
+        """
+        if not is_valid_job_id(job_id):
+            return None
+        try:
+            with open(self.spool_dir / job_id / META_FILE) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if self._is_expired(meta, time.time()):
+            return None
+        return meta
+
+    def expires_at(self, meta: dict) -> float | None:
+        """完了したジョブの有効期限（未完了の場合はNone）"""
+        if meta["finished_at"] is None:
+            return None
+        return meta["finished_at"] + self.retention_seconds
+
+    def _is_expired(self, meta: dict, now: float) -> bool:
+        """保持期間を過ぎているかどうか"""
+        expires_at = self.expires_at(meta)
+        return expires_at is not None and now >= expires_at
+
+    def _write_meta(self, job_id: str, meta: dict) -> None:
+        """メタデータをアトミックに書き込む（読み手が書きかけの内容を見ないように）"""
+        path = self.spool_dir / job_id / META_FILE
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+
+    def _update_meta(self, job_id: str, **changes) -> dict:
+        """メタデータの一部を更新し、更新後のメタデータを返す"""
+        with open(self.spool_dir / job_id / META_FILE) as f:
+            meta = json.load(f)
+        meta.update(changes)
+        self._write_meta(job_id, meta)
+        return meta
+
+    def submit(self, job_id: str, total: int, convert_many: Callable[[list[float], str, str], list[float]]) -> None:
+        """
+        スプール済みのジョブをワーカープールに投入する
+
+        Args:
+            job_id: ジョブID
+            total: 入力値の数（進捗の計算に使用）
+            convert_many: カテゴリの一括変換関数
+        """
+        self._update_meta(job_id, total=total)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="metrix-job")
+            future = self._executor.submit(self._run, job_id, convert_many)
+            self._futures[job_id] = future
+        future.add_done_callback(lambda _: self._futures.pop(job_id, None))
+
+    def _run(self, job_id: str, convert_many: Callable[[list[float], str, str], list[float]]) -> None:
+        """ジョブをチャンク単位で実行する（ワーカースレッド上）"""
+        processed = 0
+        try:
+            meta = self._update_meta(job_id, status=STATUS_RUNNING)
+            from_unit, to_unit = meta["from_unit"], meta["to_unit"]
+            with open(self.input_path(job_id)) as src, open(self.output_path(job_id), "w") as dst:
+                chunk = []
+                for line_number, line in enumerate(src, start=1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    chunk.append(_parse_value(line, line_number))
+                    if len(chunk) >= self.chunk_size:
+                        processed += self._convert_chunk(dst, chunk, convert_many, from_unit, to_unit)
+                        self._update_meta(job_id, processed=processed)
+                        chunk = []
+                        if self._stopping.is_set():
+                            raise JobInterruptedError("Interrupted by server shutdown")
+                if chunk:
+                    processed += self._convert_chunk(dst, chunk, convert_many, from_unit, to_unit)
+            self._update_meta(job_id, status=STATUS_COMPLETED, processed=processed, finished_at=time.time())
+        except (OSError, ValueError, JobInterruptedError) as e:
+            logger.warning(f"Job {job_id} failed: {e}")
+            self._fail(job_id, str(e), processed=processed)
+        except Exception:
+            # 変換関数の想定外のエラーでも実行中のまま残さない（詳細はログのみに出力）
+            logger.exception(f"Job {job_id} failed")
+            self._fail(job_id, "Internal error during conversion", processed=processed)
+
+    def _fail(self, job_id: str, error: str, **changes) -> None:
+        """ジョブを失敗にする（メタデータを更新できない場合はログに出力する）"""
+        try:
+            self._update_meta(job_id, status=STATUS_FAILED, error=error, finished_at=time.time(), **changes)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to mark job {job_id} as failed: {e}")
+
+    @staticmethod
+    def _convert_chunk(dst, chunk: list[float], convert_many, from_unit: str, to_unit: str) -> int:
+        """1チャンク分を一括変換して出力ファイルに書き出す"""
+        results = convert_many(chunk, from_unit, to_unit)
+        dst.write("".join(f"{result!r}\n" for result in results))
+        return len(results)
+
+    def purge_expired(self) -> int:
+        """
+        保持期間を過ぎたジョブのファイルを削除する
+
+        Returns:
+            int: 削除したジョブの数
+        """
+        if not self.spool_dir.exists():
+            return 0
+        now = time.time()
+        removed = 0
+        for job_dir in self.spool_dir.iterdir():
+            try:
+                with open(job_dir / META_FILE) as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if self._is_expired(meta, now):
+                shutil.rmtree(job_dir, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def recover_orphaned(self) -> int:
+        """
+        前回のプロセスが異常終了し、待機中・実行中のまま残ったジョブを失敗にする
+
+        起動時に呼び出す。同じホストのジョブのうち、実行していたプロセスが存在しないものだけを
+        対象にする（スプールディレクトリを共有する他のワーカーのジョブには触れない）。
+
+        Returns:
+            int: 失敗にしたジョブの数
+        """
+        if not self.spool_dir.exists():
+            return 0
+        recovered = 0
+        for job_dir in self.spool_dir.iterdir():
+            try:
+                with open(job_dir / META_FILE) as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if meta.get("status") in (STATUS_QUEUED, STATUS_RUNNING) and self._is_orphaned(meta.get("owner")):
+                self._fail(job_dir.name, "Interrupted by server restart")
+                recovered += 1
+        return recovered
+
+    async def cleanup_loop(self, interval: float) -> None:
+        """一定間隔で保持期間を過ぎたジョブを削除し続ける（lifespanのタスクとして実行）"""
+        while True:
+            await asyncio.sleep(interval)
+            removed = await asyncio.to_thread(self.purge_expired)
+            if removed:
+                logger.info(f"Purged {removed} expired job(s)")
+
+    def shutdown(self) -> None:
+        """
+        ワーカープールを停止する
+
+        待機中のジョブは取り消し、実行中のジョブは次のチャンクの区切りで中断して、どちらも失敗にする。
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            futures, self._futures = self._futures, {}
+        if executor is None:
+            return
+        self._stopping.set()
+        for job_id, future in futures.items():
+            if future.cancel():
+                self._fail(job_id, "Cancelled by server shutdown")
+        executor.shutdown(wait=True)
+        self._stopping.clear()
+
+
+def _parse_value(line: str, line_number: int) -> float:
+    """入力の1行を数値として解析する"""
+    try:
+        value = float(line)
+    except ValueError:
+        raise ValueError(f"Invalid number at line {line_number}: {line[:50]}")
+    if not math.isfinite(value):
+        raise ValueError(f"Value must be a finite number at line {line_number}")
+    return value
@@ -0,0 +1,357 @@
+"""
+JSONオブジェクトの逐次解析
+
+リクエストボディ全体をメモリに読み込まずに、受信したチャンクごとにJSONオブジェクトを解析する。
+トップレベルのオブジェクトの配列（大量変換の values など）は要素数を数えながら組み立て、
+上限を超えた時点で解析を打ち切る。数値が続く部分はチャンク単位でまとめて json.loads に渡し、
+要素ごとのPythonの処理を避ける。チャンクの境界で切れた値（長い文字列・入れ子の値など）はチャンクを
+リストにためて続きだけを走査し、値が終わり得る文字が届いてから1回だけ解析する（解析の時間はボディの
+大きさに比例する）。解析結果は json.loads と同じになる。
+"""
+
+import codecs
+import json
+import re
+from typing import Any
+
+# 1回に解析するテキストの最大長（大きなチャンクを受け取っても作業用のコピーをこの大きさに抑える）
+_PIECE_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# 数値に含まれ得る文字の並び
+_NUMBER_CHARS = re.compile(r"[0-9.eE+\-]*")
+# カンマで終わる数値の並び（配列の途中の要素をまとめて解析する）
+_NUMBER_RUN = re.compile(r"(?:-?[0-9][0-9.eE+\-]*[ \t\n\r]*,[ \t\n\r]*)+")
+# 数値・リテラル（true, NaN など）に含まれ得る文字の並び
+_LITERAL_CHARS = re.compile(r"[0-9A-Za-z.+\-]*")
+# 文字列の中身（閉じる引用符、または末尾で切れたエスケープの直前まで）
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+# 入れ子の値の中で文字列・括弧以外の文字の並び
+_NESTED_BODY = re.compile(r'[^"\[\]{}]*')
+
+# 解析の状態
+_START = 0          # トップレベルの値の前
+_FIRST_KEY = 1      # "{" の直後（キーまたは "}"）
+_KEY = 2            # "," の直後（キー）
+_COLON = 3          # キーの後（":"）
+_VALUE = 4          # ":" の後（値）
+_FIRST_ITEM = 5     # "[" の直後（要素または "]"）
+_ITEM = 6           # 配列の "," の直後（要素）
+_NEXT_ITEM = 7      # 配列の要素の後（"," または "]"）
+_AFTER_VALUE = 8    # オブジェクトの値の後（"," または "}"）
+_END = 9            # トップレベルのオブジェクトの後（空白のみ）
+
+# 途中で切れた値の種類
+_PENDING_LITERAL = 0    # 数値・リテラル
+_PENDING_STRING = 1     # 文字列
+_PENDING_NESTED = 2     # 入れ子のオブジェクト・配列
+
+
+class JSONStreamError(ValueError):
+    """
+    JSONの構文エラー
+
+    Args:
+        message: エラーメッセージ
+        pos: エラーの位置（ボディの先頭からの文字数）
+    """
+
+    def __init__(self, message: str, pos: int):
+        super().__init__(f"{message}: char {pos}")
+        self.msg = message
+        self.pos = pos
+
+
+class ArrayTooLongError(ValueError):
+    """
+    配列の要素数が上限を超えたエラー
+
+    Args:
+        key: 配列のキー
+        max_length: 要素数の上限
+    """
+
+    def __init__(self, key: str, max_length: int):
+        super().__init__(f"Array '{key}' has more than {max_length} items")
+        self.key = key
+        self.max_length = max_length
+
+
+class IncrementalObjectParser:
+    """
+    チャンク単位でJSONオブジェクトを解析するパーサー
+
+    feed() でボディのチャンクを渡し、close() で解析結果を受け取る。トップレベルが
+    オブジェクトでない場合は残りのボディをまとめて json.loads で解析する。
+
+    Args:
+        max_array_length: トップレベルのオブジェクトの配列の要素数の上限（Noneの場合は無制限）
+    """
+
+    def __init__(self, max_array_length: int | None = None):
+        self.max_array_length = max_array_length
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._scanner = json.JSONDecoder()
+        # チャンクの境界で切れた値のテキスト（値が終わり得る文字が届くまでためる）
+        self._pending: list[str] = []
+        self._pending_kind = _PENDING_LITERAL
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        # 解析中のテキストの先頭のボディ内での位置（エラーの位置の計算用）
+        self._offset = 0
+        self._state = _START
+        self._result: dict[str, Any] = {}
+        self._key: str | None = None
+        self._array: list | None = None
+        # トップレベルがオブジェクトでない場合の残りのボディ
+        self._raw: list[str] | None = None
+
+    def feed(self, data: bytes) -> None:
+        """
+        ボディのチャンクを解析する
+
+        Args:
+            data: 受信したチャンク
+
+        Raises:
+            JSONStreamError: JSONとして不正な場合
+            ArrayTooLongError: 配列の要素数が上限を超えた場合
+        """
+        for start in range(0, len(data), _PIECE_SIZE):
+            self._feed_text(self._decode(data[start:start + _PIECE_SIZE]), final=False)
+
+    def close(self) -> Any:
+        """
+        残りのボディを解析して結果を返す
+
+        Returns:
+            Any: 解析結果（json.loads と同じ）
+
+        Raises:
+            JSONStreamError: JSONとして不正な場合（途中で終わっている場合を含む）
+            ArrayTooLongError: 配列の要素数が上限を超えた場合
+        """
+        self._feed_text(self._decode(b"", final=True), final=True)
+        if self._raw is not None:
+            try:
+                return json.loads("".join(self._raw))
+            except json.JSONDecodeError as e:
+                raise JSONStreamError(e.msg, self._offset + e.pos) from None
+        if self._state != _END:
+            raise JSONStreamError("Expecting value", self._offset)
+        return self._result
+
+    def _decode(self, data: bytes, final: bool = False) -> str:
+        try:
+            return self._decoder.decode(data, final)
+        except UnicodeDecodeError:
+            pending = sum(len(text) for text in self._pending)
+            raise JSONStreamError("Invalid UTF-8", self._offset + pending) from None
+
+    def _feed_text(self, text: str, final: bool) -> None:
+        if self._raw is not None:
+            self._raw.append(text)
+            return
+        resumed = bool(self._pending)
+        if resumed:
+            # 途中で切れた値の続き: 値が終わり得る文字が届くまでは解析しない
+            self._pending.append(text)
+            if not self._scan(text) and not final:
+                return
+            buffer = "".join(self._pending)
+            self._pending = []
+        else:
+            buffer = text
+        pos = self._parse(buffer, final, resumed)
+        if self._raw is None and pos < len(buffer):
+            rest = buffer[pos:]
+            self._start_pending(rest)
+            if self._scan(rest, 1 if self._pending_kind == _PENDING_STRING else 0):
+                # 値は終わっているのに解析できない場合は不正なJSON
+                self._token(buffer, pos, final=True)
+            # 解析済みの部分は破棄し、途中で切れた値だけを残す
+            self._pending = [rest]
+        self._offset += pos
+        if self._raw is not None:
+            self._raw.append(buffer[pos:])
+
+    def _start_pending(self, rest: str) -> None:
+        """途中で切れた値の走査の状態を初期化する"""
+        char = rest[0]
+        if char == '"':
+            self._pending_kind = _PENDING_STRING
+            self._in_string = True
+        elif char == "{" or char == "[":
+            self._pending_kind = _PENDING_NESTED
+            self._in_string = False
+        else:
+            self._pending_kind = _PENDING_LITERAL
+        self._depth = 0
+        self._escape = False
+
+    def _scan(self, text: str, pos: int = 0) -> bool:
+        """
+        途中で切れた値の続きのテキストを走査する（走査の状態は次のチャンクに引き継ぐ）
+
+        Returns:
+            bool: 値が終わり得る文字（閉じる引用符・括弧、数値・リテラルの後の区切りなど）が届いた場合はTrue
+        """
+        if self._pending_kind == _PENDING_LITERAL:
+            return _LITERAL_CHARS.match(text, pos).end() < len(text)
+        end = len(text)
+        while pos < end:
+            if self._escape:
+                self._escape = False
+                pos += 1
+            elif self._in_string:
+                pos = _STRING_BODY.match(text, pos).end()
+                if pos == end:
+                    break
+                if text[pos] == "\\":
+                    # チャンクの末尾で切れたエスケープ
+                    self._escape = True
+                else:
+                    self._in_string = False
+                    if self._pending_kind == _PENDING_STRING:
+                        return True
+                pos += 1
+            else:
+                pos = _NESTED_BODY.match(text, pos).end()
+                if pos == end:
+                    break
+                char = text[pos]
+                if char == '"':
+                    self._in_string = True
+                elif char == "[" or char == "{":
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        return True
+                pos += 1
+        return False
+
+    def _parse(self, buffer: str, final: bool, resumed: bool = False) -> int:
+        """
+        テキストを解析できるところまで解析し、次に解析する位置を返す
+
+        Args:
+            buffer: 解析するテキスト
+            final: ボディの末尾まで届いている場合はTrue
+            resumed: 先頭が途中で切れていた値で、その値が終わり得る文字まで届いている場合はTrue
+        """
+        pos = 0
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                return pos
+            state = self._state
+            char = buffer[pos]
+
+            if state == _START:
+                if char != "{":
+                    # オブジェクト以外は残りをまとめて解析する（モデルの検証でエラーになる）
+                    self._raw = []
+                    return pos
+                self._state = _FIRST_KEY
+                pos += 1
+            elif state == _FIRST_KEY or state == _KEY:
+                if char == "}" and state == _FIRST_KEY:
+                    self._state = _END
+                    pos += 1
+                    continue
+                if char != '"':
+                    raise JSONStreamError("Expecting property name enclosed in double quotes", self._offset + pos)
+                token = self._token(buffer, pos, final or (resumed and pos == 0))
+                if token is None:
+                    return pos
+                self._key, pos = token
+                self._state = _COLON
+            elif state == _COLON:
+                if char != ":":
+                    raise JSONStreamError("Expecting ':' delimiter", self._offset + pos)
+                self._state = _VALUE
+                pos += 1
+            elif state == _VALUE:
+                if char == "[":
+                    self._array = []
+                    self._result[self._key] = self._array
+                    self._state = _FIRST_ITEM
+                    pos += 1
+                    continue
+                token = self._token(buffer, pos, final or (resumed and pos == 0))
+                if token is None:
+                    return pos
+                self._result[self._key], pos = token
+                self._state = _AFTER_VALUE
+            elif state == _FIRST_ITEM or state == _ITEM:
+                if char == "]" and state == _FIRST_ITEM:
+                    self._state = _AFTER_VALUE
+                    pos += 1
+                    continue
+                # 数値が続く部分はまとめて解析する（最後の要素は区切りが届くまで待つ）
+                match = _NUMBER_RUN.match(buffer, pos)
+                if match is not None:
+                    run = buffer[pos:match.end()].rstrip(" \t\n\r")
+                    try:
+                        items = json.loads("[" + run[:-1] + "]")
+                    except json.JSONDecodeError as e:
+                        raise JSONStreamError(e.msg, self._offset + pos + e.pos - 1) from None
+                    self._extend(items)
+                    self._state = _ITEM
+                    pos = match.end()
+                    continue
+                token = self._token(buffer, pos, final or (resumed and pos == 0))
+                if token is None:
+                    return pos
+                item, pos = token
+                self._extend([item])
+                self._state = _NEXT_ITEM
+            elif state == _NEXT_ITEM:
+                if char == ",":
+                    self._state = _ITEM
+                elif char == "]":
+                    self._state = _AFTER_VALUE
+                else:
+                    raise JSONStreamError("Expecting ',' delimiter", self._offset + pos)
+                pos += 1
+            elif state == _AFTER_VALUE:
+                if char == ",":
+                    self._state = _KEY
+                elif char == "}":
+                    self._state = _END
+                else:
+                    raise JSONStreamError("Expecting ',' delimiter", self._offset + pos)
+                pos += 1
+            else:
+                raise JSONStreamError("Extra data", self._offset + pos)
+
+    def _token(self, buffer: str, pos: int, final: bool) -> tuple[Any, int] | None:
+        """
+        1つの値（文字列・数値・リテラル・入れ子の値）を解析する
+
+        Args:
+            buffer: 解析するテキスト
+            pos: 値の先頭の位置
+            final: 値の続きが届かない場合はTrue（解析できなければエラーにする）
+
+        Returns:
+            tuple[Any, int] | None: (値, 値の直後の位置)（値が途中で切れている可能性がある場合はNone）
+        """
+        try:
+            value, end = self._scanner.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            if final:
+                raise JSONStreamError(e.msg, self._offset + e.pos) from None
+            return None
+        # 数値はバッファの末尾で切れている可能性がある（"3" の後に "e2" が届くなど）ため、
+        # 数値以外の文字が届くまで待つ
+        if not final and _NUMBER_CHARS.match(buffer, end).end() == len(buffer):
+            return None
+        return value, end
+
+    def _extend(self, items: list) -> None:
+        if self.max_array_length is not None and len(self._array) + len(items) > self.max_array_length:
+            raise ArrayTooLongError(self._key, self.max_array_length)
+        self._array.extend(items)
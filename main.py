@@ -3,18 +3,32 @@ metrix - Unit Conversion Web Application
 FastAPI application entry point
 """
 
+import asyncio
+import hashlib
 import logging
+import os
 import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError as PydanticValidationError
 
-from routers import convert
+import access_log
+import config
+from converters import CATEGORY_CONFIG, reload_catalog
+from converters.catalog import watch_catalog
+from converters.currency import FileRateProvider, FixtureRateProvider, RateError, refresh_currency_rates, refresh_loop
+from converters.rate_history import RateHistoryError
+from routers import convert, rates, tables
 from exceptions import MetrixException
+from middleware import WARMUP_SCOPE_KEY
+from middleware.compression import CompressionMiddleware
+from middleware.fast_lane import FastLaneMiddleware
+from middleware.load_shed import AdaptiveConcurrencyLimiter, EventLoopLagMonitor, LoadSheddingMiddleware
+from middleware.rate_limit import RateLimitMiddleware
+from warmup import warm_up
 
 # ロギング設定
 logging.basicConfig(
@@ -23,27 +37,133 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 負荷制御（イベントループのラグに応じて同時処理数の上限を調整）
+concurrency_limiter = AdaptiveConcurrencyLimiter(
+    initial_limit=config.LOAD_SHED_INITIAL_LIMIT,
+    min_limit=config.LOAD_SHED_MIN_LIMIT,
+    max_limit=config.LOAD_SHED_MAX_LIMIT,
+    target_lag=config.LOAD_SHED_TARGET_LAG,
+)
+lag_monitor = EventLoopLagMonitor(concurrency_limiter, interval=config.LOAD_SHED_SAMPLE_INTERVAL)
+
+# バイナリ形式のアクセスログ（オプトイン、集計ツールの依存モジュールは読み込まない）
+access_log_writer = (
+    access_log.AccessLogWriter(
+        config.ACCESS_LOG_DIR,
+        max_bytes=config.ACCESS_LOG_MAX_BYTES,
+        buffer_size=config.ACCESS_LOG_BUFFER_SIZE,
+        flush_interval=config.ACCESS_LOG_FLUSH_INTERVAL,
+    )
+    if config.ACCESS_LOG_DIR else None
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """起動時にウォームアップを行い、完了後にreadyにする"""
+    app.state.ready = False
+    # アクセスログのディレクトリを確認する（書き込めない場合は起動を中止する）
+    if access_log_writer is not None:
+        try:
+            access_log_writer.prepare()
+        except OSError as e:
+            logger.error(f"Invalid METRIX_ACCESS_LOG_DIR: {e}")
+            raise
+    # 為替レートの履歴を開く（設定されているのに読み込めない場合は起動を中止する）
+    try:
+        await asyncio.to_thread(rates.get_rate_history)
+    except (OSError, RateHistoryError) as e:
+        logger.error(f"Failed to open rate history at {config.RATE_HISTORY_PATH}: {e}")
+        raise
+    lag_monitor.start()
+    jobs_cleanup_task = None
+    if config.JOBS_ENABLED:
+        # 前回のプロセスが異常終了して実行中のまま残ったジョブを失敗にする
+        orphaned = await asyncio.to_thread(jobs.job_manager.recover_orphaned)
+        if orphaned:
+            logger.warning(f"Marked {orphaned} interrupted job(s) as failed")
+        jobs_cleanup_task = asyncio.create_task(jobs.job_manager.cleanup_loop(config.JOBS_CLEANUP_INTERVAL))
+    # 単位カタログをコンパイルし、変更を監視する
+    reload_catalog(config.CATALOG_PATH)
+    catalog_stop = asyncio.Event()
+    catalog_task = (
+        asyncio.create_task(watch_catalog(CATEGORY_CONFIG.catalog_path, reload_catalog, catalog_stop))
+        if config.CATALOG_RELOAD else None
+    )
+    # 為替レートを読み込み、一定間隔で更新する（失敗した場合は現在のレートを使い続ける）
+    rates_provider = (
+        FileRateProvider(config.CURRENCY_RATES_PATH) if config.CURRENCY_RATES_PATH else FixtureRateProvider()
+    )
+    if not config.CURRENCY_RATES_PATH:
+        logger.warning(
+            "METRIX_CURRENCY_RATES_PATH is not set; currency conversions use fixed offline rates (rate_source=fixture)"
+        )
+    try:
+        await asyncio.to_thread(refresh_currency_rates, rates_provider)
+    except (OSError, RateError) as e:
+        logger.error(f"Failed to load currency rates: {e}")
+    rates_stop = asyncio.Event()
+    rates_task = (
+        asyncio.create_task(refresh_loop(rates_provider, config.CURRENCY_REFRESH_INTERVAL, rates_stop))
+        if config.CURRENCY_RATES_PATH and config.CURRENCY_REFRESH_INTERVAL > 0 else None
+    )
+    if not config.API_ONLY:
+        get_templates().get_template("index.html")
+    await warm_up(app)
+    app.state.ready = True
+    yield
+    app.state.ready = False
+    await lag_monitor.stop()
+    if jobs_cleanup_task is not None:
+        jobs_cleanup_task.cancel()
+    if catalog_task is not None:
+        # 監視スレッドが終了するのを待つ（キャンセルだけではプロセス終了時にスレッドが残る）
+        catalog_stop.set()
+        await asyncio.wait_for(catalog_task, timeout=5)
+    if rates_task is not None:
+        rates_stop.set()
+        await asyncio.wait_for(rates_task, timeout=5)
+    convert.offloader.shutdown()
+    if config.JOBS_ENABLED:
+        jobs.job_manager.shutdown()
+    if access_log_writer is not None:
+        access_log_writer.close()
+
+
 app = FastAPI(
     title="metrix",
     description="Simple unit conversion web application",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
+app.state.ready = False
 
 # CORS設定
-app.add_middleware(
-    CORSMiddleware,
+CORS_OPTIONS = dict(
     allow_origins=["*"],  # 本番環境では特定のオリジンのみ許可すること
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CORSMiddleware, **CORS_OPTIONS)
+
+# レスポンス圧縮（閾値以上のAPIレスポンスのみ）
+COMPRESSION_OPTIONS = dict(
+    minimum_size=config.COMPRESSION_MIN_SIZE,
+    gzip_level=config.COMPRESSION_GZIP_LEVEL,
+    zstd_level=config.COMPRESSION_ZSTD_LEVEL,
+)
+if config.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, **COMPRESSION_OPTIONS)
 
 
 # リクエスト・レスポンスのログ出力ミドルウェア
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """リクエストとレスポンスをログ出力"""
+    """リクエストとレスポンスをログ出力（アクセスログが有効な場合はバイナリ形式でも記録、ウォームアップは除く）"""
     start_time = time.time()
+    writer = access_log_writer if not request.scope.get(WARMUP_SCOPE_KEY) else None
+    annotations = access_log.begin_request() if writer is not None else None
 
     # リクエストログ
     logger.info(f"Request: {request.method} {request.url.path}")
@@ -58,10 +178,60 @@ async def log_requests(request: Request, call_next):
         f"Status: {response.status_code} "
         f"Duration: {process_time:.3f}s"
     )
+    if writer is not None:
+        # パスはパラメーターを含まないルートのテンプレートで記録する（/api/units/{category} など）
+        route = request.scope.get("route")
+        writer.write(
+            f"{request.method} {route.path}" if route is not None else access_log.UNMATCHED_ROUTE,
+            response.status_code,
+            process_time,
+            timestamp=start_time,
+            **annotations,
+        )
 
     return response
 
 
+def wrap_fast_lane_response(inner):
+    """高速レーン・レート制限・負荷制御が直接返すレスポンスに通常の経路と同じCORS・圧縮の処理を適用する"""
+    inner = CORSMiddleware(inner, **CORS_OPTIONS)
+    if config.COMPRESSION_ENABLED:
+        inner = CompressionMiddleware(inner, **COMPRESSION_OPTIONS)
+    return inner
+
+
+# 変換・単位一覧のリクエストをFastAPIのルーティングを通さずに処理（オプトイン、負荷制御・レート制限の内側）
+if config.FAST_LANE:
+    app.add_middleware(FastLaneMiddleware, wrap=wrap_fast_lane_response, access_log_writer=access_log_writer)
+
+
+# 同時処理数の上限を超えたリクエストを即座に拒否（ヘルスチェック系は対象外）
+if config.LOAD_SHED_ENABLED:
+    app.add_middleware(
+        LoadSheddingMiddleware,
+        limiter=concurrency_limiter,
+        exempt_paths=("/health", "/ready", "/metrics"),
+        access_log_writer=access_log_writer,
+        routes=app.routes,
+        wrap=wrap_fast_lane_response,
+    )
+
+
+# クライアントごとのレート制限（最も外側で判定し、超過したリクエストには処理コストをかけない）
+if config.RATE_LIMIT_RATE > 0:
+    app.add_middleware(
+        RateLimitMiddleware,
+        rate=config.RATE_LIMIT_RATE,
+        burst=config.RATE_LIMIT_BURST,
+        max_clients=config.RATE_LIMIT_MAX_CLIENTS,
+        idle_ttl=config.RATE_LIMIT_IDLE_TTL,
+        api_keys=config.RATE_LIMIT_API_KEYS,
+        access_log_writer=access_log_writer,
+        routes=app.routes,
+        wrap=wrap_fast_lane_response,
+    )
+
+
 # カスタム例外ハンドラー
 @app.exception_handler(MetrixException)
 async def metrix_exception_handler(request: Request, exc: MetrixException):
@@ -69,7 +239,8 @@ async def metrix_exception_handler(request: Request, exc: MetrixException):
     logger.error(f"MetrixException: {exc.message} (status: {exc.status_code})")
     return JSONResponse(
         status_code=exc.status_code,
-        content={"success": False, "error": exc.message}
+        content=exc.to_dict(),
+        headers=exc.headers
     )
 
 
@@ -88,7 +259,7 @@ async def request_validation_exception_handler(request: Request, exc: RequestVal
 
     return JSONResponse(
         status_code=400,
-        content={"success": False, "error": error_detail}
+        content={"success": False, "error": error_detail, "code": "VALIDATION_ERROR"}
     )
 
 
@@ -107,7 +278,7 @@ async def validation_exception_handler(request: Request, exc: PydanticValidation
 
     return JSONResponse(
         status_code=400,
-        content={"success": False, "error": error_detail}
+        content={"success": False, "error": error_detail, "code": "VALIDATION_ERROR"}
     )
 
 
@@ -117,27 +288,131 @@ async def general_exception_handler(request: Request, exc: Exception):
     logger.error(f"Unexpected error: {str(exc)}", exc_info=True)
     return JSONResponse(
         status_code=500,
-        content={"success": False, "error": "Internal server error"}
+        content={"success": False, "error": "Internal server error", "code": "INTERNAL_ERROR"}
     )
 
 
 # Include routers
 app.include_router(convert.router)
+app.include_router(rates.router)
+app.include_router(tables.router)
+
+# 非同期変換ジョブ（無効な場合はジョブ関連のモジュールを読み込まない）
+if config.JOBS_ENABLED:
+    from routers import jobs
+
+    app.include_router(jobs.router)
+
+# UI（API専用モードではUI関連のモジュールを一切読み込まない）
+if not config.API_ONLY:
+    from fastapi.staticfiles import StaticFiles
+
+    # Mount static files
+    app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+    # Jinja2テンプレートは初回アクセス時に読み込む
+    _templates = None
 
-# Setup templates
-templates = Jinja2Templates(directory="templates")
+    def get_templates():
+        """Jinja2テンプレートを取得（初回呼び出し時に生成）"""
+        global _templates
+        if _templates is None:
+            from fastapi.templating import Jinja2Templates
+            _templates = Jinja2Templates(directory="templates")
+        return _templates
 
+    @app.get("/", response_class=HTMLResponse)
+    async def root(request: Request):
+        """Render the main UI page"""
+        return get_templates().TemplateResponse(request, "index.html")
 
-@app.get("/", response_class=HTMLResponse)
-async def root(request: Request):
-    """Render the main UI page"""
-    return templates.TemplateResponse("index.html", {"request": request})
+    # キャッシュのバージョン（初回アクセス時に求める）
+    _asset_version = None
+
+    def get_asset_version() -> str:
+        """
+        Service Workerのキャッシュのバージョンを取得
+
+        METRIX_ASSET_VERSION（デプロイのIDなど）が未設定の場合は、静的ファイルと
+        メイン画面のテンプレートの内容のハッシュを使う（変更をデプロイするとバージョンが変わる）
+
+        Returns:
+            str: バージョン
+        """
+        global _asset_version
+        if _asset_version is None:
+            if config.ASSET_VERSION:
+                _asset_version = config.ASSET_VERSION
+            else:
+                digest = hashlib.sha256()
+                for path in [*_static_files(), os.path.join("templates", "index.html")]:
+                    digest.update(path.encode())
+                    with open(path, "rb") as f:
+                        digest.update(f.read())
+                _asset_version = digest.hexdigest()[:12]
+        return _asset_version
+
+    def _static_files() -> list[str]:
+        """static ディレクトリ内のファイルのパス（ソート済み）"""
+        return sorted(
+            os.path.join(directory, name)
+            for directory, _, names in os.walk("static")
+            for name in names
+        )
+
+    @app.get("/sw.js", include_in_schema=False)
+    async def service_worker(request: Request):
+        """Service Worker（スコープをサイト全体にするためルートから配信する）"""
+        precache_urls = ["/", *("/" + path.replace(os.sep, "/") for path in _static_files())]
+        return get_templates().TemplateResponse(
+            request,
+            "sw.js",
+            {"cache_version": get_asset_version(), "precache_urls": precache_urls},
+            headers={"Cache-Control": "no-cache"},
+            media_type="application/javascript",
+        )
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe (ウォームアップ完了後に200を返す)"""
+    if not app.state.ready:
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "ready"}
+
+
+@app.get("/metrics")
+async def metrics():
+    """監視用メトリクス（イベントループのラグ・同時処理数の上限・コアレッサー・換算表キャッシュ・アクセスログ・オフロードの統計）"""
+    return {
+        "event_loop_lag_ms": round(lag_monitor.lag * 1000, 3),
+        "concurrency_limit": int(concurrency_limiter.limit),
+        "in_flight": concurrency_limiter.in_flight,
+        "shed_total": concurrency_limiter.shed_total,
+        "coalescer": None if convert.coalescer is None else {
+            "requests_total": convert.coalescer.requests_total,
+            "batches_total": convert.coalescer.batches_total,
+        },
+        "table_cache": {
+            "entries": len(tables.table_cache),
+            "hits": tables.table_cache.hits,
+            "misses": tables.table_cache.misses,
+        },
+        "access_log": None if access_log_writer is None else {
+            "records_total": access_log_writer.records_total,
+            "dropped_total": access_log_writer.dropped_total,
+        },
+        "offload": {
+            "offloaded_total": convert.offloader.offloaded_total,
+            "inline_total": convert.offloader.inline_total,
+            "queue_depth": convert.offloader.queue_depth,
+            "rejected_total": convert.offloader.rejected_total,
+            "active": convert.offloader.active,
+        },
+    }
@@ -0,0 +1,26 @@
+"""
+metrix 単位変換ライブラリ
+
+Webフレームワークに依存しないコアAPI（converters パッケージ）の公開窓口
+
+使用例:
+    import metrix
+
+    metrix.convert(1.0, "km", "m")                  # 1000.0
+    metrix.convert([1, 2], "kg", "lb")              # [2.2046..., 4.4092...]
+    metrix.convert(25, "celsius", "fahrenheit", category="temperature")
+    metrix.convert(3, "miles", "kilometers")        # 別名でも指定できる
+    metrix.best_unit(0.000342, "km")                # ("cm", 34.2)
+"""
+
+from converters import CATEGORY_CONFIG, best_unit, categories, convert, find_category, get_units, resolve_unit
+
+__all__ = [
+    "CATEGORY_CONFIG",
+    "best_unit",
+    "categories",
+    "convert",
+    "find_category",
+    "get_units",
+    "resolve_unit",
+]
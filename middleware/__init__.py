@@ -0,0 +1,52 @@
+# Middleware module for ASGI request/response processing
+
+from collections.abc import Callable
+
+from starlette.responses import Response
+from starlette.routing import Match
+
+import access_log
+
+# 起動時のウォームアップのリクエストを示すスコープのキー（レート制限・負荷制御の対象外）
+WARMUP_SCOPE_KEY = "metrix.warmup"
+
+# 拒否のレスポンスを内側のアプリに渡すスコープのキー
+_REJECTION_SCOPE_KEY = "metrix.rejection"
+
+
+def route_template(routes, scope) -> str:
+    """
+    ルーティングの前に拒否したリクエストのルートを、通常の経路と同じテンプレートの形式で求める
+
+    Args:
+        routes: アプリケーションのルート（app.routes）
+        scope: ASGIスコープ
+
+    Returns:
+        "POST /api/convert" などのルート（一致するルートがない場合は access_log.UNMATCHED_ROUTE）
+    """
+    for route in routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return f"{scope['method']} {route.path}"
+    return access_log.UNMATCHED_ROUTE
+
+
+class RejectionSender:
+    """
+    ルーティングの前に拒否したリクエストのレスポンスを、通常の経路と同じミドルウェア（CORS・圧縮など）を
+    通して送信する（最も外側のミドルウェアが返すエラーもブラウザーから読めるようにする）
+
+    Args:
+        wrap: レスポンスに適用するミドルウェア（Noneの場合はそのまま送信する）
+    """
+
+    def __init__(self, wrap: Callable | None = None):
+        self._app = (wrap or (lambda inner: inner))(self._send_response)
+
+    async def __call__(self, scope, receive, send, response: Response) -> None:
+        await self._app({**scope, _REJECTION_SCOPE_KEY: response}, receive, send)
+
+    @staticmethod
+    async def _send_response(scope, receive, send) -> None:
+        await scope[_REJECTION_SCOPE_KEY](scope, receive, send)
@@ -0,0 +1,208 @@
+"""
+レスポンス圧縮ミドルウェア
+
+APIレスポンスを閾値以上のサイズの場合のみ gzip / zstd でストリーミング圧縮する。
+圧縮の有無はクライアントの Accept-Encoding によって変わるため、APIのレスポンスには常に
+Vary: Accept-Encoding を付ける（共有キャッシュが圧縮済みのレスポンスを非対応のクライアントに返さないようにする）。
+"""
+
+import importlib.util
+import zlib
+
+
+def _find_zstd_backend() -> str | None:
+    """利用可能なzstd実装を探す（モジュールはまだ読み込まない）"""
+    try:
+        # Python 3.14+ の標準ライブラリ
+        if importlib.util.find_spec("compression.zstd") is not None:
+            return "compression.zstd"
+    except ModuleNotFoundError:
+        pass
+    if importlib.util.find_spec("zstandard") is not None:
+        return "zstandard"
+    return None
+
+
+_ZSTD_BACKEND = _find_zstd_backend()
+ZSTD_AVAILABLE = _ZSTD_BACKEND is not None
+
+
+def _new_zstd_compressor(level: int):
+    """
+    zstdのストリーミング圧縮器を生成する（初回利用時にモジュールを読み込む）
+
+    Returns:
+        tuple: (圧縮器, それまでの入力をブロック単位で書き出す flush() の引数)
+    """
+    if _ZSTD_BACKEND == "compression.zstd":
+        from compression import zstd
+        return zstd.ZstdCompressor(level=level), zstd.ZstdCompressor.FLUSH_BLOCK
+    import zstandard
+    return zstandard.ZstdCompressor(level=level).compressobj(), zstandard.COMPRESSOBJ_FLUSH_BLOCK
+
+
+def _add_vary(headers: list, value: bytes = b"Accept-Encoding") -> list:
+    """ヘッダーの Vary に値を追加する（既に含まれている場合はそのまま）"""
+    result = []
+    vary = None
+    for name, existing in headers:
+        if name == b"vary":
+            vary = existing
+            continue
+        result.append((name, existing))
+    if vary is None:
+        vary = value
+    elif value.lower() not in [item.strip().lower() for item in vary.split(b",")]:
+        vary = vary + b", " + value
+    result.append((b"vary", vary))
+    return result
+
+
+def _parse_accept_encoding(value: str) -> dict[str, float]:
+    """
+    Accept-Encodingヘッダーを解析する
+
+    Args:
+        value: ヘッダー値 (例: "gzip, zstd;q=0.9")
+
+    Returns:
+        dict[str, float]: エンコーディング名から品質値へのマッピング
+    """
+    encodings = {}
+    for item in value.split(","):
+        parts = item.strip().split(";")
+        name = parts[0].strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in parts[1:]:
+            key, _, raw = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(raw)
+                except ValueError:
+                    quality = 0.0
+        encodings[name] = quality
+    return encodings
+
+
+class CompressionMiddleware:
+    """
+    閾値ベースのレスポンス圧縮を行うASGIミドルウェア
+
+    レスポンス全体をバッファせず、本文のチャンクごとに圧縮して送信する（ストリーミングの
+    レスポンスはチャンクごとに圧縮器をフラッシュし、届いた分をすぐにクライアントに送る）。
+    閾値未満の単一チャンクのレスポンス（通常の単一変換など）は圧縮しない。
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+        path_prefix: str = "/api",
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._select_encoding(scope)
+        responder = _CompressionResponder(send, encoding, self)
+        await self.app(scope, receive, responder.send)
+
+    def _select_encoding(self, scope) -> str | None:
+        """クライアントが受け入れ可能なエンコーディングを選択する（zstd優先）"""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accepted = _parse_accept_encoding(value.decode("latin-1"))
+                break
+        else:
+            return None
+
+        if ZSTD_AVAILABLE and accepted.get("zstd", 0) > 0:
+            return "zstd"
+        if accepted.get("gzip", 0) > 0:
+            return "gzip"
+        return None
+
+    def new_compressor(self, encoding: str):
+        """
+        エンコーディングに対応するストリーミング圧縮器を生成する
+
+        Returns:
+            tuple: (圧縮器, チャンクごとのフラッシュに使う flush() の引数)
+        """
+        if encoding == "zstd":
+            return _new_zstd_compressor(self.zstd_level)
+        return zlib.compressobj(self.gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16), zlib.Z_SYNC_FLUSH
+
+
+class _CompressionResponder:
+    """1リクエスト分のレスポンス送信を仲介し、必要に応じて圧縮する（encoding がNoneの場合は Vary の追加のみ）"""
+
+    def __init__(self, send, encoding: str | None, middleware: CompressionMiddleware):
+        self._send = send
+        self._encoding = encoding
+        self._middleware = middleware
+        self._start_message = None
+        self._compressor = None
+        self._flush_mode = None
+        self._passthrough = encoding is None
+
+    async def send(self, message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            headers = message.get("headers", [])
+            for name, value in headers:
+                if name == b"content-encoding":
+                    self._passthrough = True
+                elif name == b"content-length" and int(value) < self._middleware.minimum_size:
+                    self._passthrough = True
+            self._start_message = {**message, "headers": _add_vary(list(headers))}
+            if self._passthrough:
+                await self._send(self._start_message)
+            return
+
+        if message_type != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._compressor is None:
+            if not more_body and len(body) < self._middleware.minimum_size:
+                # 小さなレスポンスは圧縮コストの方が大きいためそのまま送信
+                self._passthrough = True
+                await self._send(self._start_message)
+                await self._send(message)
+                return
+            await self._start_compression()
+
+        if not body and more_body:
+            return
+        chunk = self._compressor.compress(body) if body else b""
+        if more_body:
+            # ストリーミングのレスポンスは届いたチャンクをバッファせずにクライアントへ送る
+            chunk += self._compressor.flush(self._flush_mode)
+        else:
+            chunk += self._compressor.flush()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _start_compression(self):
+        """圧縮用にヘッダーを書き換えてレスポンスを開始する"""
+        self._compressor, self._flush_mode = self._middleware.new_compressor(self._encoding)
+        headers = [
+            (name, value) for name, value in self._start_message["headers"] if name != b"content-length"
+        ]
+        headers.append((b"content-encoding", self._encoding.encode("latin-1")))
+        await self._send({**self._start_message, "headers": headers})
@@ -0,0 +1,227 @@
+"""
+高速レーンミドルウェア
+
+最も呼び出しの多い POST /api/convert と GET /api/units/{category} を、FastAPIの
+ルーティング・依存関係の解決・Pydanticの検証・BaseHTTPMiddlewareを通さずに処理する。
+ステータスコード・レスポンスボディ・ヘッダーは通常の経路と同じにする（JSONは
+JSONResponseと同じ設定でエンコードし、CORS・圧縮は同じミドルウェアを通す）。
+正常系と無効な単位・カテゴリ以外（検証エラー・変換先 auto・想定外の例外など）はすべて通常の経路で処理する。
+"""
+
+import json
+import logging
+import math
+import time
+from collections.abc import Callable
+from functools import partial
+
+import access_log
+from converters import CATEGORY_CONFIG
+from converters.best_unit import is_auto_unit
+from exceptions import CategoryNotFoundError, InvalidUnitError
+from middleware import WARMUP_SCOPE_KEY
+from routers import convert
+
+logger = logging.getLogger(__name__)
+
+CONVERT_PATH = "/api/convert"
+UNITS_PREFIX = "/api/units/"
+
+# アクセスログに記録するルート（通常の経路のルートのテンプレートと同じ）
+CONVERT_ROUTE = "POST /api/convert"
+UNITS_ROUTE = "GET /api/units/{category}"
+
+# これより大きいボディは読み込みを打ち切り、通常の経路で処理する
+MAX_BODY_SIZE = 16 * 1024
+
+# 高速レーンで生成したレスポンスを内側のアプリに渡すスコープのキー
+_SCOPE_KEY = "metrix.fast_lane"
+
+
+def _render(content: dict) -> bytes:
+    """JSONResponseと同じ設定でJSONにエンコードする"""
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _is_json(scope) -> bool:
+    """Content-Typeが application/json かどうかを返す"""
+    for name, value in scope["headers"]:
+        if name == b"content-type":
+            return value.split(b";", 1)[0].strip().lower() == b"application/json"
+    return False
+
+
+class FastLaneMiddleware:
+    """
+    ホットパスのエンドポイントを直接処理するASGIミドルウェア
+
+    Args:
+        app: 通常の経路（FastAPIのミドルウェアとルーター）
+        wrap: 高速レーンのレスポンスに適用するミドルウェア（CORS・圧縮など、通常の経路と同じ設定）
+        access_log_writer: バイナリ形式のアクセスログ（Noneの場合は記録しない）
+    """
+
+    def __init__(self, app, wrap: Callable | None = None, access_log_writer: access_log.AccessLogWriter | None = None):
+        self.app = app
+        self.access_log_writer = access_log_writer
+        self.handled_total = 0
+        self.fallback_total = 0
+        self._respond = (wrap or (lambda inner: inner))(self._send_prepared)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        path = scope["path"]
+        if method == "POST" and path == CONVERT_PATH and _is_json(scope):
+            await self._handle_convert(scope, receive, send)
+        elif method == "GET" and path.startswith(UNITS_PREFIX):
+            category = path[len(UNITS_PREFIX):]
+            if not category or "/" in category:
+                await self.app(scope, receive, send)
+                return
+            start_time = time.time()
+            logger.info(f"Request: {method} {path}")
+            annotations = access_log.begin_request() if self.access_log_writer is not None else None
+            config = CATEGORY_CONFIG.get(category)
+            if config is None:
+                status, content = 404, CategoryNotFoundError(category).to_dict()
+            else:
+                access_log.annotate(category)
+                status, content = 200, {
+                    "category": category,
+                    "units": [
+                        {"code": unit["code"], "name": unit["name"]}
+                        for unit in config["get_units_info_func"]()
+                    ],
+                }
+            await self._finish(scope, receive, send, status, _render(content), start_time, UNITS_ROUTE, annotations)
+        else:
+            await self.app(scope, receive, send)
+
+    async def _handle_convert(self, scope, receive, send) -> None:
+        """単位変換を処理する（正常系と無効な単位以外は通常の経路に渡す）"""
+        start_time = time.time()
+        annotations = access_log.begin_request() if self.access_log_writer is not None else None
+        messages = []
+        size = 0
+        chunks = []
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > MAX_BODY_SIZE:
+                break
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                try:
+                    prepared = await self._convert(b"".join(chunks))
+                except Exception:
+                    # 想定外のエラーは通常の経路で処理する（同じ500レスポンスになる）
+                    prepared = None
+                if prepared is not None:
+                    logger.info(f"Request: {scope['method']} {scope['path']}")
+                    await self._finish(scope, receive, send, *prepared, start_time, CONVERT_ROUTE, annotations)
+                    return
+                break
+
+        # 読み込んだボディを再生して通常の経路で処理する
+        self.fallback_total += 1
+
+        async def replay():
+            if messages:
+                return messages.pop(0)
+            return await receive()
+
+        await self.app(scope, replay, send)
+
+    async def _convert(self, body: bytes) -> tuple[int, bytes] | None:
+        """
+        変換リクエストを処理する
+
+        Returns:
+            tuple[int, bytes] | None: (ステータスコード, ボディ)（通常の経路で処理する場合はNone）
+        """
+        data = json.loads(body)
+        if not isinstance(data, dict):
+            return None
+        value = data.get("value")
+        category = data.get("category")
+        from_unit = data.get("from_unit")
+        to_unit = data.get("to_unit")
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        value = float(value)
+        if not math.isfinite(value) or not isinstance(category, str):
+            return None
+        if not isinstance(from_unit, str) or not isinstance(to_unit, str):
+            return None
+        from_unit = from_unit.strip()
+        to_unit = to_unit.strip()
+        config = CATEGORY_CONFIG.get(category)
+        if config is None or not from_unit or not to_unit:
+            return None
+        # 変換先 auto・単位系の指定は通常の経路で処理する
+        if "unit_system" in data or is_auto_unit(to_unit):
+            return None
+
+        resolve_unit = config["resolve_unit_func"]
+        from_code = resolve_unit(from_unit)
+        if from_code is None:
+            return 400, _render(InvalidUnitError(from_unit, config["suggest_units_func"](from_unit)).to_dict())
+        to_code = resolve_unit(to_unit)
+        if to_code is None:
+            return 400, _render(InvalidUnitError(to_unit, config["suggest_units_func"](to_unit)).to_dict())
+
+        access_log.annotate(category, from_code, to_code)
+        if convert.coalescer is not None:
+            result, rates = await convert.coalescer.submit(
+                partial(convert._many_converter, config), category, value, from_code, to_code
+            )
+        else:
+            convert_func, _, rates = convert._converters(config)
+            result = convert_func(value, from_code, to_code)
+        content = {
+            "success": True,
+            "result": float(result),
+            "from_unit": from_code,
+            "to_unit": to_code,
+            "original_value": value,
+        }
+        content.update(convert._rate_fields(rates))
+        return 200, _render(content)
+
+    async def _finish(
+        self, scope, receive, send, status: int, body: bytes, start_time: float, route: str, annotations: dict | None
+    ) -> None:
+        """生成したレスポンスをCORS・圧縮を通して送信し、通常の経路と同じ形式でログを出力する（ウォームアップはアクセスログに記録しない）"""
+        self.handled_total += 1
+        await self._respond({**scope, _SCOPE_KEY: (status, body)}, receive, send)
+        process_time = time.time() - start_time
+        logger.info(
+            f"Response: {scope['method']} {scope['path']} "
+            f"Status: {status} "
+            f"Duration: {process_time:.3f}s"
+        )
+        if self.access_log_writer is not None and not scope.get(WARMUP_SCOPE_KEY):
+            self.access_log_writer.write(route, status, process_time, timestamp=start_time, **annotations)
+
+    @staticmethod
+    async def _send_prepared(scope, receive, send) -> None:
+        status, body = scope[_SCOPE_KEY]
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"content-type", b"application/json"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
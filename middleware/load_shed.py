@@ -0,0 +1,163 @@
+"""
+負荷制御ミドルウェア
+
+イベントループの遅延（ラグ）を監視し、同時処理数の上限をAIMDで調整する。
+上限を超えたリクエストは処理せずに即座に503を返す。
+"""
+
+import asyncio
+import time
+from collections.abc import Callable, Iterable
+
+from fastapi.responses import JSONResponse
+
+import access_log
+from exceptions import ServiceOverloadedError
+from middleware import WARMUP_SCOPE_KEY, RejectionSender, route_template
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD（加算増加・乗算減少）で同時処理数の上限を調整する
+
+    イベントループのラグが目標値を超えた場合は上限を乗算で減らし、
+    ラグが小さく上限に達していた場合は加算で増やす。
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 256,
+        min_limit: int = 8,
+        max_limit: int = 1024,
+        target_lag: float = 0.05,
+        increase_step: float = 4.0,
+        backoff: float = 0.75,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_lag = target_lag
+        self.increase_step = increase_step
+        self.backoff = backoff
+        self.in_flight = 0
+        self.shed_total = 0
+        self._saturated = False
+
+    def try_acquire(self) -> bool:
+        """処理枠を確保する（上限に達している場合はFalse）"""
+        if self.in_flight >= int(self.limit):
+            self.shed_total += 1
+            self._saturated = True
+            return False
+        self.in_flight += 1
+        if self.in_flight >= int(self.limit):
+            self._saturated = True
+        return True
+
+    def release(self) -> None:
+        """処理枠を解放する"""
+        self.in_flight -= 1
+
+    def update(self, lag: float) -> None:
+        """
+        計測したイベントループのラグに応じて上限を調整する
+
+        Args:
+            lag: 直近のイベントループのラグ（秒）
+        """
+        if lag > self.target_lag:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        elif self._saturated:
+            self.limit = min(self.max_limit, self.limit + self.increase_step)
+        self._saturated = False
+
+
+class EventLoopLagMonitor:
+    """
+    一定間隔でスリープし、予定より遅れて再開した時間をイベントループのラグとして計測する
+    """
+
+    def __init__(self, limiter: AdaptiveConcurrencyLimiter | None = None, interval: float = 0.1):
+        self.limiter = limiter
+        self.interval = interval
+        self.lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """監視タスクを開始する"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """監視タスクを停止する"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lag = max(0.0, loop.time() - start - self.interval)
+            if self.limiter is not None:
+                self.limiter.update(self.lag)
+
+
+class LoadSheddingMiddleware:
+    """
+    同時処理数の上限を超えたリクエストを503で即座に拒否するASGIミドルウェア（起動時のウォームアップは対象外）
+
+    Args:
+        app: ASGIアプリケーション
+        limiter: 同時処理数の上限
+        exempt_paths: 対象外のパス
+        access_log_writer: 拒否したリクエストを記録するバイナリ形式のアクセスログ（Noneの場合は記録しない）
+        routes: ルートのテンプレートを求めるためのアプリケーションのルート（app.routes）
+        wrap: 503のレスポンスに適用するミドルウェア（CORSなど、通常の経路と同じ設定）
+    """
+
+    def __init__(
+        self,
+        app,
+        limiter: AdaptiveConcurrencyLimiter,
+        exempt_paths: tuple[str, ...] = (),
+        access_log_writer: access_log.AccessLogWriter | None = None,
+        routes: Iterable = (),
+        wrap: Callable | None = None,
+    ):
+        self.app = app
+        self.access_log_writer = access_log_writer
+        self.routes = routes
+        self.limiter = limiter
+        self.exempt_paths = frozenset(exempt_paths)
+        # 拒否のレスポンスはリクエストによらないため1回だけ生成する
+        error = ServiceOverloadedError()
+        self._response = JSONResponse(error.to_dict(), status_code=error.status_code, headers=error.headers)
+        self._reject = RejectionSender(wrap)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths or scope.get(WARMUP_SCOPE_KEY):
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.time()
+        if not self.limiter.try_acquire():
+            await self._reject(scope, receive, send, self._response)
+            if self.access_log_writer is not None:
+                self.access_log_writer.write(
+                    route_template(self.routes, scope),
+                    self._response.status_code,
+                    time.time() - start_time,
+                    timestamp=start_time,
+                )
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.release()
@@ -0,0 +1,163 @@
+"""
+レート制限ミドルウェア
+
+クライアント（登録済みのAPIキーまたはIPアドレス）ごとのトークンバケットでリクエスト数を制限する
+"""
+
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+
+from fastapi.responses import JSONResponse
+
+import access_log
+from exceptions import RateLimitExceededError
+from middleware import WARMUP_SCOPE_KEY, RejectionSender, route_template
+
+
+class TokenBucketLimiter:
+    """
+    クライアントごとのトークンバケットをメモリ上で管理する
+
+    バケットは最終アクセス順に保持し、上限数を超えた場合やアイドル時間を過ぎた場合は
+    古いものから削除する。
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        max_clients: int = 10000,
+        idle_ttl: float = 300.0,
+        clock=time.monotonic,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.idle_ttl = idle_ttl
+        self._clock = clock
+        # キー -> [残りトークン数, 最終更新時刻]
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def acquire(self, key: str) -> float:
+        """
+        トークンを1つ消費する
+
+        Args:
+            key: クライアントを識別するキー
+
+        Returns:
+            float: 許可された場合は0、拒否された場合は次のトークンまでの待ち秒数
+        """
+        now = self._clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._evict(now)
+            bucket = [float(self.burst), now]
+            self._buckets[key] = bucket
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            return 0.0
+        return (1.0 - bucket[0]) / self.rate
+
+    def _evict(self, now: float) -> None:
+        """アイドル状態のバケットと上限を超えたバケットを古い順に削除する"""
+        buckets = self._buckets
+        while buckets:
+            oldest = next(iter(buckets.values()))
+            if len(buckets) >= self.max_clients or now - oldest[1] > self.idle_ttl:
+                buckets.popitem(last=False)
+            else:
+                break
+
+
+class RateLimitMiddleware:
+    """
+    APIルートにクライアントごとのレート制限を適用するASGIミドルウェア
+
+    制限を超えたリクエストには429とRetry-Afterヘッダーを返す（起動時のウォームアップは対象外）。APIキーは api_keys に登録された
+    ものだけを別のクライアントとして扱い、それ以外はクライアントIPで判定する（ヘッダーを
+    付け替えて新しいバケットを得たり、大量のキーで他のクライアントのバケットを追い出したりできないようにする）。
+
+    Args:
+        app: ASGIアプリケーション
+        rate: 1秒あたりの許可リクエスト数
+        burst: トークンバケットの容量
+        max_clients: メモリ上に保持するクライアント数の上限
+        idle_ttl: アイドル状態のクライアントを削除するまでの秒数
+        api_keys: 登録済みのAPIキー
+        api_key_header: APIキーのヘッダー名
+        path_prefix: 制限の対象のパスの接頭辞
+        access_log_writer: 拒否したリクエストを記録するバイナリ形式のアクセスログ（Noneの場合は記録しない）
+        routes: ルートのテンプレートを求めるためのアプリケーションのルート（app.routes）
+        wrap: 429のレスポンスに適用するミドルウェア（CORSなど、通常の経路と同じ設定）
+    """
+
+    def __init__(
+        self,
+        app,
+        rate: float,
+        burst: int,
+        max_clients: int = 10000,
+        idle_ttl: float = 300.0,
+        api_keys: Iterable[str] = (),
+        api_key_header: str = "x-api-key",
+        path_prefix: str = "/api",
+        access_log_writer: access_log.AccessLogWriter | None = None,
+        routes: Iterable = (),
+        wrap: Callable | None = None,
+    ):
+        self.app = app
+        self.access_log_writer = access_log_writer
+        self.routes = routes
+        self._reject = RejectionSender(wrap)
+        self.limiter = TokenBucketLimiter(rate, burst, max_clients=max_clients, idle_ttl=idle_ttl)
+        self.api_keys = frozenset(key.encode("latin-1") for key in api_keys)
+        self.api_key_header = api_key_header.lower().encode("latin-1")
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not scope["path"].startswith(self.path_prefix)
+            or scope.get(WARMUP_SCOPE_KEY)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.time()
+        wait = self.limiter.acquire(self._client_key(scope))
+        if wait == 0.0:
+            await self.app(scope, receive, send)
+            return
+
+        error = RateLimitExceededError()
+        response = JSONResponse(
+            error.to_dict(), status_code=error.status_code, headers={"Retry-After": str(max(1, math.ceil(wait)))}
+        )
+        await self._reject(scope, receive, send, response)
+        if self.access_log_writer is not None:
+            self.access_log_writer.write(
+                route_template(self.routes, scope),
+                response.status_code,
+                time.time() - start_time,
+                timestamp=start_time,
+            )
+
+    def _client_key(self, scope) -> str:
+        """登録済みのAPIキーがあればAPIキー、なければクライアントIPをキーにする"""
+        if self.api_keys:
+            for name, value in scope["headers"]:
+                if name == self.api_key_header and value in self.api_keys:
+                    return "key:" + value.decode("latin-1")
+        client = scope.get("client")
+        return "ip:" + (client[0] if client else "unknown")
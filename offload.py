@@ -0,0 +1,144 @@
+"""
+大きな変換処理のスレッドプールへのオフロード
+
+ペイロードのサイズが閾値以上の変換・エンコード処理をイベントループ外の
+上限付きスレッドプールで実行し、他の接続の処理を妨げないようにする。
+実行枠の空きを待つ処理の数と待ち時間にも上限を設け、超えた場合は503で即座に拒否する
+（過負荷時にリクエストと解析済みのペイロードがメモリ上に溜まり続けないようにする）。
+"""
+
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+from exceptions import ServiceOverloadedError
+
+T = TypeVar("T")
+
+
+class ConversionOffloader:
+    """
+    閾値以上のペイロードの処理をスレッドプールで実行する
+
+    小さなペイロードはイベントループ上でそのまま処理する（インラインの高速パス）。
+
+    Args:
+        threshold: オフロードするペイロードの要素数の閾値
+        max_workers: スレッド数
+        max_pending: スレッドプールに投入する（実行中・実行待ちの）処理数の上限
+        max_queued: max_pending に達している間に投入の空きを待てる処理数の上限
+        queue_timeout: 投入の空きを待つ最大秒数
+    """
+
+    def __init__(
+        self, threshold: int, max_workers: int = 4, max_pending: int = 64, max_queued: int = 64,
+        queue_timeout: float = 1.0
+    ):
+        self.threshold = threshold
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.offloaded_total = 0
+        self.inline_total = 0
+        self.rejected_total = 0
+        self.active = 0
+        self._waiting = 0
+        # 投入の空きを待っている処理の数
+        self._queued = 0
+        self._executor: ThreadPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        """スレッドでの実行開始を待っている処理の数（投入の空きを待っている処理を含む）"""
+        return self._waiting + self._queued
+
+    def should_offload(self, size: int) -> bool:
+        """
+        ペイロードのサイズからオフロードするかどうかを判定する（統計も更新）
+
+        Args:
+            size: ペイロードの要素数
+
+        Returns:
+            bool: スレッドプールで実行すべき場合True
+        """
+        if size < self.threshold:
+            self.inline_total += 1
+            return False
+        self.offloaded_total += 1
+        return True
+
+    async def run(self, func: Callable[[], T]) -> T:
+        """
+        処理をスレッドプールで実行する
+
+        実行待ちの処理が max_pending に達している場合は空きができるまで queue_timeout 秒まで待つ。
+        空きを待つ処理が max_queued に達している場合は待たずに拒否する。
+
+        Args:
+            func: 実行する処理
+
+        Returns:
+            処理の戻り値
+
+        Raises:
+            ServiceOverloadedError: 空きを待つ処理が多すぎる場合、または待ち時間が上限を超えた場合
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="metrix-offload")
+            self._slots = asyncio.Semaphore(self.max_pending)
+
+        slots = self._slots
+        if slots.locked():
+            if self._queued >= self.max_queued:
+                self.rejected_total += 1
+                raise ServiceOverloadedError()
+            self._queued += 1
+            try:
+                await asyncio.wait_for(slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected_total += 1
+                raise ServiceOverloadedError() from None
+            finally:
+                self._queued -= 1
+        else:
+            await slots.acquire()
+
+        # 待ち状態を解除済みかどうか（スレッド側とキャンセル時の二重減算を防ぐ）
+        dequeued = [False]
+        with self._lock:
+            self._waiting += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self._call, func, dequeued)
+        finally:
+            slots.release()
+            # 実行開始前にキャンセルされた場合は待ち数を戻す
+            with self._lock:
+                if not dequeued[0]:
+                    dequeued[0] = True
+                    self._waiting -= 1
+
+    def _call(self, func: Callable[[], T], dequeued: list[bool]) -> T:
+        """ワーカースレッド上で処理を実行する"""
+        with self._lock:
+            if not dequeued[0]:
+                dequeued[0] = True
+                self._waiting -= 1
+            self.active += 1
+        try:
+            return func()
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def shutdown(self) -> None:
+        """スレッドプールを停止する"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._slots = None
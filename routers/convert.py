@@ -4,49 +4,67 @@
 単位変換のためのAPIエンドポイントを提供
 """
 
+import logging
 import math
-from fastapi import APIRouter
-from pydantic import BaseModel, Field, field_validator
-
-from converters.length import convert_length, get_length_units_info, get_length_units
-from converters.weight import convert_weight, get_weight_units_info, get_weight_units
-from converters.temperature import convert_temperature, get_temperature_units_info, get_temperature_units
+from collections.abc import Callable
+from functools import partial
+from fastapi import APIRouter, Depends, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, Field, ValidationError as PydanticValidationError, field_validator
+
+import access_log
+from coalescer import ConversionCoalescer
+from config import (
+    COALESCE_MAX_BATCH,
+    COALESCE_WINDOW_MS,
+    MAX_ARRAY_LENGTH,
+    MAX_BODY_SIZE,
+    OFFLOAD_MAX_PENDING,
+    OFFLOAD_MAX_QUEUED,
+    OFFLOAD_QUEUE_TIMEOUT,
+    OFFLOAD_THRESHOLD,
+    OFFLOAD_WORKERS
+)
+from converters import CATEGORY_CONFIG
+from converters.best_unit import AUTO_UNIT, UNIT_SYSTEMS, is_auto_unit
+from converters.currency import RateSnapshot
+from json_stream import ArrayTooLongError, IncrementalObjectParser, JSONStreamError
+from offload import ConversionOffloader
 from exceptions import (
-    ValidationError,
+    MetrixException,
+    AutoUnitNotSupportedError,
     InvalidCategoryError,
     InvalidUnitError,
-    CategoryNotFoundError
+    CategoryNotFoundError,
+    PayloadTooLargeError
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api", tags=["convert"])
 
 
-# カテゴリ別の設定マッピング
-CATEGORY_CONFIG = {
-    "length": {
-        "convert_func": convert_length,
-        "get_units_func": get_length_units,
-        "get_units_info_func": get_length_units_info
-    },
-    "weight": {
-        "convert_func": convert_weight,
-        "get_units_func": get_weight_units,
-        "get_units_info_func": get_weight_units_info
-    },
-    "temperature": {
-        "convert_func": convert_temperature,
-        "get_units_func": get_temperature_units,
-        "get_units_info_func": get_temperature_units_info
-    }
-}
+# 同時に届いた単一変換をまとめて一括変換する（オプトイン）
+coalescer = (
+    ConversionCoalescer(window=COALESCE_WINDOW_MS / 1000, max_batch=COALESCE_MAX_BATCH)
+    if COALESCE_WINDOW_MS > 0 else None
+)
+
+# 閾値以上の要素数の変換・エンコードはスレッドプールで実行する
+offloader = ConversionOffloader(
+    threshold=OFFLOAD_THRESHOLD, max_workers=OFFLOAD_WORKERS, max_pending=OFFLOAD_MAX_PENDING,
+    max_queued=OFFLOAD_MAX_QUEUED, queue_timeout=OFFLOAD_QUEUE_TIMEOUT
+)
 
 
 class ConvertRequest(BaseModel):
     """変換リクエストのモデル"""
     value: float = Field(..., description="変換する値")
     from_unit: str = Field(..., description="変換元の単位")
-    to_unit: str = Field(..., description="変換先の単位")
-    category: str = Field(..., description="変換カテゴリ (length, weight, temperature)")
+    to_unit: str = Field(..., description="変換先の単位（auto の場合は値の大きさに応じて読みやすい単位を選ぶ）")
+    category: str = Field(..., description="変換カテゴリ (length, weight, temperature, area など。/api/categories を参照)")
+    unit_system: str | None = Field(None, description="auto で選ぶ単位の単位系 (metric / imperial、省略時は変換元の単位と同じ)")
 
     @field_validator('value')
     @classmethod
@@ -60,9 +78,8 @@ class ConvertRequest(BaseModel):
     @classmethod
     def validate_category(cls, v: str) -> str:
         """カテゴリのバリデーション"""
-        valid_categories = {'length', 'weight', 'temperature'}
-        if v not in valid_categories:
-            raise ValueError(f"Category must be one of: {', '.join(valid_categories)}")
+        if v not in CATEGORY_CONFIG:
+            raise ValueError(f"Category must be one of: {', '.join(CATEGORY_CONFIG)}")
         return v
 
     @field_validator('from_unit', 'to_unit')
@@ -73,6 +90,14 @@ class ConvertRequest(BaseModel):
             raise ValueError("Unit cannot be empty")
         return v.strip()
 
+    @field_validator('unit_system')
+    @classmethod
+    def validate_unit_system(cls, v: str | None) -> str | None:
+        """単位系のバリデーション"""
+        if v is not None and v not in UNIT_SYSTEMS:
+            raise ValueError(f"unit_system must be one of: {', '.join(UNIT_SYSTEMS)}")
+        return v
+
 
 class ConvertResponse(BaseModel):
     """変換レスポンスのモデル (成功時)"""
@@ -81,12 +106,18 @@ class ConvertResponse(BaseModel):
     from_unit: str = Field(..., description="変換元の単位")
     to_unit: str = Field(..., description="変換先の単位")
     original_value: float = Field(..., description="変換前の値")
+    rate_timestamp: str | None = Field(None, description="換算に使った為替レートの時刻（ISO 8601、通貨のみ）")
+    rate_source: str | None = Field(
+        None, description="換算に使った為替レートの取得元（fixture: オフライン用の固定レート、file: レートファイル。通貨のみ）"
+    )
 
 
 class ErrorResponse(BaseModel):
     """エラーレスポンスのモデル"""
     success: bool = Field(default=False, description="変換が成功したかどうか")
     error: str = Field(..., description="エラーメッセージ")
+    code: str = Field(..., description="機械可読なエラーコード (例: INVALID_UNIT)")
+    suggestions: list[str] | None = Field(None, description="無効な単位の場合の近い単位の候補")
 
 
 class UnitInfo(BaseModel):
@@ -95,6 +126,17 @@ class UnitInfo(BaseModel):
     name: str = Field(..., description="単位の名称")
 
 
+class CategoryInfo(BaseModel):
+    """カテゴリ情報のモデル"""
+    code: str = Field(..., description="カテゴリ名")
+    name: str = Field(..., description="カテゴリの表示名")
+
+
+class CategoriesResponse(BaseModel):
+    """カテゴリ一覧レスポンスのモデル"""
+    categories: list[CategoryInfo] = Field(..., description="利用可能なカテゴリのリスト")
+
+
 class UnitsResponse(BaseModel):
     """単位一覧レスポンスのモデル"""
     category: str = Field(..., description="カテゴリ名")
@@ -105,8 +147,9 @@ class BatchConvertRequest(BaseModel):
     """一括変換リクエストのモデル"""
     value: float = Field(..., description="変換する値")
     from_unit: str = Field(..., description="変換元の単位")
-    category: str = Field(..., description="変換カテゴリ (length, weight, temperature)")
-    to_units: list[str] | None = Field(None, description="変換先の単位リスト（省略時はfrom_unitを除く全単位）")
+    category: str = Field(..., description="変換カテゴリ (length, weight, temperature, area など。/api/categories を参照)")
+    to_units: list[str] | None = Field(None, description="変換先の単位リスト（省略時はfrom_unitを除く全単位。auto を含めると読みやすい単位も返す）")
+    unit_system: str | None = Field(None, description="auto で選ぶ単位の単位系 (metric / imperial、省略時は変換元の単位と同じ)")
 
     @field_validator('value')
     @classmethod
@@ -120,9 +163,8 @@ class BatchConvertRequest(BaseModel):
     @classmethod
     def validate_category(cls, v: str) -> str:
         """カテゴリのバリデーション"""
-        valid_categories = {'length', 'weight', 'temperature'}
-        if v not in valid_categories:
-            raise ValueError(f"Category must be one of: {', '.join(valid_categories)}")
+        if v not in CATEGORY_CONFIG:
+            raise ValueError(f"Category must be one of: {', '.join(CATEGORY_CONFIG)}")
         return v
 
     @field_validator('from_unit')
@@ -146,11 +188,20 @@ class BatchConvertRequest(BaseModel):
                     raise ValueError("to_units cannot contain empty strings")
         return v
 
+    @field_validator('unit_system')
+    @classmethod
+    def validate_unit_system(cls, v: str | None) -> str | None:
+        """単位系のバリデーション"""
+        if v is not None and v not in UNIT_SYSTEMS:
+            raise ValueError(f"unit_system must be one of: {', '.join(UNIT_SYSTEMS)}")
+        return v
+
 
 class ConversionResult(BaseModel):
     """個別の変換結果"""
     to_unit: str = Field(..., description="変換先の単位")
     value: float = Field(..., description="変換後の値")
+    auto: bool | None = Field(None, description="変換先 auto で選ばれた単位の場合True")
 
 
 class BatchConvertResponse(BaseModel):
@@ -161,146 +212,463 @@ class BatchConvertResponse(BaseModel):
     category: str = Field(..., description="変換カテゴリ")
     results: list[ConversionResult] = Field(..., description="変換結果のリスト")
     failed_units: list[str] = Field(default_factory=list, description="変換に失敗した単位のリスト")
+    rate_timestamp: str | None = Field(None, description="換算に使った為替レートの時刻（ISO 8601、通貨のみ）")
+    rate_source: str | None = Field(
+        None, description="換算に使った為替レートの取得元（fixture: オフライン用の固定レート、file: レートファイル。通貨のみ）"
+    )
+
+
+class BulkConvertRequest(BaseModel):
+    """大量変換リクエストのモデル（複数の値を同じ単位ペアで変換）"""
+    values: list[float] = Field(..., description="変換する値のリスト")
+    from_unit: str = Field(..., description="変換元の単位")
+    to_unit: str = Field(..., description="変換先の単位（auto の場合は値ごとに読みやすい単位を選ぶ）")
+    category: str = Field(..., description="変換カテゴリ (length, weight, temperature, area など。/api/categories を参照)")
+    unit_system: str | None = Field(None, description="auto で選ぶ単位の単位系 (metric / imperial、省略時は変換元の単位と同じ)")
+
+    @field_validator('values')
+    @classmethod
+    def validate_values(cls, v: list[float]) -> list[float]:
+        """値のバリデーション"""
+        for value in v:
+            if math.isnan(value) or math.isinf(value):
+                raise ValueError("Values must be finite numbers")
+        return v
+
+    @field_validator('category')
+    @classmethod
+    def validate_category(cls, v: str) -> str:
+        """カテゴリのバリデーション"""
+        if v not in CATEGORY_CONFIG:
+            raise ValueError(f"Category must be one of: {', '.join(CATEGORY_CONFIG)}")
+        return v
+
+    @field_validator('from_unit', 'to_unit')
+    @classmethod
+    def validate_unit(cls, v: str) -> str:
+        """単位のバリデーション（空文字チェック）"""
+        if not v or not v.strip():
+            raise ValueError("Unit cannot be empty")
+        return v.strip()
+
+    @field_validator('unit_system')
+    @classmethod
+    def validate_unit_system(cls, v: str | None) -> str | None:
+        """単位系のバリデーション"""
+        if v is not None and v not in UNIT_SYSTEMS:
+            raise ValueError(f"unit_system must be one of: {', '.join(UNIT_SYSTEMS)}")
+        return v
+
+
+class BulkConvertResponse(BaseModel):
+    """大量変換レスポンスのモデル"""
+    success: bool = Field(default=True, description="変換が成功したかどうか")
+    from_unit: str = Field(..., description="変換元の単位")
+    to_unit: str = Field(..., description="変換先の単位")
+    category: str = Field(..., description="変換カテゴリ")
+    results: list[float] = Field(..., description="変換後の値のリスト（入力と同じ順序）")
+    units: list[str] | None = Field(None, description="to_unit が auto の場合の値ごとの単位のリスト（results と同じ順序）")
+    rate_timestamp: str | None = Field(None, description="換算に使った為替レートの時刻（ISO 8601、通貨のみ）")
+    rate_source: str | None = Field(
+        None, description="換算に使った為替レートの取得元（fixture: オフライン用の固定レート、file: レートファイル。通貨のみ）"
+    )
 
 
-@router.post("/convert", response_model=ConvertResponse, responses={400: {"model": ErrorResponse}})
-async def convert_unit(request: ConvertRequest):
+def _error_response(exc: MetrixException) -> JSONResponse:
     """
-    単位変換を実行するAPIエンドポイント
+    例外を送出せずにエラーレスポンスを生成する
+
+    不正な入力はリクエスト全体に占める割合が大きいため、例外ハンドラーを経由しない
 
     Args:
-        request: 変換リクエスト
+        exc: エラー内容を表す例外オブジェクト（送出はしない）
+
+    Returns:
+        JSONResponse: エラーレスポンス
+    """
+    return JSONResponse(status_code=exc.status_code, content=exc.to_dict(), headers=exc.headers)
+
+
+def _invalid_unit_response(config: dict, unit: str) -> JSONResponse:
+    """無効な単位のエラーレスポンスを生成する（近い単位の候補を含む）"""
+    return _error_response(InvalidUnitError(unit, config["suggest_units_func"](unit)))
+
+
+def _encode_response(model: BaseModel) -> Response:
+    """レスポンスモデルをJSONにエンコードする（オフロード先のスレッドで実行）"""
+    return Response(content=model.model_dump_json(exclude_none=True), media_type="application/json")
+
+
+def _converters(config: dict) -> tuple[Callable, Callable, RateSnapshot | None]:
+    """
+    リクエストで使う変換関数を返す
+
+    為替レートを使うカテゴリは、その時点のスナップショットに固定する
+    （処理中にレートが更新されても、変換結果とレートの時刻が食い違わないようにする）
+
+    Returns:
+        tuple[Callable, Callable, RateSnapshot | None]: (変換関数, 一括変換関数, レートのスナップショット)
+    """
+    rates_func = config.get("rates_func")
+    if rates_func is None:
+        return config["convert_func"], config["convert_many_func"], None
+    rates = rates_func()
+    return rates.convert, rates.convert_many, rates
+
+
+def _many_converter(config: dict) -> tuple[Callable, RateSnapshot | None]:
+    """
+    コアレッサーが実行時に使う一括変換関数を返す（為替レートはその時点のスナップショット）
+
+    Returns:
+        tuple[Callable, RateSnapshot | None]: (一括変換関数, レートのスナップショット)
+    """
+    _, convert_many, rates = _converters(config)
+    return convert_many, rates
+
+
+def _rate_fields(rates: RateSnapshot | None) -> dict:
+    """
+    レスポンスに含める為替レートの時刻と取得元を返す
 
     Returns:
-        ConvertResponse: 変換結果
+        dict: rate_timestamp・rate_source（為替レートを使わないカテゴリは空）
+    """
+    if rates is None:
+        return {}
+    return {"rate_timestamp": rates.timestamp, "rate_source": rates.source}
+
+
+def _is_json_content_type(content_type: str | None) -> bool:
+    """Content-TypeがJSONとして解析する対象か（未指定・application/json・application/*+json）"""
+    if not content_type:
+        return True
+    maintype, _, subtype = content_type.split(";", 1)[0].strip().lower().partition("/")
+    return maintype == "application" and (subtype == "json" or subtype.endswith("+json"))
 
-    Raises:
-        HTTPException: 無効なカテゴリまたは単位が指定された場合
+
+def json_body(model: type[BaseModel]) -> Callable:
+    """
+    リクエストボディを受信しながら逐次解析し、モデルに検証する依存関係を生成する
+
+    ボディ全体をメモリに読み込まず、ボディのサイズ・配列の要素数が上限を超えた時点で
+    413を返す（Content-Lengthが上限を超える場合は受信する前に返す）。
+    検証エラーはFastAPIのボディの検証と同じ形式（RequestValidationError）で送出する。
+
+    Args:
+        model: リクエストのモデル
+
+    Returns:
+        Callable: FastAPIの依存関係
     """
-    try:
-        # カテゴリ設定を取得
-        if request.category not in CATEGORY_CONFIG:
-            raise InvalidCategoryError(request.category)
+    async def dependency(http_request: Request) -> BaseModel:
+        content_length = http_request.headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > MAX_BODY_SIZE:
+            raise PayloadTooLargeError(f"Request body exceeds {MAX_BODY_SIZE} bytes")
+
+        # JSON以外のContent-Typeはボディをそのまま検証する（FastAPIと同じくエラーになる）
+        parser = (
+            IncrementalObjectParser(max_array_length=MAX_ARRAY_LENGTH)
+            if _is_json_content_type(http_request.headers.get("content-type")) else None
+        )
+        chunks = []
+        size = 0
+        try:
+            async for chunk in http_request.stream():
+                size += len(chunk)
+                if size > MAX_BODY_SIZE:
+                    raise PayloadTooLargeError(f"Request body exceeds {MAX_BODY_SIZE} bytes")
+                if parser is not None:
+                    parser.feed(chunk)
+                else:
+                    chunks.append(chunk)
+            if size == 0:
+                body = None
+            elif parser is not None:
+                body = parser.close()
+            else:
+                body = b"".join(chunks)
+        except ArrayTooLongError as e:
+            raise PayloadTooLargeError(str(e)) from None
+        except JSONStreamError as e:
+            raise RequestValidationError([{
+                "type": "json_invalid",
+                "loc": ("body", e.pos),
+                "msg": "JSON decode error",
+                "input": {},
+                "ctx": {"error": e.msg},
+            }]) from None
+
+        if body is None:
+            raise RequestValidationError([{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}])
+        try:
+            return model.model_validate(body)
+        except PydanticValidationError as e:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)],
+                body=body
+            ) from None
+
+    return dependency
+
+
+def json_body_openapi(model: type[BaseModel]) -> dict:
+    """json_body で受け取るリクエストボディのOpenAPIの定義を返す"""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
+    }
+
 
-        config = CATEGORY_CONFIG[request.category]
-        convert_func = config["convert_func"]
+@router.post(
+    "/convert", response_model=ConvertResponse, response_model_exclude_none=True,
+    responses={400: {"model": ErrorResponse}, 413: {"model": ErrorResponse}}, openapi_extra=json_body_openapi(ConvertRequest))
+async def convert_unit(request: ConvertRequest = Depends(json_body(ConvertRequest))):
+    """
+    単位変換を実行するAPIエンドポイント
 
-        # 変換を実行
-        result = convert_func(request.value, request.from_unit, request.to_unit)
+    Args:
+        request: 変換リクエスト
 
+    Returns:
+        ConvertResponse: 変換結果（無効なカテゴリまたは単位の場合はエラーレスポンス）
+    """
+    # カテゴリ設定を取得
+    config = CATEGORY_CONFIG.get(request.category)
+    if config is None:
+        return _error_response(InvalidCategoryError(request.category))
+
+    # 単位の検証（別名・表記ゆれを単位コードに解決し、例外を使わずに判定）
+    resolve_unit = config["resolve_unit_func"]
+    from_unit = resolve_unit(request.from_unit)
+    if from_unit is None:
+        return _invalid_unit_response(config, request.from_unit)
+
+    # 変換先 auto: 値の大きさに応じて読みやすい単位を選んで変換
+    if is_auto_unit(request.to_unit):
+        best_unit = config.get("best_unit_func")
+        if best_unit is None:
+            return _error_response(AutoUnitNotSupportedError(request.category))
+        to_unit, result = best_unit(request.value, from_unit, request.unit_system)
+        access_log.annotate(request.category, from_unit, to_unit)
         return ConvertResponse(
             success=True,
             result=result,
-            from_unit=request.from_unit,
-            to_unit=request.to_unit,
+            from_unit=from_unit,
+            to_unit=to_unit,
             original_value=request.value
         )
 
-    except ValueError as e:
-        # 変換関数からのValueErrorをカスタム例外に変換
-        error_msg = str(e)
-        if "Invalid unit:" in error_msg:
-            # 単位名を抽出
-            unit = error_msg.split("Invalid unit:")[-1].strip()
-            raise InvalidUnitError(unit)
-        else:
-            raise ValidationError(error_msg)
+    to_unit = resolve_unit(request.to_unit)
+    if to_unit is None:
+        return _invalid_unit_response(config, request.to_unit)
+    access_log.annotate(request.category, from_unit, to_unit)
+
+    # 変換を実行（コアレッサーが有効な場合は同時リクエストとまとめて一括変換）
+    if coalescer is not None:
+        result, rates = await coalescer.submit(
+            partial(_many_converter, config), request.category, request.value, from_unit, to_unit
+        )
+    else:
+        convert_func, _, rates = _converters(config)
+        result = convert_func(request.value, from_unit, to_unit)
+
+    return ConvertResponse(
+        success=True,
+        result=result,
+        from_unit=from_unit,
+        to_unit=to_unit,
+        original_value=request.value,
+        **_rate_fields(rates)
+    )
 
 
-def _get_unit_size_order(category: str, unit: str) -> float:
+@router.post(
+    "/convert/batch", response_model=BatchConvertResponse, response_model_exclude_none=True,
+    responses={400: {"model": ErrorResponse}, 413: {"model": ErrorResponse}}, openapi_extra=json_body_openapi(BatchConvertRequest))
+async def batch_convert_unit(request: BatchConvertRequest = Depends(json_body(BatchConvertRequest))):
     """
-    単位の大きさを取得（ソート用）
+    一括単位変換を実行するAPIエンドポイント
 
     Args:
-        category: カテゴリ
-        unit: 単位コード
+        request: 一括変換リクエスト
 
     Returns:
-        float: 単位の大きさ（基準単位に対する比率）
+        BatchConvertResponse: 変換結果（無効なカテゴリまたは変換元単位の場合はエラーレスポンス）
     """
-    from converters.length import UNITS_TO_METERS
-    from converters.weight import UNITS_TO_GRAMS
-
-    if category == "length":
-        return UNITS_TO_METERS.get(unit, 0)
-    elif category == "weight":
-        return UNITS_TO_GRAMS.get(unit, 0)
-    elif category == "temperature":
-        # 温度は変換係数がないため、定義順
-        temp_order = {'kelvin': 3, 'celsius': 2, 'fahrenheit': 1}
-        return temp_order.get(unit, 0)
-    return 0
-
-
-@router.post("/convert/batch", response_model=BatchConvertResponse, responses={400: {"model": ErrorResponse}})
-async def batch_convert_unit(request: BatchConvertRequest):
+    # カテゴリ設定を取得
+    config = CATEGORY_CONFIG.get(request.category)
+    if config is None:
+        return _error_response(InvalidCategoryError(request.category))
+
+    # from_unitの検証（別名は単位コードに解決）
+    from_unit = config["resolve_unit_func"](request.from_unit)
+    if from_unit is None:
+        return _invalid_unit_response(config, request.from_unit)
+    access_log.annotate(request.category, from_unit)
+
+    # 変換先単位リストの決定
+    if request.to_units is None:
+        # to_unitsが省略された場合、from_unitを除く全単位
+        target_units = [unit for unit in config["get_units_func"]() if unit != from_unit]
+    else:
+        target_units = request.to_units
+
+    # 大きなペイロードは変換とエンコードをスレッドプールで実行
+    if offloader.should_offload(len(target_units)):
+        return await offloader.run(
+            lambda: _encode_response(_batch_convert(request, config, from_unit, target_units))
+        )
+    return _batch_convert(request, config, from_unit, target_units)
+
+
+def _batch_convert(
+    request: BatchConvertRequest, config: dict, from_unit: str, target_units: list[str]
+) -> BatchConvertResponse:
     """
-    一括単位変換を実行するAPIエンドポイント
+    一括変換を実行してレスポンスモデルを構築する
 
     Args:
         request: 一括変換リクエスト
+        config: カテゴリ設定
+        from_unit: 変換元の単位コード
+        target_units: 変換先単位のリスト（別名を含んでもよい）
 
     Returns:
-        BatchConvertResponse: 変換結果
-
-    Raises:
-        HTTPException: 無効なカテゴリまたは単位が指定された場合
+        BatchConvertResponse: 変換結果（無効な単位は failed_units に記録）
     """
-    try:
-        # カテゴリ設定を取得
-        if request.category not in CATEGORY_CONFIG:
-            raise InvalidCategoryError(request.category)
-
-        config = CATEGORY_CONFIG[request.category]
-        convert_func = config["convert_func"]
-        get_units_func = config["get_units_func"]
-        all_units = get_units_func()
-
-        # from_unitの検証
-        if request.from_unit not in all_units:
-            raise InvalidUnitError(request.from_unit)
-
-        # 変換先単位リストの決定
-        if request.to_units is None:
-            # to_unitsが省略された場合、from_unitを除く全単位
-            target_units = [unit for unit in all_units if unit != request.from_unit]
+    convert_func, _, rates = _converters(config)
+    resolve_unit = config["resolve_unit_func"]
+    best_unit = config.get("best_unit_func")
+
+    # 各単位への変換を実行（無効な単位は失敗として記録）
+    results = []
+    failed_units = []
+
+    for unit in target_units:
+        if is_auto_unit(unit):
+            # 変換先 auto: 値の大きさに応じて読みやすい単位を選ぶ（対応していないカテゴリは失敗として記録）
+            if best_unit is None:
+                failed_units.append(unit)
+                continue
+            to_unit, converted_value = best_unit(request.value, from_unit, request.unit_system)
+            results.append(ConversionResult(to_unit=to_unit, value=converted_value, auto=True))
+            continue
+        to_unit = resolve_unit(unit)
+        if to_unit is not None:
+            converted_value = convert_func(request.value, from_unit, to_unit)
+            results.append(ConversionResult(to_unit=to_unit, value=converted_value))
         else:
-            target_units = request.to_units
-
-        # 各単位への変換を実行
-        results = []
-        failed_units = []
-
-        for to_unit in target_units:
-            try:
-                converted_value = convert_func(request.value, request.from_unit, to_unit)
-                results.append(ConversionResult(to_unit=to_unit, value=converted_value))
-            except ValueError as e:
-                # 変換に失敗した単位を記録（ログも出力）
-                import logging
-                logging.warning(f"Failed to convert {request.value} {request.from_unit} to {to_unit}: {str(e)}")
-                failed_units.append(to_unit)
-
-        # 結果を単位の大きさ順にソート（降順）
-        results.sort(key=lambda r: _get_unit_size_order(request.category, r.to_unit), reverse=True)
-
-        return BatchConvertResponse(
+            failed_units.append(unit)
+
+    # 失敗した単位はリクエストごとにまとめて1回だけログ出力
+    if failed_units:
+        logger.warning(
+            f"Batch conversion from {from_unit} ({request.category}): "
+            f"{len(failed_units)} unit(s) failed: {', '.join(failed_units)}"
+        )
+
+    # 結果を単位の大きさ順にソート（降順）
+    unit_size = config["unit_size_func"]
+    results.sort(key=lambda r: unit_size(r.to_unit), reverse=True)
+
+    return BatchConvertResponse(
+        success=True,
+        original_value=request.value,
+        from_unit=from_unit,
+        category=request.category,
+        results=results,
+        failed_units=failed_units,
+        **_rate_fields(rates)
+    )
+
+
+@router.post(
+    "/convert/bulk", response_model=BulkConvertResponse, response_model_exclude_none=True,
+    responses={400: {"model": ErrorResponse}, 413: {"model": ErrorResponse}}, openapi_extra=json_body_openapi(BulkConvertRequest))
+async def bulk_convert_unit(request: BulkConvertRequest = Depends(json_body(BulkConvertRequest))):
+    """
+    複数の値を同じ単位ペアでまとめて変換するAPIエンドポイント
+
+    Args:
+        request: 大量変換リクエスト
+
+    Returns:
+        BulkConvertResponse: 変換結果（無効なカテゴリまたは単位の場合はエラーレスポンス）
+    """
+    # カテゴリ設定を取得
+    config = CATEGORY_CONFIG.get(request.category)
+    if config is None:
+        return _error_response(InvalidCategoryError(request.category))
+
+    # 単位の検証（別名は単位コードに解決）
+    resolve_unit = config["resolve_unit_func"]
+    from_unit = resolve_unit(request.from_unit)
+    if from_unit is None:
+        return _invalid_unit_response(config, request.from_unit)
+
+    # 変換先 auto: 値ごとに読みやすい単位を選んで変換
+    if is_auto_unit(request.to_unit):
+        best_units_many = config.get("best_units_many_func")
+        if best_units_many is None:
+            return _error_response(AutoUnitNotSupportedError(request.category))
+        access_log.annotate(request.category, from_unit, AUTO_UNIT)
+
+        def build_auto() -> BulkConvertResponse:
+            units, results = best_units_many(request.values, from_unit, request.unit_system)
+            return BulkConvertResponse(
+                success=True,
+                from_unit=from_unit,
+                to_unit=AUTO_UNIT,
+                category=request.category,
+                results=results,
+                units=units
+            )
+
+        # 大きなペイロードは変換とエンコードをスレッドプールで実行
+        if offloader.should_offload(len(request.values)):
+            return await offloader.run(lambda: _encode_response(build_auto()))
+        return build_auto()
+
+    to_unit = resolve_unit(request.to_unit)
+    if to_unit is None:
+        return _invalid_unit_response(config, request.to_unit)
+    access_log.annotate(request.category, from_unit, to_unit)
+
+    _, convert_many, rates = _converters(config)
+
+    def build() -> BulkConvertResponse:
+        return BulkConvertResponse(
             success=True,
-            original_value=request.value,
-            from_unit=request.from_unit,
+            from_unit=from_unit,
+            to_unit=to_unit,
             category=request.category,
-            results=results,
-            failed_units=failed_units
+            results=convert_many(request.values, from_unit, to_unit),
+            **_rate_fields(rates)
         )
 
-    except ValueError as e:
-        # 変換関数からのValueErrorをカスタム例外に変換
-        error_msg = str(e)
-        if "Invalid unit:" in error_msg:
-            unit = error_msg.split("Invalid unit:")[-1].strip()
-            raise InvalidUnitError(unit)
-        else:
-            raise ValidationError(error_msg)
+    # 大きなペイロードは変換とエンコードをスレッドプールで実行
+    if offloader.should_offload(len(request.values)):
+        return await offloader.run(lambda: _encode_response(build()))
+    return build()
+
+
+@router.get("/categories", response_model=CategoriesResponse)
+async def get_categories():
+    """
+    利用可能なカテゴリ一覧を取得するAPIエンドポイント
+
+    Returns:
+        CategoriesResponse: カテゴリ一覧（組み込みカテゴリ、単位カタログの順）
+    """
+    return CategoriesResponse(
+        categories=[
+            CategoryInfo(code=category, name=config["name"])
+            for category, config in CATEGORY_CONFIG.items()
+        ]
+    )
 
 
 @router.get("/units/{category}", response_model=UnitsResponse, responses={404: {"model": ErrorResponse}})
@@ -309,18 +677,16 @@ async def get_units(category: str):
     カテゴリ別の利用可能な単位一覧を取得するAPIエンドポイント
 
     Args:
-        category: 単位カテゴリ (length, weight, temperature)
+        category: 単位カテゴリ (length, weight, temperature, area など)
 
     Returns:
-        UnitsResponse: 単位一覧
-
-    Raises:
-        CategoryNotFoundError: 無効なカテゴリが指定された場合 (404)
+        UnitsResponse: 単位一覧（無効なカテゴリの場合は404のエラーレスポンス）
     """
-    if category not in CATEGORY_CONFIG:
-        raise CategoryNotFoundError(category)
+    config = CATEGORY_CONFIG.get(category)
+    if config is None:
+        return _error_response(CategoryNotFoundError(category))
+    access_log.annotate(category)
 
-    config = CATEGORY_CONFIG[category]
     get_units_info_func = config["get_units_info_func"]
     units_info = get_units_info_func()
 
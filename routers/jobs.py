@@ -0,0 +1,253 @@
+"""
+非同期変換ジョブAPIルーター
+
+1回のHTTPリクエストでは扱えない大きな変換を、ジョブとして受け付けて
+バックグラウンドで実行するためのAPIエンドポイントを提供
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import FileResponse, JSONResponse
+from pydantic import BaseModel, Field
+
+from config import (
+    JOBS_CHUNK_SIZE,
+    JOBS_RETENTION_SECONDS,
+    JOBS_SPOOL_DIR,
+    JOBS_WORKERS,
+    MAX_ARRAY_LENGTH,
+    MAX_BODY_SIZE
+)
+from exceptions import (
+    InvalidCategoryError,
+    InvalidUnitError,
+    JobNotFoundError,
+    JobNotReadyError,
+    PayloadTooLargeError
+)
+from jobs import STATUS_COMPLETED, JobManager, TextSpool
+from routers.convert import (
+    CATEGORY_CONFIG,
+    BulkConvertRequest,
+    ErrorResponse,
+    _error_response,
+    json_body,
+    json_body_openapi
+)
+
+router = APIRouter(prefix="/api", tags=["jobs"])
+
+job_manager = JobManager(
+    spool_dir=JOBS_SPOOL_DIR,
+    max_workers=JOBS_WORKERS,
+    chunk_size=JOBS_CHUNK_SIZE,
+    retention_seconds=JOBS_RETENTION_SECONDS,
+)
+
+
+class JobSubmitResponse(BaseModel):
+    """ジョブ受付レスポンスのモデル"""
+    success: bool = Field(default=True, description="受付が成功したかどうか")
+    job_id: str = Field(..., description="ジョブID")
+    status: str = Field(..., description="ジョブの状態 (queued, running, completed, failed)")
+    status_url: str = Field(..., description="状態取得APIのURL")
+    result_url: str = Field(..., description="結果取得APIのURL")
+
+
+class JobStatusResponse(BaseModel):
+    """ジョブ状態レスポンスのモデル"""
+    success: bool = Field(default=True, description="取得が成功したかどうか")
+    job_id: str = Field(..., description="ジョブID")
+    status: str = Field(..., description="ジョブの状態 (queued, running, completed, failed)")
+    category: str = Field(..., description="変換カテゴリ")
+    from_unit: str = Field(..., description="変換元の単位")
+    to_unit: str = Field(..., description="変換先の単位")
+    total: int = Field(..., description="入力値の数")
+    processed: int = Field(..., description="変換済みの値の数")
+    progress: float = Field(..., description="進捗 (0.0〜1.0)")
+    created_at: str = Field(..., description="作成日時 (ISO 8601)")
+    finished_at: str | None = Field(None, description="完了日時 (ISO 8601)")
+    expires_at: str | None = Field(None, description="結果の有効期限 (ISO 8601)")
+    error: str | None = Field(None, description="失敗時のエラーメッセージ")
+
+
+def _isoformat(timestamp: float | None) -> str | None:
+    """UNIX時刻をISO 8601形式に変換する"""
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+def _resolve_units(category: str, from_unit: str, to_unit: str) -> tuple[str, str] | JSONResponse:
+    """
+    カテゴリと単位を検証し、単位の表記を単位コードに解決する
+
+    Returns:
+        tuple[str, str] | JSONResponse: (変換元, 変換先) の単位コード（無効な場合はエラーレスポンス）
+    """
+    config = CATEGORY_CONFIG.get(category)
+    if config is None:
+        return _error_response(InvalidCategoryError(category))
+    resolved = []
+    for unit in (from_unit, to_unit):
+        code = config["resolve_unit_func"](unit)
+        if code is None:
+            return _error_response(InvalidUnitError(unit, config["suggest_units_func"](unit)))
+        resolved.append(code)
+    return resolved[0], resolved[1]
+
+
+def _submitted(job_id: str) -> JSONResponse:
+    """ジョブ受付レスポンス (202) を生成する"""
+    response = JobSubmitResponse(
+        job_id=job_id,
+        status="queued",
+        status_url=f"/api/jobs/{job_id}",
+        result_url=f"/api/jobs/{job_id}/result",
+    )
+    return JSONResponse(status_code=202, content=response.model_dump())
+
+
+@router.post(
+    "/jobs", status_code=202, response_model=JobSubmitResponse,
+    responses={400: {"model": ErrorResponse}, 413: {"model": ErrorResponse}}, openapi_extra=json_body_openapi(BulkConvertRequest)
+)
+async def submit_job(request: BulkConvertRequest = Depends(json_body(BulkConvertRequest))):
+    """
+    値のリストを変換ジョブとして受け付けるAPIエンドポイント
+
+    Args:
+        request: 変換リクエスト（/api/convert/bulk と同じ形式）
+
+    Returns:
+        JobSubmitResponse: ジョブIDと状態取得・結果取得のURL
+    """
+    units = _resolve_units(request.category, request.from_unit, request.to_unit)
+    if isinstance(units, JSONResponse):
+        return units
+
+    # スプールへの書き込みはイベントループを止めないようにスレッドで行う
+    job_id = await asyncio.to_thread(job_manager.create_job, request.category, *units)
+    total = await asyncio.to_thread(job_manager.write_values, job_id, request.values)
+    await asyncio.to_thread(job_manager.submit, job_id, total, CATEGORY_CONFIG[request.category]["convert_many_func"])
+    return _submitted(job_id)
+
+
+@router.post(
+    "/jobs/upload", status_code=202, response_model=JobSubmitResponse,
+    responses={400: {"model": ErrorResponse}, 413: {"model": ErrorResponse}}
+)
+async def upload_job(request: Request, category: str, from_unit: str, to_unit: str):
+    """
+    1行1値のテキストファイルを変換ジョブとして受け付けるAPIエンドポイント
+
+    リクエストボディはメモリに保持せず、受信したチャンクごとにディスクへ書き出す。
+    ボディが MAX_BODY_SIZE バイト、値（空行を除いた行）が MAX_ARRAY_LENGTH 個を超えた時点で
+    413を返し、書き出した入力を削除する。
+
+    Args:
+        request: リクエスト（ボディは1行1値のテキスト）
+        category: 変換カテゴリ
+        from_unit: 変換元の単位
+        to_unit: 変換先の単位
+
+    Returns:
+        JobSubmitResponse: ジョブIDと状態取得・結果取得のURL
+    """
+    units = _resolve_units(category, from_unit, to_unit)
+    if isinstance(units, JSONResponse):
+        return units
+
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > MAX_BODY_SIZE:
+        raise PayloadTooLargeError(f"Request body exceeds {MAX_BODY_SIZE} bytes")
+
+    job_id = await asyncio.to_thread(job_manager.create_job, category, *units)
+    spool = await asyncio.to_thread(TextSpool, job_manager.input_path(job_id))
+    try:
+        async for chunk in request.stream():
+            if not chunk:
+                continue
+            if spool.size + len(chunk) > MAX_BODY_SIZE:
+                raise PayloadTooLargeError(f"Request body exceeds {MAX_BODY_SIZE} bytes")
+            await asyncio.to_thread(spool.write, chunk)
+            if spool.count > MAX_ARRAY_LENGTH:
+                raise PayloadTooLargeError(f"Input has more than {MAX_ARRAY_LENGTH} values")
+        await asyncio.to_thread(spool.close)
+        if spool.count > MAX_ARRAY_LENGTH:
+            raise PayloadTooLargeError(f"Input has more than {MAX_ARRAY_LENGTH} values")
+    except Exception:
+        await asyncio.to_thread(spool.close)
+        await asyncio.to_thread(job_manager.delete_job, job_id)
+        raise
+
+    await asyncio.to_thread(job_manager.submit, job_id, spool.count, CATEGORY_CONFIG[category]["convert_many_func"])
+    return _submitted(job_id)
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse, responses={404: {"model": ErrorResponse}})
+async def get_job_status(job_id: str):
+    """
+    ジョブの状態と進捗を取得するAPIエンドポイント
+
+    Args:
+        job_id: ジョブID
+
+    Returns:
+        JobStatusResponse: ジョブの状態（存在しない・期限切れの場合は404のエラーレスポンス）
+    """
+    meta = await asyncio.to_thread(job_manager.get_job, job_id)
+    if meta is None:
+        return _error_response(JobNotFoundError(job_id))
+
+    if meta["status"] == STATUS_COMPLETED:
+        progress = 1.0
+    elif meta["total"] > 0:
+        progress = min(1.0, meta["processed"] / meta["total"])
+    else:
+        progress = 0.0
+
+    return JobStatusResponse(
+        job_id=job_id,
+        status=meta["status"],
+        category=meta["category"],
+        from_unit=meta["from_unit"],
+        to_unit=meta["to_unit"],
+        total=meta["total"],
+        processed=meta["processed"],
+        progress=progress,
+        created_at=_isoformat(meta["created_at"]),
+        finished_at=_isoformat(meta["finished_at"]),
+        expires_at=_isoformat(job_manager.expires_at(meta)),
+        error=meta["error"],
+    )
+
+
+@router.get(
+    "/jobs/{job_id}/result",
+    response_class=FileResponse,
+    responses={404: {"model": ErrorResponse}, 409: {"model": ErrorResponse}}
+)
+async def get_job_result(job_id: str):
+    """
+    完了したジョブの結果（1行1値のテキスト）をダウンロードするAPIエンドポイント
+
+    Args:
+        job_id: ジョブID
+
+    Returns:
+        FileResponse: 変換結果（未完了の場合は409、存在しない場合は404のエラーレスポンス）
+    """
+    meta = await asyncio.to_thread(job_manager.get_job, job_id)
+    if meta is None:
+        return _error_response(JobNotFoundError(job_id))
+    if meta["status"] != STATUS_COMPLETED:
+        return _error_response(JobNotReadyError(job_id, meta["status"]))
+
+    return FileResponse(
+        job_manager.output_path(job_id),
+        media_type="text/plain",
+        filename=f"metrix-job-{job_id}.txt",
+    )
@@ -0,0 +1,143 @@
+"""
+為替レートの履歴APIルーター
+
+日付を指定した通貨換算（その日以前で最新のレートを使う）のAPIエンドポイントを提供
+"""
+
+import logging
+import math
+from datetime import date
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from config import RATE_HISTORY_PATH
+from converters.rate_history import RateHistory, RateHistoryError
+from exceptions import InvalidUnitError, RateHistoryUnavailableError, RateNotAvailableError
+from routers.convert import (
+    CATEGORY_CONFIG,
+    ErrorResponse,
+    _encode_response,
+    _error_response,
+    json_body,
+    json_body_openapi,
+    offloader
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["currency"])
+
+# 履歴ストア（起動時、または最初のリクエストでメモリマップする）
+_history: RateHistory | None = None
+
+
+def get_rate_history() -> RateHistory | None:
+    """
+    為替レートの履歴ストアを返す
+
+    Returns:
+        RateHistory | None: 履歴ストア（設定されていない場合はNone）
+
+    Raises:
+        OSError: 履歴を読み込めない場合
+        RateHistoryError: 履歴が不正な場合
+    """
+    global _history
+    if _history is None and RATE_HISTORY_PATH is not None:
+        _history = RateHistory(RATE_HISTORY_PATH)
+    return _history
+
+
+class HistoricalConvertRequest(BaseModel):
+    """日付を指定した通貨換算リクエストのモデル"""
+    values: list[float] = Field(..., description="変換する値のリスト")
+    dates: list[date] = Field(..., description="値ごとの日付のリスト (YYYY-MM-DD、values と同じ長さ)")
+    from_unit: str = Field(..., description="変換元の通貨")
+    to_unit: str = Field(..., description="変換先の通貨")
+
+    @field_validator('values')
+    @classmethod
+    def validate_values(cls, v: list[float]) -> list[float]:
+        """値のバリデーション"""
+        for value in v:
+            if math.isnan(value) or math.isinf(value):
+                raise ValueError("Values must be finite numbers")
+        return v
+
+    @field_validator('from_unit', 'to_unit')
+    @classmethod
+    def validate_unit(cls, v: str) -> str:
+        """単位のバリデーション（空文字チェック）"""
+        if not v or not v.strip():
+            raise ValueError("Unit cannot be empty")
+        return v.strip()
+
+    @model_validator(mode='after')
+    def validate_lengths(self) -> 'HistoricalConvertRequest':
+        """値と日付の数が一致することを検証する"""
+        if len(self.values) != len(self.dates):
+            raise ValueError("values and dates must have the same length")
+        return self
+
+
+class HistoricalConvertResponse(BaseModel):
+    """日付を指定した通貨換算レスポンスのモデル"""
+    success: bool = Field(default=True, description="変換が成功したかどうか")
+    from_unit: str = Field(..., description="変換元の通貨")
+    to_unit: str = Field(..., description="変換先の通貨")
+    results: list[float] = Field(..., description="変換後の値のリスト（入力と同じ順序）")
+    rate_dates: list[date] = Field(..., description="実際に使ったレートの日付のリスト（指定日以前で最新）")
+
+
+@router.post(
+    "/currency/historical",
+    response_model=HistoricalConvertResponse,
+    responses={400: {"model": ErrorResponse}, 413: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+    openapi_extra=json_body_openapi(HistoricalConvertRequest),
+)
+async def convert_historical(request: HistoricalConvertRequest = Depends(json_body(HistoricalConvertRequest))):
+    """
+    各値をそれぞれの日付時点の為替レートで換算するAPIエンドポイント
+
+    Args:
+        request: 日付を指定した通貨換算リクエスト
+
+    Returns:
+        HistoricalConvertResponse: 変換結果（履歴がない場合・指定日のレートがない場合はエラーレスポンス）
+    """
+    try:
+        history = get_rate_history()
+    except (OSError, RateHistoryError) as e:
+        logger.error(f"Failed to open rate history: {e}")
+        return _error_response(RateHistoryUnavailableError("Rate history is unavailable"))
+    if history is None:
+        return _error_response(RateHistoryUnavailableError())
+
+    # 単位の検証（別名は通貨コードに解決）
+    config = CATEGORY_CONFIG["currency"]
+    units = []
+    for unit in (request.from_unit, request.to_unit):
+        code = config["resolve_unit_func"](unit)
+        if code is None:
+            return _error_response(InvalidUnitError(unit, config["suggest_units_func"](unit)))
+        units.append(code)
+    from_unit, to_unit = units
+
+    def build() -> HistoricalConvertResponse:
+        results, rate_dates = history.convert_at(request.values, from_unit, to_unit, request.dates)
+        return HistoricalConvertResponse(
+            from_unit=from_unit, to_unit=to_unit, results=results, rate_dates=rate_dates
+        )
+
+    try:
+        # 大きなペイロードは検索とエンコードをスレッドプールで実行
+        if offloader.should_offload(len(request.values)):
+            return await offloader.run(lambda: _encode_response(build()))
+        return build()
+    except RateHistoryError as e:
+        return _error_response(RateNotAvailableError(str(e)))
+    except OSError as e:
+        # 追記された行の読み込みに失敗した場合（ファイルの削除など）
+        logger.error(f"Failed to read rate history: {e}")
+        return _error_response(RateHistoryUnavailableError("Rate history is unavailable"))
@@ -0,0 +1,160 @@
+"""
+換算表APIルーター
+
+開始値・終了値・刻み幅で指定した範囲の換算表（例: 摂氏→華氏を-50〜150の0.5刻み）を
+生成するAPIエンドポイントを提供。JSONはページ単位で返し、CSVは表全体をストリーミングする。
+"""
+
+from collections.abc import Iterator
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+import access_log
+from config import (
+    TABLE_CACHE_MAX_ROWS,
+    TABLE_CACHE_SIZE,
+    TABLE_MAX_PAGE_SIZE,
+    TABLE_MAX_ROWS,
+    TABLE_PAGE_SIZE
+)
+from exceptions import InvalidCategoryError, TableTooLargeError, ValidationError
+from routers.convert import (
+    CATEGORY_CONFIG,
+    ErrorResponse,
+    _converters,
+    _encode_response,
+    _error_response,
+    _invalid_unit_response,
+    _rate_fields,
+    offloader
+)
+from tables import ConversionTableCache, table_size, table_values
+
+router = APIRouter(prefix="/api", tags=["tables"])
+
+# よく要求される換算表の変換結果（2回目の要求から保持する）
+table_cache = ConversionTableCache(max_entries=TABLE_CACHE_SIZE, max_rows=TABLE_CACHE_MAX_ROWS)
+
+# CSVのストリーミングで1回に変換・書き出す行数
+CSV_CHUNK_ROWS = 1000
+
+
+class ConversionTableResponse(BaseModel):
+    """換算表レスポンスのモデル（1ページ分）"""
+    success: bool = Field(default=True, description="生成が成功したかどうか")
+    category: str = Field(..., description="変換カテゴリ")
+    from_unit: str = Field(..., description="変換元の単位")
+    to_unit: str = Field(..., description="変換先の単位")
+    total: int = Field(..., description="換算表全体の行数（終了値を含む）")
+    offset: int = Field(..., description="このページの先頭行（0始まり）")
+    values: list[float] = Field(..., description="変換前の値のリスト")
+    results: list[float] = Field(..., description="変換後の値のリスト（values と同じ順序）")
+    next_offset: int | None = Field(None, description="次のページの先頭行（最後のページの場合は省略）")
+    rate_timestamp: str | None = Field(None, description="換算に使った為替レートの時刻（ISO 8601、通貨のみ）")
+    rate_source: str | None = Field(
+        None, description="換算に使った為替レートの取得元（fixture: オフライン用の固定レート、file: レートファイル。通貨のみ）"
+    )
+
+
+@router.get(
+    "/table", response_model=ConversionTableResponse, response_model_exclude_none=True,
+    responses={400: {"model": ErrorResponse}, 200: {"content": {"text/csv": {}}}}
+)
+async def conversion_table(
+    category: str,
+    from_unit: str,
+    to_unit: str,
+    start: float,
+    stop: float,
+    step: float,
+    offset: int = Query(0, ge=0, description="ページの先頭行（0始まり）"),
+    limit: int = Query(TABLE_PAGE_SIZE, ge=1, le=TABLE_MAX_PAGE_SIZE, description="1ページの行数（JSONのみ）"),
+    output: str = Query("json", alias="format", pattern="^(json|csv)$", description="json（ページ単位）または csv（offset 以降をすべてストリーミング）"),
+):
+    """
+    換算表を生成するAPIエンドポイント
+
+    Args:
+        category: 変換カテゴリ
+        from_unit: 変換元の単位
+        to_unit: 変換先の単位
+        start: 開始値
+        stop: 終了値（刻み幅で到達する場合は含む）
+        step: 刻み幅（start から stop に向かう符号）
+        offset: ページの先頭行
+        limit: 1ページの行数
+        output: 出力形式（json / csv）
+
+    Returns:
+        ConversionTableResponse | StreamingResponse: 換算表（不正な範囲・単位の場合はエラーレスポンス）
+    """
+    config = CATEGORY_CONFIG.get(category)
+    if config is None:
+        return _error_response(InvalidCategoryError(category))
+
+    # 単位の検証（別名は単位コードに解決）
+    resolve_unit = config["resolve_unit_func"]
+    from_code = resolve_unit(from_unit.strip())
+    if from_code is None:
+        return _invalid_unit_response(config, from_unit.strip())
+    to_code = resolve_unit(to_unit.strip())
+    if to_code is None:
+        return _invalid_unit_response(config, to_unit.strip())
+    access_log.annotate(category, from_code, to_code)
+
+    # 範囲の検証（行数は値を生成せずに求める）
+    try:
+        total = table_size(start, stop, step)
+    except ValueError as e:
+        return _error_response(ValidationError(str(e)))
+    if total > TABLE_MAX_ROWS:
+        return _error_response(TableTooLargeError(total, TABLE_MAX_ROWS))
+
+    # 変換関数はリクエストの間固定する（為替レートの更新で表の途中から値が変わらないようにする）
+    _, convert_many, rates = _converters(config)
+
+    def convert_rows(begin: int, end: int) -> list[float]:
+        return convert_many(table_values(start, step, begin, end), from_code, to_code)
+
+    # よく要求される表は全体の変換結果をキャッシュから返す
+    # （カタログの再読み込み・為替レートの更新で設定・レートのスナップショットが変わると作り直す）
+    cached = table_cache.get_or_build(
+        (category, from_code, to_code, start, stop, step),
+        (config, rates),
+        total,
+        lambda: convert_rows(0, total),
+    )
+
+    if output == "csv":
+        def stream() -> Iterator[bytes]:
+            yield f"{from_code},{to_code}\n".encode()
+            for begin in range(offset, total, CSV_CHUNK_ROWS):
+                end = min(begin + CSV_CHUNK_ROWS, total)
+                values = table_values(start, step, begin, end)
+                results = cached[begin:end] if cached is not None else convert_many(values, from_code, to_code)
+                yield "".join(f"{value!r},{result!r}\n" for value, result in zip(values, results)).encode()
+
+        return StreamingResponse(stream(), media_type="text/csv")
+
+    end = min(offset + limit, total)
+
+    def build() -> ConversionTableResponse:
+        begin = min(offset, total)
+        return ConversionTableResponse(
+            category=category,
+            from_unit=from_code,
+            to_unit=to_code,
+            total=total,
+            offset=offset,
+            values=table_values(start, step, begin, end),
+            results=cached[begin:end] if cached is not None else convert_rows(begin, end),
+            next_offset=end if end < total else None,
+            **_rate_fields(rates)
+        )
+
+    # 大きなページは変換とエンコードをスレッドプールで実行
+    if offloader.should_offload(end - offset):
+        return await offloader.run(lambda: _encode_response(build()))
+    return build()
@@ -0,0 +1,158 @@
+"""
+本番用サーバー起動スクリプト
+
+CPU数・cgroupのCPU制限からワーカー数を決定し、uvloop/httptoolsを有効にしてuvicornを起動する
+
+使い方:
+    python server.py [--workers N] [--port 8080] ...
+"""
+
+import argparse
+import importlib.util
+import math
+import os
+from pathlib import Path
+
+import uvicorn
+
+from config import _env_int
+
+# cgroupのマウントポイント
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def _read_text(path: Path) -> str | None:
+    """ファイルを読み込む（存在しない・読めない場合はNone）"""
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def detect_cgroup_cpu_limit(cgroup_root: Path = CGROUP_ROOT) -> float | None:
+    """
+    cgroupで設定されたCPUクォータを取得する
+
+    Args:
+        cgroup_root: cgroupファイルシステムのルート
+
+    Returns:
+        float | None: 利用可能なCPU数（制限がない場合はNone）
+    """
+    # cgroup v2: "<quota> <period>" または "max <period>"
+    cpu_max = _read_text(cgroup_root / "cpu.max")
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            try:
+                return int(quota) / int(period)
+            except (ValueError, ZeroDivisionError):
+                return None
+        return None
+
+    # cgroup v1: quotaが-1の場合は無制限
+    quota = _read_text(cgroup_root / "cpu" / "cpu.cfs_quota_us")
+    period = _read_text(cgroup_root / "cpu" / "cpu.cfs_period_us")
+    if quota and period:
+        try:
+            quota_us, period_us = int(quota), int(period)
+        except ValueError:
+            return None
+        if quota_us > 0 and period_us > 0:
+            return quota_us / period_us
+    return None
+
+
+def available_cpus() -> int:
+    """プロセスに割り当てられたCPU数を返す（CPUアフィニティを考慮）"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def default_worker_count(cgroup_root: Path = CGROUP_ROOT) -> int:
+    """
+    デフォルトのワーカー数を決定する
+
+    CPUアフィニティとcgroupのCPUクォータのうち小さい方を採用する。
+
+    Args:
+        cgroup_root: cgroupファイルシステムのルート
+
+    Returns:
+        int: ワーカー数（1以上）
+    """
+    cpus = available_cpus()
+    cgroup_limit = detect_cgroup_cpu_limit(cgroup_root)
+    if cgroup_limit is not None:
+        cpus = min(cpus, math.ceil(cgroup_limit))
+    return max(1, cpus)
+
+
+def _has_module(name: str) -> bool:
+    """モジュールがインストールされているかを確認"""
+    return importlib.util.find_spec(name) is not None
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """コマンドライン引数を解析する（環境変数をデフォルト値として使用）"""
+    parser = argparse.ArgumentParser(description="metrix production server")
+    parser.add_argument("--host", default=os.getenv("METRIX_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=_env_int("PORT", 8080))
+    parser.add_argument(
+        "--workers", type=int, default=_env_int("METRIX_WORKERS", 0),
+        help="ワーカー数（0の場合はCPU数・cgroup制限から自動決定）"
+    )
+    parser.add_argument(
+        "--keep-alive", type=int, default=_env_int("METRIX_KEEP_ALIVE", 15),
+        help="Keep-Aliveのタイムアウト秒数"
+    )
+    parser.add_argument(
+        "--backlog", type=int, default=_env_int("METRIX_BACKLOG", 2048),
+        help="listenソケットのバックログ"
+    )
+    parser.add_argument(
+        "--graceful-timeout", type=int, default=_env_int("METRIX_GRACEFUL_TIMEOUT", 30),
+        help="シャットダウン時に処理中のリクエストを待つ秒数"
+    )
+    parser.add_argument(
+        "--healthcheck-timeout", type=int, default=_env_int("METRIX_WORKER_HEALTHCHECK_TIMEOUT", 5),
+        help="ワーカーの死活監視のタイムアウト秒数"
+    )
+    return parser.parse_args(argv)
+
+
+def build_uvicorn_options(args: argparse.Namespace) -> dict:
+    """
+    uvicorn.runに渡すオプションを構築する
+
+    Args:
+        args: コマンドライン引数
+
+    Returns:
+        dict: uvicorn.runのキーワード引数
+    """
+    workers = args.workers if args.workers > 0 else default_worker_count()
+    return {
+        "host": args.host,
+        "port": args.port,
+        "workers": workers,
+        "loop": "uvloop" if _has_module("uvloop") else "asyncio",
+        "http": "httptools" if _has_module("httptools") else "h11",
+        "timeout_keep_alive": args.keep_alive,
+        "backlog": args.backlog,
+        "timeout_graceful_shutdown": args.graceful_timeout,
+        "timeout_worker_healthcheck": args.healthcheck_timeout,
+        "proxy_headers": True,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """サーバーを起動する"""
+    options = build_uvicorn_options(parse_args(argv))
+    # 複数ワーカー時はuvicornのスーパーバイザーが落ちたワーカーを再起動する
+    uvicorn.run("main:app", **options)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,15 +17,145 @@ const batchResultContent = document.getElementById('batch-result-content');
 const errorSection = document.getElementById('error-section');
 const errorMessage = document.getElementById('error-message');
 
+// 入力が止まってから自動で変換するまでの待ち時間（ミリ秒）
+const INPUT_DEBOUNCE_MS = 300;
+
+/**
+ * 上限付きのメモリキャッシュ
+ * 上限を超えると最も長く使われていないものから破棄し、有効期間を過ぎたものは使わない
+ */
+class BoundedCache {
+    /**
+     * @param {number} maxEntries - 保持する件数の上限
+     * @param {number} ttlMs - 有効期間（ミリ秒）
+     */
+    constructor(maxEntries, ttlMs) {
+        this.maxEntries = maxEntries;
+        this.ttlMs = ttlMs;
+        this.entries = new Map();
+    }
+
+    /**
+     * キャッシュから取得（使った項目は最も新しいものとして扱う）
+     * @param {string} key - キー
+     * @returns {*} - 保持している値（ない場合・期限切れの場合はundefined）
+     */
+    get(key) {
+        const entry = this.entries.get(key);
+        if (entry === undefined) {
+            return undefined;
+        }
+        this.entries.delete(key);
+        if (Date.now() - entry.time > this.ttlMs) {
+            return undefined;
+        }
+        this.entries.set(key, entry);
+        return entry.value;
+    }
+
+    /**
+     * キャッシュに保存（上限を超えた場合は最も古いものを破棄）
+     * @param {string} key - キー
+     * @param {*} value - 値
+     */
+    set(key, value) {
+        this.entries.delete(key);
+        this.entries.set(key, { value, time: Date.now() });
+        if (this.entries.size > this.maxEntries) {
+            this.entries.delete(this.entries.keys().next().value);
+        }
+    }
+}
+
+/**
+ * 最新のリクエストだけを有効にする（新しいリクエストを始めると前のリクエストを中断する）
+ */
+class LatestRequest {
+    constructor() {
+        this.controller = null;
+        this.kind = null;
+    }
+
+    /**
+     * 前のリクエストを中断し、新しいリクエスト用のシグナルを返す
+     * @param {string} kind - リクエストの種類（ローディング表示の管理用）
+     * @returns {AbortSignal} - fetchに渡すシグナル
+     */
+    start(kind) {
+        this.cancel();
+        this.controller = new AbortController();
+        this.kind = kind;
+        return this.controller.signal;
+    }
+
+    /**
+     * 実行中のリクエストを中断
+     */
+    cancel() {
+        if (this.controller) {
+            this.controller.abort();
+            this.controller = null;
+            this.kind = null;
+        }
+    }
+
+    /**
+     * リクエストの完了を記録（最新のリクエストの場合のみ）
+     * @param {AbortSignal} signal - 完了したリクエストのシグナル
+     */
+    finish(signal) {
+        if (this.isCurrent(signal)) {
+            this.controller = null;
+            this.kind = null;
+        }
+    }
+
+    /**
+     * シグナルが最新のリクエストのものかどうか
+     * @param {AbortSignal} signal - シグナル
+     * @returns {boolean}
+     */
+    isCurrent(signal) {
+        return this.controller !== null && this.controller.signal === signal;
+    }
+
+    /**
+     * 指定した種類のリクエストが実行中かどうか
+     * @param {string} kind - リクエストの種類
+     * @returns {boolean}
+     */
+    isBusy(kind) {
+        return this.controller !== null && this.kind === kind;
+    }
+}
+
+// 直近の変換結果（為替レートの更新を反映するため短めの有効期間）と単位一覧のキャッシュ
+const conversionCache = new BoundedCache(200, 60 * 1000);
+const unitsCache = new BoundedCache(32, 10 * 60 * 1000);
+
+// 変換（単一・一括は結果の表示先を共有するため同じ枠で管理）と単位一覧の読み込み
+const conversionRequest = new LatestRequest();
+const unitsRequest = new LatestRequest();
+let inputDebounceTimer = null;
+
+// Service Workerを登録（再訪問時はUIと単位データをキャッシュから読み込む）
+if ('serviceWorker' in navigator) {
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register('/sw.js').catch(() => {
+            // 登録できない環境（HTTPなど）では通常どおりネットワークから読み込む
+        });
+    });
+}
+
 // 初期化処理
 document.addEventListener('DOMContentLoaded', () => {
-    // 初期カテゴリ（length）の単位をロード
-    loadUnits('length');
+    // カテゴリ一覧と最初のカテゴリの単位をロード
+    loadCategories();
 
     // イベントリスナーの設定
     categorySelect.addEventListener('change', handleCategoryChange);
-    convertBtn.addEventListener('click', handleConvert);
-    batchConvertBtn.addEventListener('click', handleBatchConvert);
+    convertBtn.addEventListener('click', () => handleConvert());
+    batchConvertBtn.addEventListener('click', () => handleBatchConvert());
 
     // Enterキーで変換を実行
     valueInput.addEventListener('keypress', (e) => {
@@ -33,13 +163,69 @@ document.addEventListener('DOMContentLoaded', () => {
             handleConvert();
         }
     });
+
+    // 入力・単位の変更が落ち着いたら自動で変換
+    valueInput.addEventListener('input', scheduleConvert);
+    fromUnitSelect.addEventListener('change', scheduleConvert);
+    toUnitSelect.addEventListener('change', scheduleConvert);
 });
 
+/**
+ * 入力が止まってから自動で変換する（入力が完了していない間はエラーを表示しない）
+ */
+function scheduleConvert() {
+    clearTimeout(inputDebounceTimer);
+    inputDebounceTimer = setTimeout(() => {
+        if (isInputComplete()) {
+            handleConvert({ silent: true });
+        }
+    }, INPUT_DEBOUNCE_MS);
+}
+
+/**
+ * 変換リクエストを送信（同じリクエストの結果がキャッシュにあれば送信しない）
+ * @param {string} url - APIのURL
+ * @param {Object} requestData - リクエストデータ
+ * @param {AbortSignal} signal - 中断用のシグナル
+ * @returns {Promise<Object>} - APIレスポンスデータ
+ */
+async function postConversion(url, requestData, signal) {
+    const key = `${url} ${JSON.stringify(requestData)}`;
+    const cached = conversionCache.get(key);
+    if (cached !== undefined) {
+        return cached;
+    }
+
+    const response = await fetch(url, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify(requestData),
+        signal
+    });
+
+    const data = await response.json();
+
+    if (!response.ok || !data.success) {
+        throw new Error(data.error || 'Conversion failed');
+    }
+
+    // 成功した結果のみキャッシュする
+    conversionCache.set(key, data);
+    return data;
+}
+
 /**
  * カテゴリ変更時の処理
  */
 async function handleCategoryChange() {
     const category = categorySelect.value;
+    // 前のカテゴリの変換は不要になるため中断
+    clearTimeout(inputDebounceTimer);
+    conversionRequest.cancel();
+    showLoading(false);
+    showBatchLoading(false);
     await loadUnits(category);
     // エラーと結果をクリア
     hideError();
@@ -48,27 +234,62 @@ async function handleCategoryChange() {
 }
 
 /**
- * 指定されたカテゴリの単位一覧を取得してドロップダウンを更新
- * @param {string} category - カテゴリ名 (length, weight, temperature)
+ * カテゴリ一覧を取得してドロップダウンを更新し、最初のカテゴリの単位をロード
  */
-async function loadUnits(category) {
+async function loadCategories() {
     try {
-        showLoading(true);
-
-        const response = await fetch(`/api/units/${category}`);
+        const response = await fetch('/api/categories');
 
         if (!response.ok) {
-            throw new Error(`Failed to load units: ${response.statusText}`);
+            throw new Error(`Failed to load categories: ${response.statusText}`);
         }
 
         const data = await response.json();
 
+        categorySelect.innerHTML = '';
+        data.categories.forEach((category) => {
+            categorySelect.add(new Option(category.name, category.code));
+        });
+    } catch (error) {
+        showError(`カテゴリの読み込みに失敗しました: ${error.message}`);
+        return;
+    }
+
+    if (categorySelect.value) {
+        await loadUnits(categorySelect.value);
+    }
+}
+
+/**
+ * 指定されたカテゴリの単位一覧を取得してドロップダウンを更新
+ * @param {string} category - カテゴリ名 (length, weight, temperature, area など)
+ */
+async function loadUnits(category) {
+    // カテゴリを素早く切り替えた場合は前の読み込みを中断（古い一覧で上書きしない）
+    const signal = unitsRequest.start('units');
+
+    try {
+        let units = unitsCache.get(category);
+        if (units === undefined) {
+            showLoading(true);
+
+            const response = await fetch(`/api/units/${encodeURIComponent(category)}`, { signal });
+
+            if (!response.ok) {
+                throw new Error(`Failed to load units: ${response.statusText}`);
+            }
+
+            const data = await response.json();
+            units = data.units;
+            unitsCache.set(category, units);
+        }
+
         // ドロップダウンをクリア
         fromUnitSelect.innerHTML = '';
         toUnitSelect.innerHTML = '';
 
         // 単位オプションを追加
-        data.units.forEach((unit, index) => {
+        units.forEach((unit, index) => {
             const fromOption = new Option(unit.name, unit.code);
             const toOption = new Option(unit.name, unit.code);
 
@@ -85,59 +306,69 @@ async function loadUnits(category) {
         });
 
     } catch (error) {
+        if (error.name === 'AbortError') {
+            return;
+        }
         showError(`単位の読み込みに失敗しました: ${error.message}`);
     } finally {
-        showLoading(false);
+        if (unitsRequest.isCurrent(signal)) {
+            unitsRequest.finish(signal);
+            showLoading(false);
+        }
     }
 }
 
 /**
- * 変換ボタンクリック時の処理
+ * 変換ボタンクリック・Enterキー・入力の変更時の処理
+ * @param {Object} [options] - オプション
+ * @param {boolean} [options.silent] - 入力の変更による自動変換（ローディング表示をしない）
  */
-async function handleConvert() {
+async function handleConvert(options = {}) {
+    const silent = options.silent === true;
+
+    // 明示的な変換では待機中の自動変換を取り消す
+    clearTimeout(inputDebounceTimer);
+
     // 入力値のバリデーション
     if (!validateInput()) {
         return;
     }
 
-    // エラーと前の結果をクリア
-    hideError();
-    hideResult();
-    hideBatchResult();
+    // リクエストデータの準備
+    const requestData = {
+        value: parseFloat(valueInput.value),
+        from_unit: fromUnitSelect.value,
+        to_unit: toUnitSelect.value,
+        category: categorySelect.value
+    };
 
-    try {
-        showLoading(true);
+    // 実行中の変換は結果が不要になるため中断
+    const signal = conversionRequest.start('convert');
 
-        // リクエストデータの準備
-        const requestData = {
-            value: parseFloat(valueInput.value),
-            from_unit: fromUnitSelect.value,
-            to_unit: toUnitSelect.value,
-            category: categorySelect.value
-        };
-
-        // API呼び出し
-        const response = await fetch('/api/convert', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify(requestData)
-        });
-
-        const data = await response.json();
-
-        if (!response.ok || !data.success) {
-            throw new Error(data.error || 'Conversion failed');
+    try {
+        if (!silent) {
+            showLoading(true);
         }
 
-        // 結果を表示
+        // API呼び出し（直近に同じ変換をしていればキャッシュから表示）
+        const data = await postConversion('/api/convert', requestData, signal);
+
+        // エラーと前の結果をクリアして結果を表示
+        hideError();
+        hideBatchResult();
         displayResult(data);
 
     } catch (error) {
+        if (error.name === 'AbortError') {
+            return;
+        }
+        hideBatchResult();
         showError(`変換に失敗しました: ${error.message}`);
     } finally {
-        showLoading(false);
+        conversionRequest.finish(signal);
+        if (!conversionRequest.isBusy('convert')) {
+            showLoading(false);
+        }
     }
 }
 
@@ -150,10 +381,9 @@ async function handleBatchConvert() {
         return;
     }
 
-    // エラーと前の結果をクリア
-    hideError();
-    hideResult();
-    hideBatchResult();
+    // 待機中の自動変換を取り消し、実行中の変換は中断
+    clearTimeout(inputDebounceTimer);
+    const signal = conversionRequest.start('batch');
 
     try {
         showBatchLoading(true);
@@ -166,31 +396,38 @@ async function handleBatchConvert() {
             // to_units は省略（全単位に変換）
         };
 
-        // API呼び出し
-        const response = await fetch('/api/convert/batch', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify(requestData)
-        });
-
-        const data = await response.json();
-
-        if (!response.ok || !data.success) {
-            throw new Error(data.error || 'Batch conversion failed');
-        }
+        // API呼び出し（直近に同じ変換をしていればキャッシュから表示）
+        const data = await postConversion('/api/convert/batch', requestData, signal);
 
-        // 結果を表示
+        // エラーと前の結果をクリアして結果を表示
+        hideError();
+        hideResult();
         displayBatchResult(data);
 
     } catch (error) {
+        if (error.name === 'AbortError') {
+            return;
+        }
+        hideResult();
+        hideBatchResult();
         showError(`一括変換に失敗しました: ${error.message}`);
     } finally {
-        showBatchLoading(false);
+        conversionRequest.finish(signal);
+        if (!conversionRequest.isBusy('batch')) {
+            showBatchLoading(false);
+        }
     }
 }
 
+/**
+ * 入力が変換できる状態かどうか（エラーを表示しない判定、自動変換用）
+ * @returns {boolean}
+ */
+function isInputComplete() {
+    const value = valueInput.value.trim();
+    return value !== '' && isFinite(parseFloat(value)) && Boolean(fromUnitSelect.value) && Boolean(toUnitSelect.value);
+}
+
 /**
  * 共通の入力値バリデーション
  * @returns {boolean} - バリデーション結果
@@ -0,0 +1,125 @@
+"""
+換算表の生成とキャッシュ
+
+開始値・終了値・刻み幅で決まる等間隔の値の並び（例: -50℃〜150℃を0.5刻み）を
+カテゴリの一括変換関数でまとめて変換する。値は start + i * step で求め、
+刻み幅の足し込みによる誤差が行数とともに蓄積しないようにする。
+"""
+
+import math
+from collections import OrderedDict
+from collections.abc import Callable
+
+# 浮動小数点の誤差で終了値の行が欠けないようにするための許容幅（刻み幅に対する比率）
+_STOP_TOLERANCE = 1e-9
+
+
+def table_size(start: float, stop: float, step: float) -> int:
+    """
+    換算表の行数を返す（終了値を含む）
+
+    Args:
+        start: 開始値
+        stop: 終了値
+        step: 刻み幅（start から stop に向かう符号）
+
+    Returns:
+        int: 行数
+
+    Raises:
+        ValueError: 値が有限数でない、刻み幅が0、または刻み幅の符号が stop に向かわない場合
+    """
+    if not all(math.isfinite(v) for v in (start, stop, step)):
+        raise ValueError("start, stop and step must be finite numbers")
+    if step == 0:
+        raise ValueError("step must not be zero")
+    span = (stop - start) / step
+    if span < 0:
+        raise ValueError("step must move from start toward stop")
+    if not math.isfinite(span):
+        raise ValueError("Too many rows")
+    return math.floor(span + _STOP_TOLERANCE) + 1
+
+
+def table_values(start: float, step: float, begin: int, end: int) -> list[float]:
+    """
+    換算表の begin 行目から end 行目の手前までの変換前の値を返す
+
+    Args:
+        start: 開始値
+        step: 刻み幅
+        begin: 開始行（0始まり）
+        end: 終了行（この行は含まない）
+
+    Returns:
+        list[float]: 変換前の値のリスト
+    """
+    return [start + i * step for i in range(begin, end)]
+
+
+class ConversionTableCache:
+    """
+    よく要求される換算表の変換結果を保持するLRUキャッシュ
+
+    1回だけ要求された表でキャッシュが埋まらないよう、同じキーが admit_after 回
+    要求された時点で初めて保持する。行数が max_rows を超える表は保持しない。
+    """
+
+    def __init__(self, max_entries: int = 128, max_rows: int = 10000, admit_after: int = 2):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.admit_after = admit_after
+        self.hits = 0
+        self.misses = 0
+        # キー -> (バージョン, 変換後の値のリスト)
+        self._entries: OrderedDict[tuple, tuple[tuple, list[float]]] = OrderedDict()
+        # まだ保持していないキー -> 要求回数（max_entries 件まで）
+        self._seen: OrderedDict[tuple, int] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_build(
+        self, key: tuple, version: tuple, total: int, build: Callable[[], list[float]]
+    ) -> list[float] | None:
+        """
+        換算表全体の変換結果を返す（保持していない場合は条件を満たせば build で生成して保持する）
+
+        Args:
+            key: (category, from_unit, to_unit, start, stop, step)
+            version: 変換結果が変わり得るオブジェクトの組（カテゴリ設定・為替レートなど。同一性で比較する）
+            total: 換算表の行数
+            build: 換算表全体の変換結果を生成する関数
+
+        Returns:
+            list[float] | None: 変換後の値のリスト（キャッシュの対象外の場合はNone）
+        """
+        if total > self.max_rows:
+            return None
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            cached_version, results = entry
+            if len(cached_version) == len(version) and all(a is b for a, b in zip(cached_version, version)):
+                self._entries[key] = entry
+                self.hits += 1
+                return results
+
+        self.misses += 1
+        # 保持していた表が古くなった場合（カタログ・為替レートの更新）はすぐに作り直す
+        count = self.admit_after if entry is not None else self._seen.pop(key, 0) + 1
+        if count < self.admit_after:
+            self._seen[key] = count
+            if len(self._seen) > self.max_entries:
+                self._seen.popitem(last=False)
+            return None
+
+        results = build()
+        self._entries[key] = (version, results)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return results
+
+    def clear(self) -> None:
+        """保持している換算表をすべて破棄する"""
+        self._entries.clear()
+        self._seen.clear()
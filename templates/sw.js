@@ -0,0 +1,127 @@
+/**
+ * metrix Service Worker
+ *
+ * UIの静的ファイル・カテゴリ一覧・単位一覧をインストール時にキャッシュし、キャッシュから返す
+ * （stale-while-revalidate）。再訪問時は変換（POST）以外でサーバーにアクセスしない。
+ * キャッシュ名にはデプロイごとに変わるバージョンを含め、新しいバージョンの有効化時に古いキャッシュを削除する。
+ */
+
+const CACHE_PREFIX = 'metrix-';
+const CACHE_NAME = CACHE_PREFIX + {{ cache_version | tojson }};
+const PRECACHE_URLS = {{ precache_urls | tojson }};
+const CATEGORIES_URL = '/api/categories';
+const UNITS_PREFIX = '/api/units/';
+
+// キャッシュから返した後、バックグラウンドで取得し直すまでの間隔（ミリ秒）
+const REVALIDATE_AFTER_MS = 10 * 60 * 1000;
+// キャッシュに保存した時刻を記録するヘッダー
+const FETCHED_AT_HEADER = 'x-metrix-fetched-at';
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(precache().then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil(deleteOldCaches().then(() => self.clients.claim()));
+});
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    // 変換（POST）などGET以外のリクエストは常にネットワークに送る
+    if (request.method !== 'GET') {
+        return;
+    }
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin || !isCacheable(url.pathname)) {
+        return;
+    }
+    event.respondWith(staleWhileRevalidate(event, request));
+});
+
+/**
+ * キャッシュの対象かどうか
+ * @param {string} pathname - リクエストのパス
+ * @returns {boolean}
+ */
+function isCacheable(pathname) {
+    return PRECACHE_URLS.includes(pathname) || pathname === CATEGORIES_URL || pathname.startsWith(UNITS_PREFIX);
+}
+
+/**
+ * UIの静的ファイル・カテゴリ一覧・全カテゴリの単位一覧をキャッシュする
+ * （1つでも取得できない場合はインストールを失敗させ、次回のアクセスでやり直す）
+ */
+async function precache() {
+    const cache = await caches.open(CACHE_NAME);
+    const categories = await fetchAndCache(cache, new Request(CATEGORIES_URL, { cache: 'reload' }));
+    if (!categories.ok) {
+        throw new Error(`Failed to precache ${CATEGORIES_URL}`);
+    }
+    const data = await categories.json();
+    const urls = [
+        ...PRECACHE_URLS,
+        ...data.categories.map((category) => UNITS_PREFIX + encodeURIComponent(category.code))
+    ];
+    await Promise.all(urls.map(async (url) => {
+        const response = await fetchAndCache(cache, new Request(url, { cache: 'reload' }));
+        if (!response.ok) {
+            throw new Error(`Failed to precache ${url}`);
+        }
+    }));
+}
+
+/**
+ * 現在のバージョン以外のキャッシュを削除する
+ */
+async function deleteOldCaches() {
+    const names = await caches.keys();
+    await Promise.all(
+        names
+            .filter((name) => name.startsWith(CACHE_PREFIX) && name !== CACHE_NAME)
+            .map((name) => caches.delete(name))
+    );
+}
+
+/**
+ * キャッシュがあればそれを返し、古くなっていればバックグラウンドで取得し直す
+ * @param {FetchEvent} event - fetchイベント
+ * @param {Request} request - リクエスト
+ * @returns {Promise<Response>}
+ */
+async function staleWhileRevalidate(event, request) {
+    const cache = await caches.open(CACHE_NAME);
+    const cached = await cache.match(request);
+    if (cached === undefined) {
+        return fetchAndCache(cache, request);
+    }
+    const fetchedAt = Number(cached.headers.get(FETCHED_AT_HEADER)) || 0;
+    if (Date.now() - fetchedAt > REVALIDATE_AFTER_MS) {
+        // 取得し直せない場合（オフラインなど）はキャッシュを使い続ける
+        event.waitUntil(fetchAndCache(cache, request).catch(() => undefined));
+    }
+    return cached;
+}
+
+/**
+ * ネットワークから取得し、成功したレスポンスを取得時刻付きでキャッシュに保存する
+ * @param {Cache} cache - キャッシュ
+ * @param {Request} request - リクエスト
+ * @returns {Promise<Response>} - ネットワークからのレスポンス
+ */
+async function fetchAndCache(cache, request) {
+    const response = await fetch(request);
+    if (response.ok) {
+        const headers = new Headers(response.headers);
+        headers.set(FETCHED_AT_HEADER, String(Date.now()));
+        // ボディは展開済みのため、圧縮に関するヘッダーは保存しない
+        headers.delete('content-encoding');
+        headers.delete('content-length');
+        const body = await response.clone().blob();
+        await cache.put(request, new Response(body, {
+            status: response.status,
+            statusText: response.statusText,
+            headers
+        }));
+    }
+    return response;
+}
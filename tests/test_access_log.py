@@ -0,0 +1,313 @@
+"""
+バイナリ形式のアクセスログと集計ツールのテスト
+"""
+
+import asyncio
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+import access_log
+import main
+from access_log import AccessLogWriter, analyze, read_blocks
+from middleware.fast_lane import FastLaneMiddleware
+from middleware.load_shed import AdaptiveConcurrencyLimiter, LoadSheddingMiddleware
+from middleware.rate_limit import RateLimitMiddleware
+from warmup import dispatch, warmup_requests
+
+BASE_TIME = 1_790_000_000.0
+
+
+def _write(directory, records, **kwargs) -> AccessLogWriter:
+    """(ルート, ステータスコード, 処理時間（秒）, 経過秒数, カテゴリ, 変換元, 変換先) のレコードを書き出す"""
+    writer = AccessLogWriter(str(directory), **kwargs)
+    for route, status, duration, offset, *names in records:
+        writer.write(route, status, duration, BASE_TIME + offset, *names)
+    writer.close()
+    return writer
+
+
+def _records(directory) -> list[tuple]:
+    """ディレクトリ内のすべてのレコードを読み込む"""
+    return [
+        record
+        for path in access_log.log_files([str(directory)])
+        for block in read_blocks(path)
+        for record in access_log.RECORD.iter_unpack(block)
+    ]
+
+
+class TestAccessLogWriter:
+    """AccessLogWriterのテスト"""
+
+    def test_round_trip(self, tmp_path):
+        """書き出したレコードと名前を読み込めること"""
+        writer = _write(tmp_path, [
+            ("POST /api/convert", 200, 0.0012, 0, "length", "m", "km"),
+            ("GET /api/units/{category}", 404, 0.0003, 1, "nope"),
+        ])
+        records = _records(tmp_path)
+        assert [(r[1], r[3]) for r in records] == [(1200, 200), (300, 404)]
+        assert records[0][0] == int(BASE_TIME * 1_000_000)
+        assert records[1][6:] == (0, 0)
+
+        names = access_log.read_names(writer.path)
+        assert names[("route", records[0][2])] == "POST /api/convert"
+        assert names[("unit", records[0][6])] == "m"
+        assert names[("category", records[1][5])] == "nope"
+        assert os.path.getsize(writer.path) == access_log.HEADER.size + 2 * access_log.RECORD.size
+
+    def test_buffered_until_flush(self, tmp_path):
+        """バッファの大きさに達するまではファイルに書き出さないこと"""
+        writer = AccessLogWriter(str(tmp_path), buffer_size=1024, flush_interval=3600)
+        writer.write("POST /api/convert", 200, 0.001)
+        assert writer.path is None
+        for _ in range(1024 // access_log.RECORD.size):
+            writer.write("POST /api/convert", 200, 0.001)
+        assert writer.path is not None
+        writer.close()
+        assert len(_records(tmp_path)) == 1024 // access_log.RECORD.size + 1
+
+    def test_rotation(self, tmp_path):
+        """最大サイズを超えると次のファイルに切り替え、各ファイルに名前を書き出すこと"""
+        max_bytes = access_log.HEADER.size + 10 * access_log.RECORD.size
+        records = [("POST /api/convert", 200, 0.001, i, "length", "m", "km") for i in range(25)]
+        _write(tmp_path, records, max_bytes=max_bytes, buffer_size=access_log.RECORD.size)
+
+        files = access_log.log_files([str(tmp_path)])
+        assert len(files) == 3
+        assert all(os.path.getsize(path) <= max_bytes for path in files)
+        assert len(_records(tmp_path)) == 25
+        for path in files:
+            assert set(access_log.read_names(path).values()) == {"POST /api/convert", "length", "m", "km"}
+
+    def test_duration_clamped(self, tmp_path):
+        """処理時間は32ビットの範囲に収めること"""
+        _write(tmp_path, [("POST /api/convert", 200, 10_000.0, 0), ("POST /api/convert", 200, -1.0, 0)])
+        assert [r[1] for r in _records(tmp_path)] == [0xFFFFFFFF, 0]
+
+    def test_truncated_tail_ignored(self, tmp_path):
+        """書き込み途中で終了した末尾の不完全なレコードは無視すること"""
+        writer = _write(tmp_path, [("POST /api/convert", 200, 0.001, i) for i in range(3)])
+        with open(writer.path, "ab") as f:
+            f.write(b"\x01" * 10)
+        assert len(_records(tmp_path)) == 3
+
+    def test_write_error_drops_records(self, tmp_path):
+        """書き出しに失敗してもリクエストの処理に例外を伝えず、破棄した件数を数えて次の書き出しで復帰すること"""
+        directory = tmp_path / "logs"
+        directory.write_text("not a directory")
+        writer = AccessLogWriter(str(directory), buffer_size=access_log.RECORD.size)
+        for _ in range(3):
+            writer.write("POST /api/convert", 200, 0.001, BASE_TIME, "length", "m", "km")
+        assert writer.dropped_total == 3
+        assert writer.path is None
+
+        directory.unlink()
+        writer.write("POST /api/convert", 200, 0.001, BASE_TIME, "length", "m", "km")
+        writer.close()
+        assert writer.dropped_total == 3
+        assert len(_records(directory)) == 1
+        assert set(access_log.read_names(writer.path).values()) == {"POST /api/convert", "length", "m", "km"}
+
+    def test_prepare(self, tmp_path):
+        """起動時にディレクトリを作成し、作成できない場合はエラーになること"""
+        AccessLogWriter(str(tmp_path / "a" / "b")).prepare()
+        assert (tmp_path / "a" / "b").is_dir()
+        (tmp_path / "file").write_text("")
+        with pytest.raises(OSError):
+            AccessLogWriter(str(tmp_path / "file" / "logs")).prepare()
+
+    def test_not_access_log(self, tmp_path):
+        """形式が不正なファイルはエラーになること"""
+        path = tmp_path / "other.mxlog"
+        path.write_bytes(b"x" * 64)
+        with pytest.raises(ValueError):
+            analyze([str(path)])
+
+
+class TestAnalyze:
+    """analyzeのテスト"""
+
+    def test_percentiles_and_error_rates(self, tmp_path):
+        """ルートごと・全体のパーセンタイルとエラー率を求めること"""
+        records = [("POST /api/convert", 200, (i + 1) / 1000, i, "length", "m", "km") for i in range(100)]
+        records += [("POST /api/convert", 400, 0.5, 100), ("POST /api/convert/bulk", 500, 0.002, 101)]
+        _write(tmp_path, records)
+
+        report = analyze([str(tmp_path)])
+        assert report["records"] == 102
+        convert_route, bulk_route = report["routes"]
+        assert convert_route["route"] == "POST /api/convert"
+        assert convert_route["count"] == 101
+        assert convert_route["p50_ms"] == 51.0
+        assert convert_route["p90_ms"] == 91.0
+        assert convert_route["p99_ms"] == 100.0
+        assert convert_route["max_ms"] == 500.0
+        assert convert_route["client_error_rate"] == pytest.approx(1 / 101)
+        assert convert_route["server_error_rate"] == 0
+        assert bulk_route["server_error_rate"] == 1
+        assert report["overall"]["client_error_rate"] == pytest.approx(1 / 102)
+        assert report["unit_pairs"] == [{"category": "length", "from_unit": "m", "to_unit": "km", "count": 100}]
+
+    def test_top(self, tmp_path):
+        """件数の多い順に上位のルートのみを返すこと"""
+        records = [(f"GET /r{i}", 200, 0.001, 0) for i in range(5) for _ in range(i + 1)]
+        _write(tmp_path, records)
+        report = analyze([str(tmp_path)], top=2)
+        assert [route["route"] for route in report["routes"]] == ["GET /r4", "GET /r3"]
+
+    def test_since_until(self, tmp_path):
+        """期間を指定した場合はその範囲のレコードのみを集計すること"""
+        _write(tmp_path, [("POST /api/convert", 200, 0.001, i) for i in range(100)])
+        report = analyze([str(tmp_path)], since=BASE_TIME + 10, until=BASE_TIME + 20)
+        assert report["records"] == 10
+        assert analyze([str(tmp_path)], since=BASE_TIME + 1000)["records"] == 0
+
+    def test_multiple_files_parallel(self, tmp_path):
+        """複数のファイルを並列に集計しても同じ結果になること"""
+        for index in range(3):
+            _write(tmp_path / f"w{index}", [("POST /api/convert", 200, (i + 1) / 1000, i) for i in range(50)])
+        paths = [str(tmp_path / f"w{index}") for index in range(3)]
+        assert analyze(paths, jobs=2) == analyze(paths)
+        assert analyze(paths)["records"] == 150
+
+    def test_empty(self, tmp_path):
+        """レコードがない場合は件数0を返すこと"""
+        report = analyze([str(tmp_path)])
+        assert report["records"] == 0
+        assert access_log.format_report(report) == "no records\n"
+
+
+class TestAccessLogCli:
+    """集計ツールのコマンドラインのテスト"""
+
+    def test_json(self, tmp_path, capsys):
+        """--json でJSONの集計結果を出力すること"""
+        _write(tmp_path, [("POST /api/convert", 200, 0.001, 0, "length", "m", "km")])
+        assert access_log.main([str(tmp_path), "--json"]) == 0
+        report = json.loads(capsys.readouterr().out)
+        assert report["records"] == 1
+        assert report["routes"][0]["route"] == "POST /api/convert"
+
+    def test_table(self, tmp_path, capsys):
+        """表形式でルートと単位ペアを出力すること"""
+        _write(tmp_path, [("POST /api/convert", 200, 0.001, 0, "length", "m", "km")])
+        assert access_log.main([str(tmp_path), "--since", "2026-01-01"]) == 0
+        out = capsys.readouterr().out
+        assert "POST /api/convert" in out
+        assert "length" in out
+
+    def test_missing_file(self, tmp_path, capsys):
+        """ログファイルを読み込めない場合は終了コード1を返すこと"""
+        assert access_log.main([str(tmp_path / "missing.mxlog")]) == 1
+        assert "metrix-access-log" in capsys.readouterr().err
+
+
+class TestAccessLogIntegration:
+    """APIのリクエストの記録のテスト"""
+
+    @pytest.fixture
+    def writer(self, tmp_path, monkeypatch):
+        writer = AccessLogWriter(str(tmp_path), flush_interval=3600)
+        monkeypatch.setattr(main, "access_log_writer", writer)
+        yield writer
+        writer.close()
+
+    def _report(self, writer, tmp_path) -> dict:
+        writer.flush()
+        return analyze([str(tmp_path)])
+
+    def test_routes_and_units(self, writer, tmp_path):
+        """ルートのテンプレートと変換の単位を記録すること"""
+        client = TestClient(main.app)
+        client.post("/api/convert", json={"value": 1, "from_unit": "m", "to_unit": "km", "category": "length"})
+        client.get("/api/units/length")
+        client.get("/api/units/nope")
+        client.get("/api/no-such-path")
+
+        report = self._report(writer, tmp_path)
+        routes = {route["route"]: route for route in report["routes"]}
+        assert routes["POST /api/convert"]["count"] == 1
+        assert routes["GET /api/units/{category}"]["count"] == 2
+        assert routes["GET /api/units/{category}"]["client_error_rate"] == 0.5
+        assert routes[access_log.UNMATCHED_ROUTE]["client_error_rate"] == 1
+        pairs = {(p["category"], p["from_unit"], p["to_unit"]): p["count"] for p in report["unit_pairs"]}
+        assert pairs[("length", "m", "km")] == 1
+        assert pairs[("length", None, None)] == 1
+
+    def test_fast_lane(self, writer, tmp_path):
+        """高速レーンで処理したリクエストも同じ形式で記録すること"""
+        client = TestClient(FastLaneMiddleware(main.app, wrap=main.wrap_fast_lane_response, access_log_writer=writer))
+        client.post("/api/convert", json={"value": 1, "from_unit": "m", "to_unit": "km", "category": "length"})
+        client.get("/api/units/length")
+
+        report = self._report(writer, tmp_path)
+        assert {route["route"] for route in report["routes"]} == {"POST /api/convert", "GET /api/units/{category}"}
+        pairs = {(p["category"], p["from_unit"], p["to_unit"]) for p in report["unit_pairs"]}
+        assert pairs == {("length", "m", "km"), ("length", None, None)}
+
+    def test_rate_limited(self, writer, tmp_path):
+        """レート制限で拒否したリクエスト（429）もルートのテンプレートで記録すること"""
+        client = TestClient(RateLimitMiddleware(
+            main.app, rate=0.001, burst=1, access_log_writer=writer, routes=main.app.routes
+        ))
+        assert client.get("/api/units/length").status_code == 200
+        assert client.get("/api/units/mass").status_code == 429
+        assert client.get("/api/no-such-path").status_code == 429
+
+        report = self._report(writer, tmp_path)
+        routes = {route["route"]: route for route in report["routes"]}
+        assert routes["GET /api/units/{category}"]["count"] == 2
+        assert routes["GET /api/units/{category}"]["client_error_rate"] == 0.5
+        assert routes[access_log.UNMATCHED_ROUTE]["count"] == 1
+
+    def test_load_shed(self, writer, tmp_path):
+        """負荷制御で拒否したリクエスト（503）も記録し、対象外のパスは拒否しないこと"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=0, min_limit=0)
+        client = TestClient(LoadSheddingMiddleware(
+            main.app, limiter=limiter, exempt_paths=("/health",), access_log_writer=writer, routes=main.app.routes
+        ))
+        response = client.post("/api/convert", json={"value": 1, "from_unit": "m", "to_unit": "km", "category": "length"})
+        assert response.status_code == 503
+        assert client.get("/health").status_code == 200
+
+        report = self._report(writer, tmp_path)
+        routes = {route["route"]: route for route in report["routes"]}
+        assert routes["POST /api/convert"]["count"] == 1
+        assert routes["POST /api/convert"]["server_error_rate"] == 1
+        assert routes["GET /health"]["server_error_rate"] == 0
+
+    @pytest.mark.parametrize("fast_lane", [False, True])
+    def test_warm_up_not_recorded(self, writer, tmp_path, fast_lane):
+        """起動時のウォームアップのリクエストは記録しないこと（通常の経路・高速レーンの両方）"""
+        app = main.app
+        if fast_lane:
+            app = FastLaneMiddleware(app, wrap=main.wrap_fast_lane_response, access_log_writer=writer)
+
+        async def run():
+            return [await dispatch(app, *request) for request in warmup_requests()]
+
+        assert set(asyncio.run(run())) == {200}
+        assert self._report(writer, tmp_path)["records"] == 0
+        assert writer.records_total == 0
+
+    def test_invalid_directory_fails_startup(self, tmp_path, monkeypatch):
+        """ログのディレクトリを作成できない場合は起動時に失敗すること"""
+        (tmp_path / "file").write_text("")
+        monkeypatch.setattr(main, "access_log_writer", AccessLogWriter(str(tmp_path / "file" / "logs")))
+        with pytest.raises(OSError):
+            with TestClient(main.app):
+                pass
+
+    def test_dropped_records_in_metrics(self, writer):
+        """破棄したレコードの件数を /metrics で確認できること"""
+        writer.dropped_total = 5
+        data = TestClient(main.app).get("/metrics").json()
+        assert data["access_log"]["dropped_total"] == 5
+
+    def test_disabled_by_default(self):
+        """既定ではアクセスログを書き出さないこと"""
+        assert main.access_log_writer is None
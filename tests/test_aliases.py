@@ -0,0 +1,83 @@
+"""
+単位の別名の索引のテスト
+"""
+
+from converters.aliases import AliasIndex, BKTree, edit_distance, normalize_unit
+
+
+class TestNormalizeUnit:
+    """normalize_unit関数のテスト"""
+
+    def test_case_and_whitespace(self):
+        """大文字小文字と空白の違いを同一視すること"""
+        assert normalize_unit("  Square   Meters ") == "square meters"
+
+    def test_unicode(self):
+        """Unicodeの互換文字を正規化すること"""
+        assert normalize_unit("℃") == normalize_unit("°C")
+        assert normalize_unit("m²") == "m2"
+        assert normalize_unit("ｋｍ") == "km"
+
+
+class TestBKTree:
+    """BK木のテスト"""
+
+    def test_edit_distance(self):
+        """編集距離を計算できること"""
+        assert edit_distance("kitten", "sitting") == 3
+        assert edit_distance("", "abc") == 3
+        assert edit_distance("meter", "meter") == 0
+
+    def test_search(self):
+        """指定した距離以内の単語を近い順に返すこと"""
+        tree = BKTree(["meter", "meters", "liter", "mile", "inch"])
+        assert tree.search("metr", 1) == [(1, "meter")]
+        assert tree.search("meterz", 1) == [(1, "meter"), (1, "meters")]
+        assert tree.search("xyz", 1) == []
+
+
+class TestAliasIndex:
+    """AliasIndexのテスト"""
+
+    def test_resolve(self):
+        """単位コードと別名を単位コードに解決すること"""
+        index = AliasIndex({"m": ["meter", "meters"], "ft": ["foot", "feet"]})
+        assert index.resolve("m") == "m"
+        assert index.resolve("Meters") == "m"
+        assert index.resolve("FEET") == "ft"
+        assert index.resolve("yard") is None
+
+    def test_ambiguous_alias(self):
+        """正規化すると複数の単位に一致する表記は解決しないこと"""
+        index = AliasIndex({"Mm": [], "mm": []})
+        assert index.resolve("Mm") == "Mm"
+        assert index.resolve("mm") == "mm"
+        assert index.resolve("MM") is None
+        assert index.suggest("MM") == ["Mm", "mm"]
+
+    def test_prefixed_symbols(self):
+        """正規化した単位コードが別の単位の記号と一致する場合だけ解決せず、候補として返すこと"""
+        index = AliasIndex(
+            {"MB": ["megabyte"], "kB": [], "mL": ["ml", "milliliter"]},
+            symbols=[("MB", "MB"), ("mB", "mB"), ("kB", "kB"), ("mL", "mL"), ("ML", "ML")],
+        )
+        assert index.resolve("MB") == "MB"
+        assert index.resolve("Mb") is None
+        assert index.resolve("KB") == "kB"
+        assert index.resolve("MegaByte") == "MB"
+        assert index.suggest("Mb")[0] == "MB"
+        # 別名として明示した表記は記号と一致しても解決する
+        assert index.resolve("ml") == "mL"
+
+    def test_suggest(self):
+        """綴り間違いに近い単位コードを返すこと"""
+        index = AliasIndex({"m": ["meter", "meters"], "ft": ["foot", "feet"]})
+        assert index.suggest("metr") == ["m"]
+        assert index.suggest("fet") == ["ft"]
+
+    def test_suggest_bounds(self):
+        """遠すぎる表記や長すぎる入力には候補を返さないこと"""
+        index = AliasIndex({"m": ["meter"], "ft": ["foot"]})
+        assert index.suggest("kilogram") == []
+        assert index.suggest("m" * 1000) == []
+        assert index.suggest("") == []
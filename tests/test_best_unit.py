@@ -0,0 +1,135 @@
+"""
+読みやすい単位（auto）の選択のテスト
+"""
+
+import pytest
+
+from converters.best_unit import MagnitudeIndex, is_auto_unit
+from converters.catalog import CatalogError, compile_category
+from converters.length import best_length_unit, best_length_units_many, convert_length
+from converters.weight import best_weight_unit, best_weight_units_many, convert_weight
+
+
+class TestMagnitudeIndex:
+    """MagnitudeIndexのテスト"""
+
+    def setup_method(self):
+        self.index = MagnitudeIndex(
+            {"mm": 0.001, "m": 1.0, "km": 1000.0, "ft": 0.3048},
+            {"mm": "metric", "m": "metric", "km": "metric", "ft": "imperial"},
+        )
+
+    @pytest.mark.parametrize("base_value, expected", [
+        (0.5, "ft"),
+        (1.0, "m"),
+        (999.0, "m"),
+        (1000.0, "km"),
+        (-2500.0, "km"),
+        (1e-9, "mm"),
+    ])
+    def test_best(self, base_value, expected):
+        """値の絶対値が1以上になる最大の単位が選ばれること"""
+        assert self.index.best(base_value) == expected
+
+    def test_system(self):
+        """単位系を指定した場合はその単位系の単位から選ばれること"""
+        assert self.index.best(0.5, "metric") == "mm"
+        assert self.index.best(5000.0, "imperial") == "ft"
+
+    def test_zero_uses_zero_factor(self):
+        """値が0の場合は zero_factor の大きさで選ばれること"""
+        assert self.index.best(0.0, zero_factor=1000.0) == "km"
+
+    def test_best_many(self):
+        """複数の値をまとめて選べること（best と同じ結果）"""
+        values = [0.5, 1.0, 1000.0, -3.0, 0.0]
+        assert self.index.best_many(values, "metric") == [self.index.best(v, "metric") for v in values]
+
+    def test_invalid_system(self):
+        """無効な単位系はValueErrorになること"""
+        with pytest.raises(ValueError):
+            self.index.best(1.0, "nautical")
+
+    def test_is_auto_unit(self):
+        """auto の判定は大文字小文字・前後の空白を区別しないこと"""
+        assert is_auto_unit(" Auto ")
+        assert not is_auto_unit("autumn")
+
+
+class TestBestLengthUnit:
+    """長さ・重さの読みやすい単位への変換のテスト"""
+
+    def test_example(self):
+        """0.000342 km は 34.2 cm になること"""
+        assert best_length_unit(0.000342, "km") == ("cm", pytest.approx(34.2))
+
+    @pytest.mark.parametrize("value, from_unit, expected", [
+        (12, "in", "ft"),
+        (3, "ft", "yd"),
+        (1760, "yd", "mi"),
+        (1000, "m", "km"),
+        (0.01, "m", "cm"),
+    ])
+    def test_exact_boundary(self, value, from_unit, expected):
+        """係数の丸め誤差があっても境界ちょうどの値は上の単位の1になること"""
+        assert best_length_unit(value, from_unit) == (expected, 1.0)
+        assert best_length_units_many([value, -value], from_unit) == ([expected] * 2, [1.0, -1.0])
+
+    def test_exact_boundary_weight(self):
+        """重さでも境界ちょうどの値は上の単位の1になること"""
+        assert best_weight_unit(16, "oz") == ("lb", 1.0)
+        assert best_weight_unit(1000, "g") == ("kg", 1.0)
+
+    def test_keeps_source_system(self):
+        """単位系を省略した場合は変換元の単位と同じ単位系から選ばれること"""
+        assert best_length_unit(5280, "ft")[0] == "mi"
+        assert best_length_unit(1500, "m")[0] == "km"
+        assert best_length_unit(1500, "μm")[0] == "mm"
+
+    def test_explicit_system(self):
+        """単位系を指定すると変換元と異なる単位系で返ること"""
+        unit, value = best_length_unit(100, "cm", "imperial")
+        assert unit == "yd"
+        assert value == convert_length(100, "cm", "yd")
+        assert best_weight_unit(1500, "g", "imperial")[0] == "lb"
+
+    def test_same_result_as_convert(self):
+        """選んだ単位への変換結果が通常の変換と同じであること"""
+        values = [0.001, 0.5, 42.0, 12345.678, -7.0]
+        units, results = best_weight_units_many(values, "kg")
+        assert results == [convert_weight(v, "kg", u) for v, u in zip(values, units)]
+
+    def test_many_matches_scalar(self):
+        """一括版と単一版の結果が一致すること"""
+        values = [0.0, 0.003, 1.0, 950.0, 2e6]
+        units, results = best_length_units_many(values, "m")
+        assert list(zip(units, results)) == [best_length_unit(v, "m") for v in values]
+
+    def test_invalid_unit(self):
+        """無効な単位はValueErrorになること"""
+        with pytest.raises(ValueError):
+            best_length_unit(1, "parsec")
+
+
+class TestCatalogBestUnit:
+    """単位カタログのカテゴリの読みやすい単位のテスト"""
+
+    def test_catalog_category(self):
+        """係数だけのカテゴリでは単位系に応じて選ばれること"""
+        config = compile_category("area", {"units": {
+            "m2": {"factor": 1, "system": "metric"},
+            "km2": {"factor": 1000000, "system": "metric"},
+            "ft2": {"factor": 0.09290304, "system": "imperial"},
+        }})
+        assert config["best_unit_func"](2500000, "m2") == ("km2", 2.5)
+        assert config["best_units_many_func"]([1, 2], "m2", "imperial")[0] == ["ft2", "ft2"]
+
+    def test_affine_category(self):
+        """offset を持つカテゴリでは auto を使えないこと"""
+        config = compile_category("temp", {"units": {"K": {"factor": 1}, "C": {"factor": 1, "offset": 273.15}}})
+        assert config["best_unit_func"] is None
+
+    def test_invalid_system(self):
+        """不正な単位系はCatalogErrorになること"""
+        with pytest.raises(CatalogError):
+            compile_category("broken", {"units": {"m": {"factor": 1, "system": "si"}}})
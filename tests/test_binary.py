@@ -0,0 +1,113 @@
+"""
+バイナリファイルの単位変換のテスト
+"""
+
+from array import array
+
+import pytest
+
+from converters.binary import convert_binary_file, main
+from converters.length import convert_length
+from converters.temperature import convert_temperature
+
+
+def _write(path, code: str, values: list[float]) -> None:
+    """値をバイナリファイルに書き出す"""
+    with open(path, "wb") as f:
+        array(code, values).tofile(f)
+
+
+def _read(path, code: str) -> list[float]:
+    """バイナリファイルの値を読み込む"""
+    data = array(code)
+    data.frombytes(path.read_bytes())
+    return data.tolist()
+
+
+class TestConvertBinaryFile:
+    """convert_binary_file関数のテスト"""
+
+    def test_float64_across_windows(self, tmp_path):
+        """複数の窓にまたがるファイルが順序を保って変換されること"""
+        values = [float(i) * 0.5 for i in range(3000)]
+        src, dst = tmp_path / "in.f64", tmp_path / "out.f64"
+        _write(src, "d", values)
+
+        count = convert_binary_file(str(src), str(dst), "length", "m", "ft", chunk_size=512)
+
+        assert count == 3000
+        assert _read(dst, "d") == [convert_length(v, "m", "ft") for v in values]
+
+    def test_float32_to_float64(self, tmp_path):
+        """float32の入力をfloat64で出力できること"""
+        values = [-40.0, 0.0, 100.0]
+        src, dst = tmp_path / "in.f32", tmp_path / "out.f64"
+        _write(src, "f", values)
+
+        convert_binary_file(str(src), str(dst), "temperature", "celsius", "fahrenheit",
+                            dtype="float32", out_dtype="float64")
+
+        assert _read(dst, "d") == [convert_temperature(v, "celsius", "fahrenheit") for v in values]
+
+    @pytest.mark.parametrize("dtype, out_dtype", [("float32", "float64"), ("float64", "float32")])
+    @pytest.mark.parametrize("chunk_size", [1000, 100000])
+    def test_mixed_dtypes_across_windows(self, tmp_path, dtype, out_dtype, chunk_size):
+        """入出力の型が異なっても、複数の窓のオフセットが入出力の両方で境界に揃うこと"""
+        codes = {"float32": "f", "float64": "d"}
+        values = [float(i) for i in range(250000)]
+        src, dst = tmp_path / "in.bin", tmp_path / "out.bin"
+        _write(src, codes[dtype], values)
+
+        count = convert_binary_file(str(src), str(dst), "weight", "kg", "g",
+                                    dtype=dtype, out_dtype=out_dtype, chunk_size=chunk_size)
+
+        assert count == len(values)
+        assert _read(dst, codes[out_dtype]) == array(codes[out_dtype], [v * 1000 for v in values]).tolist()
+
+    def test_empty_file(self, tmp_path):
+        """空のファイルは空の出力になること"""
+        src, dst = tmp_path / "in.f64", tmp_path / "out.f64"
+        src.write_bytes(b"")
+        assert convert_binary_file(str(src), str(dst), "weight", "kg", "g") == 0
+        assert dst.read_bytes() == b""
+
+    def test_truncated_file(self, tmp_path):
+        """値のサイズの倍数でないファイルはエラーになること"""
+        src = tmp_path / "in.f64"
+        src.write_bytes(b"\x00" * 12)
+        with pytest.raises(ValueError, match="not a multiple"):
+            convert_binary_file(str(src), str(tmp_path / "out.f64"), "length", "m", "km")
+
+    def test_invalid_unit(self, tmp_path):
+        """無効な単位はファイルを作成する前にエラーになること"""
+        src, dst = tmp_path / "in.f64", tmp_path / "out.f64"
+        _write(src, "d", [1.0])
+        with pytest.raises(ValueError, match="Invalid unit"):
+            convert_binary_file(str(src), str(dst), "length", "m", "xyz")
+        assert not dst.exists()
+
+    def test_same_file_rejected(self, tmp_path):
+        """入力と出力が同じファイルの場合はエラーになること"""
+        src = tmp_path / "in.f64"
+        _write(src, "d", [1.0])
+        with pytest.raises(ValueError, match="different files"):
+            convert_binary_file(str(src), str(src), "length", "m", "km")
+
+
+class TestBinaryCommandLine:
+    """コマンドラインのテスト"""
+
+    def test_main(self, tmp_path):
+        """コマンドラインから変換できること"""
+        src, dst = tmp_path / "in.f64", tmp_path / "out.f64"
+        _write(src, "d", [1.0, 2.5])
+        code = main([str(src), str(dst), "--category", "length", "--from", "km", "--to", "m"])
+        assert code == 0
+        assert _read(dst, "d") == [1000.0, 2500.0]
+
+    def test_main_error(self, tmp_path, capsys):
+        """エラー時は終了コード1とメッセージを返すこと"""
+        code = main([str(tmp_path / "missing"), str(tmp_path / "out"), "--category", "length",
+                     "--from", "m", "--to", "km"])
+        assert code == 1
+        assert "error:" in capsys.readouterr().err
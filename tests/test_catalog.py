@@ -0,0 +1,200 @@
+"""
+単位カタログのテスト
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from converters import BUILTIN_CATEGORIES
+from converters.catalog import CatalogError, compile_category, load_catalog, watch_catalog
+from converters.registry import CategoryRegistry
+from main import app
+
+CATALOG_V1 = """
+categories:
+  luminous_flux:
+    name: Luminous Flux
+    units:
+      lm: {name: ルーメン, factor: 1}
+      klm: {name: キロルーメン, factor: 1000}
+"""
+
+CATALOG_V2 = CATALOG_V1 + """      mlm: {name: ミリルーメン, factor: 0.001}
+"""
+
+
+class TestLoadCatalog:
+    """同梱カタログの読み込みのテスト"""
+
+    def test_categories(self):
+        """同梱カタログのカテゴリが読み込まれること"""
+        catalog = load_catalog()
+        for category in ("area", "volume", "speed", "time", "pressure", "energy", "data_size"):
+            assert category in catalog
+
+    @pytest.mark.parametrize("category,value,from_unit,to_unit,expected", [
+        ("area", 1, "km2", "m2", 1000000.0),
+        ("area", 1, "ha", "a", 100.0),
+        ("volume", 1, "L", "mL", 1000.0),
+        ("speed", 1, "mph", "km/h", 1.609344),
+        ("time", 2, "h", "min", 120.0),
+        ("pressure", 1, "atm", "kPa", 101.325),
+        ("energy", 1, "kWh", "J", 3600000.0),
+        ("data_size", 1, "GiB", "MiB", 1024.0),
+    ])
+    def test_convert(self, category, value, from_unit, to_unit, expected):
+        """カタログのカテゴリで変換できること"""
+        config = load_catalog()[category]
+        assert config["convert_func"](value, from_unit, to_unit) == pytest.approx(expected)
+        assert config["convert_many_func"]([value], from_unit, to_unit) == [
+            config["convert_func"](value, from_unit, to_unit)
+        ]
+
+    def test_invalid_unit(self):
+        """カタログのカテゴリでも無効な単位はValueErrorになること"""
+        config = load_catalog()["area"]
+        assert config["is_valid_unit_func"]("m2")
+        assert not config["is_valid_unit_func"]("m")
+        with pytest.raises(ValueError, match="Invalid unit: m"):
+            config["convert_func"](1, "m", "m2")
+
+
+class TestCompileCategory:
+    """compile_category関数のテスト"""
+
+    def test_affine_units(self):
+        """offsetを持つ単位が変換できること"""
+        config = compile_category("temp", {"units": {
+            "C": {"factor": 1},
+            "F": {"factor": 5 / 9, "offset": -32 * 5 / 9},
+        }})
+        assert config["convert_func"](212, "F", "C") == pytest.approx(100.0)
+        assert config["convert_many_func"]([0, 100], "C", "F") == pytest.approx([32.0, 212.0])
+
+    def test_prefixed_units(self):
+        """prefixes を指定した単位は接頭辞付きの単位も変換できること"""
+        config = compile_category("data", {"units": {
+            "B": {"factor": 1, "prefixes": ["si", "binary"]},
+            "bit": {"factor": 0.125},
+        }})
+        assert config["convert_func"](1, "KiB", "B") == 1024
+        assert config["convert_many_func"]([1, 2], "MB", "kB") == [1000.0, 2000.0]
+        assert config["prefixed_unit_func"]("GiB") == "GiB"
+        assert config["is_valid_unit_func"]("kbit") is False
+        assert config["get_units_func"]() == ["B", "bit"]
+
+    @pytest.mark.parametrize("units", [
+        {},
+        {"a": {"name": "A"}},
+        {"a": {"factor": 0}},
+        {"a": {"factor": "1"}},
+        {"a": 1},
+        {"a": {"factor": 1, "prefixes": "metric"}},
+        {"a": {"factor": 1, "offset": 1, "prefixes": "si"}},
+    ])
+    def test_invalid_definition(self, units):
+        """不正な定義はCatalogErrorになること"""
+        with pytest.raises(CatalogError):
+            compile_category("broken", {"units": units})
+
+
+class TestCategoryRegistry:
+    """CategoryRegistryのテスト"""
+
+    def test_reload_swaps_catalog(self, tmp_path):
+        """再読み込みで新しいカタログに差し替わること"""
+        path = tmp_path / "catalog.yaml"
+        path.write_text(CATALOG_V1, encoding="utf-8")
+        registry = CategoryRegistry(BUILTIN_CATEGORIES, path)
+        old = registry["luminous_flux"]
+        assert registry.categories_for("klm") == ("luminous_flux",)
+
+        path.write_text(CATALOG_V2, encoding="utf-8")
+        registry.reload()
+        assert registry["luminous_flux"] is not old
+        assert registry["luminous_flux"]["is_valid_unit_func"]("mlm")
+        # 差し替え前に取得した設定はそのまま使える
+        assert not old["is_valid_unit_func"]("mlm")
+
+    def test_invalid_reload_keeps_catalog(self, tmp_path):
+        """不正なカタログへの再読み込みは失敗し、現在のカタログが使われ続けること"""
+        path = tmp_path / "catalog.yaml"
+        path.write_text(CATALOG_V1, encoding="utf-8")
+        registry = CategoryRegistry(BUILTIN_CATEGORIES, path)
+        assert "luminous_flux" in registry
+
+        path.write_text("categories: [", encoding="utf-8")
+        with pytest.raises(CatalogError):
+            registry.reload()
+        assert "luminous_flux" in registry
+
+    def test_builtin_conflict(self, tmp_path):
+        """組み込みカテゴリと同名のカテゴリはCatalogErrorになること"""
+        path = tmp_path / "catalog.yaml"
+        path.write_text("categories:\n  length:\n    units:\n      m: {factor: 1}\n", encoding="utf-8")
+        registry = CategoryRegistry(BUILTIN_CATEGORIES, path)
+        with pytest.raises(CatalogError, match="already defined"):
+            len(registry)
+
+    def test_watch_triggers_reload(self, tmp_path):
+        """カタログファイルを編集すると再読み込みされること"""
+        path = tmp_path / "catalog.yaml"
+        path.write_text(CATALOG_V1, encoding="utf-8")
+        registry = CategoryRegistry(BUILTIN_CATEGORIES, path)
+        assert not registry.categories_for("mlm")
+
+        async def scenario():
+            stop = asyncio.Event()
+            reloaded = asyncio.Event()
+            loop = asyncio.get_running_loop()
+
+            def on_change():
+                # イベントループのスレッドでは呼び出されない
+                assert threading.current_thread() is not threading.main_thread()
+                registry.reload()
+                loop.call_soon_threadsafe(reloaded.set)
+
+            task = asyncio.create_task(watch_catalog(path, on_change, stop, debounce_ms=50))
+            await asyncio.sleep(0.2)
+            path.write_text(CATALOG_V2, encoding="utf-8")
+            await asyncio.wait_for(reloaded.wait(), timeout=5)
+            stop.set()
+            await asyncio.wait_for(task, timeout=5)
+
+        asyncio.run(scenario())
+        assert registry.categories_for("mlm") == ("luminous_flux",)
+
+
+class TestCatalogAPI:
+    """カタログのカテゴリを使ったAPIのテスト"""
+
+    def test_categories_endpoint(self):
+        """カテゴリ一覧に組み込みカテゴリとカタログのカテゴリが含まれること"""
+        client = TestClient(app)
+        response = client.get("/api/categories")
+        assert response.status_code == 200
+        codes = [category["code"] for category in response.json()["categories"]]
+        assert codes[:3] == ["length", "weight", "temperature"]
+        assert "data_size" in codes
+
+    def test_convert(self):
+        """カタログのカテゴリで変換APIが使えること"""
+        client = TestClient(app)
+        response = client.post(
+            "/api/convert",
+            json={"value": 1, "from_unit": "kn", "to_unit": "km/h", "category": "speed"}
+        )
+        assert response.status_code == 200
+        assert response.json()["result"] == pytest.approx(1.852)
+
+    def test_batch_sorted_by_size(self):
+        """一括変換の結果が単位の大きさ順に並ぶこと"""
+        client = TestClient(app)
+        response = client.post(
+            "/api/convert/batch",
+            json={"value": 1, "from_unit": "s", "category": "time", "to_units": ["ms", "h", "min"]}
+        )
+        assert [r["to_unit"] for r in response.json()["results"]] == ["h", "min", "ms"]
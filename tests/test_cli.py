@@ -0,0 +1,84 @@
+"""
+metrix コマンドラインツールのテスト
+"""
+
+import io
+import json
+
+import pytest
+
+from cli import ConversionError, convert_stream, main
+
+
+def _run(text: str, *args, **kwargs) -> str:
+    """文字列を入力としてconvert_streamを実行し、出力を返す"""
+    out = io.StringIO()
+    convert_stream(io.StringIO(text), out, *args, **kwargs)
+    return out.getvalue()
+
+
+class TestConvertStream:
+    """convert_stream関数のテスト"""
+
+    def test_plain(self):
+        """1行1値の入力が変換されること（空行は無視）"""
+        assert _run("1\n\n2.5\n", "length", "km", "m") == "1000.0\n2500.0\n"
+
+    def test_csv_by_name(self):
+        """CSVの列を名前で指定した場合、ヘッダーを保って対象の列だけが変換されること"""
+        text = "id,temp\na,0\nb,100\n"
+        result = _run(text, "temperature", "celsius", "kelvin", fmt="csv", column="temp")
+        assert result == "id,temp\na,273.15\nb,373.15\n"
+
+    def test_csv_by_index(self):
+        """CSVの列を番号で指定できること"""
+        assert _run("1,x\n2,y\n", "weight", "kg", "g", fmt="csv", column="0") == "1000.0,x\n2000.0,y\n"
+
+    def test_ndjson(self):
+        """NDJSONの指定フィールドが変換され、他のフィールドが保たれること"""
+        text = '{"id": 1, "v": 1}\n{"id": 2, "v": 3}\n'
+        lines = _run(text, "length", "m", "cm", fmt="ndjson", field="v").splitlines()
+        assert [json.loads(line) for line in lines] == [{"id": 1, "v": 100.0}, {"id": 2, "v": 300.0}]
+
+    def test_invalid_value_reports_line(self):
+        """解析できない値は行番号付きのエラーになること"""
+        with pytest.raises(ConversionError, match="line 3"):
+            _run("id,v\na,1\nb,x\n", "length", "m", "cm", fmt="csv", column="v", chunk_size=1)
+
+    def test_missing_field(self):
+        """NDJSONのフィールドがない場合はエラーになること"""
+        with pytest.raises(ConversionError, match="field 'value' not found"):
+            _run('{"x": 1}\n', "length", "m", "cm", fmt="ndjson")
+
+    def test_invalid_unit(self):
+        """無効な単位は入力を読む前にエラーになること"""
+        with pytest.raises(ValueError, match="Invalid unit"):
+            _run("1\n", "length", "m", "xyz")
+
+    def test_jobs_preserve_order(self):
+        """プロセスプールで並列に変換しても入力の順序が保たれること"""
+        text = "".join(f"{i}\n" for i in range(2000))
+        result = _run(text, "length", "m", "mm", jobs=2, chunk_size=100)
+        assert result == "".join(f"{i * 1000.0!r}\n" for i in range(2000))
+
+
+class TestMain:
+    """main関数のテスト"""
+
+    def test_files(self, tmp_path, capsys):
+        """複数のファイルを順に変換し、CSVのヘッダーは1回だけ出力すること"""
+        first, second = tmp_path / "a.csv", tmp_path / "b.csv"
+        first.write_text("v\n1\n")
+        second.write_text("v\n2\n")
+        code = main([str(first), str(second), "--category", "length", "--from", "m", "--to", "cm",
+                     "--format", "csv", "--column", "v"])
+        assert code == 0
+        assert capsys.readouterr().out == "v\n100.0\n200.0\n"
+
+    def test_error_exit_code(self, tmp_path, capsys):
+        """変換エラーの場合は終了コード1を返すこと"""
+        path = tmp_path / "values.txt"
+        path.write_text("abc\n")
+        code = main([str(path), "--category", "length", "--from", "m", "--to", "cm"])
+        assert code == 1
+        assert "invalid number" in capsys.readouterr().err
@@ -0,0 +1,128 @@
+"""
+単一変換のマイクロバッチ処理のテスト
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import routers.convert
+from coalescer import ConversionCoalescer
+from converters.length import convert_length, convert_length_many
+from converters.temperature import convert_temperature_many
+from main import app
+
+
+def _length():
+    """長さの一括変換関数（レートの時刻なし）"""
+    return convert_length_many, None
+
+
+def _temperature():
+    """温度の一括変換関数（レートの時刻なし）"""
+    return convert_temperature_many, None
+
+
+class TestConversionCoalescer:
+    """ConversionCoalescerのテスト"""
+
+    def test_concurrent_requests_coalesced(self):
+        """同時に届いた変換が1回の一括変換にまとめられること"""
+        async def scenario():
+            coalescer = ConversionCoalescer(window=0.01, max_batch=1000)
+            futures = [
+                coalescer.submit(_length, "length", float(i), "m", "ft")
+                for i in range(100)
+            ]
+            results = await asyncio.gather(*futures)
+            return coalescer, results
+
+        coalescer, results = asyncio.run(scenario())
+        assert coalescer.batches_total == 1
+        assert coalescer.requests_total == 100
+        assert results == [(convert_length(float(i), "m", "ft"), None) for i in range(100)]
+
+    def test_grouped_by_unit_pair(self):
+        """(カテゴリ, 変換元, 変換先) ごとにグループ化されること"""
+        async def scenario():
+            coalescer = ConversionCoalescer(window=0.01)
+            results = await asyncio.gather(
+                coalescer.submit(_length, "length", 1.0, "km", "m"),
+                coalescer.submit(_length, "length", 2.0, "km", "m"),
+                coalescer.submit(_temperature, "temperature", 100.0, "celsius", "fahrenheit"),
+            )
+            return coalescer, results
+
+        coalescer, results = asyncio.run(scenario())
+        assert coalescer.batches_total == 2
+        assert [result for result, _ in results] == [1000.0, 2000.0, 212.0]
+
+    def test_flush_on_max_batch(self):
+        """最大バッチサイズに達すると時間窓を待たずに実行されること"""
+        async def scenario():
+            coalescer = ConversionCoalescer(window=60.0, max_batch=3)
+            futures = [coalescer.submit(_length, "length", 1.0, "m", "cm") for _ in range(3)]
+            return await asyncio.wait_for(asyncio.gather(*futures), timeout=1.0)
+
+        assert asyncio.run(scenario()) == [(100.0, None)] * 3
+
+    def test_error_propagated(self):
+        """一括変換の例外が各Futureに伝播すること"""
+        async def scenario():
+            coalescer = ConversionCoalescer(window=0.001)
+            return await coalescer.submit(_length, "length", 1.0, "m", "xyz")
+
+        with pytest.raises(ValueError, match="Invalid unit: xyz"):
+            asyncio.run(scenario())
+
+    def test_snapshot_resolved_once_per_flush(self):
+        """一括変換関数は実行時にカテゴリごとに1回だけ取得し、結果とそのレートの時刻を返すこと"""
+        snapshots = []
+
+        def resolve():
+            # 呼び出すたびにレートが更新されたスナップショットを返す
+            rate = float(len(snapshots) + 1)
+            snapshots.append(rate)
+            return (lambda values, from_unit, to_unit: [value * rate for value in values]), f"t{rate:g}"
+
+        async def scenario():
+            coalescer = ConversionCoalescer(window=0.01)
+            return await asyncio.gather(
+                coalescer.submit(resolve, "currency", 1.0, "USD", "JPY"),
+                coalescer.submit(resolve, "currency", 2.0, "USD", "EUR"),
+                coalescer.submit(resolve, "currency", 3.0, "USD", "JPY"),
+            )
+
+        assert asyncio.run(scenario()) == [(1.0, "t1"), (2.0, "t1"), (3.0, "t1")]
+        assert snapshots == [1.0]
+
+
+class TestConvertEndpointWithCoalescer:
+    """コアレッサー有効時の /api/convert のテスト"""
+
+    def test_convert_via_coalescer(self, monkeypatch):
+        """コアレッサー経由でも同じ結果が返ること"""
+        coalescer = ConversionCoalescer(window=0.001)
+        monkeypatch.setattr(routers.convert, "coalescer", coalescer)
+        client = TestClient(app)
+        response = client.post(
+            "/api/convert",
+            json={"value": 100, "from_unit": "m", "to_unit": "km", "category": "length"}
+        )
+        assert response.status_code == 200
+        assert response.json()["result"] == 0.1
+        assert coalescer.requests_total == 1
+
+    def test_currency_rate_timestamp(self, monkeypatch):
+        """通貨の換算ではコアレッサー経由でも使ったレートの時刻を返すこと"""
+        coalescer = ConversionCoalescer(window=0.001)
+        monkeypatch.setattr(routers.convert, "coalescer", coalescer)
+        client = TestClient(app)
+        response = client.post(
+            "/api/convert",
+            json={"value": 1, "from_unit": "USD", "to_unit": "USD", "category": "currency"}
+        )
+        assert response.status_code == 200
+        assert response.json()["result"] == 1
+        assert response.json()["rate_timestamp"] == routers.convert.CATEGORY_CONFIG["currency"]["rates_func"]().timestamp
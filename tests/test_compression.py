@@ -0,0 +1,171 @@
+"""
+レスポンス圧縮ミドルウェアのテスト
+"""
+
+import asyncio
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from main import app
+from middleware.compression import CompressionMiddleware, ZSTD_AVAILABLE, _parse_accept_encoding
+
+
+def _build_app(minimum_size: int = 100) -> FastAPI:
+    """テスト用の小さなアプリケーションを構築"""
+    test_app = FastAPI()
+    test_app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+
+    @test_app.get("/api/small")
+    async def small():
+        return PlainTextResponse("x" * 10)
+
+    @test_app.get("/api/large")
+    async def large():
+        return PlainTextResponse("metrix " * 1000)
+
+    @test_app.get("/api/stream")
+    async def stream():
+        async def generate():
+            for i in range(50):
+                yield f"line {i}\n".encode()
+        return StreamingResponse(generate(), media_type="text/plain")
+
+    @test_app.get("/other/large")
+    async def other_large():
+        return PlainTextResponse("metrix " * 1000)
+
+    return test_app
+
+
+def _call(middleware, accept_encoding: str) -> list[dict]:
+    """ミドルウェアを直接呼び出し、送信されたメッセージを返す"""
+    messages = []
+    scope = {"type": "http", "path": "/api/x", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(middleware(scope, receive, send))
+    return messages
+
+
+class TestParseAcceptEncoding:
+    """Accept-Encodingヘッダー解析のテスト"""
+
+    def test_quality_values(self):
+        """品質値が解析されること"""
+        result = _parse_accept_encoding("gzip;q=0.5, zstd, br;q=0")
+        assert result == {"gzip": 0.5, "zstd": 1.0, "br": 0.0}
+
+    def test_invalid_quality(self):
+        """不正な品質値は0として扱われること"""
+        assert _parse_accept_encoding("gzip;q=abc") == {"gzip": 0.0}
+
+
+class TestCompressionMiddleware:
+    """CompressionMiddlewareのテスト"""
+
+    def setup_method(self):
+        self.client = TestClient(_build_app())
+
+    def test_large_response_gzip(self):
+        """閾値以上のレスポンスがgzip圧縮されること"""
+        response = self.client.get("/api/large", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.text == "metrix " * 1000
+
+    def test_small_response_not_compressed(self):
+        """閾値未満のレスポンスは圧縮されないが、Varyは付くこと"""
+        response = self.client.get("/api/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.text == "x" * 10
+
+    def test_no_accept_encoding(self):
+        """Accept-Encodingがない場合は圧縮されないが、Varyは付くこと"""
+        response = self.client.get("/api/large", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+
+    def test_non_api_path_not_compressed(self):
+        """API以外のパスは圧縮対象外であること"""
+        response = self.client.get("/other/large", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert "vary" not in response.headers
+
+    def test_existing_vary_merged(self):
+        """既存のVaryにAccept-Encodingを重複なく追加すること"""
+        async def inner(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": [(b"vary", b"Origin")]})
+            await send({"type": "http.response.body", "body": b"x"})
+
+        messages = _call(CompressionMiddleware(inner), "gzip")
+        assert dict(messages[0]["headers"])[b"vary"] == b"Origin, Accept-Encoding"
+
+    def test_streaming_chunks_flushed(self):
+        """ストリーミングのレスポンスは各チャンクがその時点で展開できる形で送られること"""
+        async def inner(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            for i in range(3):
+                await send({"type": "http.response.body", "body": f"chunk {i}\n".encode() * 200, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+
+        messages = _call(CompressionMiddleware(inner, minimum_size=100), "gzip")
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        bodies = [message["body"] for message in messages[1:]]
+        for i in range(3):
+            assert decompressor.decompress(bodies[i]) == f"chunk {i}\n".encode() * 200
+        decompressor.decompress(bodies[3])
+        assert decompressor.eof
+
+    def test_streaming_response_compressed(self):
+        """ストリーミングレスポンスもチャンク単位で圧縮されること"""
+        with self.client.stream("GET", "/api/stream", headers={"Accept-Encoding": "gzip"}) as response:
+            assert response.headers["content-encoding"] == "gzip"
+            raw = b"".join(response.iter_raw())
+        expected = "".join(f"line {i}\n" for i in range(50)).encode()
+        assert gzip.decompress(raw) == expected
+
+    @pytest.mark.skipif(not ZSTD_AVAILABLE, reason="zstd is not available")
+    def test_zstd_preferred(self):
+        """zstdが利用可能な場合は優先されること"""
+        response = self.client.get("/api/large", headers={"Accept-Encoding": "gzip, zstd"})
+        assert response.headers["content-encoding"] == "zstd"
+        assert response.text == "metrix " * 1000
+
+
+class TestAppCompression:
+    """アプリケーションへの組み込みのテスト"""
+
+    def test_large_batch_response_compressed(self):
+        """大きな一括変換レスポンスが圧縮されること"""
+        client = TestClient(app)
+        response = client.post(
+            "/api/convert/batch",
+            json={"value": 1, "from_unit": "m", "category": "length", "to_units": ["km", "cm"] * 100},
+            headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert len(response.json()["results"]) == 200
+
+    def test_single_conversion_not_compressed(self):
+        """単一変換の小さなレスポンスは圧縮されないこと"""
+        client = TestClient(app)
+        response = client.post(
+            "/api/convert",
+            json={"value": 1, "from_unit": "m", "to_unit": "km", "category": "length"},
+            headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
@@ -538,6 +538,70 @@ class TestBatchConvertAPI:
         assert fahrenheit_result["value"] == -40.0
 
 
+class TestBulkConvertAPI:
+    """POST /api/convert/bulk エンドポイントのテスト"""
+
+    def test_bulk_convert_success(self):
+        """複数の値がまとめて変換されること"""
+        response = client.post(
+            "/api/convert/bulk",
+            json={
+                "values": [1, 2.5, -3, 0],
+                "from_unit": "km",
+                "to_unit": "m",
+                "category": "length"
+            }
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["results"] == [1000.0, 2500.0, -3000.0, 0.0]
+        assert data["from_unit"] == "km"
+        assert data["to_unit"] == "m"
+        assert data["category"] == "length"
+
+    def test_bulk_convert_temperature(self):
+        """温度の大量変換が正しく行われること"""
+        response = client.post(
+            "/api/convert/bulk",
+            json={
+                "values": [0, 100, -40],
+                "from_unit": "celsius",
+                "to_unit": "fahrenheit",
+                "category": "temperature"
+            }
+        )
+        assert response.status_code == 200
+        assert response.json()["results"] == [32.0, 212.0, -40.0]
+
+    def test_bulk_convert_empty_values(self):
+        """空のリストでは空の結果が返ること"""
+        response = client.post(
+            "/api/convert/bulk",
+            json={"values": [], "from_unit": "g", "to_unit": "kg", "category": "weight"}
+        )
+        assert response.status_code == 200
+        assert response.json()["results"] == []
+
+    def test_bulk_convert_invalid_unit(self):
+        """無効な単位で400エラーが返ること"""
+        response = client.post(
+            "/api/convert/bulk",
+            json={"values": [1], "from_unit": "m", "to_unit": "xyz", "category": "length"}
+        )
+        assert response.status_code == 400
+        assert response.json()["code"] == "INVALID_UNIT"
+
+    def test_bulk_convert_invalid_category(self):
+        """無効なカテゴリで400エラーが返ること"""
+        response = client.post(
+            "/api/convert/bulk",
+            json={"values": [1], "from_unit": "m", "to_unit": "km", "category": "invalid"}
+        )
+        assert response.status_code == 400
+        assert "Category must be one of" in response.json()["error"]
+
+
 class TestErrorHandling:
     """エラーハンドリングのテスト"""
 
@@ -587,6 +651,58 @@ class TestErrorHandling:
         data = response.json()
         assert data["success"] is False
 
+    def test_invalid_unit_error_code(self):
+        """無効な単位のエラーに機械可読なコードが付与されること"""
+        response = client.post(
+            "/api/convert",
+            json={
+                "value": 100,
+                "from_unit": "m",
+                "to_unit": "xyz",
+                "category": "length"
+            }
+        )
+        assert response.status_code == 400
+        assert response.json() == {"success": False, "error": "Invalid unit: xyz", "code": "INVALID_UNIT"}
+
+    def test_validation_error_code(self):
+        """リクエストのバリデーションエラーにコードが付与されること"""
+        response = client.post(
+            "/api/convert",
+            json={
+                "value": "not_a_number",
+                "from_unit": "m",
+                "to_unit": "km",
+                "category": "length"
+            }
+        )
+        assert response.status_code == 400
+        assert response.json()["code"] == "VALIDATION_ERROR"
+
+    def test_category_not_found_error_code(self):
+        """存在しないカテゴリのエラーにコードが付与されること"""
+        response = client.get("/api/units/invalid")
+        assert response.status_code == 404
+        assert response.json()["code"] == "CATEGORY_NOT_FOUND"
+
+    def test_batch_failures_logged_once(self, caplog):
+        """一括変換の失敗がリクエストごとに1回だけまとめてログ出力されること"""
+        with caplog.at_level("WARNING", logger="routers.convert"):
+            response = client.post(
+                "/api/convert/batch",
+                json={
+                    "value": 1,
+                    "from_unit": "m",
+                    "category": "length",
+                    "to_units": ["km", "xyz", "abc", "def"]
+                }
+            )
+        assert response.status_code == 200
+        assert response.json()["failed_units"] == ["xyz", "abc", "def"]
+        records = [r for r in caplog.records if r.name == "routers.convert"]
+        assert len(records) == 1
+        assert "3 unit(s) failed" in records[0].getMessage()
+
     def test_health_endpoint(self):
         """ヘルスチェックエンドポイントが正常に動作すること"""
         response = client.get("/health")
@@ -609,3 +725,210 @@ class TestErrorHandling:
         )
         # 通常のリクエストでもCORSヘッダーが返される
         assert response.status_code == 200
+
+
+class TestUnitAliases:
+    """単位の別名・表記ゆれのテスト"""
+
+    def test_convert_with_alias(self):
+        """別名で指定した単位が単位コードに解決されること"""
+        response = client.post(
+            "/api/convert",
+            json={"value": 1, "from_unit": "Meters", "to_unit": "feet", "category": "length"}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["from_unit"] == "m"
+        assert data["to_unit"] == "ft"
+        assert data["result"] == pytest.approx(3.28084, rel=1e-5)
+
+    def test_convert_with_unicode_symbol(self):
+        """記号の表記ゆれ（℃ など）も解決されること"""
+        response = client.post(
+            "/api/convert",
+            json={"value": 0, "from_unit": "℃", "to_unit": "K", "category": "temperature"}
+        )
+        assert response.status_code == 200
+        assert response.json()["result"] == 273.15
+
+    def test_typo_suggestions(self):
+        """綴り間違いの単位には近い単位の候補が返されること"""
+        response = client.post(
+            "/api/convert",
+            json={"value": 1, "from_unit": "metr", "to_unit": "ft", "category": "length"}
+        )
+        assert response.status_code == 400
+        assert response.json() == {
+            "success": False,
+            "error": "Invalid unit: metr (did you mean: m?)",
+            "code": "INVALID_UNIT",
+            "suggestions": ["m"],
+        }
+
+    def test_batch_with_aliases(self):
+        """一括変換の変換先にも別名を指定できること"""
+        response = client.post(
+            "/api/convert/batch",
+            json={"value": 1, "from_unit": "kilogram", "category": "weight", "to_units": ["grams", "xyz"]}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["from_unit"] == "kg"
+        assert data["results"] == [{"to_unit": "g", "value": 1000.0}]
+        assert data["failed_units"] == ["xyz"]
+
+    def test_bulk_with_aliases(self):
+        """複数値の変換でも別名を指定できること"""
+        response = client.post(
+            "/api/convert/bulk",
+            json={"values": [1, 2], "from_unit": "inches", "to_unit": "cm", "category": "length"}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["from_unit"] == "in"
+        assert data["results"] == [2.54, 5.08]
+
+
+class TestPrefixedUnits:
+    """SI接頭辞・2進接頭辞付きの単位のテスト"""
+
+    def test_convert_prefixed_unit(self):
+        """係数の表にない接頭辞付きの単位を変換できること"""
+        response = client.post(
+            "/api/convert",
+            json={"value": 1, "from_unit": "um", "to_unit": "m", "category": "length"}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["from_unit"] == "μm"
+        assert data["result"] == pytest.approx(1e-6)
+
+    def test_prefix_case_sensitive(self):
+        """Mm（メガメートル）と mm（ミリメートル）を区別すること"""
+        response = client.post(
+            "/api/convert/bulk",
+            json={"values": [1], "from_unit": "Mm", "to_unit": "mm", "category": "length"}
+        )
+        assert response.status_code == 200
+        assert response.json()["results"] == [pytest.approx(1e9)]
+
+    @pytest.mark.parametrize("category, unit, expected, suggestion", [
+        ("data_size", "Mb", None, "MB"),
+        ("data_size", "mB", "mB", None),
+        ("data_size", "KB", "kB", None),
+        ("volume", "ml", "mL", None),
+        ("volume", "mL", "mL", None),
+        ("length", "MM", None, "mm"),
+        ("length", "mm", "mm", None),
+        ("length", "KM", "km", None),
+        ("length", "CM", "cm", None),
+        ("weight", "KG", "kg", None),
+        ("weight", "Kg", "kg", None),
+        ("pressure", "hpa", "hPa", None),
+        ("pressure", "mpa", None, "MPa"),
+    ])
+    def test_symbol_case(self, category, unit, expected, suggestion):
+        """大文字小文字だけが異なる単位記号は、接頭辞付きの別の単位と紛らわしい場合だけ解決せずに候補を返すこと"""
+        response = client.post(
+            "/api/convert",
+            json={"value": 1, "from_unit": unit, "to_unit": unit, "category": category}
+        )
+        if expected is None:
+            assert response.status_code == 400
+            assert response.json()["suggestions"][0] == suggestion
+        else:
+            assert response.status_code == 200
+            assert response.json()["from_unit"] == expected
+
+    @pytest.mark.parametrize("unit", ["us", "μs", "µs"])
+    def test_listed_prefixed_unit_single_code(self, unit):
+        """列挙した接頭辞付きの単位（us）は表記によらず同じ単位コードを返すこと"""
+        response = client.post(
+            "/api/convert",
+            json={"value": 1, "from_unit": unit, "to_unit": "ns", "category": "time"}
+        )
+        assert response.status_code == 200
+        assert response.json()["from_unit"] == "us"
+        assert response.json()["result"] == pytest.approx(1000)
+
+    def test_binary_prefix(self):
+        """データサイズには2進接頭辞を付けられること"""
+        response = client.post(
+            "/api/convert",
+            json={"value": 1, "from_unit": "PiB", "to_unit": "TiB", "category": "data_size"}
+        )
+        assert response.status_code == 200
+        assert response.json()["result"] == 1024.0
+
+
+class TestAutoUnit:
+    """変換先 auto（読みやすい単位の選択）のテスト"""
+
+    def test_convert_auto(self):
+        """auto で読みやすい単位が選ばれること"""
+        response = client.post(
+            "/api/convert",
+            json={"value": 0.000342, "from_unit": "km", "to_unit": "auto", "category": "length"}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["to_unit"] == "cm"
+        assert data["result"] == pytest.approx(34.2)
+
+    def test_convert_auto_unit_system(self):
+        """unit_system で単位系を指定できること"""
+        response = client.post(
+            "/api/convert",
+            json={"value": 1500, "from_unit": "g", "to_unit": "auto", "category": "weight", "unit_system": "imperial"}
+        )
+        assert response.status_code == 200
+        assert response.json()["to_unit"] == "lb"
+
+    def test_invalid_unit_system(self):
+        """無効な unit_system はバリデーションエラーになること"""
+        response = client.post(
+            "/api/convert",
+            json={"value": 1, "from_unit": "m", "to_unit": "auto", "category": "length", "unit_system": "si"}
+        )
+        assert response.status_code == 400
+        assert response.json()["code"] == "VALIDATION_ERROR"
+
+    def test_auto_not_supported(self):
+        """値の大きさで単位を選べないカテゴリはエラーになること"""
+        response = client.post(
+            "/api/convert",
+            json={"value": 20, "from_unit": "C", "to_unit": "auto", "category": "temperature"}
+        )
+        assert response.status_code == 400
+        assert response.json()["code"] == "AUTO_UNIT_NOT_SUPPORTED"
+
+    def test_batch_auto(self):
+        """一括変換の to_units に auto を含められること"""
+        response = client.post(
+            "/api/convert/batch",
+            json={"value": 1500, "from_unit": "g", "to_units": ["lb", "auto"], "category": "weight"}
+        )
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert {"to_unit": "kg", "value": 1.5, "auto": True} in results
+        assert all("auto" not in r for r in results if r["to_unit"] == "lb")
+
+    def test_batch_auto_not_supported(self):
+        """auto に対応していないカテゴリでは failed_units に記録されること"""
+        response = client.post(
+            "/api/convert/batch",
+            json={"value": 100, "from_unit": "USD", "to_units": ["auto", "JPY"], "category": "currency"}
+        )
+        assert response.status_code == 200
+        assert response.json()["failed_units"] == ["auto"]
+
+    def test_bulk_auto(self):
+        """大量変換では値ごとに単位が選ばれること"""
+        response = client.post(
+            "/api/convert/bulk",
+            json={"values": [0.5, 1500, 2500000], "from_unit": "m2", "to_unit": "auto", "category": "area"}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["to_unit"] == "auto"
+        assert data["units"] == ["cm2", "a", "km2"]
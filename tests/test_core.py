@@ -0,0 +1,96 @@
+"""
+コアライブラリ（converters パッケージの公開API）のテスト
+"""
+
+from array import array
+
+import pytest
+
+import metrix
+from converters import convert, find_category, get_units
+
+
+class TestConvert:
+    """convert関数のテスト"""
+
+    def test_scalar(self):
+        """単一の値を変換するとfloatを返すこと"""
+        assert convert(1.0, "km", "m", category="length") == 1000.0
+
+    def test_infer_category(self):
+        """カテゴリを省略すると単位から判定されること"""
+        assert convert(0, "celsius", "kelvin") == 273.15
+
+    def test_sequence(self):
+        """リストやarrayを渡すと入力と同じ順序のリストを返すこと"""
+        assert convert([1, 2], "kg", "g") == [1000.0, 2000.0]
+        assert convert(array("d", [1.0, 2.0]), "m", "cm") == [100.0, 200.0]
+        assert convert((x for x in [1.0]), "m", "mm") == [1000.0]
+
+    def test_alias(self):
+        """単位の別名・表記ゆれでも変換できること"""
+        assert convert(1, "kilometers", "meters") == 1000.0
+        assert convert(0, "℃", "K") == 273.15
+        assert convert(1, "Pounds", "g", category="weight") == 453.59237
+
+    def test_prefixed_unit(self):
+        """接頭辞付きの単位からカテゴリを判定して変換できること"""
+        assert convert(1, "Mg", "kg") == 1000.0
+        assert convert(1, "GiB", "MiB") == 1024.0
+
+    def test_invalid_unit(self):
+        """無効な単位はValueErrorになること"""
+        with pytest.raises(ValueError, match="Invalid unit: xyz"):
+            convert(1.0, "m", "xyz")
+
+    def test_invalid_unit_suggestion(self):
+        """綴り間違いの単位には候補がメッセージに含まれること"""
+        with pytest.raises(ValueError, match="did you mean: m"):
+            convert(1.0, "metr", "ft", category="length")
+
+    def test_incompatible_units(self):
+        """異なるカテゴリの単位同士はValueErrorになること"""
+        with pytest.raises(ValueError, match="Incompatible units"):
+            convert(1.0, "m", "kg")
+
+    def test_invalid_category(self):
+        """無効なカテゴリはValueErrorになること"""
+        with pytest.raises(ValueError, match="Invalid category"):
+            convert(1.0, "m", "km", category="luminosity")
+
+
+class TestBestUnit:
+    """best_unit関数のテスト"""
+
+    def test_scalar(self):
+        """単一の値は (単位, 変換後の値) を返すこと"""
+        unit, value = metrix.best_unit(0.000342, "km")
+        assert unit == "cm"
+        assert value == pytest.approx(34.2)
+
+    def test_sequence(self):
+        """イテラブルを渡すと値ごとの単位と変換後の値のリストを返すこと"""
+        assert metrix.best_unit([1, 2000], "g", system="metric") == (["g", "kg"], [1.0, 2.0])
+
+    def test_not_supported(self):
+        """値の大きさで単位を選べないカテゴリはValueErrorになること"""
+        with pytest.raises(ValueError, match="not supported"):
+            metrix.best_unit(20, "celsius")
+
+
+class TestRegistry:
+    """カテゴリの参照関数のテスト"""
+
+    def test_find_category(self):
+        """単位からカテゴリを判定できること"""
+        assert find_category("ft", "mi") == "length"
+        assert find_category("lb", "kg") == "weight"
+
+    def test_get_units(self):
+        """カテゴリの単位一覧を取得できること"""
+        assert "km" in get_units("length")
+
+    def test_facade(self):
+        """metrix モジュールから同じAPIを利用できること"""
+        assert metrix.convert is convert
+        assert {"length", "weight", "temperature"} <= set(metrix.categories())
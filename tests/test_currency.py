@@ -0,0 +1,169 @@
+"""
+通貨換算のテスト
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from converters.currency import (
+    FIXTURE_RATES,
+    FIXTURE_TIMESTAMP,
+    FileRateProvider,
+    FixtureRateProvider,
+    RateError,
+    RateSnapshot,
+    convert_currency,
+    convert_currency_many,
+    get_currency_rates,
+    refresh_currency_rates,
+    refresh_loop,
+    set_currency_rates,
+)
+from main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def restore_rates():
+    """テストで差し替えたレートを元に戻す"""
+    snapshot = get_currency_rates()
+    yield
+    set_currency_rates(snapshot)
+
+
+def _rates(**overrides) -> dict[str, float]:
+    return {**FIXTURE_RATES, **overrides}
+
+
+class TestRateSnapshot:
+    """RateSnapshotのテスト"""
+
+    def test_convert(self):
+        """基準通貨1単位あたりのレートで換算できること"""
+        snapshot = RateSnapshot("USD", _rates(JPY=150.0, EUR=0.75), "2026-01-01T00:00:00Z")
+        assert snapshot.convert(2, "USD", "JPY") == 300.0
+        assert snapshot.convert(150, "JPY", "EUR") == pytest.approx(0.75)
+        assert snapshot.convert_many([1, 3], "EUR", "USD") == pytest.approx([4 / 3, 4.0])
+
+    def test_invalid_unit(self):
+        """無効な通貨はValueErrorになること"""
+        snapshot = FixtureRateProvider().fetch()
+        with pytest.raises(ValueError, match="Invalid unit: XXX"):
+            snapshot.convert(1, "USD", "XXX")
+
+    @pytest.mark.parametrize("rates", [
+        {k: v for k, v in FIXTURE_RATES.items() if k != "JPY"},
+        _rates(JPY=0),
+        _rates(JPY=float("inf")),
+        _rates(JPY="150"),
+    ])
+    def test_invalid_rates(self, rates):
+        """レートが不足・不正な場合はRateErrorになること"""
+        with pytest.raises(RateError):
+            RateSnapshot("USD", rates, FIXTURE_TIMESTAMP)
+
+    def test_base_rate_implied(self):
+        """基準通貨のレートは省略できること"""
+        rates = {code: rate / FIXTURE_RATES["JPY"] for code, rate in FIXTURE_RATES.items() if code != "JPY"}
+        snapshot = RateSnapshot("JPY", rates, FIXTURE_TIMESTAMP)
+        assert snapshot.rates["JPY"] == 1.0
+
+
+class TestRateProviders:
+    """レートの取得元と差し替えのテスト"""
+
+    def test_file_provider(self, tmp_path):
+        """JSONファイルからレートを読み込めること"""
+        path = tmp_path / "rates.json"
+        path.write_text(json.dumps({
+            "base": "USD", "timestamp": "2026-10-19T00:00:00Z", "rates": _rates(JPY=140.0)
+        }), encoding="utf-8")
+        snapshot = FileRateProvider(path).fetch()
+        assert snapshot.rates["JPY"] == 140.0
+        assert snapshot.timestamp == "2026-10-19T00:00:00Z"
+        assert snapshot.source == "file"
+
+    def test_file_provider_invalid(self, tmp_path):
+        """不正なファイルはRateErrorになること"""
+        path = tmp_path / "rates.json"
+        path.write_text("{", encoding="utf-8")
+        with pytest.raises(RateError):
+            FileRateProvider(path).fetch()
+
+    def test_refresh_swaps_snapshot(self):
+        """更新で新しいスナップショットに差し替わり、取得済みのスナップショットは変わらないこと"""
+        old = get_currency_rates()
+        refresh_currency_rates(FixtureRateProvider(_rates(JPY=100.0), "2026-10-19T00:00:00Z"))
+        assert convert_currency(1, "USD", "JPY") == 100.0
+        assert convert_currency_many([2], "USD", "JPY") == [200.0]
+        assert old.convert(1, "USD", "JPY") == FIXTURE_RATES["JPY"]
+
+    def test_refresh_loop(self, tmp_path):
+        """一定間隔でファイルを読み込み直し、不正な内容では現在のレートを使い続けること"""
+        path = tmp_path / "rates.json"
+
+        async def scenario():
+            stop = asyncio.Event()
+            task = asyncio.create_task(refresh_loop(FileRateProvider(path), 0.01, stop))
+            path.write_text(json.dumps({"timestamp": "t1", "rates": _rates(JPY=120.0)}), encoding="utf-8")
+            for _ in range(200):
+                if get_currency_rates().timestamp == "t1":
+                    break
+                await asyncio.sleep(0.01)
+            path.write_text("{", encoding="utf-8")
+            await asyncio.sleep(0.05)
+            stop.set()
+            await asyncio.wait_for(task, timeout=5)
+
+        asyncio.run(scenario())
+        assert get_currency_rates().timestamp == "t1"
+        assert convert_currency(1, "USD", "JPY") == 120.0
+
+
+class TestCurrencyAPI:
+    """通貨換算APIのテスト"""
+
+    def test_convert_includes_rate_timestamp(self):
+        """換算結果にレートの時刻と取得元が含まれること"""
+        set_currency_rates(FixtureRateProvider(_rates(JPY=150.0), "2026-10-19T09:00:00Z").fetch())
+        response = client.post(
+            "/api/convert",
+            json={"value": 10, "from_unit": "USD", "to_unit": "円", "category": "currency"}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["result"] == 1500.0
+        assert data["to_unit"] == "JPY"
+        assert data["rate_timestamp"] == "2026-10-19T09:00:00Z"
+        assert data["rate_source"] == "fixture"
+
+    def test_bulk_and_batch(self):
+        """一括変換・大量変換にもレートの時刻が含まれること"""
+        bulk = client.post(
+            "/api/convert/bulk",
+            json={"values": [1, 2], "from_unit": "EUR", "to_unit": "EUR", "category": "currency"}
+        ).json()
+        assert bulk["results"] == [1.0, 2.0]
+        assert bulk["rate_timestamp"] == get_currency_rates().timestamp
+        assert bulk["rate_source"] == get_currency_rates().source
+
+        batch = client.post(
+            "/api/convert/batch",
+            json={"value": 1, "from_unit": "USD", "category": "currency", "to_units": ["JPY", "GBP"]}
+        ).json()
+        # 価値の大きい通貨から並ぶ
+        assert [r["to_unit"] for r in batch["results"]] == ["GBP", "JPY"]
+        assert batch["rate_timestamp"] == get_currency_rates().timestamp
+
+    def test_other_categories_omit_rate_timestamp(self):
+        """為替レートを使わないカテゴリのレスポンスには含まれないこと"""
+        response = client.post(
+            "/api/convert",
+            json={"value": 1, "from_unit": "m", "to_unit": "cm", "category": "length"}
+        )
+        assert "rate_timestamp" not in response.json()
+        assert "rate_source" not in response.json()
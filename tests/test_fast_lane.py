@@ -0,0 +1,139 @@
+"""
+高速レーンミドルウェアのテスト
+"""
+
+import pytest
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.testclient import TestClient
+
+import main
+from middleware.compression import CompressionMiddleware
+from middleware.fast_lane import FastLaneMiddleware
+from routers import convert
+
+
+def _comparable(response) -> tuple:
+    """ステータスコード・ヘッダー・ボディを比較用に返す"""
+    headers = sorted((k, v) for k, v in response.headers.items() if k not in ("date", "server"))
+    return response.status_code, headers, response.content
+
+
+class TestFastLaneMiddleware:
+    """通常の経路と同じレスポンスを返すことのテスト"""
+
+    def setup_method(self):
+        self.fast_lane = FastLaneMiddleware(main.app, wrap=main.wrap_fast_lane_response)
+        self.fast = TestClient(self.fast_lane)
+        self.full = TestClient(main.app)
+
+    def assert_same(self, method: str, path: str, expect_handled: bool, **kwargs):
+        before = self.fast_lane.handled_total
+        fast = self.fast.request(method, path, **kwargs)
+        full = self.full.request(method, path, **kwargs)
+        assert _comparable(fast) == _comparable(full)
+        assert self.fast_lane.handled_total - before == (1 if expect_handled else 0)
+        return fast
+
+    @pytest.mark.parametrize("payload", [
+        {"value": 1, "from_unit": "km", "to_unit": "m", "category": "length"},
+        {"value": 2.5, "from_unit": " kg ", "to_unit": "lb", "category": "weight"},
+        {"value": -40, "from_unit": "C", "to_unit": "F", "category": "temperature"},
+        {"value": 1e300, "from_unit": "km", "to_unit": "mm", "category": "length"},
+        {"value": 3, "from_unit": "Kilometers", "to_unit": "mi", "category": "length"},
+        {"value": 5, "from_unit": "GiB", "to_unit": "MB", "category": "data_size"},
+        {"value": 100, "from_unit": "$", "to_unit": "JPY", "category": "currency"},
+    ])
+    def test_convert_success(self, payload):
+        """変換の成功レスポンスが通常の経路と同じであること"""
+        response = self.assert_same("POST", "/api/convert", True, json=payload)
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize("payload", [
+        {"value": 1, "from_unit": "kmm", "to_unit": "m", "category": "length"},
+        {"value": 1, "from_unit": "km", "to_unit": "xyz", "category": "length"},
+    ])
+    def test_invalid_unit(self, payload):
+        """無効な単位のエラーレスポンスが通常の経路と同じであること"""
+        response = self.assert_same("POST", "/api/convert", True, json=payload)
+        assert response.json()["code"] == "INVALID_UNIT"
+
+    @pytest.mark.parametrize("payload", [
+        {"value": 1, "from_unit": "km", "to_unit": "m", "category": "invalid"},
+        {"value": 1, "from_unit": "  ", "to_unit": "m", "category": "length"},
+        {"from_unit": "km", "to_unit": "m", "category": "length"},
+        {"value": 1, "from_unit": "km", "to_unit": "m", "category": "length", "unit_system": "si"},
+        [1, 2, 3],
+    ])
+    def test_validation_error_falls_back(self, payload):
+        """検証エラーは通常の経路で処理されること"""
+        response = self.assert_same("POST", "/api/convert", False, json=payload)
+        assert response.json()["code"] == "VALIDATION_ERROR"
+
+    @pytest.mark.parametrize("value", ["1", True])
+    def test_coerced_value_falls_back(self, value):
+        """型変換が必要な値は通常の経路で処理されること"""
+        payload = {"value": value, "from_unit": "km", "to_unit": "m", "category": "length"}
+        response = self.assert_same("POST", "/api/convert", False, json=payload)
+        assert response.status_code == 200
+
+    def test_auto_unit_falls_back(self):
+        """変換先 auto は通常の経路で処理されること"""
+        payload = {"value": 0.000342, "from_unit": "km", "to_unit": "auto", "category": "length"}
+        response = self.assert_same("POST", "/api/convert", False, json=payload)
+        assert response.json()["to_unit"] == "cm"
+
+    def test_invalid_json_falls_back(self):
+        """JSONとして不正なボディは通常の経路で処理されること"""
+        self.assert_same(
+            "POST", "/api/convert", False, content=b"{invalid", headers={"Content-Type": "application/json"}
+        )
+
+    def test_non_finite_result_falls_back(self):
+        """結果が有限数でない場合は通常の経路で処理されること"""
+        payload = {"value": 1e308, "from_unit": "mi", "to_unit": "mm", "category": "length"}
+        fast = TestClient(self.fast_lane, raise_server_exceptions=False).post("/api/convert", json=payload)
+        assert self.fast_lane.fallback_total == 1
+        assert fast.status_code == 500
+
+    @pytest.mark.parametrize("category", ["length", "currency", "data_size"])
+    def test_units(self, category):
+        """単位一覧が通常の経路と同じであること"""
+        response = self.assert_same("GET", f"/api/units/{category}", True)
+        assert response.json()["category"] == category
+
+    def test_units_not_found(self):
+        """存在しないカテゴリは同じ404レスポンスになること"""
+        response = self.assert_same("GET", "/api/units/invalid", True)
+        assert response.status_code == 404
+
+    def test_other_paths_fall_back(self):
+        """対象外のパスは通常の経路で処理されること"""
+        self.assert_same("GET", "/api/categories", False)
+        self.assert_same("GET", "/api/units/length/", False, follow_redirects=False)
+        self.assert_same("POST", "/api/convert/batch", False,
+                         json={"value": 1, "from_unit": "km", "category": "length"})
+
+    def test_cors_headers(self):
+        """CORSヘッダーが通常の経路と同じであること"""
+        payload = {"value": 1, "from_unit": "km", "to_unit": "m", "category": "length"}
+        response = self.assert_same("POST", "/api/convert", True, json=payload,
+                                    headers={"Origin": "https://example.com"})
+        assert "access-control-allow-origin" in response.headers
+
+    def test_coalescer(self, monkeypatch):
+        """コアレッサーが有効な場合も同じ結果になること"""
+        from coalescer import ConversionCoalescer
+
+        monkeypatch.setattr(convert, "coalescer", ConversionCoalescer(window=0.001, max_batch=8))
+        payload = {"value": 1, "from_unit": "km", "to_unit": "m", "category": "length"}
+        self.assert_same("POST", "/api/convert", True, json=payload)
+
+    def test_compression(self):
+        """高速レーンのレスポンスにも圧縮が適用されること"""
+        def wrap(inner):
+            return CompressionMiddleware(CORSMiddleware(inner, **main.CORS_OPTIONS), minimum_size=100)
+
+        client = TestClient(FastLaneMiddleware(main.app, wrap=wrap))
+        response = client.get("/api/units/length", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.content == self.full.get("/api/units/length").content
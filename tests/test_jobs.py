@@ -0,0 +1,279 @@
+"""
+非同期変換ジョブAPIのテスト
+"""
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import routers.jobs
+from converters.length import convert_length, convert_length_many
+from jobs import STATUS_COMPLETED, STATUS_FAILED, STATUS_QUEUED, STATUS_RUNNING, JobManager, is_valid_job_id
+from main import app
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """一時ディレクトリをスプール先にしたJobManager"""
+    job_manager = JobManager(tmp_path / "jobs", max_workers=2, chunk_size=10, retention_seconds=3600)
+    monkeypatch.setattr(routers.jobs, "job_manager", job_manager)
+    yield job_manager
+    job_manager.shutdown()
+
+
+def _wait_job(manager: JobManager, job_id: str, timeout: float = 5.0) -> dict:
+    """ジョブが完了または失敗するまでメタデータをポーリングする"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        meta = manager.get_job(job_id)
+        if meta is None or meta["status"] in (STATUS_COMPLETED, STATUS_FAILED):
+            return meta
+        time.sleep(0.01)
+    raise AssertionError("job did not finish in time")
+
+
+def _wait_for(client: TestClient, job_id: str, timeout: float = 5.0) -> dict:
+    """ジョブが完了または失敗するまで状態をポーリングする"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        data = client.get(f"/api/jobs/{job_id}").json()
+        if data["status"] in (STATUS_COMPLETED, STATUS_FAILED):
+            return data
+        time.sleep(0.01)
+    raise AssertionError("job did not finish in time")
+
+
+class TestJobManager:
+    """JobManagerのテスト"""
+
+    def test_run_in_chunks(self, manager):
+        """チャンク単位で変換され、結果が入力と同じ順序で書き出されること"""
+        job_id = manager.create_job("length", "m", "ft")
+        values = [float(i) for i in range(25)]
+        total = manager.write_values(job_id, values)
+        manager.submit(job_id, total, convert_length_many)
+
+        meta = _wait_job(manager, job_id)
+        assert meta["status"] == STATUS_COMPLETED
+        assert meta["processed"] == 25
+        results = [float(line) for line in manager.output_path(job_id).read_text().splitlines()]
+        assert results == [convert_length(v, "m", "ft") for v in values]
+
+    def test_invalid_line_fails_job(self, manager):
+        """数値でない行があるとジョブが失敗すること"""
+        job_id = manager.create_job("length", "m", "ft")
+        manager.input_path(job_id).write_text("1\nabc\n3\n")
+        manager.submit(job_id, 3, convert_length_many)
+
+        meta = _wait_job(manager, job_id)
+        assert meta["status"] == STATUS_FAILED
+        assert "line 2" in meta["error"]
+
+    def test_unexpected_error_fails_job(self, manager):
+        """変換関数の想定外の例外でもジョブが実行中のまま残らず失敗になること"""
+        def broken(values, from_unit, to_unit):
+            raise KeyError(from_unit)
+
+        job_id = manager.create_job("length", "m", "ft")
+        manager.submit(job_id, manager.write_values(job_id, [1.0]), broken)
+
+        meta = _wait_job(manager, job_id)
+        assert meta["status"] == STATUS_FAILED
+        assert meta["error"] == "Internal error during conversion"
+        assert manager.expires_at(meta) is not None
+
+    def test_shutdown_cancels_pending_jobs(self, manager):
+        """停止時に待機中のジョブは取り消し、実行中のジョブはチャンクの区切りで中断すること"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking(values, from_unit, to_unit):
+            started.set()
+            release.wait(5)
+            return values
+
+        manager.max_workers = 1
+        job_ids = []
+        for _ in range(3):
+            job_id = manager.create_job("length", "m", "m")
+            manager.submit(job_id, manager.write_values(job_id, [float(i) for i in range(25)]), blocking)
+            job_ids.append(job_id)
+        assert started.wait(5)
+
+        stopper = threading.Thread(target=manager.shutdown)
+        stopper.start()
+        # 待機中のジョブが取り消されてから実行中のジョブを進める
+        deadline = time.monotonic() + 5
+        while manager.get_job(job_ids[-1])["status"] != STATUS_FAILED and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        stopper.join(5)
+        assert not stopper.is_alive()
+
+        running, *queued = (manager.get_job(job_id) for job_id in job_ids)
+        assert running["status"] == STATUS_FAILED
+        assert running["error"] == "Interrupted by server shutdown"
+        assert running["processed"] == 10
+        assert [meta["status"] for meta in queued] == [STATUS_FAILED, STATUS_FAILED]
+        assert all(meta["error"] == "Cancelled by server shutdown" for meta in queued)
+
+    def test_recover_orphaned(self, manager, tmp_path):
+        """異常終了したプロセスのジョブだけを起動時に失敗にすること"""
+        previous = JobManager(manager.spool_dir)
+        orphaned = previous.create_job("length", "m", "ft")
+        previous._update_meta(orphaned, status=STATUS_RUNNING)
+        own = manager.create_job("length", "m", "ft")
+        finished = previous.create_job("length", "m", "ft")
+        previous._update_meta(finished, status=STATUS_COMPLETED, finished_at=time.time())
+
+        # 前回のプロセスと同じPIDで再起動した場合もトークンで区別する
+        assert manager.recover_orphaned() == 1
+        assert manager.get_job(orphaned)["status"] == STATUS_FAILED
+        assert manager.get_job(orphaned)["error"] == "Interrupted by server restart"
+        assert manager.get_job(own)["status"] == STATUS_QUEUED
+        assert manager.get_job(finished)["status"] == STATUS_COMPLETED
+
+    def test_purge_expired(self, manager):
+        """保持期間を過ぎたジョブが削除されること"""
+        manager.retention_seconds = 0
+        job_id = manager.create_job("length", "m", "ft")
+        manager.submit(job_id, manager.write_values(job_id, [1.0]), convert_length_many)
+
+        assert _wait_job(manager, job_id) is None
+        assert manager.purge_expired() == 1
+        assert not (manager.spool_dir / job_id).exists()
+
+    def test_is_valid_job_id(self):
+        """ジョブIDの形式が検証されること"""
+        assert is_valid_job_id("0123456789abcdef0123456789abcdef")
+        assert not is_valid_job_id("../etc/passwd")
+        assert not is_valid_job_id("")
+
+
+class TestJobsAPI:
+    """ジョブAPIのテスト"""
+
+    def test_submit_json_and_download(self, manager):
+        """JSONで投入したジョブの状態取得と結果ダウンロードができること"""
+        client = TestClient(app)
+        response = client.post(
+            "/api/jobs",
+            json={"values": [1, 2, 3], "from_unit": "km", "to_unit": "m", "category": "length"}
+        )
+        assert response.status_code == 202
+        data = response.json()
+        assert data["status"] == "queued"
+        job_id = data["job_id"]
+        assert data["status_url"] == f"/api/jobs/{job_id}"
+
+        status = _wait_for(client, job_id)
+        assert status["status"] == STATUS_COMPLETED
+        assert status["progress"] == 1.0
+        assert status["total"] == 3
+        assert status["expires_at"] is not None
+
+        result = client.get(f"/api/jobs/{job_id}/result")
+        assert result.status_code == 200
+        assert result.text.splitlines() == ["1000.0", "2000.0", "3000.0"]
+
+    def test_upload_text(self, manager):
+        """テキストファイルのアップロードでジョブを投入できること"""
+        client = TestClient(app)
+        body = "\n".join(str(i) for i in range(50))  # 末尾の改行なし
+        response = client.post(
+            "/api/jobs/upload",
+            params={"category": "temperature", "from_unit": "celsius", "to_unit": "kelvin"},
+            content=body.encode(),
+            headers={"Content-Type": "text/plain"}
+        )
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        status = _wait_for(client, job_id)
+        assert status["status"] == STATUS_COMPLETED
+        assert status["total"] == 50
+        lines = client.get(f"/api/jobs/{job_id}/result").text.splitlines()
+        assert len(lines) == 50
+        assert float(lines[0]) == 273.15
+
+    def test_upload_counts_non_blank_lines(self, manager):
+        """空行を除いた行数を入力値の数とし、チャンクをまたぐ行も1行として数えること"""
+        client = TestClient(app)
+
+        def chunks():
+            yield b"1\n\n  \n2"
+            yield b"5\n"
+            yield b"\n3"
+
+        response = client.post(
+            "/api/jobs/upload",
+            params={"category": "length", "from_unit": "m", "to_unit": "m"},
+            content=chunks()
+        )
+        job_id = response.json()["job_id"]
+        status = _wait_for(client, job_id)
+        assert status["total"] == 3
+        assert status["processed"] == 3
+        assert status["progress"] == 1.0
+        assert client.get(f"/api/jobs/{job_id}/result").text.splitlines() == ["1.0", "25.0", "3.0"]
+
+    def test_upload_too_large(self, manager, monkeypatch):
+        """アップロードがボディの上限・値の数の上限を超えると413になり、入力を残さないこと"""
+        client = TestClient(app)
+        params = {"category": "length", "from_unit": "m", "to_unit": "ft"}
+        monkeypatch.setattr(routers.jobs, "MAX_BODY_SIZE", 8)
+        response = client.post("/api/jobs/upload", params=params, content=b"1\n2\n3\n4\n5\n")
+        assert response.status_code == 413
+        assert response.json()["code"] == "PAYLOAD_TOO_LARGE"
+
+        def chunks():
+            yield b"1\n2\n"
+            yield b"3\n4\n5\n"
+
+        response = client.post("/api/jobs/upload", params=params, content=chunks())
+        assert response.status_code == 413
+
+        monkeypatch.setattr(routers.jobs, "MAX_BODY_SIZE", 1024)
+        monkeypatch.setattr(routers.jobs, "MAX_ARRAY_LENGTH", 2)
+        response = client.post("/api/jobs/upload", params=params, content=b"1\n\n2\n\n")
+        assert response.status_code == 202
+        response = client.post("/api/jobs/upload", params=params, content=b"1\n2\n3")
+        assert response.status_code == 413
+        assert "2 values" in response.json()["error"]
+
+        job_dirs = list(manager.spool_dir.iterdir())
+        assert len(job_dirs) == 1
+
+    def test_invalid_unit_rejected(self, manager):
+        """無効な単位のジョブは受け付けないこと"""
+        client = TestClient(app)
+        response = client.post(
+            "/api/jobs/upload",
+            params={"category": "length", "from_unit": "m", "to_unit": "xyz"},
+            content=b"1\n"
+        )
+        assert response.status_code == 400
+        assert response.json()["code"] == "INVALID_UNIT"
+
+    def test_failed_job_result_not_ready(self, manager):
+        """失敗したジョブの結果取得は409になること"""
+        client = TestClient(app)
+        response = client.post(
+            "/api/jobs/upload",
+            params={"category": "length", "from_unit": "m", "to_unit": "km"},
+            content=b"1\nnot-a-number\n"
+        )
+        job_id = response.json()["job_id"]
+        assert _wait_for(client, job_id)["status"] == STATUS_FAILED
+        result = client.get(f"/api/jobs/{job_id}/result")
+        assert result.status_code == 409
+        assert result.json()["code"] == "JOB_NOT_READY"
+
+    def test_unknown_job(self, manager):
+        """存在しないジョブは404になること"""
+        client = TestClient(app)
+        response = client.get("/api/jobs/0123456789abcdef0123456789abcdef")
+        assert response.status_code == 404
+        assert response.json()["code"] == "JOB_NOT_FOUND"
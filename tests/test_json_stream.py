@@ -0,0 +1,265 @@
+"""
+JSONオブジェクトの逐次解析とリクエストボディの上限のテスト
+"""
+
+import json
+import random
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+
+from json_stream import ArrayTooLongError, IncrementalObjectParser, JSONStreamError
+from main import app
+from routers import convert as convert_router
+
+client = TestClient(app)
+
+BULK = {"from_unit": "m", "to_unit": "km", "category": "length"}
+
+
+def _parse(body: bytes, chunk_size: int, max_array_length: int | None = None):
+    """ボディを chunk_size バイトずつ渡して解析する"""
+    parser = IncrementalObjectParser(max_array_length=max_array_length)
+    for start in range(0, len(body), chunk_size):
+        parser.feed(body[start:start + chunk_size])
+    return parser.close()
+
+
+def _bulk_chunks(count: int, chunk_values: int = 1000):
+    """値 count 個の大量変換リクエストのボディを少しずつ生成する（ボディ全体をメモリに持たない）"""
+    rng = random.Random(0)
+    yield b'{"from_unit":"m","to_unit":"km","category":"length","values":['
+    for start in range(0, count, chunk_values):
+        end = min(start + chunk_values, count)
+        text = ",".join(repr(rng.random() * 1000) for _ in range(start, end))
+        yield (text + ("," if end < count else "")).encode()
+    yield b"]}"
+
+
+class TestIncrementalObjectParser:
+    """IncrementalObjectParserのテスト"""
+
+    @pytest.mark.parametrize("text", [
+        '{}',
+        ' { "a" : [ ] } ',
+        '{"values": [1, 2 ,3e2 , -4.5E-1, -0, 1.5e+10], "from_unit": "m"}',
+        '{"a": [-Infinity, NaN, 1], "b": null, "c": true}',
+        '{"a": ["x,y", "\\u00e9\\"", [1, [2]], {"b": [3]}], "d": {"e": 1}}',
+        '{"a": 12345678901234567890, "a": "dup"}',
+        '[1, 2]',
+        '"x"',
+    ])
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1 << 20])
+    def test_same_as_json_loads(self, text, chunk_size):
+        """チャンクの区切り方によらず json.loads と同じ結果になること"""
+        body = text.encode()
+        assert _parse(body, chunk_size) == json.loads(body)
+
+    @pytest.mark.parametrize("text", [
+        '{"a": [1, 2',
+        '{"a": [1, 2,]}',
+        '{"a": [01]}',
+        '{"a": [1 2]}',
+        '{"a": 1,}',
+        '{"a" 1}',
+        '{1: 2}',
+        '{"a": tru}',
+        '{"a": 1} x',
+        '   ',
+    ])
+    @pytest.mark.parametrize("chunk_size", [1, 3, 1 << 20])
+    def test_invalid_json(self, text, chunk_size):
+        """不正なJSONでは json.loads と同じ位置のエラーになること"""
+        with pytest.raises(json.JSONDecodeError) as expected:
+            json.loads(text)
+        with pytest.raises(JSONStreamError) as e:
+            _parse(text.encode(), chunk_size)
+        assert e.value.pos == expected.value.pos
+
+    def test_multibyte_split(self):
+        """マルチバイト文字がチャンクの境界で分かれても解析できること"""
+        body = '{"unit": "µm", "values": [1]}'.encode()
+        assert _parse(body, 1) == {"unit": "µm", "values": [1]}
+
+    @pytest.mark.parametrize("value", [
+        "x" * 1_000_000,
+        '\\"' * 100_000 + "é" * 100_000,
+        {"a": ["}]" * 10_000, [[1, {"b": "{["}]] * 10_000]},
+    ])
+    def test_long_value_parsed_once(self, value):
+        """チャンクの境界をまたぐ長い値は、値が終わるまで解析をやり直さないこと（解析の時間がボディの大きさに比例する）"""
+        body = json.dumps({"from_unit": value, "values": [1, 2], "to_unit": "km"}).encode()
+        parser = IncrementalObjectParser()
+        calls = 0
+        raw_decode = parser._scanner.raw_decode
+
+        def counting_raw_decode(*args):
+            nonlocal calls
+            calls += 1
+            return raw_decode(*args)
+
+        parser._scanner.raw_decode = counting_raw_decode
+        for start in range(0, len(body), 1024):
+            parser.feed(body[start:start + 1024])
+        assert parser.close() == json.loads(body)
+        assert calls < 10
+
+    def test_array_limit(self):
+        """配列の要素数が上限を超えた時点でエラーになり、残りのボディは読まないこと"""
+        parser = IncrementalObjectParser(max_array_length=5000)
+        fed = 0
+        with pytest.raises(ArrayTooLongError) as e:
+            for chunk in _bulk_chunks(100000):
+                fed += 1
+                parser.feed(chunk)
+        assert e.value.key == "values"
+        assert fed < 10
+
+    def test_array_limit_exact(self):
+        """要素数が上限ちょうどの場合は解析できること"""
+        body = json.dumps({"values": list(range(100))}).encode()
+        assert len(_parse(body, 16, max_array_length=100)["values"]) == 100
+
+
+class TestParserMemory:
+    """逐次解析のピークメモリのテスト"""
+
+    COUNT = 200000
+
+    def test_peak_memory_bounded(self):
+        """解析中のピークメモリが解析結果の大きさ + チャンク数個分に収まること（ボディの大きさによらない）"""
+        body_size = sum(len(chunk) for chunk in _bulk_chunks(self.COUNT))
+
+        tracemalloc.start()
+        try:
+            parser = IncrementalObjectParser()
+            for chunk in _bulk_chunks(self.COUNT):
+                parser.feed(chunk)
+            result = parser.close()
+            retained, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert len(result["values"]) == self.COUNT
+        # 作業用のメモリ（ピークと解析結果の差）はボディの大きさの一部に収まる
+        assert peak - retained < 1024 * 1024
+        assert peak - retained < body_size / 4
+
+    def test_less_than_whole_body_parse(self):
+        """ボディ全体を読み込んでから解析する場合よりピークメモリが小さいこと"""
+        tracemalloc.start()
+        try:
+            json.loads(b"".join(_bulk_chunks(self.COUNT)))
+            _, whole_peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            tracemalloc.clear_traces()
+        finally:
+            tracemalloc.stop()
+
+        tracemalloc.start()
+        try:
+            parser = IncrementalObjectParser()
+            for chunk in _bulk_chunks(self.COUNT):
+                parser.feed(chunk)
+            parser.close()
+            _, stream_peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert stream_peak < whole_peak * 0.8
+
+
+class TestBodyLimits:
+    """変換APIのリクエストボディの上限のテスト"""
+
+    def test_content_length_too_large(self, monkeypatch):
+        """Content-Lengthが上限を超える場合は413を返すこと"""
+        monkeypatch.setattr(convert_router, "MAX_BODY_SIZE", 1024)
+        response = client.post("/api/convert/bulk", json={**BULK, "values": list(range(1000))})
+        assert response.status_code == 413
+        assert response.json()["code"] == "PAYLOAD_TOO_LARGE"
+
+    def test_streamed_body_too_large(self, monkeypatch):
+        """Content-Lengthのないボディも受信したサイズが上限を超えた時点で413を返すこと"""
+        monkeypatch.setattr(convert_router, "MAX_BODY_SIZE", 64 * 1024)
+        response = client.post(
+            "/api/convert/bulk", content=_bulk_chunks(50000), headers={"Content-Type": "application/json"}
+        )
+        assert response.status_code == 413
+        assert response.json()["code"] == "PAYLOAD_TOO_LARGE"
+
+    def test_array_too_long(self, monkeypatch):
+        """配列の要素数が上限を超える場合は413を返すこと"""
+        monkeypatch.setattr(convert_router, "MAX_ARRAY_LENGTH", 100)
+        response = client.post("/api/convert/bulk", json={**BULK, "values": list(range(101))})
+        assert response.status_code == 413
+        assert response.json() == {
+            "success": False, "error": "Array 'values' has more than 100 items", "code": "PAYLOAD_TOO_LARGE"
+        }
+
+    def test_batch_to_units_too_long(self, monkeypatch):
+        """一括変換の to_units も要素数の上限の対象であること"""
+        monkeypatch.setattr(convert_router, "MAX_ARRAY_LENGTH", 2)
+        response = client.post(
+            "/api/convert/batch",
+            json={"value": 1, "from_unit": "m", "category": "length", "to_units": ["km", "cm", "mm"]}
+        )
+        assert response.status_code == 413
+
+    def test_convert_body_too_large(self, monkeypatch):
+        """単一の変換も上限の対象であること（Content-Lengthあり・なしの両方）"""
+        monkeypatch.setattr(convert_router, "MAX_BODY_SIZE", 64)
+        body = {"value": 1, "from_unit": "m", "to_unit": "km", "category": "length", "padding": "x" * 100}
+        response = client.post("/api/convert", json=body)
+        assert response.status_code == 413
+        assert response.json()["code"] == "PAYLOAD_TOO_LARGE"
+
+        response = client.post(
+            "/api/convert", content=iter([json.dumps(body).encode()]), headers={"Content-Type": "application/json"}
+        )
+        assert response.status_code == 413
+
+    def test_convert_invalid_body_unchanged(self):
+        """単一の変換の不正なボディのエラーはFastAPIのボディの検証と同じ形式であること"""
+        response = client.post("/api/convert", content=b'{"value":', headers={"Content-Type": "application/json"})
+        assert response.status_code == 400
+        assert response.json() == {"success": False, "error": "body.9: JSON decode error", "code": "VALIDATION_ERROR"}
+        response = client.post("/api/convert", json=[1, 2])
+        assert response.status_code == 400
+        assert response.json()["code"] == "VALIDATION_ERROR"
+
+    def test_jobs_body_too_large(self, monkeypatch):
+        """ジョブの投入も上限の対象であること"""
+        monkeypatch.setattr(convert_router, "MAX_ARRAY_LENGTH", 10)
+        response = client.post("/api/jobs", json={**BULK, "values": list(range(11))})
+        assert response.status_code == 413
+
+    def test_streamed_body_within_limit(self):
+        """上限内のチャンク分割されたボディはそのまま変換されること"""
+        response = client.post(
+            "/api/convert/bulk", content=_bulk_chunks(5000), headers={"Content-Type": "application/json"}
+        )
+        assert response.status_code == 200
+        expected = json.loads(b"".join(_bulk_chunks(5000)))["values"]
+        assert response.json()["results"] == pytest.approx([value / 1000 for value in expected])
+
+    def test_invalid_json_error_unchanged(self):
+        """不正なJSONのエラーはFastAPIのボディの検証と同じ形式であること"""
+        response = client.post(
+            "/api/convert/bulk", content=b'{"values":[1,2', headers={"Content-Type": "application/json"}
+        )
+        assert response.status_code == 400
+        assert response.json() == {"success": False, "error": "body.14: JSON decode error", "code": "VALIDATION_ERROR"}
+
+    def test_validation_error_unchanged(self):
+        """モデルの検証エラーはFastAPIのボディの検証と同じ形式であること"""
+        response = client.post("/api/convert/bulk", json={**BULK, "values": [1, "x"]})
+        assert response.status_code == 400
+        assert response.json()["error"].startswith("body.values.1: ")
+
+    def test_empty_body(self):
+        """ボディがない場合は必須エラーになること"""
+        response = client.post("/api/convert/bulk", headers={"Content-Type": "application/json"})
+        assert response.status_code == 400
+        assert response.json()["error"] == "body: Field required"
@@ -3,7 +3,7 @@
 """
 
 import pytest
-from converters.length import convert_length, get_length_units
+from converters.length import convert_length, convert_length_many, get_length_units, is_valid_length_unit
 
 
 class TestGetLengthUnits:
@@ -22,6 +22,20 @@ class TestGetLengthUnits:
             assert unit in units
 
 
+class TestIsValidLengthUnit:
+    """is_valid_length_unit関数のテスト"""
+
+    def test_valid_units(self):
+        """有効な単位でTrueを返すことを確認"""
+        for unit in ['m', 'km', 'mi']:
+            assert is_valid_length_unit(unit) is True
+
+    def test_invalid_units(self):
+        """無効な単位でFalseを返す（例外を送出しない）ことを確認"""
+        for unit in ['xyz', 'M', '']:
+            assert is_valid_length_unit(unit) is False
+
+
 class TestConvertLength:
     """convert_length関数のテスト"""
 
@@ -102,3 +116,50 @@ class TestConvertLength:
         """両方の単位が無効な場合にValueErrorが発生することを確認"""
         with pytest.raises(ValueError):
             convert_length(100, 'xyz', 'abc')
+
+
+class TestConvertLengthMany:
+    """convert_length_many関数のテスト"""
+
+    def test_multiple_values(self):
+        """複数の値がまとめて変換されることを確認"""
+        assert convert_length_many([1, 2.5, -3], 'km', 'm') == pytest.approx([1000, 2500, -3000])
+
+    def test_matches_single_conversion(self):
+        """単一変換と同じ結果になることを確認"""
+        values = [0.1, 1.5, 123.456, -7.0]
+        units = get_length_units()
+        for from_unit in units:
+            for to_unit in units:
+                assert convert_length_many(values, from_unit, to_unit) == [
+                    convert_length(v, from_unit, to_unit) for v in values
+                ]
+
+    def test_empty_list(self):
+        """空のリストでは空のリストを返すことを確認"""
+        assert convert_length_many([], get_length_units()[0], get_length_units()[1]) == []
+
+    def test_invalid_unit(self):
+        """無効な単位でValueErrorが発生することを確認"""
+        with pytest.raises(ValueError, match="Invalid unit: xyz"):
+            convert_length_many([1.0], 'xyz', get_length_units()[0])
+
+
+class TestPrefixedLengthUnits:
+    """SI接頭辞付きの長さの単位のテスト"""
+
+    def test_valid_prefixed_units(self):
+        """係数の表にない接頭辞付きの単位も有効であること"""
+        for unit in ['μm', 'um', 'nm', 'Mm', 'dam']:
+            assert is_valid_length_unit(unit) is True
+
+    def test_convert_prefixed_units(self):
+        """接頭辞付きの単位を変換できること"""
+        assert convert_length(1, 'm', 'μm') == pytest.approx(1e6)
+        assert convert_length(1, 'Mm', 'km') == pytest.approx(1000.0)
+        assert convert_length_many([1, 2], 'nm', 'm') == pytest.approx([1e-9, 2e-9])
+
+    def test_non_si_units_not_prefixed(self):
+        """SI以外の単位には接頭辞を付けられないこと"""
+        for unit in ['kft', 'Mmi', 'cin']:
+            assert is_valid_length_unit(unit) is False
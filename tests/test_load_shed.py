@@ -0,0 +1,148 @@
+"""
+負荷制御ミドルウェアのテスト
+"""
+
+import asyncio
+import time
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+import main
+from exceptions import ServiceOverloadedError
+from main import app
+from middleware.load_shed import AdaptiveConcurrencyLimiter, EventLoopLagMonitor, LoadSheddingMiddleware
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """AdaptiveConcurrencyLimiterのテスト"""
+
+    def test_acquire_until_limit(self):
+        """上限までは確保でき、超えると拒否されること"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=1)
+        assert limiter.try_acquire() is True
+        assert limiter.try_acquire() is True
+        assert limiter.try_acquire() is False
+        assert limiter.shed_total == 1
+        limiter.release()
+        assert limiter.try_acquire() is True
+
+    def test_multiplicative_decrease_on_lag(self):
+        """ラグが目標を超えると上限が乗算で減ること"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=100, min_limit=10, target_lag=0.05, backoff=0.5)
+        limiter.update(0.2)
+        assert limiter.limit == 50
+        for _ in range(10):
+            limiter.update(0.2)
+        assert limiter.limit == 10
+
+    def test_additive_increase_when_saturated(self):
+        """ラグが小さく上限に達していた場合のみ上限が増えること"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=5, increase_step=2)
+        limiter.update(0.0)
+        assert limiter.limit == 2
+        limiter.try_acquire()
+        limiter.try_acquire()
+        limiter.update(0.0)
+        assert limiter.limit == 4
+        limiter.try_acquire()
+        limiter.try_acquire()
+        limiter.update(0.0)
+        assert limiter.limit == 5
+
+
+class TestEventLoopLagMonitor:
+    """EventLoopLagMonitorのテスト"""
+
+    def test_measures_lag(self):
+        """イベントループのブロックがラグとして計測され、上限の調整に使われること"""
+        class RecordingLimiter:
+            def __init__(self):
+                self.lags = []
+
+            def update(self, lag):
+                self.lags.append(lag)
+
+        async def scenario():
+            limiter = RecordingLimiter()
+            monitor = EventLoopLagMonitor(limiter, interval=0.01)
+            monitor.start()
+            await asyncio.sleep(0)
+            time.sleep(0.1)  # イベントループをブロック
+            await asyncio.sleep(0.05)
+            await monitor.stop()
+            return limiter.lags
+
+        assert max(asyncio.run(scenario())) >= 0.05
+
+
+def _build_app(limiter: AdaptiveConcurrencyLimiter) -> FastAPI:
+    """テスト用の小さなアプリケーションを構築"""
+    test_app = FastAPI()
+    test_app.add_middleware(LoadSheddingMiddleware, limiter=limiter, exempt_paths=("/health",))
+
+    @test_app.get("/api/ping")
+    async def ping():
+        return {"ok": True}
+
+    @test_app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    return test_app
+
+
+class TestLoadSheddingMiddleware:
+    """LoadSheddingMiddlewareのテスト"""
+
+    def test_sheds_with_503(self):
+        """上限に達している場合は503で即座に拒否されること"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, min_limit=1)
+        client = TestClient(_build_app(limiter))
+        limiter.try_acquire()  # 処理中のリクエストを模擬
+        response = client.get("/api/ping")
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+        assert response.json()["code"] == "OVERLOADED"
+
+    def test_cors_headers_and_error_format(self):
+        """503も通常の経路と同じCORSヘッダーとエラーの形式（JSONResponse）で返すこと"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, min_limit=1)
+        client = TestClient(LoadSheddingMiddleware(app, limiter=limiter, wrap=main.wrap_fast_lane_response))
+        limiter.try_acquire()
+        response = client.get("/api/categories", headers={"Origin": "https://example.com"})
+        assert response.status_code == 503
+        assert response.headers["access-control-allow-origin"] in ("*", "https://example.com")
+        assert response.headers["retry-after"] == "1"
+        assert response.content == JSONResponse(ServiceOverloadedError().to_dict()).body
+
+    def test_health_exempt(self):
+        """/health は上限に関係なく処理されること"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, min_limit=1)
+        client = TestClient(_build_app(limiter))
+        limiter.try_acquire()
+        assert client.get("/health").status_code == 200
+
+    def test_releases_after_request(self):
+        """リクエスト完了後に処理枠が解放されること"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, min_limit=1)
+        client = TestClient(_build_app(limiter))
+        for _ in range(3):
+            assert client.get("/api/ping").status_code == 200
+        assert limiter.in_flight == 0
+
+
+class TestMetricsEndpoint:
+    """/metrics エンドポイントのテスト"""
+
+    def test_metrics(self):
+        """ラグと同時処理数の上限が公開されること"""
+        client = TestClient(app)
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        data = response.json()
+        assert "event_loop_lag_ms" in data
+        assert data["concurrency_limit"] > 0
+        assert "in_flight" in data
+        assert "shed_total" in data
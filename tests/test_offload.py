@@ -0,0 +1,163 @@
+"""
+スレッドプールへのオフロードのテスト
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import routers.convert
+from exceptions import ServiceOverloadedError
+from main import app
+from offload import ConversionOffloader
+
+
+class TestConversionOffloader:
+    """ConversionOffloaderのテスト"""
+
+    def test_should_offload_threshold(self):
+        """閾値以上の場合のみオフロード対象となり、統計が更新されること"""
+        offloader = ConversionOffloader(threshold=10)
+        assert offloader.should_offload(9) is False
+        assert offloader.should_offload(10) is True
+        assert offloader.inline_total == 1
+        assert offloader.offloaded_total == 1
+
+    def test_run_in_worker_thread(self):
+        """処理がイベントループとは別のスレッドで実行されること"""
+        offloader = ConversionOffloader(threshold=1, max_workers=2)
+
+        async def scenario():
+            loop_thread = threading.get_ident()
+            worker_thread = await offloader.run(threading.get_ident)
+            return loop_thread, worker_thread
+
+        loop_thread, worker_thread = asyncio.run(scenario())
+        offloader.shutdown()
+        assert loop_thread != worker_thread
+        assert offloader.queue_depth == 0
+        assert offloader.active == 0
+
+    def test_queue_depth(self):
+        """ワーカーが埋まっている間は実行待ちの数がキューの深さとして計測されること"""
+        offloader = ConversionOffloader(threshold=1, max_workers=1)
+        release = threading.Event()
+
+        async def scenario():
+            first = asyncio.ensure_future(offloader.run(release.wait))
+            second = asyncio.ensure_future(offloader.run(lambda: 42))
+            await asyncio.sleep(0.05)
+            depth = offloader.queue_depth
+            active = offloader.active
+            release.set()
+            await asyncio.gather(first, second)
+            return depth, active
+
+        depth, active = asyncio.run(scenario())
+        offloader.shutdown()
+        assert depth == 1
+        assert active == 1
+        assert offloader.queue_depth == 0
+
+    def test_reject_when_queue_full(self):
+        """空きを待つ処理が上限に達している場合は待たずに拒否すること"""
+        offloader = ConversionOffloader(threshold=1, max_workers=1, max_pending=1, max_queued=1, queue_timeout=5.0)
+        release = threading.Event()
+
+        async def scenario():
+            running = asyncio.ensure_future(offloader.run(release.wait))
+            queued = asyncio.ensure_future(offloader.run(lambda: 42))
+            await asyncio.sleep(0.05)
+            depth = offloader.queue_depth
+            with pytest.raises(ServiceOverloadedError):
+                await offloader.run(lambda: 0)
+            release.set()
+            return depth, await queued, await running
+
+        depth, queued, _ = asyncio.run(scenario())
+        offloader.shutdown()
+        assert depth == 1
+        assert queued == 42
+        assert offloader.rejected_total == 1
+        assert offloader.queue_depth == 0
+
+    def test_reject_after_timeout(self):
+        """空きを待つ時間が上限を超えた場合は拒否すること"""
+        offloader = ConversionOffloader(threshold=1, max_workers=1, max_pending=1, queue_timeout=0.05)
+        release = threading.Event()
+
+        async def scenario():
+            running = asyncio.ensure_future(offloader.run(release.wait))
+            await asyncio.sleep(0.01)
+            with pytest.raises(ServiceOverloadedError):
+                await offloader.run(lambda: 0)
+            release.set()
+            await running
+
+        asyncio.run(scenario())
+        offloader.shutdown()
+        assert offloader.rejected_total == 1
+        assert offloader.queue_depth == 0
+
+
+class TestOffloadedEndpoints:
+    """オフロード時のエンドポイントのテスト"""
+
+    def test_batch_offloaded_same_result(self, monkeypatch):
+        """オフロードされた一括変換がインライン時と同じ結果を返すこと"""
+        client = TestClient(app)
+        payload = {"value": 1, "from_unit": "m", "category": "length", "to_units": ["km", "cm", "xyz"]}
+        inline = client.post("/api/convert/batch", json=payload).json()
+
+        offloader = ConversionOffloader(threshold=2)
+        monkeypatch.setattr(routers.convert, "offloader", offloader)
+        response = client.post("/api/convert/batch", json=payload)
+        offloader.shutdown()
+
+        assert response.status_code == 200
+        assert response.json() == inline
+        assert offloader.offloaded_total == 1
+
+    def test_bulk_offloaded_same_result(self, monkeypatch):
+        """オフロードされた大量変換がインライン時と同じ結果を返すこと"""
+        client = TestClient(app)
+        payload = {"values": [float(i) for i in range(100)], "from_unit": "ft", "to_unit": "m", "category": "length"}
+        inline = client.post("/api/convert/bulk", json=payload).json()
+
+        offloader = ConversionOffloader(threshold=50)
+        monkeypatch.setattr(routers.convert, "offloader", offloader)
+        response = client.post("/api/convert/bulk", json=payload)
+        offloader.shutdown()
+
+        assert response.status_code == 200
+        assert response.json() == inline
+        assert offloader.offloaded_total == 1
+
+    def test_metrics_include_offload(self):
+        """/metrics にオフロードの統計が含まれること"""
+        data = TestClient(app).get("/metrics").json()
+        assert set(data["offload"]) == {"offloaded_total", "inline_total", "queue_depth", "rejected_total", "active"}
+
+    def test_overloaded_returns_503(self, monkeypatch):
+        """オフロードの空きがない場合は503とRetry-Afterを返すこと"""
+        offloader = ConversionOffloader(threshold=1, max_workers=1, max_pending=1, max_queued=0)
+        release = threading.Event()
+        monkeypatch.setattr(routers.convert, "offloader", offloader)
+        blocker = threading.Thread(target=lambda: asyncio.run(offloader.run(release.wait)))
+        blocker.start()
+        try:
+            while offloader.active == 0:
+                time.sleep(0.001)
+            response = TestClient(app).post(
+                "/api/convert/bulk", json={"values": [1, 2], "from_unit": "m", "to_unit": "km", "category": "length"}
+            )
+        finally:
+            release.set()
+            blocker.join()
+            offloader.shutdown()
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+        assert response.json()["code"] == "OVERLOADED"
@@ -0,0 +1,69 @@
+"""
+SI接頭辞・2進接頭辞の解析のテスト
+"""
+
+import pytest
+
+from converters.prefixes import PrefixedUnits
+
+
+class TestPrefixedUnits:
+    """PrefixedUnitsのテスト"""
+
+    def test_si_prefixes(self):
+        """SI接頭辞付きの単位を係数に解決すること"""
+        units = PrefixedUnits({"m": (1.0, ["si"])})
+        assert units.parse("km") == ("km", 1e3)
+        assert units.parse("nm") == ("nm", 1e-9)
+        assert units.parse("dam") == ("dam", 10.0)
+        assert units.parse("Qm") == ("Qm", 1e30)
+
+    def test_case_sensitive(self):
+        """接頭辞の大文字小文字を区別すること"""
+        units = PrefixedUnits({"m": (1.0, ["si"])})
+        assert units.factor("Mm") == 1e6
+        assert units.factor("mm") == 1e-3
+        assert units.parse("MM") is None
+        assert units.parse("Km") is None
+
+    def test_micro_spellings(self):
+        """マイクロは μ（ギリシャ文字）・µ（マイクロ記号）・u のいずれでも解決すること"""
+        units = PrefixedUnits({"g": (1.0, ["si"])})
+        for unit in ["μg", "µg", "ug"]:
+            assert units.canonical(unit) == "μg"
+
+    def test_listed_code_preferred(self):
+        """係数の表に列挙した単位は、表記によらず列挙した単位コードに解決すること"""
+        units = PrefixedUnits({"s": (1.0, ["si"])}, listed=["s", "ms", "us"])
+        for unit in ["μs", "µs", "us"]:
+            assert units.parse(unit) == ("us", pytest.approx(1e-6))
+        assert units.canonical("ms") == "ms"
+        assert units.canonical("ns") == "ns"
+
+    def test_binary_prefixes(self):
+        """2進接頭辞は指定した単位だけに付けられること"""
+        units = PrefixedUnits({"B": (1.0, ["si", "binary"]), "m": (1.0, ["si"])})
+        assert units.factor("KiB") == 1024
+        assert units.factor("GiB") == 2 ** 30
+        assert units.factor("kB") == 1e3
+        assert units.parse("Kim") is None
+
+    def test_not_prefixed(self):
+        """基準単位そのものや未知の単位は解決しないこと"""
+        units = PrefixedUnits({"m": (1.0, ["si"])})
+        for unit in ["m", "", "xm", "kft", "k"]:
+            assert units.parse(unit) is None
+
+    def test_bounded_cache(self):
+        """解析結果を上限付きのキャッシュに保持すること"""
+        units = PrefixedUnits({"m": (1.0, ["si"])}, cache_size=2)
+        for unit in ["km", "km", "cm", "mm", "nm"]:
+            units.parse(unit)
+        info = units.parse.cache_info()
+        assert info.hits == 1
+        assert info.currsize == 2
+
+    def test_invalid_system(self):
+        """無効な接頭辞の種類はValueErrorになること"""
+        with pytest.raises(ValueError, match="Invalid prefix system"):
+            PrefixedUnits({"m": (1.0, ["metric"])})
@@ -0,0 +1,204 @@
+"""
+為替レートの履歴ストアのテスト
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from converters.rate_history import (
+    RateHistory,
+    RateHistoryError,
+    append_rates,
+    create_rate_history,
+    main,
+)
+from main import app
+from routers import convert as convert_router
+from routers import rates as rates_router
+
+client = TestClient(app)
+
+START = date(2024, 1, 1)
+
+
+@pytest.fixture
+def history_path(tmp_path):
+    """100日分（平日のみ）のレートを記録した履歴"""
+    path = tmp_path / "rates"
+    create_rate_history(path, "USD", ["EUR", "JPY"])
+    for i in range(100):
+        day = START + timedelta(days=i)
+        if day.weekday() < 5:
+            append_rates(path, day, {"EUR": 0.9, "JPY": 100.0 + i})
+    return path
+
+
+class TestRateHistory:
+    """RateHistoryのテスト"""
+
+    def test_lookup_as_of(self, history_path):
+        """指定日以前で最新のレートを使うこと（週末は直前の金曜日）"""
+        history = RateHistory(history_path)
+        rates, rate_dates = history.rates_at("JPY", [date(2024, 1, 5), date(2024, 1, 6), date(2024, 1, 7)])
+        assert list(rates) == [104.0, 104.0, 104.0]
+        assert rate_dates == [date(2024, 1, 5)] * 3
+
+    def test_vectorized_lookup(self, history_path):
+        """昇順・降順の混在した日付の配列をまとめて検索できること"""
+        history = RateHistory(history_path)
+        days = [START + timedelta(days=i) for i in (0, 30, 10, 10, 99, 1)]
+        rates, _ = history.rates_at("JPY", days)
+        expected = [history.rates_at("JPY", [day])[0][0] for day in days]
+        assert list(rates) == expected
+
+    def test_convert_at(self, history_path):
+        """通貨ごとの列から任意の通貨の組み合わせで換算できること"""
+        history = RateHistory(history_path)
+        results, _ = history.convert_at([1, 2], "EUR", "JPY", [START, START + timedelta(days=1)])
+        assert results == pytest.approx([100.0 / 0.9, 2 * 101.0 / 0.9])
+        results, _ = history.convert_at([100.0], "JPY", "USD", [START])
+        assert results == [1.0]
+
+    def test_before_first_date(self, history_path):
+        """記録より前の日付はRateHistoryErrorになること"""
+        history = RateHistory(history_path)
+        with pytest.raises(RateHistoryError, match="No rate on or before 2023-12-31"):
+            history.rates_at("JPY", [date(2023, 12, 31)])
+
+    def test_unknown_currency(self, history_path):
+        """履歴のない通貨はRateHistoryErrorになること"""
+        history = RateHistory(history_path)
+        with pytest.raises(RateHistoryError, match="GBP"):
+            history.rates_at("GBP", [START])
+
+    def test_sees_appended_rows(self, history_path):
+        """記録済みの範囲より後の日付を検索すると追記された行を読み込むこと"""
+        history = RateHistory(history_path)
+        last = history.last_date
+        new_day = last + timedelta(days=1)
+        append_rates(history_path, new_day, {"EUR": 0.8, "JPY": 500.0})
+        rates, rate_dates = history.rates_at("JPY", [new_day])
+        assert list(rates) == [500.0]
+        assert rate_dates == [new_day]
+
+    def test_append_validation(self, history_path):
+        """日付の逆行・レートの不足は追記できないこと"""
+        with pytest.raises(RateHistoryError, match="Date must be after"):
+            append_rates(history_path, START, {"EUR": 0.9, "JPY": 100.0})
+        with pytest.raises(RateHistoryError, match="JPY"):
+            append_rates(history_path, date(2030, 1, 1), {"EUR": 0.9})
+
+    def test_empty_history(self, tmp_path):
+        """空の履歴を開けること"""
+        create_rate_history(tmp_path / "empty", "USD", ["JPY"])
+        history = RateHistory(tmp_path / "empty")
+        assert len(history) == 0
+        assert history.last_date is None
+        with pytest.raises(RateHistoryError):
+            history.rates_at("JPY", [START])
+
+    def test_cli(self, tmp_path):
+        """コマンドラインから作成・追記できること"""
+        path = str(tmp_path / "cli")
+        assert main(["init", path, "--base", "USD", "--currencies", "JPY"]) == 0
+        assert main(["append", path, "2026-10-19", '{"JPY": 150.0}']) == 0
+        assert main(["append", path, "2026-10-18", '{"JPY": 150.0}']) == 1
+        assert RateHistory(path).last_date == date(2026, 10, 19)
+
+
+class TestHistoricalAPI:
+    """日付を指定した通貨換算APIのテスト"""
+
+    def test_convert(self, history_path, monkeypatch):
+        """日付ごとのレートで換算し、使ったレートの日付を返すこと"""
+        monkeypatch.setattr(rates_router, "_history", RateHistory(history_path))
+        response = client.post(
+            "/api/currency/historical",
+            json={"values": [1, 1], "dates": ["2024-01-02", "2024-01-06"], "from_unit": "dollar", "to_unit": "円"}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["from_unit"] == "USD"
+        assert data["to_unit"] == "JPY"
+        assert data["results"] == [101.0, 104.0]
+        assert data["rate_dates"] == ["2024-01-02", "2024-01-05"]
+
+    def test_rate_not_available(self, history_path, monkeypatch):
+        """記録より前の日付は400になること"""
+        monkeypatch.setattr(rates_router, "_history", RateHistory(history_path))
+        response = client.post(
+            "/api/currency/historical",
+            json={"values": [1], "dates": ["2000-01-01"], "from_unit": "USD", "to_unit": "JPY"}
+        )
+        assert response.status_code == 400
+        assert response.json()["code"] == "RATE_NOT_AVAILABLE"
+
+    def test_length_mismatch(self, history_path, monkeypatch):
+        """値と日付の数が異なる場合はバリデーションエラーになること"""
+        monkeypatch.setattr(rates_router, "_history", RateHistory(history_path))
+        response = client.post(
+            "/api/currency/historical",
+            json={"values": [1, 2], "dates": ["2024-01-02"], "from_unit": "USD", "to_unit": "JPY"}
+        )
+        assert response.status_code == 400
+        assert response.json()["code"] == "VALIDATION_ERROR"
+
+    def test_body_too_large(self, history_path, monkeypatch):
+        """ボディのサイズが上限を超える場合は413を返すこと"""
+        monkeypatch.setattr(rates_router, "_history", RateHistory(history_path))
+        monkeypatch.setattr(convert_router, "MAX_BODY_SIZE", 1024)
+        response = client.post(
+            "/api/currency/historical",
+            json={"values": [1] * 500, "dates": ["2024-01-02"] * 500, "from_unit": "USD", "to_unit": "JPY"}
+        )
+        assert response.status_code == 413
+        assert response.json()["code"] == "PAYLOAD_TOO_LARGE"
+
+    def test_array_too_long(self, history_path, monkeypatch):
+        """values・dates の要素数が上限を超える場合は413を返すこと"""
+        monkeypatch.setattr(rates_router, "_history", RateHistory(history_path))
+        monkeypatch.setattr(convert_router, "MAX_ARRAY_LENGTH", 2)
+        response = client.post(
+            "/api/currency/historical",
+            json={"dates": ["2024-01-02"] * 3, "values": [1, 1, 1], "from_unit": "USD", "to_unit": "JPY"}
+        )
+        assert response.status_code == 413
+        assert response.json() == {
+            "success": False, "error": "Array 'dates' has more than 2 items", "code": "PAYLOAD_TOO_LARGE"
+        }
+
+    def test_not_configured(self, monkeypatch):
+        """履歴が設定されていない場合は503になること"""
+        monkeypatch.setattr(rates_router, "_history", None)
+        monkeypatch.setattr(rates_router, "RATE_HISTORY_PATH", None)
+        response = client.post(
+            "/api/currency/historical",
+            json={"values": [1], "dates": ["2024-01-02"], "from_unit": "USD", "to_unit": "JPY"}
+        )
+        assert response.status_code == 503
+        assert response.json()["code"] == "RATE_HISTORY_UNAVAILABLE"
+
+    def test_unreadable_history(self, tmp_path, monkeypatch):
+        """履歴を読み込めない場合は500ではなく503になること"""
+        monkeypatch.setattr(rates_router, "_history", None)
+        monkeypatch.setattr(rates_router, "RATE_HISTORY_PATH", str(tmp_path / "missing"))
+        response = client.post(
+            "/api/currency/historical",
+            json={"values": [1], "dates": ["2024-01-02"], "from_unit": "USD", "to_unit": "JPY"}
+        )
+        assert response.status_code == 503
+        assert response.json() == {
+            "success": False,
+            "error": "Rate history is unavailable",
+            "code": "RATE_HISTORY_UNAVAILABLE",
+        }
+
+    def test_unreadable_history_fails_startup(self, tmp_path, monkeypatch):
+        """設定された履歴を読み込めない場合は起動時に失敗すること"""
+        monkeypatch.setattr(rates_router, "_history", None)
+        monkeypatch.setattr(rates_router, "RATE_HISTORY_PATH", str(tmp_path / "missing"))
+        with pytest.raises(OSError):
+            with TestClient(app):
+                pass
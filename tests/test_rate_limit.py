@@ -0,0 +1,140 @@
+"""
+レート制限ミドルウェアのテスト
+"""
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+import main
+from exceptions import RateLimitExceededError
+from middleware.rate_limit import RateLimitMiddleware, TokenBucketLimiter
+
+
+class FakeClock:
+    """テスト用の時計"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucketLimiter:
+    """TokenBucketLimiterのテスト"""
+
+    def test_allows_burst_then_rejects(self):
+        """バースト分までは許可され、超えると待ち時間を返すこと"""
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(rate=2.0, burst=3, clock=clock)
+        assert [limiter.acquire("a") for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert limiter.acquire("a") == 0.5
+
+    def test_refill(self):
+        """時間経過でトークンが補充されること"""
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(rate=1.0, burst=1, clock=clock)
+        assert limiter.acquire("a") == 0.0
+        assert limiter.acquire("a") > 0
+        clock.now += 1.0
+        assert limiter.acquire("a") == 0.0
+
+    def test_clients_are_independent(self):
+        """クライアントごとに独立したバケットを持つこと"""
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(rate=1.0, burst=1, clock=clock)
+        assert limiter.acquire("a") == 0.0
+        assert limiter.acquire("b") == 0.0
+        assert limiter.acquire("a") > 0
+
+    def test_bounded_size(self):
+        """クライアント数の上限を超えると古いバケットから削除されること"""
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(rate=1.0, burst=1, max_clients=3, clock=clock)
+        for key in ["a", "b", "c", "d", "e"]:
+            limiter.acquire(key)
+        assert len(limiter) == 3
+
+    def test_idle_eviction(self):
+        """アイドル時間を過ぎたバケットが削除されること"""
+        clock = FakeClock()
+        limiter = TokenBucketLimiter(rate=1.0, burst=1, idle_ttl=60.0, clock=clock)
+        limiter.acquire("a")
+        limiter.acquire("b")
+        clock.now += 61.0
+        limiter.acquire("c")
+        assert len(limiter) == 1
+
+
+def _build_app(rate: float = 1.0, burst: int = 2, api_keys: tuple[str, ...] = ()) -> FastAPI:
+    """テスト用の小さなアプリケーションを構築"""
+    test_app = FastAPI()
+    test_app.add_middleware(RateLimitMiddleware, rate=rate, burst=burst, api_keys=api_keys)
+
+    @test_app.get("/api/ping")
+    async def ping():
+        return {"ok": True}
+
+    @test_app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    return test_app
+
+
+class TestRateLimitMiddleware:
+    """RateLimitMiddlewareのテスト"""
+
+    def test_returns_429_with_retry_after(self):
+        """制限を超えると429とRetry-Afterを返すこと"""
+        client = TestClient(_build_app(rate=0.5, burst=2))
+        assert client.get("/api/ping").status_code == 200
+        assert client.get("/api/ping").status_code == 200
+        response = client.get("/api/ping")
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "2"
+        assert response.json() == {"success": False, "error": "Rate limit exceeded", "code": "RATE_LIMITED"}
+
+    def test_keyed_by_api_key(self):
+        """登録済みのAPIキーごとに別々に制限されること"""
+        client = TestClient(_build_app(rate=1.0, burst=1, api_keys=("one", "two")))
+        assert client.get("/api/ping", headers={"X-API-Key": "one"}).status_code == 200
+        assert client.get("/api/ping", headers={"X-API-Key": "two"}).status_code == 200
+        assert client.get("/api/ping", headers={"X-API-Key": "one"}).status_code == 429
+
+    def test_unregistered_api_key_keyed_by_ip(self):
+        """未登録のAPIキーを付け替えても同じIPの制限を受けること"""
+        client = TestClient(_build_app(rate=1.0, burst=2, api_keys=("one",)))
+        assert client.get("/api/ping", headers={"X-API-Key": "a"}).status_code == 200
+        assert client.get("/api/ping", headers={"X-API-Key": "b"}).status_code == 200
+        assert client.get("/api/ping", headers={"X-API-Key": "c"}).status_code == 429
+        assert client.get("/api/ping", headers={"X-API-Key": "one"}).status_code == 200
+
+    def test_random_keys_do_not_create_buckets(self):
+        """未登録のAPIキーではバケットが増えないこと（他のクライアントを追い出せない）"""
+        app = _build_app(rate=100.0, burst=100)
+        client = TestClient(app)
+        for i in range(20):
+            client.get("/api/ping", headers={"X-API-Key": f"random-{i}"})
+        middleware = app.middleware_stack
+        while not isinstance(middleware, RateLimitMiddleware):
+            middleware = middleware.app
+        assert len(middleware.limiter) == 1
+
+    def test_cors_headers_and_error_format(self):
+        """429も通常の経路と同じCORSヘッダーとエラーの形式（JSONResponse）で返すこと"""
+        client = TestClient(RateLimitMiddleware(main.app, rate=0.001, burst=1, wrap=main.wrap_fast_lane_response))
+        headers = {"Origin": "https://example.com"}
+        assert client.get("/api/categories", headers=headers).status_code == 200
+        response = client.get("/api/categories", headers=headers)
+        assert response.status_code == 429
+        assert response.headers["access-control-allow-origin"] in ("*", "https://example.com")
+        assert response.headers["retry-after"]
+        assert response.content == JSONResponse(RateLimitExceededError().to_dict()).body
+
+    def test_non_api_paths_exempt(self):
+        """API以外のパス（/healthなど）は制限されないこと"""
+        client = TestClient(_build_app(rate=1.0, burst=1))
+        for _ in range(5):
+            assert client.get("/health").status_code == 200
@@ -0,0 +1,101 @@
+"""
+本番用サーバー起動スクリプトのテスト
+"""
+
+from unittest.mock import patch
+
+from server import (
+    build_uvicorn_options,
+    default_worker_count,
+    detect_cgroup_cpu_limit,
+    parse_args,
+)
+
+
+class TestDetectCgroupCpuLimit:
+    """detect_cgroup_cpu_limit関数のテスト"""
+
+    def test_cgroup_v2_quota(self, tmp_path):
+        """cgroup v2のクォータが読み取れること"""
+        (tmp_path / "cpu.max").write_text("200000 100000\n")
+        assert detect_cgroup_cpu_limit(tmp_path) == 2.0
+
+    def test_cgroup_v2_unlimited(self, tmp_path):
+        """cgroup v2で無制限の場合はNoneを返すこと"""
+        (tmp_path / "cpu.max").write_text("max 100000\n")
+        assert detect_cgroup_cpu_limit(tmp_path) is None
+
+    def test_cgroup_v1_quota(self, tmp_path):
+        """cgroup v1のクォータが読み取れること"""
+        (tmp_path / "cpu").mkdir()
+        (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("150000")
+        (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000")
+        assert detect_cgroup_cpu_limit(tmp_path) == 1.5
+
+    def test_cgroup_v1_unlimited(self, tmp_path):
+        """cgroup v1でquotaが-1の場合はNoneを返すこと"""
+        (tmp_path / "cpu").mkdir()
+        (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1")
+        (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000")
+        assert detect_cgroup_cpu_limit(tmp_path) is None
+
+    def test_no_cgroup(self, tmp_path):
+        """cgroupファイルがない場合はNoneを返すこと"""
+        assert detect_cgroup_cpu_limit(tmp_path) is None
+
+
+class TestDefaultWorkerCount:
+    """default_worker_count関数のテスト"""
+
+    def test_limited_by_cgroup(self, tmp_path):
+        """cgroupのクォータで制限されること（切り上げ）"""
+        (tmp_path / "cpu.max").write_text("150000 100000")
+        with patch("server.available_cpus", return_value=8):
+            assert default_worker_count(tmp_path) == 2
+
+    def test_limited_by_affinity(self, tmp_path):
+        """CPUアフィニティの方が小さい場合はそちらを採用すること"""
+        (tmp_path / "cpu.max").write_text("800000 100000")
+        with patch("server.available_cpus", return_value=2):
+            assert default_worker_count(tmp_path) == 2
+
+    def test_at_least_one(self, tmp_path):
+        """最低1ワーカーになること"""
+        (tmp_path / "cpu.max").write_text("10000 100000")
+        with patch("server.available_cpus", return_value=4):
+            assert default_worker_count(tmp_path) == 1
+
+
+class TestBuildUvicornOptions:
+    """build_uvicorn_options関数のテスト"""
+
+    def test_explicit_options(self):
+        """指定したオプションが反映されること"""
+        args = parse_args(["--workers", "3", "--port", "9000", "--keep-alive", "20", "--backlog", "4096"])
+        options = build_uvicorn_options(args)
+        assert options["workers"] == 3
+        assert options["port"] == 9000
+        assert options["timeout_keep_alive"] == 20
+        assert options["backlog"] == 4096
+
+    def test_auto_workers(self):
+        """ワーカー数が0の場合は自動決定されること"""
+        with patch("server.default_worker_count", return_value=6):
+            options = build_uvicorn_options(parse_args(["--workers", "0"]))
+        assert options["workers"] == 6
+
+    def test_uses_uvloop_and_httptools(self):
+        """uvloopとhttptoolsがインストールされていれば使用されること"""
+        options = build_uvicorn_options(parse_args(["--workers", "1"]))
+        assert options["loop"] == "uvloop"
+        assert options["http"] == "httptools"
+
+    def test_malformed_env_uses_default(self, monkeypatch):
+        """環境変数が不正な値の場合はデフォルト値を使うこと"""
+        monkeypatch.setenv("PORT", "80a")
+        monkeypatch.setenv("METRIX_WORKERS", "four")
+        monkeypatch.setenv("METRIX_KEEP_ALIVE", "30")
+        args = parse_args([])
+        assert args.port == 8080
+        assert args.workers == 0
+        assert args.keep_alive == 30
@@ -0,0 +1,227 @@
+"""
+起動時間（インポート時間）のテスト
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+# API専用モードでの `import main` のインポート時間予算（マイクロ秒、計測値の約0.33秒の約1.5倍）
+# README.md の「起動時間の予算」を参照
+IMPORT_TIME_BUDGET_US = 500_000
+
+# コアライブラリ（`import metrix`）のインポート時間予算（マイクロ秒）
+CORE_IMPORT_TIME_BUDGET_US = 100_000
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _run_importtime(code: str, extra_env: dict[str, str]) -> dict[str, int]:
+    """
+    `python -X importtime` でコードを実行し、モジュールごとの累積インポート時間を返す
+
+    Returns:
+        dict[str, int]: モジュール名から累積時間（マイクロ秒）へのマッピング
+    """
+    env = {**os.environ, **extra_env}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            timings[name.strip()] = int(cumulative)
+    return timings
+
+
+class TestApiOnlyMode:
+    """API専用モードのテスト"""
+
+    def test_ui_stack_not_imported(self):
+        """API専用モードではJinja2・テンプレート関連が読み込まれないこと"""
+        timings = _run_importtime("import main", {"METRIX_API_ONLY": "1"})
+        assert "main" in timings
+        assert "jinja2" not in timings
+        assert "fastapi.templating" not in timings
+        assert "fastapi.staticfiles" not in timings
+
+    def test_optional_subsystems_not_imported(self):
+        """コマンドラインツール用のモジュールと無効にした機能のモジュールが読み込まれないこと"""
+        timings = _run_importtime("import main", {"METRIX_API_ONLY": "1", "METRIX_JOBS": "0"})
+        assert "main" in timings
+        for module in ("argparse", "concurrent.futures.process", "multiprocessing", "jobs", "routers.jobs"):
+            assert module not in timings
+
+    def test_jobs_disabled(self):
+        """変換ジョブを無効にした場合は /api/jobs を提供しないこと"""
+        code = (
+            "from fastapi.testclient import TestClient\n"
+            "import main\n"
+            "client = TestClient(main.app)\n"
+            "job = {'values': [1], 'from_unit': 'm', 'to_unit': 'km', 'category': 'length'}\n"
+            "assert client.post('/api/jobs', json=job).status_code == 404\n"
+            "assert client.post('/api/convert', json={'value': 1, 'from_unit': 'm', 'to_unit': 'km', "
+            "'category': 'length'}).status_code == 200\n"
+        )
+        env = {**os.environ, "METRIX_API_ONLY": "1", "METRIX_JOBS": "0"}
+        subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, env=env, check=True)
+
+    def test_import_time_budget(self):
+        """API専用モードの `import main` がインポート時間予算内に収まること"""
+        timings = _run_importtime("import main", {"METRIX_API_ONLY": "1"})
+        assert timings["main"] < IMPORT_TIME_BUDGET_US
+
+    def test_api_only_routes(self):
+        """API専用モードでもAPIは動作し、UIはマウントされないこと"""
+        code = (
+            "from fastapi.testclient import TestClient\n"
+            "import main\n"
+            "client = TestClient(main.app)\n"
+            "assert client.get('/').status_code == 404\n"
+            "assert client.get('/static/js/app.js').status_code == 404\n"
+            "assert client.get('/api/units/length').status_code == 200\n"
+        )
+        env = {**os.environ, "METRIX_API_ONLY": "1"}
+        subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, env=env, check=True)
+
+
+class TestCoreLibrary:
+    """コアライブラリのテスト"""
+
+    def test_web_stack_not_imported(self):
+        """`import metrix` でFastAPI・Starlette・Pydanticが読み込まれないこと"""
+        timings = _run_importtime("import metrix", {})
+        assert "metrix" in timings
+        for module in ("fastapi", "starlette", "pydantic", "config"):
+            assert module not in timings
+
+    def test_import_time_budget(self):
+        """`import metrix` がインポート時間予算内に収まること"""
+        timings = _run_importtime("import metrix", {})
+        assert timings["metrix"] < CORE_IMPORT_TIME_BUDGET_US
+
+
+class TestUiMode:
+    """通常モード（UIあり）のテスト"""
+
+    def test_templates_loaded_lazily(self):
+        """Jinja2はインポート時には読み込まれないこと"""
+        timings = _run_importtime("import main", {"METRIX_API_ONLY": "0"})
+        assert "jinja2" not in timings
+
+    def test_root_page(self):
+        """メイン画面が表示されること"""
+        from main import app
+        client = TestClient(app)
+        response = client.get("/")
+        assert response.status_code == 200
+        assert "metrix" in response.text
+
+    def test_service_worker(self):
+        """Service Workerがバージョン付きのキャッシュ名・プリキャッシュするURLとともに配信されること"""
+        import main
+        client = TestClient(main.app)
+        response = client.get("/sw.js")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/javascript")
+        assert response.headers["cache-control"] == "no-cache"
+        version = main.get_asset_version()
+        assert f'CACHE_PREFIX + "{version}"' in response.text
+        assert '"/static/css/style.css"' in response.text
+        assert '"/static/js/app.js"' in response.text
+
+    def test_asset_version_from_env(self, monkeypatch):
+        """METRIX_ASSET_VERSION を設定した場合はその値をバージョンに使うこと"""
+        import main
+        monkeypatch.setattr(main.config, "ASSET_VERSION", "deploy-42")
+        monkeypatch.setattr(main, "_asset_version", None)
+        response = TestClient(main.app).get("/sw.js")
+        assert 'CACHE_PREFIX + "deploy-42"' in response.text
+
+    def test_asset_version_is_content_hash(self, monkeypatch):
+        """未設定の場合は静的ファイルの内容のハッシュをバージョンに使うこと"""
+        import main
+        monkeypatch.setattr(main.config, "ASSET_VERSION", None)
+        monkeypatch.setattr(main, "_asset_version", None)
+        version = main.get_asset_version()
+        assert len(version) == 12
+        monkeypatch.setattr(main, "_asset_version", None)
+        assert main.get_asset_version() == version
+
+
+class TestReadiness:
+    """ウォームアップとreadinessプローブのテスト"""
+
+    def test_not_ready_before_startup(self):
+        """ウォームアップ前は503を返すこと"""
+        from main import app
+        client = TestClient(app)
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json() == {"status": "starting"}
+
+    def test_ready_after_startup(self):
+        """lifespanのウォームアップ完了後は200を返すこと"""
+        from main import app
+        with TestClient(app) as client:
+            response = client.get("/ready")
+            assert response.status_code == 200
+            assert response.json() == {"status": "ready"}
+            # OpenAPIスキーマが生成済みであること
+            assert app.openapi_schema is not None
+
+    def test_health_independent_of_readiness(self):
+        """/health はウォームアップ状態に関係なく200を返すこと"""
+        from main import app
+        client = TestClient(app)
+        assert client.get("/health").status_code == 200
+
+
+class TestWarmUp:
+    """ウォームアップ処理のテスト"""
+
+    def test_warmup_requests_cover_all_categories(self):
+        """全カテゴリの全ルートがウォームアップ対象であること"""
+        from routers.convert import CATEGORY_CONFIG
+        from warmup import warmup_requests
+        paths = {(method, path) for method, path, _ in warmup_requests()}
+        for category in CATEGORY_CONFIG:
+            assert ("GET", f"/api/units/{category}") in paths
+        assert ("POST", "/api/convert") in paths
+        assert ("POST", "/api/convert/batch") in paths
+        assert ("POST", "/api/convert/bulk") in paths
+
+    def test_warm_up_succeeds(self):
+        """ウォームアップのリクエストがすべて成功すること"""
+        import asyncio
+        from main import app
+        from warmup import warm_up
+        assert asyncio.run(warm_up(app)) is True
+
+    def test_warm_up_exempt_from_rate_limit_and_load_shedding(self):
+        """レート制限・負荷制御が有効でもウォームアップのリクエストが拒否されないこと"""
+        code = (
+            "import asyncio\n"
+            "import main\n"
+            "from warmup import dispatch, warmup_requests\n"
+            "main.concurrency_limiter.limit = 0\n"
+            "async def run():\n"
+            "    return [await dispatch(main.app, *request) for request in warmup_requests()]\n"
+            "statuses = asyncio.run(run())\n"
+            "assert len(statuses) > 20\n"
+            "assert 429 not in statuses and 503 not in statuses, statuses\n"
+            "assert set(statuses) == {200}, statuses\n"
+        )
+        env = {**os.environ, "METRIX_RATE_LIMIT": "1", "METRIX_RATE_LIMIT_BURST": "2", "METRIX_LOAD_SHED": "1"}
+        subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, env=env, check=True)
@@ -0,0 +1,163 @@
+"""
+換算表の生成とキャッシュのテスト
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from converters.temperature import convert_temperature
+from main import app
+from routers import tables as tables_router
+from tables import ConversionTableCache, table_size, table_values
+
+client = TestClient(app)
+
+CELSIUS_TABLE = {
+    "category": "temperature", "from_unit": "C", "to_unit": "F", "start": -50, "stop": 150, "step": 0.5
+}
+
+
+class TestTableSize:
+    """table_size・table_valuesのテスト"""
+
+    @pytest.mark.parametrize("start, stop, step, expected", [
+        (-50, 150, 0.5, 401),
+        (0, 1, 0.1, 11),
+        (1, 1, 1, 1),
+        (0, 10, 3, 4),
+        (10, 0, -2.5, 5),
+    ])
+    def test_size(self, start, stop, step, expected):
+        """終了値を含む行数が求められること"""
+        assert table_size(start, stop, step) == expected
+
+    @pytest.mark.parametrize("start, stop, step", [
+        (0, 10, 0),
+        (0, 10, -1),
+        (0, float("inf"), 1),
+        (0, 1, float("nan")),
+    ])
+    def test_invalid_range(self, start, stop, step):
+        """不正な範囲はValueErrorになること"""
+        with pytest.raises(ValueError):
+            table_size(start, stop, step)
+
+    def test_values_do_not_accumulate_error(self):
+        """値は刻み幅を足し込まずに求めるため、誤差が蓄積しないこと"""
+        values = table_values(0.0, 0.1, 0, 1001)
+        assert values[1000] == 100.0
+        assert table_values(0.0, 0.1, 1000, 1001) == [values[1000]]
+
+
+class TestConversionTableCache:
+    """ConversionTableCacheのテスト"""
+
+    def test_admit_after_second_request(self):
+        """2回目の要求で保持され、3回目からはキャッシュから返ること"""
+        cache = ConversionTableCache(max_entries=4, max_rows=100)
+        calls = []
+
+        def build():
+            calls.append(1)
+            return [1.0, 2.0]
+
+        assert cache.get_or_build(("k",), (), 2, build) is None
+        assert cache.get_or_build(("k",), (), 2, build) == [1.0, 2.0]
+        assert cache.get_or_build(("k",), (), 2, build) == [1.0, 2.0]
+        assert len(calls) == 1
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_large_table_not_cached(self):
+        """行数が上限を超える表は保持しないこと"""
+        cache = ConversionTableCache(max_rows=10, admit_after=1)
+        assert cache.get_or_build(("k",), (), 11, lambda: [0.0] * 11) is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """件数が上限を超えると最も古い表が破棄されること"""
+        cache = ConversionTableCache(max_entries=2, admit_after=1)
+        for key in ("a", "b", "a", "c"):
+            cache.get_or_build((key,), (), 1, lambda: [0.0])
+        assert cache.get_or_build(("b",), (), 1, lambda: [1.0]) == [1.0]
+        assert cache.hits == 1
+
+    def test_version_change_rebuilds(self):
+        """バージョンのオブジェクトが変わると作り直すこと"""
+        cache = ConversionTableCache(admit_after=1)
+        old, new = object(), object()
+        cache.get_or_build(("k",), (old,), 1, lambda: [1.0])
+        assert cache.get_or_build(("k",), (new,), 1, lambda: [2.0]) == [2.0]
+        assert cache.get_or_build(("k",), (new,), 1, lambda: [3.0]) == [2.0]
+
+
+class TestConversionTableAPI:
+    """換算表APIのテスト"""
+
+    def setup_method(self):
+        tables_router.table_cache.clear()
+
+    def test_first_page(self):
+        """最初のページと次のページの先頭行が返ること"""
+        response = client.get("/api/table", params={**CELSIUS_TABLE, "limit": 3})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["from_unit"] == "celsius"
+        assert data["total"] == 401
+        assert data["values"] == [-50.0, -49.5, -49.0]
+        assert data["results"] == [convert_temperature(v, "celsius", "fahrenheit") for v in data["values"]]
+        assert data["next_offset"] == 3
+
+    def test_last_page(self):
+        """最後のページには next_offset が含まれないこと"""
+        response = client.get("/api/table", params={**CELSIUS_TABLE, "offset": 399})
+        data = response.json()
+        assert data["values"] == [149.5, 150.0]
+        assert data["results"] == [301.1, 302.0]
+        assert "next_offset" not in data
+
+    def test_pages_match_full_table(self):
+        """ページを連結すると表全体と同じになること（キャッシュの有無によらない）"""
+        pages = []
+        offset = 0
+        while offset is not None:
+            data = client.get("/api/table", params={**CELSIUS_TABLE, "offset": offset, "limit": 150}).json()
+            pages.extend(data["results"])
+            offset = data.get("next_offset")
+        full = client.get("/api/table", params={**CELSIUS_TABLE, "limit": 1000}).json()["results"]
+        assert pages == full
+        assert tables_router.table_cache.hits > 0
+
+    def test_csv_stream(self):
+        """CSVは offset 以降の表全体を返すこと"""
+        response = client.get(
+            "/api/table",
+            params={"category": "length", "from_unit": "in", "to_unit": "cm", "start": 1, "stop": 3, "step": 1,
+                    "format": "csv"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert response.text == "in,cm\n1.0,2.54\n2.0,5.08\n3.0,7.619999999999999\n"
+
+    def test_currency_rate_timestamp(self):
+        """通貨の換算表にはレートの時刻が含まれること"""
+        response = client.get(
+            "/api/table",
+            params={"category": "currency", "from_unit": "USD", "to_unit": "JPY", "start": 1, "stop": 5, "step": 1}
+        )
+        assert response.status_code == 200
+        assert "rate_timestamp" in response.json()
+
+    @pytest.mark.parametrize("params, code", [
+        ({"step": 0}, "VALIDATION_ERROR"),
+        ({"step": -1}, "VALIDATION_ERROR"),
+        ({"stop": 1e12}, "TABLE_TOO_LARGE"),
+        ({"from_unit": "xyz"}, "INVALID_UNIT"),
+        ({"category": "luminosity"}, "INVALID_CATEGORY"),
+        ({"limit": 0}, "VALIDATION_ERROR"),
+        ({"format": "xml"}, "VALIDATION_ERROR"),
+    ])
+    def test_errors(self, params, code):
+        """不正な指定はエラーレスポンスになること"""
+        response = client.get("/api/table", params={**CELSIUS_TABLE, **params})
+        assert response.status_code == 400
+        assert response.json()["code"] == code
@@ -3,7 +3,7 @@
 """
 
 import pytest
-from converters.temperature import convert_temperature, get_temperature_units
+from converters.temperature import convert_temperature, convert_temperature_many, get_temperature_units, is_valid_temperature_unit
 
 
 class TestGetTemperatureUnits:
@@ -22,6 +22,20 @@ class TestGetTemperatureUnits:
             assert unit in units
 
 
+class TestIsValidTemperatureUnit:
+    """is_valid_temperature_unit関数のテスト"""
+
+    def test_valid_units(self):
+        """有効な単位でTrueを返すことを確認"""
+        for unit in ['celsius', 'fahrenheit', 'kelvin']:
+            assert is_valid_temperature_unit(unit) is True
+
+    def test_invalid_units(self):
+        """無効な単位でFalseを返す（例外を送出しない）ことを確認"""
+        for unit in ['xyz', 'Celsius', '']:
+            assert is_valid_temperature_unit(unit) is False
+
+
 class TestConvertTemperature:
     """convert_temperature関数のテスト"""
 
@@ -131,3 +145,30 @@ class TestConvertTemperature:
         """両方の単位が無効な場合にValueErrorが発生することを確認"""
         with pytest.raises(ValueError):
             convert_temperature(100, 'xyz', 'abc')
+
+
+class TestConvertTemperatureMany:
+    """convert_temperature_many関数のテスト"""
+
+    def test_multiple_values(self):
+        """複数の値がまとめて変換されることを確認"""
+        assert convert_temperature_many([0, 100, -40], 'celsius', 'fahrenheit') == pytest.approx([32, 212, -40])
+
+    def test_matches_single_conversion(self):
+        """単一変換と同じ結果になることを確認"""
+        values = [0.1, 1.5, 123.456, -7.0]
+        units = get_temperature_units()
+        for from_unit in units:
+            for to_unit in units:
+                assert convert_temperature_many(values, from_unit, to_unit) == [
+                    convert_temperature(v, from_unit, to_unit) for v in values
+                ]
+
+    def test_empty_list(self):
+        """空のリストでは空のリストを返すことを確認"""
+        assert convert_temperature_many([], get_temperature_units()[0], get_temperature_units()[1]) == []
+
+    def test_invalid_unit(self):
+        """無効な単位でValueErrorが発生することを確認"""
+        with pytest.raises(ValueError, match="Invalid unit: xyz"):
+            convert_temperature_many([1.0], 'xyz', get_temperature_units()[0])
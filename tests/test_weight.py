@@ -3,7 +3,7 @@
 """
 
 import pytest
-from converters.weight import convert_weight, get_weight_units
+from converters.weight import convert_weight, convert_weight_many, get_weight_units, is_valid_weight_unit
 
 
 class TestGetWeightUnits:
@@ -22,6 +22,20 @@ class TestGetWeightUnits:
             assert unit in units
 
 
+class TestIsValidWeightUnit:
+    """is_valid_weight_unit関数のテスト"""
+
+    def test_valid_units(self):
+        """有効な単位でTrueを返すことを確認"""
+        for unit in ['g', 'kg', 'oz']:
+            assert is_valid_weight_unit(unit) is True
+
+    def test_invalid_units(self):
+        """無効な単位でFalseを返す（例外を送出しない）ことを確認"""
+        for unit in ['xyz', 'KG', '']:
+            assert is_valid_weight_unit(unit) is False
+
+
 class TestConvertWeight:
     """convert_weight関数のテスト"""
 
@@ -97,3 +111,30 @@ class TestConvertWeight:
         """両方の単位が無効な場合にValueErrorが発生することを確認"""
         with pytest.raises(ValueError):
             convert_weight(100, 'xyz', 'abc')
+
+
+class TestConvertWeightMany:
+    """convert_weight_many関数のテスト"""
+
+    def test_multiple_values(self):
+        """複数の値がまとめて変換されることを確認"""
+        assert convert_weight_many([1, 2.5, -3], 'kg', 'g') == pytest.approx([1000, 2500, -3000])
+
+    def test_matches_single_conversion(self):
+        """単一変換と同じ結果になることを確認"""
+        values = [0.1, 1.5, 123.456, -7.0]
+        units = get_weight_units()
+        for from_unit in units:
+            for to_unit in units:
+                assert convert_weight_many(values, from_unit, to_unit) == [
+                    convert_weight(v, from_unit, to_unit) for v in values
+                ]
+
+    def test_empty_list(self):
+        """空のリストでは空のリストを返すことを確認"""
+        assert convert_weight_many([], get_weight_units()[0], get_weight_units()[1]) == []
+
+    def test_invalid_unit(self):
+        """無効な単位でValueErrorが発生することを確認"""
+        with pytest.raises(ValueError, match="Invalid unit: xyz"):
+            convert_weight_many([1.0], 'xyz', get_weight_units()[0])
@@ -0,0 +1,114 @@
+"""
+起動時のウォームアップ処理
+
+OpenAPIスキーマの生成と、各ルートへの試行リクエストをプロセス内で実行し、
+最初の実リクエストが初期化コストを負担しないようにする。試行リクエストはスコープに
+WARMUP_SCOPE_KEY を付けて送り、レート制限・負荷制御・アクセスログの対象外にする。
+"""
+
+import json
+import logging
+
+from middleware import WARMUP_SCOPE_KEY
+from routers.convert import CATEGORY_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+async def dispatch(app, method: str, path: str, payload: dict | None = None) -> int:
+    """
+    ASGIアプリケーションにプロセス内でリクエストを送る
+
+    Args:
+        app: ASGIアプリケーション
+        method: HTTPメソッド
+        path: リクエストパス
+        payload: JSONボディ（省略可）
+
+    Returns:
+        int: レスポンスのステータスコード
+    """
+    body = json.dumps(payload).encode() if payload is not None else b""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"warmup"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("warmup", 80),
+        WARMUP_SCOPE_KEY: True,
+    }
+    received = False
+    status = 0
+
+    async def receive():
+        nonlocal received
+        if received:
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+def warmup_requests() -> list[tuple[str, str, dict | None]]:
+    """
+    ウォームアップで送るリクエストの一覧を返す（カテゴリごとに各ルートを1回ずつ）
+
+    Returns:
+        list[tuple[str, str, dict | None]]: (メソッド, パス, ボディ) のリスト
+    """
+    requests = []
+    for category, config in CATEGORY_CONFIG.items():
+        units = config["get_units_func"]()
+        requests.append(("GET", f"/api/units/{category}", None))
+        requests.append(("POST", "/api/convert", {
+            "value": 1.0, "from_unit": units[0], "to_unit": units[-1], "category": category
+        }))
+        requests.append(("POST", "/api/convert/batch", {
+            "value": 1.0, "from_unit": units[0], "category": category
+        }))
+        requests.append(("POST", "/api/convert/bulk", {
+            "values": [1.0, 2.0], "from_unit": units[0], "to_unit": units[-1], "category": category
+        }))
+    return requests
+
+
+async def warm_up(app) -> bool:
+    """
+    アプリケーションをウォームアップする
+
+    Args:
+        app: FastAPIアプリケーション
+
+    Returns:
+        bool: すべての試行リクエストが成功した場合True
+    """
+    # OpenAPIスキーマを生成してキャッシュさせる
+    app.openapi()
+
+    ok = True
+    for method, path, payload in warmup_requests():
+        status = await dispatch(app, method, path, payload)
+        if status != 200:
+            ok = False
+            logger.warning(f"Warm-up request failed: {method} {path} Status: {status}")
+
+    logger.info("Warm-up completed" if ok else "Warm-up completed with errors")
+    return ok